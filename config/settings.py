@@ -123,6 +123,12 @@ class Settings:
     # Настройки
     TZ: str = os.getenv("TZ", "Europe/Moscow")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_ROTATION: str = os.getenv("LOG_ROTATION", "size").lower()
+    LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", str(20 * 1024 * 1024)))
+    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_ROTATION_WHEN: str = os.getenv("LOG_ROTATION_WHEN", "midnight")
+    HOT_PATH_LOG_LIMIT: int = int(os.getenv("HOT_PATH_LOG_LIMIT", "20"))
+    HOT_PATH_LOG_INTERVAL_SECONDS: int = int(os.getenv("HOT_PATH_LOG_INTERVAL_SECONDS", "60"))
     
     # Дополнительные настройки
     ENABLE_VERIFICATION: bool = os.getenv("ENABLE_VERIFICATION", "False").lower() == "true"
@@ -135,6 +141,8 @@ class Settings:
     # Расписание опросов
     POLL_CREATION_HOUR: int = int(os.getenv("POLL_CREATION_HOUR", "9"))
     POLL_CREATION_MINUTE: int = int(os.getenv("POLL_CREATION_MINUTE", "0"))
+    # Общее закрытие дневных опросов: только при ENABLE_PER_GROUP_SCHEDULES=False
+    # и для групп без poll_close_time (иначе действует время каждой группы)
     POLL_CLOSING_HOUR: int = int(os.getenv("POLL_CLOSING_HOUR", "19"))
     POLL_CLOSING_MINUTE: int = int(os.getenv("POLL_CLOSING_MINUTE", "0"))
     DUTY_POLL_HOUR: int = int(os.getenv("DUTY_POLL_HOUR", "10"))
@@ -145,6 +153,76 @@ class Settings:
         if h.strip().isdigit()
     ]
     
+    # Планировщик: сколько секунд после срока задачу ещё можно выполнить
+    # и склеивать ли пропущенные запуски в один
+    SCHEDULER_MISFIRE_GRACE_SECONDS: int = int(os.getenv("SCHEDULER_MISFIRE_GRACE_SECONDS", "300"))
+    SCHEDULER_COALESCE: bool = os.getenv("SCHEDULER_COALESCE", "True").lower() == "true"
+    REMINDER_RETRY_MISFIRE_GRACE_SECONDS: int = int(os.getenv("REMINDER_RETRY_MISFIRE_GRACE_SECONDS", "1800"))
+    # Закрытие и напоминания по времени каждой группы, разнесённые внутри окна
+    ENABLE_PER_GROUP_SCHEDULES: bool = os.getenv("ENABLE_PER_GROUP_SCHEDULES", "True").lower() == "true"
+    GROUP_SCHEDULE_SPREAD_MINUTES: int = int(os.getenv("GROUP_SCHEDULE_SPREAD_MINUTES", "10"))
+    # Опросы создаются потоком: каждая группа получает своё смещение внутри окна
+    # после POLL_CREATION_HOUR:POLL_CREATION_MINUTE (0 — все группы сразу)
+    POLL_CREATION_WINDOW_MINUTES: int = int(os.getenv("POLL_CREATION_WINDOW_MINUTES", "15"))
+    
+    # Архив отчетов по опросам: помесячные сжатые файлы групп с индексом
+    REPORTS_DIR: str = os.getenv("REPORTS_DIR", "reports")
+    REPORTS_COMPRESS_LEVEL: int = int(os.getenv("REPORTS_COMPRESS_LEVEL", "6"))
+    
+    # Картинки с итогами опросов: отрисовка в пуле процессов с ограниченной очередью
+    ENABLE_REPORT_IMAGES: bool = os.getenv("ENABLE_REPORT_IMAGES", "True").lower() == "true"
+    REPORT_IMAGE_WORKERS: int = int(os.getenv("REPORT_IMAGE_WORKERS", "1"))
+    REPORT_IMAGE_QUEUE_SIZE: int = int(os.getenv("REPORT_IMAGE_QUEUE_SIZE", "8"))
+    REPORT_IMAGE_TIMEOUT_SECONDS: int = int(os.getenv("REPORT_IMAGE_TIMEOUT_SECONDS", "30"))
+    REPORT_IMAGE_FONT: str = os.getenv("REPORT_IMAGE_FONT", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+    
+    # Снимок статистики админ-панели: период фонового пересчёта и глубина истории голосов
+    STATS_REFRESH_SECONDS: int = int(os.getenv("STATS_REFRESH_SECONDS", "60"))
+    STATS_VOTE_HISTORY_DAYS: int = int(os.getenv("STATS_VOTE_HISTORY_DAYS", "7"))
+    
+    # Кэш вида опроса для голосов: опросы дежурных и устаревшие отбрасываются без БД
+    POLL_KIND_CACHE_SECONDS: float = float(os.getenv("POLL_KIND_CACHE_SECONDS", "600"))
+    POLL_KIND_CACHE_SIZE: int = int(os.getenv("POLL_KIND_CACHE_SIZE", "10000"))
+    
+    # Хранение истории: закрытые опросы старше POLL_RETENTION_DAYS уходят в архивную
+    # таблицу, служебные записи старше DISPATCH_RETENTION_DAYS удаляются; пакетами
+    ENABLE_DATA_RETENTION: bool = os.getenv("ENABLE_DATA_RETENTION", "True").lower() == "true"
+    POLL_RETENTION_DAYS: int = int(os.getenv("POLL_RETENTION_DAYS", "180"))
+    DISPATCH_RETENTION_DAYS: int = int(os.getenv("DISPATCH_RETENTION_DAYS", "30"))
+    RETENTION_BATCH_SIZE: int = int(os.getenv("RETENTION_BATCH_SIZE", "200"))
+    RETENTION_BATCH_PAUSE_SECONDS: float = float(os.getenv("RETENTION_BATCH_PAUSE_SECONDS", "0.2"))
+    RETENTION_HOUR: int = int(os.getenv("RETENTION_HOUR", "4"))
+    RETENTION_MINUTE: int = int(os.getenv("RETENTION_MINUTE", "30"))
+    RETENTION_VACUUM: bool = os.getenv("RETENTION_VACUUM", "True").lower() == "true"
+    
+    # Мониторинг
+    METRICS_SAMPLE_INTERVAL_SECONDS: int = int(os.getenv("METRICS_SAMPLE_INTERVAL_SECONDS", "10"))
+    METRICS_HISTORY_MINUTES: int = int(os.getenv("METRICS_HISTORY_MINUTES", "60"))
+    LOOP_WATCHDOG_THRESHOLD_MS: int = int(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", "250"))
+    LOOP_WATCHDOG_INTERVAL_MS: int = int(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", "100"))
+    PROFILER_MAX_SECONDS: int = int(os.getenv("PROFILER_MAX_SECONDS", "60"))
+    PROFILER_SAMPLE_INTERVAL_MS: int = int(os.getenv("PROFILER_SAMPLE_INTERVAL_MS", "10"))
+    PROFILER_TRACEMALLOC_FRAMES: int = int(os.getenv("PROFILER_TRACEMALLOC_FRAMES", "10"))
+    ENABLE_MEMORY_WATCHDOG: bool = os.getenv("ENABLE_MEMORY_WATCHDOG", "True").lower() == "true"
+    MEMORY_WATCHDOG_INTERVAL_MINUTES: int = int(os.getenv("MEMORY_WATCHDOG_INTERVAL_MINUTES", "30"))
+    MEMORY_WATCHDOG_RSS_GROWTH_MB: int = int(os.getenv("MEMORY_WATCHDOG_RSS_GROWTH_MB", "150"))
+    MEMORY_WATCHDOG_SITE_GROWTH_MB: int = int(os.getenv("MEMORY_WATCHDOG_SITE_GROWTH_MB", "20"))
+    MEMORY_WATCHDOG_PROBE_GROWTH: int = int(os.getenv("MEMORY_WATCHDOG_PROBE_GROWTH", "500"))
+    MEMORY_WATCHDOG_TRACEMALLOC: bool = os.getenv("MEMORY_WATCHDOG_TRACEMALLOC", "False").lower() == "true"
+    ENABLE_HEALTH_SERVER: bool = os.getenv("ENABLE_HEALTH_SERVER", "True").lower() == "true"
+    HEALTH_SERVER_HOST: str = os.getenv("HEALTH_SERVER_HOST", "0.0.0.0")
+    HEALTH_SERVER_PORT: int = int(os.getenv("HEALTH_SERVER_PORT", "8080"))
+    HEALTH_CACHE_SECONDS: float = float(os.getenv("HEALTH_CACHE_SECONDS", "5"))
+    
+    # Несколько реплик: выбор ведущей и приём апдейтов через webhook
+    ENABLE_LEADER_ELECTION: bool = os.getenv("ENABLE_LEADER_ELECTION", "False").lower() == "true"
+    LEADER_LOCK_KEY: int = int(os.getenv("LEADER_LOCK_KEY", "740215001"))
+    LEADER_RETRY_SECONDS: float = float(os.getenv("LEADER_RETRY_SECONDS", "5"))
+    LEADER_CHECK_SECONDS: float = float(os.getenv("LEADER_CHECK_SECONDS", "5"))
+    WEBHOOK_URL: str = os.getenv("WEBHOOK_URL", "")
+    WEBHOOK_PATH: str = os.getenv("WEBHOOK_PATH", "/telegram/webhook")
+    WEBHOOK_SECRET: str = os.getenv("WEBHOOK_SECRET", "")
+    
     # Шифрование
     ENCRYPTION_KEY: str = os.getenv("ENCRYPTION_KEY", "")
 
@@ -0,0 +1,9 @@
+CREATE TABLE IF NOT EXISTS scheduler_jobs (
+    id VARCHAR(191) PRIMARY KEY,
+    next_run_time DOUBLE PRECISION,
+    job_state BYTEA NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_scheduler_jobs_next_run_time
+    ON scheduler_jobs (next_run_time);
@@ -0,0 +1,54 @@
+-- Счётчики версий для кэша отчетов по опросам:
+-- results_version растёт при каждом изменении голосов опроса,
+-- members_version — при изменении реестра сотрудников группы.
+
+ALTER TABLE daily_polls ADD COLUMN IF NOT EXISTS results_version INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE groups ADD COLUMN IF NOT EXISTS members_version INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION bump_daily_poll_results_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.results_version = OLD.results_version + 1;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_bump_daily_poll_results_version ON daily_polls;
+
+CREATE TRIGGER trigger_bump_daily_poll_results_version
+    BEFORE UPDATE ON daily_polls
+    FOR EACH ROW
+    WHEN (OLD.results IS DISTINCT FROM NEW.results)
+    EXECUTE FUNCTION bump_daily_poll_results_version();
+
+CREATE OR REPLACE FUNCTION bump_group_members_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE groups SET members_version = members_version + 1 WHERE id = OLD.group_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND (TG_OP = 'INSERT' OR NEW.group_id IS DISTINCT FROM OLD.group_id) THEN
+        UPDATE groups SET members_version = members_version + 1 WHERE id = NEW.group_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_bump_group_members_version ON group_members;
+DROP TRIGGER IF EXISTS trigger_bump_group_members_version_on_update ON group_members;
+
+CREATE TRIGGER trigger_bump_group_members_version
+    AFTER INSERT OR DELETE ON group_members
+    FOR EACH ROW
+    EXECUTE FUNCTION bump_group_members_version();
+
+-- Повторная привязка того же аккаунта (голос уже известного курьера) версию не меняет
+CREATE TRIGGER trigger_bump_group_members_version_on_update
+    AFTER UPDATE ON group_members
+    FOR EACH ROW
+    WHEN (
+        (OLD.group_id, OLD.full_name, OLD.telegram_user_id, OLD.username, OLD.is_active)
+        IS DISTINCT FROM
+        (NEW.group_id, NEW.full_name, NEW.telegram_user_id, NEW.username, NEW.is_active)
+    )
+    EXECUTE FUNCTION bump_group_members_version();
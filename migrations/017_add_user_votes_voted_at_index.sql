@@ -0,0 +1,2 @@
+-- Голоса по дням для статистики админ-панели считаются диапазоном по voted_at
+CREATE INDEX IF NOT EXISTS idx_user_votes_voted_at ON user_votes (voted_at);
@@ -0,0 +1,12 @@
+-- Индексы под keyset-пагинацию списков пользователей в админ-панели:
+-- выражения совпадают с ключами сортировки в UserRepository, поэтому
+-- любая страница читается с позиции граничной записи без OFFSET.
+-- Список групп пагинируется по уникальному индексу groups(name).
+
+CREATE INDEX IF NOT EXISTS idx_users_verified_name_keyset
+    ON users ((COALESCE(first_name, '')), (COALESCE(last_name, '')), id)
+    WHERE is_verified = true;
+
+CREATE INDEX IF NOT EXISTS idx_users_unverified_created_keyset
+    ON users ((COALESCE(created_at, 'epoch'::timestamp)) DESC, id DESC)
+    WHERE is_verified = false;
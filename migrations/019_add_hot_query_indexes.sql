@@ -0,0 +1,42 @@
+-- Индексы под горячие запросы репозиториев. Набор проверяется
+-- tests/test_query_plans.py: EXPLAIN каждого запроса на объёмах, близких
+-- к рабочим, не должен содержать Seq Scan по большим таблицам.
+
+-- Голос из Telegram: опрос ищется по telegram_poll_id
+CREATE INDEX IF NOT EXISTS idx_daily_polls_telegram_poll_id
+    ON daily_polls (telegram_poll_id)
+    WHERE telegram_poll_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_duty_poll_dispatches_telegram_poll_id
+    ON duty_poll_dispatches (telegram_poll_id)
+    WHERE telegram_poll_id IS NOT NULL;
+
+-- Активных опросов единицы, закрытых — тысячи: планировщик и статистика
+-- читают только активные
+CREATE INDEX IF NOT EXISTS idx_daily_polls_active_date
+    ON daily_polls (poll_date, group_id)
+    WHERE status = 'active';
+
+CREATE INDEX IF NOT EXISTS idx_duty_poll_dispatches_active_date
+    ON duty_poll_dispatches (poll_date, id)
+    WHERE status = 'active';
+
+-- Опросы за период и за день (отчеты, статистика)
+CREATE INDEX IF NOT EXISTS idx_daily_polls_date_status
+    ON daily_polls (poll_date, status);
+
+-- Последний опрос группы
+CREATE INDEX IF NOT EXISTS idx_daily_polls_group_created
+    ON daily_polls (group_id, created_at DESC);
+
+-- Активный реестр группы в порядке вывода
+CREATE INDEX IF NOT EXISTS idx_group_members_group_active
+    ON group_members (group_id, full_name)
+    WHERE is_active = true;
+
+-- Пересчёт голоса пользователя; покрывает и поиск по одному poll_id,
+-- поэтому отдельный индекс по poll_id больше не нужен
+CREATE INDEX IF NOT EXISTS idx_user_votes_poll_user
+    ON user_votes (poll_id, user_id);
+
+DROP INDEX IF EXISTS idx_user_votes_poll_id;
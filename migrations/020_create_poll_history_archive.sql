@@ -0,0 +1,28 @@
+-- Архив истории опросов: закрытые опросы старше POLL_RETENTION_DAYS
+-- переносятся сюда одной строкой на опрос (варианты и голоса — в JSONB,
+-- который PostgreSQL сжимает), а из рабочих таблиц удаляются.
+
+CREATE TABLE IF NOT EXISTS daily_polls_archive (
+    id UUID PRIMARY KEY,
+    group_id INTEGER,
+    group_name VARCHAR(255),
+    poll_date DATE NOT NULL,
+    telegram_poll_id VARCHAR(255),
+    status VARCHAR(50),
+    results JSONB NOT NULL DEFAULT '{}'::jsonb,
+    options JSONB NOT NULL DEFAULT '[]'::jsonb,
+    votes JSONB NOT NULL DEFAULT '[]'::jsonb,
+    created_at TIMESTAMP,
+    closed_at TIMESTAMP,
+    archived_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_daily_polls_archive_group_date
+    ON daily_polls_archive (group_id, poll_date);
+
+-- Очистка служебных записей идёт по времени
+CREATE INDEX IF NOT EXISTS idx_poll_reminder_dispatches_sent_at
+    ON poll_reminder_dispatches (sent_at);
+
+CREATE INDEX IF NOT EXISTS idx_obsolete_telegram_polls_retired_at
+    ON obsolete_telegram_polls (retired_at);
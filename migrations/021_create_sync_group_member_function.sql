@@ -0,0 +1,68 @@
+-- Привязка курьера к группе одним вызовом вместо цепочки запросов из сервиса.
+-- Вызывается при голосовании и при вступлении в чат группы; advisory lock
+-- по telegram_user_id (тот же, что в bind_telegram_user) не даёт двум
+-- одновременным событиям одного аккаунта создать две карточки.
+
+CREATE OR REPLACE FUNCTION sync_group_member(
+    p_group_id INTEGER,
+    p_telegram_user_id BIGINT,
+    p_full_name TEXT,
+    p_username TEXT,
+    p_create_if_missing BOOLEAN
+)
+RETURNS SETOF group_members AS $$
+DECLARE
+    v_member_id INTEGER;
+    v_full_name TEXT := COALESCE(NULLIF(btrim(p_full_name), ''), 'User_' || p_telegram_user_id);
+BEGIN
+    PERFORM pg_advisory_xact_lock(p_telegram_user_id);
+
+    -- Карточка этого аккаунта (уникальна по telegram_user_id): в этой группе
+    -- восстанавливается, из другой группы переносится
+    SELECT id INTO v_member_id
+    FROM group_members
+    WHERE telegram_user_id = p_telegram_user_id;
+
+    IF v_member_id IS NULL THEN
+        -- Настроенные администраторы группы не становятся курьерами случайно
+        IF NOT p_create_if_missing THEN
+            RETURN;
+        END IF;
+
+        -- Карточка из реестра группы с тем же ФИО, сначала непривязанная
+        SELECT id INTO v_member_id
+        FROM group_members
+        WHERE group_id = p_group_id
+          AND full_name = v_full_name
+          AND is_active = true
+        ORDER BY (telegram_user_id IS NULL) DESC, id
+        LIMIT 1;
+    END IF;
+
+    IF v_member_id IS NULL THEN
+        -- Удалённая карточка с тем же ФИО восстанавливается, а не дублируется
+        INSERT INTO group_members (group_id, full_name, telegram_user_id, username)
+        VALUES (p_group_id, v_full_name, p_telegram_user_id, p_username)
+        ON CONFLICT (group_id, full_name) DO UPDATE
+        SET is_active = true,
+            telegram_user_id = EXCLUDED.telegram_user_id,
+            username = EXCLUDED.username,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING id INTO v_member_id;
+    END IF;
+
+    -- Голос уже привязанного курьера ничего не пишет
+    UPDATE group_members
+    SET group_id = p_group_id,
+        is_active = true,
+        telegram_user_id = p_telegram_user_id,
+        username = p_username,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = v_member_id
+      AND (group_id, is_active, telegram_user_id, username)
+          IS DISTINCT FROM (p_group_id, true, p_telegram_user_id, p_username);
+
+    RETURN QUERY
+    SELECT * FROM group_members WHERE id = v_member_id;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Замер скорости сборки отчетов по опросам для больших групп.
+
+Генерирует группу с заданным числом курьеров, раскладывает их голоса по
+слотам и дополнительным ответам и измеряет:
+- компиляцию раскладки (первый отчет по новой конфигурации группы);
+- рендер итогов по готовой раскладке;
+- полную сборку отчета со списком неотметившихся;
+- разбиение длинного текста под лимит сообщения Telegram.
+
+Запуск:
+    python3 scripts/benchmark_report_rendering.py --couriers 250 --iterations 2000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from src.services.group_member_service import GroupMemberService  # noqa: E402
+from src.services.poll_report_service import PollReportService  # noqa: E402
+from src.services.report_renderer import (  # noqa: E402
+    compile_layout,
+    layout_for_group,
+    render_results,
+    split_message,
+)
+
+
+def build_fixture(couriers: int, slots: int, extra_options: int, seed: int):
+    rnd = random.Random(seed)
+    group = {
+        "id": 1,
+        "name": "ЗИЗ-бенчмарк",
+        "is_night": False,
+        "members_version": 1,
+        "settings": {
+            "slots": [{"start": f"{8 + i:02d}:00", "end": f"{12 + i:02d}:00"} for i in range(slots)],
+            "extra_options": [f"Дополнительный ответ {i + 1}" for i in range(extra_options)],
+        },
+    }
+    members = [
+        {
+            "id": index,
+            "full_name": f"Курьер {index:04d} Фамилия",
+            "telegram_user_id": 10_000 + index,
+            "username": f"courier_{index}" if index % 3 else None,
+        }
+        for index in range(1, couriers + 1)
+    ]
+    results = {"slots": {}, "curator": [], "day_off": [], "night_out": [], "not_going": [], "custom": {}}
+    buckets = [("slots", f"slot_{i}") for i in range(slots)]
+    buckets += [("custom", f"option_{i}") for i in range(extra_options)]
+    for member in members:
+        # Около 15% курьеров не отмечаются, 10% берут выходной
+        roll = rnd.random()
+        if roll < 0.15:
+            continue
+        voter = {"member_id": member["id"], "user_id": member["telegram_user_id"], "name": member["full_name"]}
+        if roll < 0.25:
+            results["day_off"].append(voter)
+            continue
+        section, key = rnd.choice(buckets)
+        results[section].setdefault(key, []).append(voter)
+    poll = {"id": "benchmark-poll", "results_version": 1, "results": results}
+    return group, members, poll
+
+
+def measure(label: str, iterations: int, func) -> None:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<38} {elapsed / iterations * 1_000_000:>10.1f} мкс/операция")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--couriers", type=int, default=250)
+    parser.add_argument("--slots", type=int, default=6)
+    parser.add_argument("--extra-options", type=int, default=2)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    group, members, poll = build_fixture(args.couriers, args.slots, args.extra_options, args.seed)
+    service = PollReportService(GroupMemberService.__new__(GroupMemberService))
+    layout = layout_for_group(group)
+
+    def compile_cold():
+        compile_layout.cache_clear()
+        layout_for_group(group)
+
+    report = service.build_report(poll, group, members)
+    long_text = report.body + report.not_voted_text + "\n".join(
+        f"• {member['full_name']} (@courier_{member['id']})" for member in members
+    )
+
+    print(
+        f"Курьеров: {args.couriers}, слотов: {args.slots}, доп. ответов: {args.extra_options}, "
+        f"итераций: {args.iterations}"
+    )
+    print(f"Длина отчета: {len(report.body)} симв., неотметившихся: {len(report.not_voted)}")
+    measure("компиляция раскладки", args.iterations, compile_cold)
+    measure("рендер итогов (готовая раскладка)", args.iterations,
+            lambda: render_results(layout, poll["results"], lambda voter: voter["name"]))
+    measure("полная сборка отчета", args.iterations, lambda: service.build_report(poll, group, members))
+    chunks = split_message(long_text)
+    measure(f"разбиение {len(long_text)} симв. на {len(chunks)} сообщ.", args.iterations,
+            lambda: split_message(long_text))
+
+
+if __name__ == "__main__":
+    main()
@@ -36,8 +36,43 @@ compose run --rm bot python3 -m compileall -q src config scripts
 echo "Применяю миграции..."
 compose run --rm bot python3 scripts/init_runtime_database.py
 
-echo "Перезапускаю бота..."
-compose up -d bot
+wait_healthy() {
+  local container_id="$1"
+  local status=""
+  for _ in $(seq 1 36); do
+    status="$(docker inspect -f '{{if .State.Health}}{{.State.Health.Status}}{{end}}' "$container_id")"
+    if [ "$status" = "healthy" ]; then
+      return 0
+    fi
+    sleep 5
+  done
+  echo "Контейнер $container_id не стал healthy (статус: ${status:-нет})"
+  return 1
+}
+
+OLD_BOT_IDS="$(compose ps -q bot)"
+if grep -qi '^ENABLE_LEADER_ELECTION=true' .env 2>/dev/null && [ -n "$OLD_BOT_IDS" ]; then
+  # Обновление без простоя: поднимаем новые реплики рядом со старыми,
+  # ждём готовности и только потом останавливаем старые. Лидерство
+  # (advisory-lock PostgreSQL) переходит к новой реплике автоматически.
+  OLD_COUNT="$(echo "$OLD_BOT_IDS" | wc -l)"
+  echo "Плавно обновляю бота: $OLD_COUNT реплик(и)..."
+  compose up -d --no-deps --no-recreate --scale bot="$((OLD_COUNT * 2))" bot
+  NEW_BOT_IDS="$(compose ps -q bot | grep -vxF "$OLD_BOT_IDS" || true)"
+  for container_id in $NEW_BOT_IDS; do
+    if ! wait_healthy "$container_id"; then
+      echo "Откатываю новые реплики, старые продолжают работу"
+      docker rm -f $NEW_BOT_IDS
+      exit 1
+    fi
+  done
+  echo "Останавливаю старые реплики..."
+  docker stop $OLD_BOT_IDS
+  docker rm $OLD_BOT_IDS
+else
+  echo "Перезапускаю бота..."
+  compose up -d bot
+fi
 compose ps
 compose logs bot --tail=30
 
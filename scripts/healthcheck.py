@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Проверка здоровья бота для healthcheck контейнера.
+
+Порт берётся из HEALTH_SERVER_PORT (по умолчанию 8080, как в
+config/settings.py). Если HTTP-сервер отключён через
+ENABLE_HEALTH_SERVER=False, проверять нечего и скрипт завершается успешно.
+
+Запуск:
+    python3 scripts/healthcheck.py            # /health/ready
+    python3 scripts/healthcheck.py /health    # полный JSON-отчёт
+"""
+import os
+import sys
+import urllib.request
+
+
+def main() -> int:
+    if os.getenv("ENABLE_HEALTH_SERVER", "True").lower() != "true":
+        return 0
+    port = os.getenv("HEALTH_SERVER_PORT", "8080")
+    path = sys.argv[1] if len(sys.argv) > 1 else "/health/ready"
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=3) as response:
+            print(response.read().decode())
+    except Exception as e:
+        print(f"Health-эндпоинт недоступен: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,9 @@ BEGIN
     IF to_regclass('public.users') IS NOT NULL THEN
         EXECUTE 'TRUNCATE TABLE users RESTART IDENTITY CASCADE';
     END IF;
+    IF to_regclass('public.scheduler_jobs') IS NOT NULL THEN
+        EXECUTE 'TRUNCATE TABLE scheduler_jobs';
+    END IF;
     IF to_regclass('public.groups') IS NOT NULL THEN
         EXECUTE 'TRUNCATE TABLE groups RESTART IDENTITY CASCADE';
     END IF;
@@ -12,6 +12,7 @@ from config.settings import settings
 from src.services.user_service import UserService
 from src.services.group_service import GroupService
 from src.services.poll_service import PollService
+from src.services.service_registry import get_scheduler_service, get_stats_service, invalidate_stats
 from src.repositories.poll_repository import PollRepository
 from src.repositories.group_repository import GroupRepository
 from src.states.setup_states import SetupStates
@@ -336,6 +337,10 @@ async def cmd_add_group(
             telegram_chat_id=chat_id,
             is_night=None,
         )
+        scheduler_service = get_scheduler_service()
+        if scheduler_service:
+            await scheduler_service.reschedule_group(group["id"])
+        invalidate_stats()
         await message.answer(
             f"✅ Группа <b>{group_name}</b> успешно создана!\n"
             f"ID: {group['id']}\n"
@@ -359,7 +364,11 @@ async def cmd_stats(
     state: Optional[FSMContext] = None,
 ) -> None:
     """Статистика системы."""
-    stats = await group_service.get_system_stats()
+    stats_service = get_stats_service()
+    if stats_service is not None:
+        stats = (await stats_service.get_snapshot()).as_dict()
+    else:
+        stats = await group_service.get_system_stats()
 
     text = (
         "📊 Статистика системы:\n\n"
@@ -0,0 +1,88 @@
+"""
+Обработчики диагностических команд администратора.
+
+Команды:
+- /profile <cpu|cprofile|memory|tasks> [секунды] - Снять профиль работающего бота
+"""
+import logging
+
+from aiogram import Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import BufferedInputFile, Message
+
+from src.services.profiler_service import (
+    PROFILE_MODES,
+    ProfilerBusyError,
+    ProfilerService,
+)
+from src.utils.auth import require_admin
+
+logger = logging.getLogger(__name__)
+router = Router()
+
+profiler_service = ProfilerService()
+
+
+def _profile_usage() -> str:
+    modes = "\n".join(f"• <code>{mode}</code> — {title}" for mode, title in PROFILE_MODES.items())
+    return (
+        "🩺 <b>Профилирование бота</b>\n\n"
+        "Использование: <code>/profile режим [секунды]</code>\n\n"
+        f"{modes}\n\n"
+        f"Длительность по умолчанию 10 сек, максимум {profiler_service.max_seconds} сек.\n"
+        "Пример: <code>/profile cpu 30</code>"
+    )
+
+
+@router.message(Command("profile"))
+@require_admin
+async def cmd_profile(message: Message, command: CommandObject) -> None:
+    """
+    Снять ограниченный по времени профиль и прислать его файлом.
+
+    Использование:
+        /profile cpu 30 - семплирующий CPU-профиль на 30 секунд
+        /profile cprofile 10 - cProfile на 10 секунд
+        /profile memory 60 - рост аллокаций tracemalloc за минуту
+        /profile tasks - дамп asyncio-задач
+    """
+    args = (command.args or "").split()
+    if not args or args[0] not in PROFILE_MODES:
+        await message.answer(_profile_usage(), parse_mode="HTML")
+        return
+
+    mode = args[0]
+    seconds = None
+    if len(args) > 1:
+        if not args[1].isdigit():
+            await message.answer("❌ Длительность должна быть числом секунд", parse_mode="HTML")
+            return
+        seconds = int(args[1])
+
+    duration = profiler_service.clamp_duration(seconds)
+    if mode != "tasks":
+        await message.answer(
+            f"⏳ Запущен замер «{PROFILE_MODES[mode]}» на {duration} сек...",
+            parse_mode="HTML",
+        )
+
+    try:
+        result = await profiler_service.capture(mode, duration)
+    except ProfilerBusyError:
+        await message.answer("⏳ Другой замер ещё выполняется, попробуйте позже", parse_mode="HTML")
+        return
+    except Exception as e:
+        logger.error("Ошибка профилирования (%s): %s", mode, e, exc_info=True)
+        await message.answer(f"❌ Ошибка профилирования: {e}", parse_mode="HTML")
+        return
+
+    logger.info(
+        "Снят профиль %s за %d сек по запросу администратора %s",
+        mode,
+        duration,
+        message.from_user.id,
+    )
+    await message.answer_document(
+        BufferedInputFile(result.content, filename=result.filename),
+        caption=f"🩺 {PROFILE_MODES[mode]}\n{result.summary}"[:1024],
+    )
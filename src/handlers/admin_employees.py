@@ -5,10 +5,18 @@ import logging
 
 from aiogram import Router
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from aiogram.types import BufferedInputFile, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from src.services.group_member_service import GroupMemberService
 from src.services.group_service import GroupService
+from src.services.member_import import (
+    MAX_IMPORT_FILE_BYTES,
+    REPORT_PREVIEW_LIMIT,
+    MemberImportResult,
+    decode_import_file,
+    format_import_report,
+    render_import_diff,
+)
 from src.states.admin_panel_states import AdminPanelStates
 from src.utils.admin_keyboards import get_back_keyboard
 from src.utils.auth import require_admin_callback
@@ -61,6 +69,46 @@ def _build_members_action_keyboard(members: list[dict], action: str) -> InlineKe
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
+def _build_import_confirm_keyboard() -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="✅ Применить", callback_data="admin:employees:import_apply")],
+        [InlineKeyboardButton(text="❌ Отмена", callback_data="admin:employees:import_cancel")],
+    ])
+
+
+def _import_instructions(group_name: str | None) -> str:
+    if group_name:
+        header = f"📥 <b>Импорт курьеров</b>\n\nГруппа: <b>{group_name}</b>\n\n"
+        example = "<code>Иванов Иван;123456789\nПетров Пётр</code>"
+        columns = "ФИО и, если известен, Telegram ID"
+    else:
+        header = "📥 <b>Импорт курьеров</b>\n\nГруппа указывается в файле.\n\n"
+        example = "<code>ЗИЗ-1;Иванов Иван;123456789\nЗИЗ-2;Петров Пётр</code>"
+        columns = "группа, ФИО и, если известен, Telegram ID"
+    return (
+        f"{header}"
+        "Отправьте CSV или TXT файл (или текст сообщением), по строке на курьера: "
+        f"{columns} через «;».\n"
+        f"Пример:\n{example}\n\n"
+        "Файл — полный список курьеров: кого нет в файле, тот будет отключен в своей группе. "
+        "Перед применением бот покажет все изменения.\n\n"
+        "Для отмены отправьте «отмена»."
+    )
+
+
+async def _send_import_report(message: Message, result: MemberImportResult, reply_markup: InlineKeyboardMarkup) -> None:
+    """Отчет об импорте; если изменений много, полный список прикладывается файлом."""
+    await message.answer(format_import_report(result), parse_mode="HTML", reply_markup=reply_markup)
+    if any(
+        len(result.by_action(action)) > REPORT_PREVIEW_LIMIT
+        for action in {change.action for change in result.changes}
+    ):
+        suffix = "applied" if result.applied else "preview"
+        await message.answer_document(
+            BufferedInputFile(render_import_diff(result), filename=f"couriers_import_{suffix}.csv"),
+        )
+
+
 def _format_bindings_text(group_name: str, members: list[dict]) -> str:
     if not members:
         return f"🔗 <b>{group_name}</b>\n\nСписок курьеров пуст."
@@ -266,6 +314,50 @@ async def callback_employee_delete_start(
     await safe_answer_callback(callback)
 
 
+@router.callback_query(lambda c: c.data == "admin:employees:import")
+@require_admin_callback
+async def callback_employee_import_start(
+    callback: CallbackQuery,
+    state: FSMContext,
+    group_service: GroupService,
+) -> None:
+    groups = await group_service.get_all_groups()
+    if not groups:
+        await safe_edit_message(
+            callback.message,
+            "❌ Нет зарегистрированных групп.",
+            reply_markup=get_back_keyboard("admin:employees_menu"),
+        )
+        await safe_answer_callback(callback)
+        return
+
+    keyboard = _build_groups_keyboard(groups, "import")
+    keyboard.inline_keyboard.insert(-1, [
+        InlineKeyboardButton(text="📂 Группа указана в файле", callback_data="admin:employees:import_any_group"),
+    ])
+    await state.update_data(employee_action="import")
+    await state.set_state(AdminPanelStates.waiting_for_employee_group)
+    await safe_edit_message(
+        callback.message,
+        "📥 <b>Импорт курьеров</b>\n\nВыберите группу ЗИЗ или загрузите файл с группами:",
+        reply_markup=keyboard,
+    )
+    await safe_answer_callback(callback)
+
+
+@router.callback_query(lambda c: c.data == "admin:employees:import_any_group")
+@require_admin_callback
+async def callback_employee_import_any_group(callback: CallbackQuery, state: FSMContext) -> None:
+    await state.update_data(group_id=None)
+    await state.set_state(AdminPanelStates.waiting_for_employee_import)
+    await safe_edit_message(
+        callback.message,
+        _import_instructions(None),
+        reply_markup=get_back_keyboard("admin:employees_menu"),
+    )
+    await safe_answer_callback(callback)
+
+
 @router.callback_query(lambda c: c.data and c.data.startswith("admin:employees:group:"))
 @require_admin_callback
 async def callback_employee_group_action(
@@ -320,6 +412,13 @@ async def callback_employee_group_action(
             "Пример: <code>Иванов Иван</code>",
             reply_markup=get_back_keyboard("admin:employees_menu"),
         )
+    elif action == "import":
+        await state.set_state(AdminPanelStates.waiting_for_employee_import)
+        await safe_edit_message(
+            callback.message,
+            _import_instructions(group["name"]),
+            reply_markup=get_back_keyboard("admin:employees_menu"),
+        )
     elif action == "list":
         active_members = await group_member_service.get_group_members(group_id, active_only=True)
         inactive_members = await group_member_service.get_group_members(group_id, active_only=False)
@@ -434,6 +533,104 @@ async def process_employee_name(
     )
 
 
+@router.message(AdminPanelStates.waiting_for_employee_import)
+async def process_employee_import(
+    message: Message,
+    state: FSMContext,
+    group_member_service: GroupMemberService,
+) -> None:
+    if message.text and message.text.lower() == "отмена":
+        await state.clear()
+        await message.answer("❌ Импорт курьеров отменен", parse_mode="HTML")
+        return
+
+    if message.document:
+        if (message.document.file_size or 0) > MAX_IMPORT_FILE_BYTES:
+            await message.answer(
+                f"❌ Файл больше {MAX_IMPORT_FILE_BYTES // 1024 // 1024} МБ. Разбейте список на части.",
+                parse_mode="HTML",
+            )
+            return
+        content = await message.bot.download(message.document)
+        text = decode_import_file(content.read())
+    else:
+        text = message.text or ""
+    if not text.strip():
+        await message.answer("❌ Отправьте CSV или TXT файл со списком курьеров.", parse_mode="HTML")
+        return
+
+    data = await state.get_data()
+    group_id = data.get("group_id")
+    try:
+        result = await group_member_service.import_members(text, group_id=group_id, apply=False)
+    except Exception as e:
+        logger.error("Ошибка при проверке импорта курьеров: %s", e, exc_info=True)
+        await message.answer(f"❌ Ошибка при проверке файла: {e}", parse_mode="HTML")
+        return
+
+    if not result.has_changes:
+        await state.clear()
+        await _send_import_report(message, result, get_back_keyboard("admin:employees_menu"))
+        return
+
+    await state.update_data(import_text=text)
+    await state.set_state(AdminPanelStates.waiting_for_employee_import_confirm)
+    await _send_import_report(message, result, _build_import_confirm_keyboard())
+
+
+@router.callback_query(lambda c: c.data == "admin:employees:import_apply")
+@require_admin_callback
+async def callback_employee_import_apply(
+    callback: CallbackQuery,
+    state: FSMContext,
+    group_member_service: GroupMemberService,
+) -> None:
+    data = await state.get_data()
+    text = data.get("import_text")
+    if not text:
+        await state.clear()
+        await safe_edit_message(
+            callback.message,
+            "❌ Файл импорта не найден, загрузите его заново.",
+            reply_markup=get_back_keyboard("admin:employees_menu"),
+        )
+        await safe_answer_callback(callback)
+        return
+
+    await safe_answer_callback(callback, "⏳ Применяю импорт...")
+    await state.clear()
+    try:
+        # Сверка повторяется: с момента проверки карточки могли измениться
+        result = await group_member_service.import_members(text, group_id=data.get("group_id"), apply=True)
+    except Exception as e:
+        logger.error("Ошибка при импорте курьеров: %s", e, exc_info=True)
+        await safe_edit_message(
+            callback.message,
+            f"❌ Ошибка при импорте курьеров: {e}\n\nИзменения не применены.",
+            reply_markup=get_back_keyboard("admin:employees_menu"),
+        )
+        return
+
+    logger.info(
+        "Импорт курьеров: %s",
+        {action: len(result.by_action(action)) for action in {change.action for change in result.changes}},
+    )
+    await safe_edit_message(callback.message, "✅ Импорт применен.")
+    await _send_import_report(callback.message, result, get_back_keyboard("admin:employees_menu"))
+
+
+@router.callback_query(lambda c: c.data == "admin:employees:import_cancel")
+@require_admin_callback
+async def callback_employee_import_cancel(callback: CallbackQuery, state: FSMContext) -> None:
+    await state.clear()
+    await safe_edit_message(
+        callback.message,
+        "❌ Импорт курьеров отменен. Изменения не применены.",
+        reply_markup=get_back_keyboard("admin:employees_menu"),
+    )
+    await safe_answer_callback(callback)
+
+
 @router.callback_query(lambda c: c.data and c.data.startswith("admin:employees:rename_member:"))
 @require_admin_callback
 async def callback_rename_member_select(
@@ -2,17 +2,20 @@
 Обработчики для раздела "Управление группами" админ-панели.
 """
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 import re
 
 from aiogram import Router, Bot
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
 
 from src.states.admin_panel_states import AdminPanelStates
 from src.services.group_service import GroupService
+from src.services.service_registry import get_scheduler_service, get_stats_service, invalidate_stats
+from src.services.stats_service import load_snapshot
 from src.repositories.group_repository import GroupRepository
+from src.repositories.pagination import PageCursor
 from src.utils.auth import require_admin_callback
 from src.utils.admin_keyboards import (
     get_groups_menu_keyboard,
@@ -26,6 +29,21 @@ from src.utils.group_formatters import format_groups_list, clean_group_name_for_
 logger = logging.getLogger(__name__)
 router = Router()
 
+GROUPS_PAGE_SIZE = 10
+
+GROUP_ACTION_TEXTS = {
+    "rename": (
+        "✏️ <b>Переименование группы</b>\n\n"
+        "Выберите группу для переименования:"
+    ),
+    "delete": (
+        "🗑️ <b>Удаление группы</b>\n\n"
+        "⚠️ <b>Внимание!</b> Удаление группы необратимо!\n"
+        "Все данные (опросы, голоса) останутся в базе, но группа будет удалена.\n\n"
+        "Выберите группу для удаления:"
+    ),
+}
+
 
 @router.callback_query(lambda c: c.data == "admin:groups:create")
 @require_admin_callback
@@ -128,6 +146,10 @@ async def process_chat_id(message: Message, state: FSMContext, group_service: Gr
             telegram_chat_id=chat_id,
         )
         logger.info(f"Группа успешно создана: id={group.get('id')}, name={group.get('name')}")
+        scheduler_service = get_scheduler_service()
+        if scheduler_service:
+            await scheduler_service.reschedule_group(group["id"])
+        invalidate_stats()
         await message.answer(
             f"✅ Группа <b>{group_name}</b> успешно создана!\n\n"
             f"ID: {group['id']}\n"
@@ -152,91 +174,80 @@ async def process_chat_id(message: Message, state: FSMContext, group_service: Gr
         await message.answer(f"❌ Ошибка при создании группы: {e}", parse_mode="HTML")
 
 
+async def _render_groups_page(
+    group_service: GroupService,
+    action: Optional[str],
+    cursor: Optional[PageCursor],
+) -> Optional[Tuple[str, InlineKeyboardMarkup]]:
+    """
+    Текст и клавиатура страницы списка групп.
+    
+    Args:
+        group_service: Сервис групп
+        action: rename, delete или None для просмотра
+        cursor: Курсор страницы или None для первой
+        
+    Returns:
+        (текст, клавиатура) или None, если групп нет
+    """
+    page = await group_service.get_groups_page(limit=GROUPS_PAGE_SIZE, cursor=cursor)
+    if not page.items:
+        return None
+    
+    # Общее число групп берём из снимка статистики, а не считаем на каждой странице
+    snapshot = await load_snapshot(get_stats_service(), group_service.db_pool)
+    if action is None:
+        text = format_groups_list(page.items) + f"Всего групп: <b>{snapshot.total_groups}</b>"
+        # Ограничиваем длину текста для Telegram (максимум 4096 символов)
+        if len(text) > 4000:
+            text = text[:4000] + "\n\n... (список обрезан)"
+            logger.warning("Текст страницы списка групп слишком длинный, обрезан до 4000 символов")
+    else:
+        text = GROUP_ACTION_TEXTS[action] + f"\n\nВсего групп: <b>{snapshot.total_groups}</b>"
+    
+    keyboard = get_groups_list_keyboard(
+        page.items,
+        action=action,
+        back_callback="admin:groups_menu",
+        next_cursor=page.next_cursor.encode() if page.next_cursor else None,
+        prev_cursor=page.prev_cursor.encode() if page.prev_cursor else None,
+    )
+    return text, keyboard
+
+
 @router.callback_query(lambda c: c.data == "admin:groups:list")
 @require_admin_callback
 async def callback_groups_list(callback: CallbackQuery, group_service: GroupService) -> None:
     """Показать список групп."""
-    try:
-        groups = await group_service.get_all_groups()
-        logger.info(f"Получено групп: {len(groups) if groups else 0}")
-        
-        if not groups:
-            text = "📭 Нет зарегистрированных групп"
-            await safe_edit_message(callback.message, text, reply_markup=get_back_keyboard("admin:groups_menu"), parse_mode="HTML")
-            await safe_answer_callback(callback)
-            return
-        
-        text = format_groups_list(groups)
-        logger.info(f"Сформированный текст (длина: {len(text)}): {text[:300]}...")
-        
-        # Проверяем, что текст не пустой
-        if not text or len(text.strip()) == 0:
-            logger.error("Текст списка групп пустой после форматирования!")
-            text = "❌ Ошибка: не удалось сформировать список групп"
-        
-        # Ограничиваем длину текста для Telegram (максимум 4096 символов)
-        if len(text) > 4000:
-            text = text[:4000] + "\n\n... (список обрезан)"
-            logger.warning(f"Текст списка групп слишком длинный, обрезан до 4000 символов")
-        
-        keyboard = get_groups_list_keyboard(groups, page=0)
-        logger.debug(f"Клавиатура создана: {len(keyboard.inline_keyboard)} строк")
-        
-        result = await safe_edit_message(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
-        if not result:
-            logger.error("Не удалось отредактировать сообщение со списком групп")
-            # Пробуем отправить новое сообщение
-            await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
-        await safe_answer_callback(callback)
-    except Exception as e:
-        logger.error(f"Ошибка при получении списка групп: {e}", exc_info=True)
-        await safe_edit_message(
-            callback.message,
-            f"❌ Ошибка при получении списка групп: {e}",
-            reply_markup=get_back_keyboard("admin:groups_menu"),
-            parse_mode="HTML"
-        )
-        await safe_answer_callback(callback)
+    await _show_groups_list_page(callback, group_service, None)
 
 
 @router.callback_query(lambda c: c.data and c.data.startswith("admin:groups:list:page:"))
 @require_admin_callback
 async def callback_groups_list_page(callback: CallbackQuery, group_service: GroupService) -> None:
-    """Пагинация списка групп."""
+    """Страница списка групп (admin:groups:list:page:<курсор>)."""
+    await _show_groups_list_page(callback, group_service, PageCursor.decode(callback.data.split(":")[-1]))
+
+
+async def _show_groups_list_page(
+    callback: CallbackQuery,
+    group_service: GroupService,
+    cursor: Optional[PageCursor],
+) -> None:
     try:
-        page = int(callback.data.split(":")[-1])
-        groups = await group_service.get_all_groups()
-        logger.info(f"Получено групп для страницы {page}: {len(groups) if groups else 0}")
-        
-        if not groups:
+        rendered = await _render_groups_page(group_service, None, cursor)
+        if rendered is None:
             text = "📭 Нет зарегистрированных групп"
             await safe_edit_message(callback.message, text, reply_markup=get_back_keyboard("admin:groups_menu"), parse_mode="HTML")
             await safe_answer_callback(callback)
             return
         
-        text = format_groups_list(groups)
-        logger.info(f"Сформированный текст для страницы {page} (длина: {len(text)}): {text[:300]}...")
-        
-        # Ограничиваем длину текста для Telegram (максимум 4096 символов)
-        if len(text) > 4000:
-            text = text[:4000] + "\n\n... (список обрезан)"
-            logger.warning(f"Текст списка групп слишком длинный, обрезан до 4000 символов")
-        
-        keyboard = get_groups_list_keyboard(groups, page=page)
-        logger.debug(f"Клавиатура создана для страницы {page}: {len(keyboard.inline_keyboard)} строк")
-        
+        text, keyboard = rendered
         result = await safe_edit_message(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
         if not result:
-            logger.error(f"Не удалось отредактировать сообщение со списком групп (страница {page})")
-        await safe_answer_callback(callback)
-    except ValueError as e:
-        logger.error(f"Ошибка парсинга номера страницы: {e}", exc_info=True)
-        await safe_edit_message(
-            callback.message,
-            f"❌ Ошибка: неверный номер страницы",
-            reply_markup=get_back_keyboard("admin:groups_menu"),
-            parse_mode="HTML"
-        )
+            logger.error("Не удалось отредактировать сообщение со списком групп")
+            # Пробуем отправить новое сообщение
+            await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
         await safe_answer_callback(callback)
     except Exception as e:
         logger.error(f"Ошибка при получении списка групп: {e}", exc_info=True)
@@ -295,52 +306,28 @@ async def callback_select_group_for_topic(callback: CallbackQuery, state: FSMCon
 @require_admin_callback
 async def callback_rename_group_start(callback: CallbackQuery, state: FSMContext, group_service: GroupService) -> None:
     """Начать процесс переименования группы."""
-    try:
-        groups = await group_service.get_all_groups()
-        logger.info(f"Получено групп для переименования: {len(groups) if groups else 0}")
-        
-        if not groups:
-            await safe_edit_message(
-                callback.message,
-                "❌ Нет зарегистрированных групп.",
-                reply_markup=get_back_keyboard("admin:groups_menu"),
-                parse_mode="HTML"
-            )
-            await safe_answer_callback(callback)
-            return
-        
-        await state.set_state(AdminPanelStates.waiting_for_group_selection)
-        await state.update_data(action="rename_group")
-        
-        text = (
-            "✏️ <b>Переименование группы</b>\n\n"
-            "Выберите группу для переименования:"
-        )
-        
-        keyboard = get_groups_list_keyboard(groups, page=0, action="rename", back_callback="admin:groups_menu")
-        await safe_edit_message(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
-        await safe_answer_callback(callback)
-    except Exception as e:
-        logger.error(f"Ошибка при получении списка групп для переименования: {e}", exc_info=True)
-        await safe_edit_message(
-            callback.message,
-            f"❌ Ошибка при получении списка групп: {e}",
-            reply_markup=get_back_keyboard("admin:groups_menu"),
-            parse_mode="HTML"
-        )
-        await safe_answer_callback(callback)
+    await state.set_state(AdminPanelStates.waiting_for_group_selection)
+    await state.update_data(action="rename_group")
+    await _show_group_action_page(callback, group_service, "rename", None)
 
 
 @router.callback_query(lambda c: c.data and c.data.startswith("admin:groups:rename:page:"))
 @require_admin_callback
 async def callback_rename_group_page(callback: CallbackQuery, state: FSMContext, group_service: GroupService) -> None:
-    """Пагинация списка групп для переименования."""
+    """Страница списка групп для переименования (admin:groups:rename:page:<курсор>)."""
+    await _show_group_action_page(callback, group_service, "rename", PageCursor.decode(callback.data.split(":")[-1]))
+
+
+async def _show_group_action_page(
+    callback: CallbackQuery,
+    group_service: GroupService,
+    action: str,
+    cursor: Optional[PageCursor],
+) -> None:
+    """Страница выбора группы для переименования или удаления."""
     try:
-        page = int(callback.data.split(":")[-1])
-        groups = await group_service.get_all_groups()
-        logger.info(f"Получено групп для переименования (страница {page}): {len(groups) if groups else 0}")
-        
-        if not groups:
+        rendered = await _render_groups_page(group_service, action, cursor)
+        if rendered is None:
             await safe_edit_message(
                 callback.message,
                 "❌ Нет зарегистрированных групп.",
@@ -350,16 +337,11 @@ async def callback_rename_group_page(callback: CallbackQuery, state: FSMContext,
             await safe_answer_callback(callback)
             return
         
-        text = (
-            "✏️ <b>Переименование группы</b>\n\n"
-            "Выберите группу для переименования:"
-        )
-        
-        keyboard = get_groups_list_keyboard(groups, page=page, action="rename", back_callback="admin:groups_menu")
+        text, keyboard = rendered
         await safe_edit_message(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
         await safe_answer_callback(callback)
     except Exception as e:
-        logger.error(f"Ошибка при получении списка групп для переименования (страница {page}): {e}", exc_info=True)
+        logger.error(f"Ошибка при получении списка групп ({action}): {e}", exc_info=True)
         await safe_edit_message(
             callback.message,
             f"❌ Ошибка при получении списка групп: {e}",
@@ -487,82 +469,16 @@ async def process_new_group_name(message: Message, state: FSMContext, group_serv
 @require_admin_callback
 async def callback_delete_group_start(callback: CallbackQuery, state: FSMContext, group_service: GroupService) -> None:
     """Начать процесс удаления группы."""
-    try:
-        groups = await group_service.get_all_groups()
-        logger.info(f"Получено групп для удаления: {len(groups) if groups else 0}")
-        
-        if not groups:
-            await safe_edit_message(
-                callback.message,
-                "❌ Нет зарегистрированных групп.",
-                reply_markup=get_back_keyboard("admin:groups_menu"),
-                parse_mode="HTML"
-            )
-            await safe_answer_callback(callback)
-            return
-        
-        await state.set_state(AdminPanelStates.waiting_for_group_selection)
-        await state.update_data(action="delete_group")
-        
-        text = (
-            "🗑️ <b>Удаление группы</b>\n\n"
-            "⚠️ <b>Внимание!</b> Удаление группы необратимо!\n"
-            "Все данные (опросы, голоса) останутся в базе, но группа будет удалена.\n\n"
-            "Выберите группу для удаления:"
-        )
-        
-        keyboard = get_groups_list_keyboard(groups, page=0, action="delete", back_callback="admin:groups_menu")
-        await safe_edit_message(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
-        await safe_answer_callback(callback)
-    except Exception as e:
-        logger.error(f"Ошибка при получении списка групп для удаления: {e}", exc_info=True)
-        await safe_edit_message(
-            callback.message,
-            f"❌ Ошибка при получении списка групп: {e}",
-            reply_markup=get_back_keyboard("admin:groups_menu"),
-            parse_mode="HTML"
-        )
-        await safe_answer_callback(callback)
+    await state.set_state(AdminPanelStates.waiting_for_group_selection)
+    await state.update_data(action="delete_group")
+    await _show_group_action_page(callback, group_service, "delete", None)
 
 
 @router.callback_query(lambda c: c.data and c.data.startswith("admin:groups:delete:page:"))
 @require_admin_callback
 async def callback_delete_group_page(callback: CallbackQuery, state: FSMContext, group_service: GroupService) -> None:
-    """Пагинация списка групп для удаления."""
-    try:
-        page = int(callback.data.split(":")[-1])
-        groups = await group_service.get_all_groups()
-        logger.info(f"Получено групп для удаления (страница {page}): {len(groups) if groups else 0}")
-        
-        if not groups:
-            await safe_edit_message(
-                callback.message,
-                "❌ Нет зарегистрированных групп.",
-                reply_markup=get_back_keyboard("admin:groups_menu"),
-                parse_mode="HTML"
-            )
-            await safe_answer_callback(callback)
-            return
-        
-        text = (
-            "🗑️ <b>Удаление группы</b>\n\n"
-            "⚠️ <b>Внимание!</b> Удаление группы необратимо!\n"
-            "Все данные (опросы, голоса) останутся в базе, но группа будет удалена.\n\n"
-            "Выберите группу для удаления:"
-        )
-        
-        keyboard = get_groups_list_keyboard(groups, page=page, action="delete", back_callback="admin:groups_menu")
-        await safe_edit_message(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
-        await safe_answer_callback(callback)
-    except Exception as e:
-        logger.error(f"Ошибка при получении списка групп для удаления (страница {page}): {e}", exc_info=True)
-        await safe_edit_message(
-            callback.message,
-            f"❌ Ошибка при получении списка групп: {e}",
-            reply_markup=get_back_keyboard("admin:groups_menu"),
-            parse_mode="HTML"
-        )
-        await safe_answer_callback(callback)
+    """Страница списка групп для удаления (admin:groups:delete:page:<курсор>)."""
+    await _show_group_action_page(callback, group_service, "delete", PageCursor.decode(callback.data.split(":")[-1]))
 
 
 @router.callback_query(lambda c: c.data and c.data.startswith("admin:delete_confirm:"))
@@ -585,6 +501,10 @@ async def callback_confirm_delete(callback: CallbackQuery, group_service: GroupS
         success = await group_service.delete_group(group_id)
         
         if success:
+            scheduler_service = get_scheduler_service()
+            if scheduler_service:
+                await scheduler_service.reschedule_group(group_id)
+            invalidate_stats()
             text = (
                 f"✅ Группа <b>{group.get('name')}</b> успешно удалена!\n\n"
                 f"ID: {group_id}\n"
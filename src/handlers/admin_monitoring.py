@@ -1,12 +1,13 @@
 """
 Обработчики для раздела "Мониторинг" админ-панели.
 """
+import html
 import logging
 import os
 import platform
+import time
 import psutil
-from datetime import date, datetime, timedelta
-from pathlib import Path
+from datetime import datetime
 from typing import Optional
 
 from aiogram import Router
@@ -15,11 +16,16 @@ from aiogram.types import CallbackQuery, Message
 
 from src.services.group_service import GroupService
 from src.services.user_service import UserService
-from src.repositories.poll_repository import PollRepository
+from src.services.metrics_service import MetricsSample, SystemMetricsService, TREND_WINDOWS_SECONDS
+from src.services.service_registry import get_metrics_service, get_loop_watchdog, get_stats_service, invalidate_stats
+from src.services.stats_service import format_votes_by_day, load_snapshot
+from src.services.log_service import LogCursor, LogService
+from src.repositories.pagination import PageCursor
 from src.states.admin_panel_states import AdminPanelStates
 from src.utils.auth import require_admin_callback
 from src.utils.admin_keyboards import (
     get_monitoring_menu_keyboard,
+    get_logs_keyboard,
     get_verification_menu_keyboard,
     get_back_keyboard,
     get_users_list_keyboard,
@@ -31,42 +37,48 @@ from src.utils.telegram_helpers import safe_edit_message, safe_answer_callback
 logger = logging.getLogger(__name__)
 router = Router()
 
+USERS_PAGE_SIZE = 10
+
+USER_LIST_TEXTS = {
+    "verify": (
+        "📋 <b>Неверифицированные пользователи</b>",
+        "✅ Нет неверифицированных пользователей.",
+        "Выберите пользователя для верификации:",
+    ),
+    "view": (
+        "✅ <b>Верифицированные пользователи</b>",
+        "📭 Нет верифицированных пользователей.",
+        "Выберите пользователя:",
+    ),
+}
+
 
 @router.callback_query(lambda c: c.data == "admin:monitoring:stats")
 @require_admin_callback
 async def callback_monitoring_stats(
     callback: CallbackQuery,
     group_service: GroupService,
-    poll_repo: PollRepository,
 ) -> None:
     """Статистика системы."""
     try:
-        # Получаем статистику по группам
-        groups = await group_service.get_all_groups()
-        active_groups = await group_service.get_all_groups(active_only=True)
-        
-        day_groups = sum(1 for g in groups if not g.get("is_night", False))
-        night_groups = sum(1 for g in groups if g.get("is_night", False))
-        
-        # Получаем статистику по опросам
-        today = date.today()
-        poll_stats = await poll_repo.get_statistics(start_date=today, end_date=today)
-        
-        # Получаем все активные опросы
-        active_polls = await poll_repo.get_active_polls()
+        # Счётчики считаются агрегатами в БД и берутся из готового снимка
+        snapshot = await load_snapshot(get_stats_service(), group_service.db_pool)
         
         text = (
             "📊 <b>Статистика системы</b>\n\n"
             f"👥 <b>Группы:</b>\n"
-            f"• Всего: <b>{len(groups)}</b>\n"
-            f"• Активных: <b>{len(active_groups)}</b>\n"
-            f"• Дневных: <b>{day_groups}</b>\n"
-            f"• Ночных: <b>{night_groups}</b>\n\n"
+            f"• Всего: <b>{snapshot.total_groups}</b>\n"
+            f"• Активных: <b>{snapshot.active_groups}</b>\n"
+            f"• Дневных: <b>{snapshot.day_groups}</b>\n"
+            f"• Ночных: <b>{snapshot.night_groups}</b>\n\n"
             f"📅 <b>Опросы:</b>\n"
-            f"• Активных: <b>{len(active_polls)}</b>\n"
-            f"• За сегодня: <b>{poll_stats.get('total_polls', 0)}</b>\n"
-            f"• Закрытых за сегодня: <b>{poll_stats.get('closed_polls', 0)}</b>\n\n"
-            f"📅 Дата: {today.strftime('%d.%m.%Y')}"
+            f"• Активных: <b>{snapshot.active_polls}</b>\n"
+            f"• За сегодня: <b>{snapshot.today_polls}</b>\n"
+            f"• Закрытых за сегодня: <b>{snapshot.today_closed}</b>\n\n"
+            f"🗳️ <b>Голоса по дням:</b>\n"
+            f"{format_votes_by_day(snapshot)}\n"
+            f"📅 Дата: {snapshot.today.strftime('%d.%m.%Y')} | "
+            f"обновлено в {snapshot.built_at.strftime('%H:%M:%S')}"
         )
         
         await safe_edit_message(callback.message, text, reply_markup=get_back_keyboard("admin:monitoring_menu"))
@@ -85,10 +97,11 @@ async def callback_monitoring_stats(
 @router.callback_query(lambda c: c.data == "admin:monitoring:system")
 @require_admin_callback
 async def callback_monitoring_system(callback: CallbackQuery) -> None:
-    """Статус системы (CPU, RAM, Disk)."""
+    """Статус системы (CPU, RAM, Disk) и тренды фонового сэмплера метрик."""
     try:
-        # Получаем информацию о системе
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # Замеры берём из фонового сэмплера: экран не блокирует event loop
+        metrics_service = get_metrics_service()
+        latest = metrics_service.get_latest() if metrics_service else None
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
         
@@ -97,9 +110,17 @@ async def callback_monitoring_system(callback: CallbackQuery) -> None:
         uptime = datetime.now() - boot_time
         uptime_str = f"{uptime.days} дн. {uptime.seconds // 3600} ч. {(uptime.seconds % 3600) // 60} мин."
         
+        if latest is not None:
+            cpu_line = (
+                f"💻 <b>CPU:</b> <b>{latest.system_cpu_percent:.1f}%</b> "
+                f"(процесс бота: {latest.cpu_percent:.1f}%)\n"
+            )
+        else:
+            cpu_line = f"💻 <b>CPU:</b> <b>{psutil.cpu_percent(interval=None):.1f}%</b>\n"
+        
         text = (
             "🔍 <b>Статус системы</b>\n\n"
-            f"💻 <b>CPU:</b> <b>{cpu_percent}%</b>\n"
+            f"{cpu_line}"
             f"🧠 <b>RAM:</b> <b>{memory.percent}%</b> "
             f"({memory.used / (1024**3):.1f} GB / {memory.total / (1024**3):.1f} GB)\n"
             f"💾 <b>Disk:</b> <b>{disk.percent}%</b> "
@@ -108,6 +129,11 @@ async def callback_monitoring_system(callback: CallbackQuery) -> None:
             f"🖥️ <b>Платформа:</b> {platform.system()} {platform.release()}"
         )
         
+        if latest is not None:
+            text += "\n\n" + _format_bot_metrics(metrics_service, latest)
+        else:
+            text += "\n\n⏳ Фоновые метрики бота ещё собираются."
+        
         await safe_edit_message(callback.message, text, reply_markup=get_back_keyboard("admin:monitoring_menu"))
         await safe_answer_callback(callback)
         
@@ -121,49 +147,217 @@ async def callback_monitoring_system(callback: CallbackQuery) -> None:
         await safe_answer_callback(callback)
 
 
-@router.callback_query(lambda c: c.data == "admin:monitoring:logs")
+def _format_optional(value: Optional[float], fmt: str, suffix: str = "") -> str:
+    """Отформатировать значение метрики или вернуть прочерк."""
+    if value is None:
+        return "—"
+    return f"{value:{fmt}}{suffix}"
+
+
+def _format_bot_metrics(metrics_service: SystemMetricsService, latest: MetricsSample) -> str:
+    """Текущие метрики процесса бота и тренды min/avg/max за 1, 15 и 60 минут."""
+    if latest.db_pool_size is not None:
+        pool_line = f"{latest.db_pool_in_use}/{latest.db_pool_size} (макс. {latest.db_pool_max_size})"
+    else:
+        pool_line = "—"
+    
+    lines = [
+        "🤖 <b>Процесс бота:</b>",
+        f"• RSS: <b>{latest.rss_bytes / (1024**2):.1f} MB</b>",
+        f"• Открытых fd: <b>{_format_optional(latest.open_fds, 'd')}</b>",
+        f"• Задержка event loop: <b>{latest.loop_lag_ms:.1f} ms</b>",
+        f"• Пул БД (занято/всего): <b>{pool_line}</b>",
+        f"• Redis PING: <b>{_format_optional(latest.redis_latency_ms, '.1f', ' ms')}</b>",
+    ]
+    
+    trend_rows = (
+        ("cpu_percent", "CPU", ".1f", "%", 1),
+        ("rss_bytes", "RSS", ".0f", " MB", 1024**2),
+        ("loop_lag_ms", "Lag", ".1f", " ms", 1),
+        ("db_pool_in_use", "Пул БД", ".1f", "", 1),
+        ("redis_latency_ms", "Redis", ".1f", " ms", 1),
+    )
+    
+    for window in TREND_WINDOWS_SECONDS:
+        trends = metrics_service.get_trends(window)
+        if not trends:
+            continue
+        lines.append("")
+        lines.append(f"📈 <b>За {window // 60} мин</b> (мин / сред / макс):")
+        for field, title, fmt, suffix, divider in trend_rows:
+            trend = trends.get(field)
+            if not trend:
+                continue
+            lines.append(
+                f"• {title}: "
+                f"{trend['min'] / divider:{fmt}} / "
+                f"{trend['avg'] / divider:{fmt}} / "
+                f"{trend['max'] / divider:{fmt}}{suffix}"
+            )
+    
+    sample_age = max(0, int(time.time() - latest.timestamp))
+    lines.append("")
+    lines.append(f"🕒 Последний замер: {sample_age} сек назад")
+    return "\n".join(lines)
+
+
+@router.callback_query(lambda c: c.data == "admin:monitoring:loop")
 @require_admin_callback
-async def callback_monitoring_logs(callback: CallbackQuery) -> None:
-    """Просмотр логов."""
+async def callback_monitoring_loop(callback: CallbackQuery) -> None:
+    """Задержки event loop: перцентили по минутам и последние блокировки."""
     try:
-        # Путь к файлу логов
-        log_file = Path(__file__).parent.parent.parent / "logs" / "bot.log"
-        
-        if not log_file.exists():
-            text = (
-                "📜 <b>Логи</b>\n\n"
-                "❌ Файл логов не найден."
+        watchdog = get_loop_watchdog()
+        if watchdog is None:
+            await safe_edit_message(
+                callback.message,
+                "🐢 <b>Задержки event loop</b>\n\n❌ Сторожевой таймер не запущен.",
+                reply_markup=get_back_keyboard("admin:monitoring_menu"),
             )
-            await safe_edit_message(callback.message, text, reply_markup=get_back_keyboard("admin:monitoring_menu"))
             await safe_answer_callback(callback)
             return
         
-        # Читаем последние 50 строк
-        try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                last_lines = lines[-50:] if len(lines) > 50 else lines
-                log_content = "".join(last_lines)
-        except Exception as e:
-            logger.error("Ошибка при чтении логов: %s", e)
-            text = (
-                "📜 <b>Логи</b>\n\n"
-                f"❌ Ошибка при чтении файла логов: {e}"
-            )
-            await safe_edit_message(callback.message, text, reply_markup=get_back_keyboard("admin:monitoring_menu"))
-            await safe_answer_callback(callback)
-            return
+        lines = [
+            "🐢 <b>Задержки event loop</b>",
+            "",
+            f"⏳ Сейчас: <b>{watchdog.current_lag_ms:.1f} ms</b> "
+            f"(порог блокировки {watchdog.threshold * 1000:.0f} ms)",
+        ]
+        
+        for minutes in (1, 15, 60):
+            summary = watchdog.get_summary(minutes)
+            if summary:
+                lines.append(
+                    f"• {minutes} мин: p50 {summary['p50_ms']:.1f} / p95 {summary['p95_ms']:.1f} / "
+                    f"p99 {summary['p99_ms']:.1f} / макс {summary['max_ms']:.0f} ms"
+                )
+        
+        history = watchdog.get_lag_history()[-10:]
+        if history:
+            lines.append("")
+            lines.append("📈 <b>По минутам</b> (p95 / p99 / макс, ms):")
+            for bucket in reversed(history):
+                lines.append(
+                    f"<code>{bucket.minute.strftime('%H:%M')}</code> "
+                    f"{bucket.p95_ms:.1f} / {bucket.p99_ms:.1f} / {bucket.max_ms:.0f}"
+                )
+        
+        offenders = watchdog.get_recent_offenders()[:5]
+        lines.append("")
+        if offenders:
+            lines.append("🚨 <b>Последние блокировки:</b>")
+            for stall in offenders:
+                lines.append(
+                    f"• {stall.started_at.strftime('%d.%m %H:%M:%S')} — "
+                    f"<b>{stall.duration_ms:.0f} ms</b>\n"
+                    f"  <code>{html.escape(stall.coroutine)}</code>"
+                )
+            lines.append("")
+            lines.append("Полный стек каждой блокировки записан в лог (уровень WARNING).")
+        else:
+            lines.append("✅ Блокировок event loop не зафиксировано.")
         
-        # Ограничиваем длину сообщения (Telegram лимит ~4096 символов)
-        if len(log_content) > 4000:
-            log_content = "...\n" + log_content[-4000:]
+        await safe_edit_message(
+            callback.message,
+            "\n".join(lines),
+            reply_markup=get_back_keyboard("admin:monitoring_menu"),
+        )
+        await safe_answer_callback(callback)
         
-        text = (
-            "📜 <b>Последние логи</b>\n\n"
-            f"<pre>{log_content}</pre>"
+    except Exception as e:
+        logger.error("Ошибка при получении задержек event loop: %s", e, exc_info=True)
+        await safe_edit_message(
+            callback.message,
+            f"❌ Ошибка при получении задержек event loop: {e}",
+            reply_markup=get_back_keyboard("admin:monitoring_menu")
         )
+        await safe_answer_callback(callback)
+
+
+LOG_LEVEL_FILTERS = ("all", "INFO", "WARNING", "ERROR")
+LOG_RECORD_MAX_CHARS = 1200
+LOG_TEXT_LIMIT = 3800
+
+
+async def _render_logs_page(
+    level: str,
+    cursor: Optional[LogCursor],
+    query: Optional[str],
+) -> tuple[str, object]:
+    """Прочитать страницу логов и подготовить текст с клавиатурой."""
+    if level not in LOG_LEVEL_FILTERS:
+        level = "all"
+    
+    log_service = LogService()
+    if not log_service.list_log_files():
+        return "📜 <b>Логи</b>\n\n❌ Файл логов не найден.", get_back_keyboard("admin:monitoring_menu")
+    
+    page = await log_service.read_page(
+        limit=50,
+        min_level=None if level == "all" else level,
+        query=query,
+        cursor=cursor,
+    )
+    
+    header_parts = ["📜 <b>Логи</b>"]
+    if level != "all":
+        header_parts.append(f"уровень: <b>{level}+</b>")
+    if query:
+        header_parts.append(f"поиск: <code>{html.escape(query)}</code>")
+    header = " · ".join(header_parts)
+    if cursor is not None:
+        header += "\n⏪ Более старые записи"
+    if page.source_files:
+        header += f"\n📁 {html.escape(', '.join(page.source_files))}"
+    
+    if page.records:
+        records = [
+            record if len(record) <= LOG_RECORD_MAX_CHARS else record[:LOG_RECORD_MAX_CHARS] + "…"
+            for record in page.records
+        ]
+        body = html.escape("\n".join(records))
+        if len(body) > LOG_TEXT_LIMIT:
+            body = "...\n" + body[-LOG_TEXT_LIMIT:]
+        text = f"{header}\n\n<pre>{body}</pre>"
+    else:
+        text = f"{header}\n\nℹ️ Подходящих записей не найдено."
+    
+    keyboard = get_logs_keyboard(
+        level=level,
+        next_cursor=page.next_cursor.encode() if page.next_cursor else None,
+        has_query=bool(query),
+    )
+    return text, keyboard
+
+
+@router.callback_query(lambda c: c.data == "admin:monitoring:logs")
+@require_admin_callback
+async def callback_monitoring_logs(callback: CallbackQuery, state: FSMContext) -> None:
+    """Просмотр последних записей лога."""
+    try:
+        await state.update_data(log_query=None)
+        text, keyboard = await _render_logs_page("all", None, None)
+        await safe_edit_message(callback.message, text, reply_markup=keyboard)
+        await safe_answer_callback(callback)
         
-        await safe_edit_message(callback.message, text, reply_markup=get_back_keyboard("admin:monitoring_menu"))
+    except Exception as e:
+        logger.error("Ошибка при просмотре логов: %s", e, exc_info=True)
+        await safe_edit_message(
+            callback.message,
+            f"❌ Ошибка при просмотре логов: {e}",
+            reply_markup=get_back_keyboard("admin:monitoring_menu")
+        )
+        await safe_answer_callback(callback)
+
+
+@router.callback_query(lambda c: c.data and c.data.startswith("admin:logs:page:"))
+@require_admin_callback
+async def callback_logs_page(callback: CallbackQuery, state: FSMContext) -> None:
+    """Страница логов с фильтром уровня и курсором (admin:logs:page:<level>:<cursor>)."""
+    try:
+        _, _, _, level, raw_cursor = callback.data.split(":", 4)
+        data = await state.get_data()
+        text, keyboard = await _render_logs_page(level, LogCursor.decode(raw_cursor), data.get("log_query"))
+        await safe_edit_message(callback.message, text, reply_markup=keyboard)
         await safe_answer_callback(callback)
         
     except Exception as e:
@@ -176,6 +370,62 @@ async def callback_monitoring_logs(callback: CallbackQuery) -> None:
         await safe_answer_callback(callback)
 
 
+@router.callback_query(lambda c: c.data and c.data.startswith("admin:logs:search:"))
+@require_admin_callback
+async def callback_logs_search(callback: CallbackQuery, state: FSMContext) -> None:
+    """Запрос подстроки для поиска по логам."""
+    level = callback.data.split(":")[-1]
+    await state.update_data(log_level=level)
+    await state.set_state(AdminPanelStates.waiting_for_log_query)
+    
+    text = (
+        "🔍 <b>Поиск по логам</b>\n\n"
+        "Отправьте текст для поиска (без учёта регистра).\n"
+        "Например: <code>Traceback</code> или ID группы.\n\n"
+        "Для отмены отправьте: <b>отмена</b>"
+    )
+    await safe_edit_message(callback.message, text, reply_markup=get_back_keyboard(f"admin:logs:page:{level}:"))
+    await safe_answer_callback(callback)
+
+
+@router.callback_query(lambda c: c.data and c.data.startswith("admin:logs:clear:"))
+@require_admin_callback
+async def callback_logs_clear_search(callback: CallbackQuery, state: FSMContext) -> None:
+    """Сбросить поиск по логам."""
+    level = callback.data.split(":")[-1]
+    await state.update_data(log_query=None)
+    text, keyboard = await _render_logs_page(level, None, None)
+    await safe_edit_message(callback.message, text, reply_markup=keyboard)
+    await safe_answer_callback(callback)
+
+
+@router.message(AdminPanelStates.waiting_for_log_query)
+async def process_log_query(message: Message, state: FSMContext) -> None:
+    """Обработка ввода подстроки для поиска по логам."""
+    data = await state.get_data()
+    level = data.get("log_level") or "all"
+    
+    if not message.text:
+        await message.answer("❌ Пожалуйста, отправьте текст для поиска.", parse_mode="HTML")
+        return
+    
+    if message.text.lower() in ["отмена", "cancel"]:
+        await state.set_state(None)
+        await message.answer("❌ Поиск отменён", reply_markup=get_back_keyboard(f"admin:logs:page:{level}:"))
+        return
+    
+    query = message.text.strip()[:100]
+    await state.set_state(None)
+    await state.update_data(log_query=query)
+    
+    try:
+        text, keyboard = await _render_logs_page(level, None, query)
+        await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    except Exception as e:
+        logger.error("Ошибка при поиске по логам: %s", e, exc_info=True)
+        await message.answer(f"❌ Ошибка при поиске по логам: {e}", parse_mode="HTML")
+
+
 @router.callback_query(lambda c: c.data == "admin:monitoring:verification")
 @require_admin_callback
 async def callback_monitoring_verification(callback: CallbackQuery) -> None:
@@ -188,44 +438,60 @@ async def callback_monitoring_verification(callback: CallbackQuery) -> None:
     await safe_answer_callback(callback)
 
 
-@router.callback_query(lambda c: c.data == "admin:verification:unverified")
-@require_admin_callback
-async def callback_verification_unverified(
+async def _show_users_page(
     callback: CallbackQuery,
     user_service: UserService,
+    action: str,
+    cursor: Optional[PageCursor],
 ) -> None:
-    """Список неверифицированных пользователей."""
+    """
+    Показать страницу списка пользователей.
+    
+    Args:
+        callback: Callback с сообщением списка
+        user_service: Сервис пользователей
+        action: verify — неверифицированные, view — верифицированные
+        cursor: Курсор страницы или None для первой
+    """
+    title, empty_text, prompt = USER_LIST_TEXTS[action]
     try:
-        users = await user_service.get_unverified_users(limit=100)
+        if action == "verify":
+            page = await user_service.get_unverified_page(limit=USERS_PAGE_SIZE, cursor=cursor)
+        else:
+            page = await user_service.get_verified_page(limit=USERS_PAGE_SIZE, cursor=cursor)
         
-        if not users:
-            text = (
-                "📋 <b>Неверифицированные пользователи</b>\n\n"
-                "✅ Нет неверифицированных пользователей."
-            )
+        if not page.items:
             await safe_edit_message(
                 callback.message,
-                text,
+                f"{title}\n\n{empty_text}",
                 reply_markup=get_back_keyboard("admin:monitoring:verification")
             )
             await safe_answer_callback(callback)
             return
         
+        # Общее число берём из снимка статистики, а не считаем на каждой странице
+        snapshot = await load_snapshot(get_stats_service(), user_service.db_pool)
+        total = snapshot.unverified_users if action == "verify" else snapshot.verified_users
         text = (
-            f"📋 <b>Неверифицированные пользователи</b>\n\n"
-            f"Найдено: <b>{len(users)}</b>\n\n"
-            "Выберите пользователя для верификации:"
+            f"{title}\n\n"
+            f"Найдено: <b>{total}</b>\n\n"
+            f"{prompt}"
         )
         
         await safe_edit_message(
             callback.message,
             text,
-            reply_markup=get_users_list_keyboard(users, action="verify", page=0)
+            reply_markup=get_users_list_keyboard(
+                page.items,
+                action=action,
+                next_cursor=page.next_cursor.encode() if page.next_cursor else None,
+                prev_cursor=page.prev_cursor.encode() if page.prev_cursor else None,
+            )
         )
         await safe_answer_callback(callback)
         
     except Exception as e:
-        logger.error("Ошибка при получении списка неверифицированных: %s", e, exc_info=True)
+        logger.error("Ошибка при получении списка пользователей (%s): %s", action, e, exc_info=True)
         await safe_edit_message(
             callback.message,
             f"❌ Ошибка: {e}",
@@ -234,6 +500,16 @@ async def callback_verification_unverified(
         await safe_answer_callback(callback)
 
 
+@router.callback_query(lambda c: c.data == "admin:verification:unverified")
+@require_admin_callback
+async def callback_verification_unverified(
+    callback: CallbackQuery,
+    user_service: UserService,
+) -> None:
+    """Список неверифицированных пользователей."""
+    await _show_users_page(callback, user_service, "verify", None)
+
+
 @router.callback_query(lambda c: c.data == "admin:verification:verified")
 @require_admin_callback
 async def callback_verification_verified(
@@ -241,43 +517,7 @@ async def callback_verification_verified(
     user_service: UserService,
 ) -> None:
     """Список верифицированных пользователей."""
-    try:
-        users = await user_service.get_verified_users(limit=100)
-        
-        if not users:
-            text = (
-                "✅ <b>Верифицированные пользователи</b>\n\n"
-                "📭 Нет верифицированных пользователей."
-            )
-            await safe_edit_message(
-                callback.message,
-                text,
-                reply_markup=get_back_keyboard("admin:monitoring:verification")
-            )
-            await safe_answer_callback(callback)
-            return
-        
-        text = (
-            f"✅ <b>Верифицированные пользователи</b>\n\n"
-            f"Найдено: <b>{len(users)}</b>\n\n"
-            "Выберите пользователя:"
-        )
-        
-        await safe_edit_message(
-            callback.message,
-            text,
-            reply_markup=get_users_list_keyboard(users, action="view", page=0)
-        )
-        await safe_answer_callback(callback)
-        
-    except Exception as e:
-        logger.error("Ошибка при получении списка верифицированных: %s", e, exc_info=True)
-        await safe_edit_message(
-            callback.message,
-            f"❌ Ошибка: {e}",
-            reply_markup=get_back_keyboard("admin:monitoring:verification")
-        )
-        await safe_answer_callback(callback)
+    await _show_users_page(callback, user_service, "view", None)
 
 
 @router.callback_query(lambda c: c.data == "admin:verification:verify_all")
@@ -289,6 +529,7 @@ async def callback_verification_verify_all(
     """Верифицировать всех неверифицированных пользователей."""
     try:
         count = await user_service.verify_all_users()
+        invalidate_stats()
         
         text = (
             f"✅ <b>Верификация завершена</b>\n\n"
@@ -394,6 +635,7 @@ async def process_user_name(
         )
         
         if success:
+            invalidate_stats()
             text = (
                 f"✅ <b>Пользователь верифицирован!</b>\n\n"
                 f"Имя: <b>{first_name}</b>\n"
@@ -610,6 +852,7 @@ async def callback_user_delete_confirm(
         success = await user_service.unverify_user(user_id)
         
         if success:
+            invalidate_stats()
             text = (
                 "✅ <b>Верификация удалена</b>\n\n"
                 "Пользователь больше не может участвовать в опросах."
@@ -640,46 +883,8 @@ async def callback_verification_unverified_page(
     callback: CallbackQuery,
     user_service: UserService,
 ) -> None:
-    """Пагинация списка неверифицированных пользователей."""
-    page = int(callback.data.split(":")[-1])
-    
-    try:
-        users = await user_service.get_unverified_users(limit=100)
-        
-        if not users:
-            text = (
-                "📋 <b>Неверифицированные пользователи</b>\n\n"
-                "✅ Нет неверифицированных пользователей."
-            )
-            await safe_edit_message(
-                callback.message,
-                text,
-                reply_markup=get_back_keyboard("admin:monitoring:verification")
-            )
-            await safe_answer_callback(callback)
-            return
-        
-        text = (
-            f"📋 <b>Неверифицированные пользователи</b>\n\n"
-            f"Найдено: <b>{len(users)}</b>\n\n"
-            "Выберите пользователя для верификации:"
-        )
-        
-        await safe_edit_message(
-            callback.message,
-            text,
-            reply_markup=get_users_list_keyboard(users, action="verify", page=page)
-        )
-        await safe_answer_callback(callback)
-        
-    except Exception as e:
-        logger.error("Ошибка при получении списка неверифицированных: %s", e, exc_info=True)
-        await safe_edit_message(
-            callback.message,
-            f"❌ Ошибка: {e}",
-            reply_markup=get_back_keyboard("admin:monitoring:verification")
-        )
-        await safe_answer_callback(callback)
+    """Страница списка неверифицированных (admin:verification:verify:page:<курсор>)."""
+    await _show_users_page(callback, user_service, "verify", PageCursor.decode(callback.data.split(":")[-1]))
 
 
 @router.callback_query(lambda c: c.data and c.data.startswith("admin:verification:view:page:"))
@@ -688,43 +893,5 @@ async def callback_verification_verified_page(
     callback: CallbackQuery,
     user_service: UserService,
 ) -> None:
-    """Пагинация списка верифицированных пользователей."""
-    page = int(callback.data.split(":")[-1])
-    
-    try:
-        users = await user_service.get_verified_users(limit=100)
-        
-        if not users:
-            text = (
-                "✅ <b>Верифицированные пользователи</b>\n\n"
-                "📭 Нет верифицированных пользователей."
-            )
-            await safe_edit_message(
-                callback.message,
-                text,
-                reply_markup=get_back_keyboard("admin:monitoring:verification")
-            )
-            await safe_answer_callback(callback)
-            return
-        
-        text = (
-            f"✅ <b>Верифицированные пользователи</b>\n\n"
-            f"Найдено: <b>{len(users)}</b>\n\n"
-            "Выберите пользователя:"
-        )
-        
-        await safe_edit_message(
-            callback.message,
-            text,
-            reply_markup=get_users_list_keyboard(users, action="view", page=page)
-        )
-        await safe_answer_callback(callback)
-        
-    except Exception as e:
-        logger.error("Ошибка при получении списка верифицированных: %s", e, exc_info=True)
-        await safe_edit_message(
-            callback.message,
-            f"❌ Ошибка: {e}",
-            reply_markup=get_back_keyboard("admin:monitoring:verification")
-        )
-        await safe_answer_callback(callback)
+    """Страница списка верифицированных (admin:verification:view:page:<курсор>)."""
+    await _show_users_page(callback, user_service, "view", PageCursor.decode(callback.data.split(":")[-1]))
@@ -2,7 +2,7 @@
 Обработчики для раздела "Опросы" админ-панели.
 """
 import logging
-from typing import Optional, Any
+from typing import Optional
 from datetime import date, timedelta
 
 from aiogram import Router, Bot
@@ -13,7 +13,9 @@ from src.states.admin_panel_states import AdminPanelStates
 from src.services.group_member_service import GroupMemberService
 from src.services.poll_service import PollService
 from src.services.group_service import GroupService
-from src.services.service_registry import get_scheduler_service
+from src.services.poll_report_service import PollReportService
+from src.services.report_renderer import split_message
+from src.services.service_registry import get_poll_report_service, get_scheduler_service
 from src.repositories.poll_repository import PollRepository
 from src.repositories.group_repository import GroupRepository
 from src.utils.auth import require_admin_callback
@@ -25,7 +27,6 @@ from src.utils.admin_keyboards import (
 )
 from src.utils.telegram_helpers import safe_edit_message, safe_answer_callback
 from src.utils.group_formatters import clean_group_name_for_display
-from config.settings import settings
 
 logger = logging.getLogger(__name__)
 router = Router()
@@ -51,90 +52,6 @@ def _build_group_selection_keyboard(groups: list[dict]) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=keyboard_buttons)
 
 
-def _format_voter_name(
-    voter: dict,
-    group_member_service: GroupMemberService,
-    member_names_by_id: dict[int, str],
-    member_names_by_user_id: dict[int, str],
-) -> str:
-    return group_member_service.resolve_voter_display_name(
-        voter,
-        member_names_by_id,
-        member_names_by_user_id,
-    )
-
-
-def _build_voter_block(
-    title: str,
-    voters: list[dict],
-    *,
-    group_member_service: GroupMemberService,
-    member_names_by_id: dict[int, str],
-    member_names_by_user_id: dict[int, str],
-    limit: int = 20,
-    show_remaining: bool = False,
-) -> str:
-    text = f"<b>{title}:</b> {len(voters)}\n"
-    for voter in voters[:limit]:
-        text += f"• {_format_voter_name(voter, group_member_service, member_names_by_id, member_names_by_user_id)}\n"
-    if show_remaining and len(voters) > limit:
-        text += f"... и еще {len(voters) - limit} человек\n"
-    return text + "\n"
-
-
-def _collect_not_voted_names(
-    members: list[dict[str, Any]],
-    voted_user_ids: set[int],
-    *,
-    limit: int = 15,
-) -> str:
-    not_voted = []
-    for member in members:
-        telegram_user_id = member.get("telegram_user_id")
-        if telegram_user_id is not None and int(telegram_user_id) in settings.ADMIN_IDS:
-            continue
-        if telegram_user_id is None or int(telegram_user_id) not in voted_user_ids:
-            not_voted.append(member.get("full_name", "Неизвестный курьер"))
-
-    if not not_voted:
-        return ""
-
-    text = "<b>Не отметились:</b>\n"
-    for person in not_voted[:limit]:
-        text += f"• {person}\n"
-    if len(not_voted) > limit:
-        text += f"... и еще {len(not_voted) - limit} человек\n"
-    return text + "\n"
-
-
-def _extract_voted_user_ids(results: dict) -> set[int]:
-    voted_user_ids: set[int] = set()
-    slots = results.get("slots", {}) if isinstance(results, dict) else {}
-    for voters in slots.values():
-        if isinstance(voters, list):
-            for voter in voters:
-                if isinstance(voter, dict) and voter.get("user_id"):
-                    voted_user_ids.add(int(voter["user_id"]))
-
-    for voter in results.get("day_off", []) if isinstance(results, dict) else []:
-        if isinstance(voter, dict) and voter.get("user_id"):
-            voted_user_ids.add(int(voter["user_id"]))
-    for bucket_name in ("curator", "night_out", "not_going"):
-        for voter in results.get(bucket_name, []) if isinstance(results, dict) else []:
-            if isinstance(voter, dict) and voter.get("user_id"):
-                voted_user_ids.add(int(voter["user_id"]))
-
-    custom_buckets = results.get("custom", {}) if isinstance(results, dict) else {}
-    if isinstance(custom_buckets, dict):
-        for voters in custom_buckets.values():
-            if isinstance(voters, list):
-                for voter in voters:
-                    if isinstance(voter, dict) and voter.get("user_id"):
-                        voted_user_ids.add(int(voter["user_id"]))
-
-    return voted_user_ids
-
-
 async def _close_poll_instance(
     *,
     callback: CallbackQuery,
@@ -738,118 +655,33 @@ async def callback_select_group_for_polls(
                 f"Дата: {poll.get('poll_date').strftime('%d.%m.%Y') if poll.get('poll_date') else '-'}\n\n"
             )
             
-            # Получаем слоты группы для форматирования
+            # Тот же готовый отчет, что уходит в чат при закрытии опроса
             try:
-                slots = group_service.get_slots_config(group)
-                extra_options = group_service.get_extra_options(group)
-                member_names_by_id, member_names_by_user_id = await group_member_service.get_member_name_maps(group_id)
-                
-                if group.get("is_night", False):
-                    results = poll.get('results', {}) if isinstance(poll.get('results'), dict) else {}
-                    for title, key in (
-                        ("Выхожу", "night_out"),
-                        ("Не выхожу", "not_going"),
-                        ("Выходной", "day_off"),
-                    ):
-                        voters = results.get(key, [])
-                        text += _build_voter_block(
-                            title,
-                            voters,
-                            group_member_service=group_member_service,
-                            member_names_by_id=member_names_by_id,
-                            member_names_by_user_id=member_names_by_user_id,
-                        )
-                    custom_results = results.get("custom", {}) if isinstance(results, dict) else {}
-                    if isinstance(custom_results, dict):
-                        for index, option_text in enumerate(extra_options):
-                            voters = custom_results.get(f"option_{index}", [])
-                            text += _build_voter_block(
-                                option_text,
-                                voters,
-                                group_member_service=group_member_service,
-                                member_names_by_id=member_names_by_id,
-                                member_names_by_user_id=member_names_by_user_id,
-                            )
-                    members = await group_member_service.get_group_members(group_id)
-                    voted_user_ids = _extract_voted_user_ids(results)
-                    text += _collect_not_voted_names(members, voted_user_ids)
-                elif slots:
-                    text += "📋 <b>Результаты по выходам:</b>\n\n"
-                    # Формируем структуру результатов
-                    results = poll.get('results', {})
-                    slot_results_map = results.get('slots', {}) if isinstance(results, dict) else {}
-                    
-                    if results and isinstance(results, dict) and results:
-                        # Если результаты есть в БД, форматируем их
-                        for i, slot in enumerate(slots):
-                            slot_start = slot.get('start', '?')
-                            slot_end = slot.get('end', '?')
-                            # Получаем данные о голосах для этого слота (если есть)
-                            slot_key = f"slot_{i}"
-                            voters = slot_results_map.get(slot_key, []) if isinstance(slot_results_map, dict) else []
-                            voters_count = len(voters) if isinstance(voters, list) else 0
-                            
-                            mark = "✅" if voters_count > 0 else "❌"
-                            text += f"{mark} <b>{slot_start} - {slot_end}</b> ({voters_count})\n"
-                            
-                            if voters and isinstance(voters, list):
-                                for voter in voters[:50]:
-                                    text += f"• {_format_voter_name(voter, group_member_service, member_names_by_id, member_names_by_user_id)}\n"
-                            
-                            text += "\n"
-
-                        # Выходной
-                        day_off = results.get('day_off', [])
-                        if day_off:
-                            text += _build_voter_block(
-                                "Выходной",
-                                day_off if isinstance(day_off, list) else [],
-                                group_member_service=group_member_service,
-                                member_names_by_id=member_names_by_id,
-                                member_names_by_user_id=member_names_by_user_id,
-                                limit=10,
-                                show_remaining=True,
-                            )
-
-                        custom_results = results.get("custom", {}) if isinstance(results, dict) else {}
-                        if isinstance(custom_results, dict):
-                            for index, option_text in enumerate(extra_options):
-                                voters = custom_results.get(f"option_{index}", [])
-                                if voters:
-                                    text += _build_voter_block(
-                                        option_text,
-                                        voters,
-                                        group_member_service=group_member_service,
-                                        member_names_by_id=member_names_by_id,
-                                        member_names_by_user_id=member_names_by_user_id,
-                                    )
-
-                        members = await group_member_service.get_group_members(group_id)
-                        voted_user_ids = _extract_voted_user_ids(results)
-                        not_voted_block = _collect_not_voted_names(members, voted_user_ids)
-                        if not_voted_block:
-                            text += "\n" + not_voted_block.rstrip() + "\n"
-                    else:
-                        # Если результатов нет, показываем структуру слотов
-                        text += "⚠️ <b>Результаты еще не получены.</b>\n\n"
-                        text += "💡 <b>Примечание:</b> Результаты опроса будут доступны после его закрытия или при получении обновлений от Telegram.\n\n"
-                        text += "📋 <b>Настроенные выходы:</b>\n"
-                        for i, slot in enumerate(slots):
-                            slot_start = slot.get('start', '?')
-                            slot_end = slot.get('end', '?')
-                            text += f"• {slot_start} - {slot_end}\n"
-                        if extra_options:
-                            text += "\n📝 <b>Дополнительные ответы:</b>\n"
-                            for option_text in extra_options:
-                                text += f"• {option_text}\n"
-                else:
+                report_service = get_poll_report_service() or PollReportService(group_member_service)
+                if not group.get("is_night", False) and not group_service.get_slots_config(group):
                     text += "⚠️ У группы не настроены выходы."
+                else:
+                    prepared = await report_service.get_report(poll, group)
+                    text += prepared.body + prepared.not_voted_text
                     
             except Exception as e:
                 logger.error("Ошибка при получении результатов опроса: %s", e, exc_info=True)
                 text += f"⚠️ Ошибка при получении результатов: {e}"
         
-        await safe_edit_message(callback.message, text, reply_markup=get_back_keyboard("admin:polls_menu"))
+        # Первая часть заменяет меню, остальные уходят отдельными сообщениями;
+        # кнопка «Назад» остаётся под последней частью
+        chunks = split_message(text)
+        await safe_edit_message(
+            callback.message,
+            chunks[0],
+            reply_markup=get_back_keyboard("admin:polls_menu") if len(chunks) == 1 else None,
+        )
+        for index, chunk in enumerate(chunks[1:], start=2):
+            await callback.message.answer(
+                chunk,
+                parse_mode="HTML",
+                reply_markup=get_back_keyboard("admin:polls_menu") if index == len(chunks) else None,
+            )
         await safe_answer_callback(callback)
         await state.clear()
     
@@ -5,23 +5,39 @@
 - /force_poll [группа] - Принудительно создать опрос
 - /manual_close [группа] - Принудительно закрыть опрос
 - /get_report [группа] [дата] - Получить отчет
-- /test_screenshot - Тест создания скриншота
+- /export_reports [группа] [месяц] - Выгрузить отчеты группы за месяц
+- /cleanup_old_data [дней] - Перенести старые опросы в архив и очистить служебные записи
+- /test_screenshot - Тест картинки с итогами опроса
 - /stats - Статистика по всем ЗИЗам
 """
+import asyncio
 import logging
 from datetime import date, datetime, timedelta
+from html import escape
 from typing import Optional
 from pathlib import Path
 
 from aiogram import Router, Bot
 from aiogram.filters import Command, CommandObject
-from aiogram.types import Message, CallbackQuery, FSInputFile
+from aiogram.types import Message, CallbackQuery, FSInputFile, BufferedInputFile
 
 from src.utils.auth import require_admin, require_admin_callback
 from src.services.scheduler_service import SchedulerService
-from src.services.poll_service import PollService
 from src.services.group_service import GroupService
-from src.services.service_registry import get_scheduler_service, get_poll_service
+from src.services.stats_service import format_close_times, format_votes_by_day, load_snapshot
+from src.services.retention_service import (
+    MIN_POLL_RETENTION_DAYS,
+    RetentionBusyError,
+    format_retention_report,
+)
+from src.services.service_registry import (
+    get_report_archive,
+    get_report_image_service,
+    get_retention_service,
+    get_scheduler_service,
+    get_stats_service,
+    invalidate_stats,
+)
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -189,20 +205,26 @@ async def cmd_get_report(
             await message.answer("❌ Неверный формат даты. Используйте YYYY-MM-DD")
             return
     
-    # Ищем файл отчета
-    report_path = Path("reports") / group_name / f"{target_date.strftime('%Y-%m-%d')}.txt"
+    report_content = None
+    report_archive = get_report_archive()
+    if report_archive is not None:
+        report_content = await report_archive.get(group_name, target_date)
     
-    if report_path.exists():
+    # Отчеты, сохранённые до перехода на архив, лежат отдельными файлами
+    report_path = Path(settings.REPORTS_DIR) / group_name / f"{target_date.strftime('%Y-%m-%d')}.txt"
+    if report_content is None and report_path.exists():
+        report_content = await asyncio.to_thread(report_path.read_text, encoding='utf-8')
+    
+    if report_content is not None:
         # Отправляем текстовый отчет
-        report_content = report_path.read_text(encoding='utf-8')
         await message.answer(
             f"📊 <b>Отчет: {group_name}</b>\n"
             f"📅 Дата: {target_date.strftime('%d.%m.%Y')}\n\n"
-            f"<pre>{report_content[:3500]}</pre>"  # Ограничиваем длину
+            f"<pre>{escape(report_content[:3500])}</pre>"  # Ограничиваем длину
         )
         
         # Проверяем наличие PNG скриншота
-        png_path = Path("reports") / group_name / f"{target_date.strftime('%Y-%m-%d')}.png"
+        png_path = Path(settings.REPORTS_DIR) / group_name / f"{target_date.strftime('%Y-%m-%d')}.png"
         if png_path.exists():
             await message.answer_photo(
                 photo=FSInputFile(png_path),
@@ -216,6 +238,107 @@ async def cmd_get_report(
         )
 
 
+@router.message(Command("export_reports"))
+@require_admin
+async def cmd_export_reports(
+    message: Message,
+    command: CommandObject,
+) -> None:
+    """
+    Выгрузить все отчеты группы за месяц одним файлом.
+    
+    Использование:
+        /export_reports ЗИЗ-1 2024-01
+    """
+    args = command.args.split() if command.args else []
+    if len(args) != 2:
+        await message.answer(
+            "ℹ️ <b>Использование:</b>\n"
+            "/export_reports <группа> <ГГГГ-ММ>\n\n"
+            "Пример:\n"
+            "/export_reports ЗИЗ-1 2024-01"
+        )
+        return
+    
+    group_name = args[0]
+    try:
+        month_start = datetime.strptime(args[1], "%Y-%m").date()
+    except ValueError:
+        await message.answer("❌ Неверный формат месяца. Используйте YYYY-MM")
+        return
+    
+    report_archive = get_report_archive()
+    if report_archive is None:
+        await message.answer("❌ Архив отчетов не инициализирован")
+        return
+    
+    reports = await report_archive.export_month(group_name, month_start.year, month_start.month)
+    if not reports:
+        await message.answer(
+            f"📭 Отчетов нет\n\n"
+            f"Группа: {group_name}\n"
+            f"Месяц: {month_start.strftime('%m.%Y')}"
+        )
+        return
+    
+    content = "\n\n".join(
+        f"===== {report_date.strftime('%d.%m.%Y')} =====\n{text}"
+        for report_date, text in reports
+    )
+    await message.answer_document(
+        BufferedInputFile(content.encode("utf-8"), filename=f"{group_name}_{args[1]}.txt"),
+        caption=f"📦 Отчеты {group_name} за {month_start.strftime('%m.%Y')}: {len(reports)}",
+    )
+
+
+@router.message(Command("cleanup_old_data"))
+@require_admin
+async def cmd_cleanup_old_data(
+    message: Message,
+    command: CommandObject,
+) -> None:
+    """
+    Перенести закрытые опросы старше срока хранения в архив и удалить
+    устаревшие служебные записи.
+    
+    Использование:
+        /cleanup_old_data - срок хранения из POLL_RETENTION_DAYS
+        /cleanup_old_data 90 - опросы старше 90 дней
+    """
+    retention_service = get_retention_service()
+    if retention_service is None:
+        await message.answer("❌ Сервис очистки не инициализирован")
+        return
+    
+    days = None
+    if command.args:
+        arg = command.args.strip()
+        if not arg.isdigit() or int(arg) < MIN_POLL_RETENTION_DAYS:
+            await message.answer(
+                "ℹ️ <b>Использование:</b>\n"
+                "/cleanup_old_data [дней]\n\n"
+                f"Срок хранения — не меньше {MIN_POLL_RETENTION_DAYS} дней, "
+                f"по умолчанию {retention_service.poll_retention_days}."
+            )
+            return
+        days = int(arg)
+    
+    await message.answer("⏳ Очистка старых данных запущена...")
+    try:
+        report = await retention_service.run(poll_retention_days=days)
+    except RetentionBusyError:
+        await message.answer("⏳ Очистка уже выполняется, попробуйте позже")
+        return
+    except Exception as e:
+        logger.error("Ошибка очистки старых данных: %s", e, exc_info=True)
+        await message.answer(f"❌ Ошибка очистки: {escape(str(e))}")
+        return
+    
+    invalidate_stats()
+    logger.info("Очистка старых данных по команде администратора %s", message.from_user.id)
+    await message.answer(format_retention_report(report))
+
+
 @router.message(Command("stats"))
 @require_admin
 async def cmd_stats(
@@ -226,53 +349,27 @@ async def cmd_stats(
     """
     Показать статистику по всем ЗИЗам.
     """
-    poll_service: Optional[PollService] = get_poll_service()
-    
     try:
-        # Статистика по группам
-        groups = await group_service.get_all_groups()
-        active_groups = await group_service.get_all_groups(active_only=True)
-        
-        # Статистика по опросам (если доступен poll_service)
-        active_polls = 0
-        today_polls = 0
-        tomorrow_polls = 0
-        
-        if poll_service:
-            all_active_polls = await poll_service.poll_repo.get_active_polls()
-            active_polls = len(all_active_polls)
-            
-            today = date.today()
-            tomorrow = today + timedelta(days=1)
-            
-            today_polls = len([p for p in all_active_polls if p.get('poll_date') == today])
-            tomorrow_polls = len([p for p in all_active_polls if p.get('poll_date') == tomorrow])
-        
-        # Подсчет типов групп
-        day_groups = sum(1 for g in groups if not g.get('is_night', False))
-        night_groups = sum(1 for g in groups if g.get('is_night', False))
-        
-        # Группы со слотами
-        groups_with_slots = sum(
-            1 for g in groups 
-            if g.get('settings', {}).get('slots')
-        )
+        # Счётчики считаются агрегатами в БД и берутся из готового снимка
+        snapshot = await load_snapshot(get_stats_service(), group_service.db_pool)
         
         stats_text = (
             "📊 <b>Статистика системы</b>\n\n"
             f"👥 <b>Группы:</b>\n"
-            f"• Всего: {len(groups)}\n"
-            f"• Активных: {len(active_groups)}\n"
-            f"• Дневных: {day_groups}\n"
-            f"• Ночных: {night_groups}\n"
-            f"• Со слотами: {groups_with_slots}\n\n"
+            f"• Всего: {snapshot.total_groups}\n"
+            f"• Активных: {snapshot.active_groups}\n"
+            f"• Дневных: {snapshot.day_groups}\n"
+            f"• Ночных: {snapshot.night_groups}\n"
+            f"• Со слотами: {snapshot.groups_with_slots}\n\n"
             f"📋 <b>Опросы:</b>\n"
-            f"• Активных: {active_polls}\n"
-            f"• На сегодня: {today_polls}\n"
-            f"• На завтра: {tomorrow_polls}\n\n"
+            f"• Активных: {snapshot.active_polls}\n"
+            f"• На сегодня: {snapshot.active_today}\n"
+            f"• На завтра: {snapshot.active_tomorrow}\n\n"
+            f"🗳️ <b>Голоса по дням:</b>\n"
+            f"{format_votes_by_day(snapshot)}\n"
             f"⏰ <b>Расписание:</b>\n"
             f"• Создание: {settings.POLL_CREATION_HOUR}:{str(settings.POLL_CREATION_MINUTE).zfill(2)}\n"
-            f"• Закрытие: {settings.POLL_CLOSING_HOUR}:{str(settings.POLL_CLOSING_MINUTE).zfill(2)}\n"
+            f"{format_close_times(snapshot)}"
             f"• Напоминания: {', '.join(map(str, settings.REMINDER_HOURS))}\n"
         )
         
@@ -287,15 +384,42 @@ async def cmd_stats(
 @require_admin
 async def cmd_test_screenshot(message: Message) -> None:
     """
-    Тест создания скриншота (заглушка).
+    Тест картинки с итогами: отрисовка пробного отчета в пуле процессов.
     """
-    await message.answer(
-        "📸 <b>Тест скриншота</b>\n\n"
-        "Функция создания скриншотов использует текстовые отчеты.\n"
-        "Для полноценных скриншотов требуется:\n"
-        "• Selenium/Playwright для рендеринга\n"
-        "• Доступ к Telegram Web\n\n"
-        "Текущая реализация сохраняет результаты в текстовом формате."
+    report_images = get_report_image_service()
+    if report_images is None or not report_images.available:
+        await message.answer(
+            "📸 <b>Тест картинки</b>\n\n"
+            "❌ Отрисовка картинок выключена.\n"
+            "Проверьте ENABLE_REPORT_IMAGES и что установлен Pillow."
+        )
+        return
+    
+    rows = [
+        ("Рабочие смены", "08:00–12:00", 12),
+        ("Рабочие смены", "12:00–16:00", 7),
+        ("Рабочие смены", "16:00–20:00", 0),
+        ("Дополнительно", "Выходной", 3),
+    ]
+    image = await report_images.render("Тестовая группа", f"Пробный отчет {date.today().strftime('%d.%m.%Y')}", rows)
+    stats = report_images.get_stats()
+    if image is None:
+        await message.answer(
+            "📸 <b>Тест картинки</b>\n\n"
+            f"❌ Картинка не получена (в очереди: {stats['pending']}/{stats['queue_size']}, "
+            f"ошибок: {stats['failed']}). Подробности в логах."
+        )
+        return
+    
+    await message.answer_photo(
+        photo=BufferedInputFile(image.data, filename="test_report.png"),
+        caption=(
+            f"📸 Отрисовка: {image.render_ms:.0f} мс, с очередью: {image.total_ms:.0f} мс\n"
+            f"Процессов: {stats['workers']}, очередь: {stats['pending']}/{stats['queue_size']}\n"
+            f"Отрисовано: {stats['rendered']}, пропущено: {stats['skipped']}, ошибок: {stats['failed']}, "
+            f"перезапусков пула: {stats['restarts']}\n"
+            f"Максимум отрисовки: {stats['max_render_ms']:.0f} мс"
+        ),
     )
 
 
@@ -417,6 +541,10 @@ async def cmd_add_ziz(
             telegram_chat_id=chat_id,
             is_night=is_night,
         )
+        scheduler_service = get_scheduler_service()
+        if scheduler_service:
+            await scheduler_service.reschedule_group(new_group["id"])
+        invalidate_stats()
         
         await message.answer(
             f"✅ <b>Группа создана</b>\n\n"
@@ -458,4 +586,17 @@ async def cmd_scheduler_status(message: Message, bot: Bot) -> None:
         next_run_str = next_run.strftime('%d.%m.%Y %H:%M') if next_run else 'N/A'
         status_text += f"• {job.name}: {next_run_str}\n"
     
+    dispatcher = scheduler_service.group_dispatcher
+    if dispatcher is not None:
+        next_group_event = dispatcher.next_run_at()
+        status_text += (
+            f"\n🗓 <b>Расписание групп:</b> {len(dispatcher)} событий, "
+            f"ближайшее: {next_group_event.strftime('%d.%m.%Y %H:%M') if next_group_event else 'N/A'}\n"
+        )
+        if scheduler_service.streams_poll_creation:
+            status_text += (
+                f"📨 Создание опросов: с {settings.POLL_CREATION_HOUR:02d}:{settings.POLL_CREATION_MINUTE:02d} "
+                f"в течение {settings.POLL_CREATION_WINDOW_MINUTES} мин\n"
+            )
+    
     await message.answer(status_text)
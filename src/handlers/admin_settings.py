@@ -12,6 +12,7 @@ from aiogram.types import Message, CallbackQuery
 
 from src.states.admin_panel_states import AdminPanelStates
 from src.services.group_service import GroupService
+from src.services.service_registry import get_scheduler_service, invalidate_stats
 from src.repositories.group_repository import GroupRepository
 from src.utils.auth import require_admin_callback
 from src.utils.admin_keyboards import (
@@ -40,7 +41,11 @@ async def callback_schedule_menu(callback: CallbackQuery) -> None:
     
     # Показываем текущие настройки
     creation_time = f"{settings.POLL_CREATION_HOUR:02d}:{settings.POLL_CREATION_MINUTE:02d}"
-    closing_time = f"{settings.POLL_CLOSING_HOUR:02d}:{settings.POLL_CLOSING_MINUTE:02d}"
+    if settings.ENABLE_PER_GROUP_SCHEDULES:
+        # Время закрытия берётся из poll_close_time каждой группы
+        closing_time = "по группам"
+    else:
+        closing_time = f"{settings.POLL_CLOSING_HOUR:02d}:{settings.POLL_CLOSING_MINUTE:02d}"
     reminder_hours = ", ".join(map(str, settings.REMINDER_HOURS)) if settings.REMINDER_HOURS else "0 (отключено)"
     
     text = (
@@ -295,6 +300,11 @@ async def process_schedule_time(message: Message, state: FSMContext, group_servi
             # TODO: Сохранить в БД или конфиг
             # Пока просто сообщаем пользователю
             reminder_text = ", ".join(map(str, reminder_hours)) if reminder_hours else "0 (отключено)"
+            closing_note = (
+                "⚠️ При ENABLE_PER_GROUP_SCHEDULES=True POLL_CLOSING_* не действуют: "
+                "время закрытия задаётся в каждой группе.\n\n"
+                if settings.ENABLE_PER_GROUP_SCHEDULES else ""
+            )
             
             await message.answer(
                 f"✅ <b>Расписание обновлено!</b>\n\n"
@@ -308,6 +318,7 @@ async def process_schedule_time(message: Message, state: FSMContext, group_servi
                 f"<code>POLL_CLOSING_HOUR={closing_hours}</code>\n"
                 f"<code>POLL_CLOSING_MINUTE={closing_minutes}</code>\n"
                 f"<code>REMINDER_HOURS=[{','.join(map(str, reminder_hours))}]</code>\n\n"
+                f"{closing_note}"
                 f"После обновления перезапустите бота.",
                 parse_mode="HTML",
                 reply_markup=get_back_keyboard("admin:settings_menu")
@@ -360,6 +371,10 @@ async def process_schedule_time(message: Message, state: FSMContext, group_servi
             elif schedule_type == "closing":
                 # Для закрытия опросов - обновляем poll_close_time
                 await group_service.update_group(group_id, poll_close_time=time_str)
+                scheduler_service = get_scheduler_service()
+                if scheduler_service:
+                    await scheduler_service.reschedule_group(group_id)
+                invalidate_stats()
                 await message.answer(
                     f"✅ Время закрытия опросов для группы установлено: <code>{time_text}</code>",
                     parse_mode="HTML",
@@ -9,6 +9,7 @@ from aiogram.types import ChatMemberUpdated, Message, User
 from config.settings import settings
 from src.repositories.group_repository import GroupRepository
 from src.services.group_member_service import GroupMemberService
+from src.services.not_voted_tracker import not_voted_tracker
 from src.utils.db_pool import get_db_pool
 
 router = Router()
@@ -47,6 +48,7 @@ async def _sync_joined_user(chat_id: int, user: User) -> None:
         create_if_missing=user.id not in settings.ADMIN_IDS,
     )
     if member:
+        not_voted_tracker.member_joined(member)
         logger.info(
             "Курьер %s автоматически привязан к группе %s",
             user.id,
@@ -68,6 +70,7 @@ async def _sync_left_user(chat_id: int, user: User) -> None:
         telegram_user_id=user.id,
     )
     if deactivated:
+        not_voted_tracker.member_left(group["id"], user.id)
         logger.info(
             "Курьер %s автоматически исключён из группы %s",
             user.id,
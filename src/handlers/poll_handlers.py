@@ -8,14 +8,23 @@ import json
 from aiogram import Router, Bot
 from aiogram.types import PollAnswer
 
-from src.repositories.group_member_repository import GroupMemberRepository
 from src.repositories.group_repository import GroupRepository
 from src.repositories.poll_repository import PollRepository
-from src.repositories.duty_poll_repository import DutyPollRepository
 from src.services.group_member_service import GroupMemberService
+from src.services.not_voted_tracker import not_voted_tracker
+from src.services.service_registry import get_poll_report_service, invalidate_stats
 from src.utils.db_pool import get_db_pool
+from src.utils.logging_setup import get_rate_limited_logger
+from src.utils.poll_kind_cache import (
+    POLL_KIND_DAILY,
+    POLL_KIND_DUTY,
+    POLL_KIND_OBSOLETE,
+    poll_kind_cache,
+)
 
 logger = logging.getLogger(__name__)
+# Записи по каждому голосу: объём ограничен, чтобы не расти вместе с числом голосов
+vote_logger = get_rate_limited_logger(f"{__name__}.votes")
 router = Router()
 
 
@@ -61,6 +70,23 @@ def _clear_previous_vote(results: Dict[str, Any], user_id: int) -> None:
                 custom_buckets[bucket_key] = [item for item in bucket if item.get("user_id") != user_id]
 
 
+def _log_foreign_vote(kind: str, poll_id: str) -> None:
+    """Голос по опросу, который бот не хранит: опрос дежурных, устаревший или неизвестный."""
+    if kind == POLL_KIND_DUTY:
+        logger.debug(
+            "Получен голос по опросу дежурных telegram_poll_id=%s; "
+            "результаты хранит Telegram",
+            poll_id,
+        )
+    elif kind == POLL_KIND_OBSOLETE:
+        vote_logger.info(
+            "Получен поздний голос по устаревшему опросу telegram_poll_id=%s, игнорируем",
+            poll_id,
+        )
+    else:
+        logger.warning("Опрос с telegram_poll_id=%s не найден", poll_id)
+
+
 @router.poll_answer()
 async def handle_poll_answer(
     poll_answer: PollAnswer,
@@ -75,13 +101,19 @@ async def handle_poll_answer(
     poll_id = poll_answer.poll_id
     option_ids = poll_answer.option_ids
     
-    logger.info(
+    logger.debug(
         "Получен голос: user_id=%d, poll_id=%s, options=%s",
         user.id,
         poll_id,
         option_ids
     )
 
+    # Голоса по опросам дежурных и устаревшим опросам отбрасываются без БД
+    cached_kind = poll_kind_cache.get(poll_id)
+    if cached_kind is not None:
+        _log_foreign_vote(cached_kind, poll_id)
+        return
+
     try:
         full_name = user.full_name or f"User_{user.id}"
         username = f"@{user.username}" if user.username else None
@@ -90,30 +122,16 @@ async def handle_poll_answer(
         poll_repo = PollRepository(pool)
         group_repo = GroupRepository(pool)
         member_service = GroupMemberService(pool)
-        member_repo = GroupMemberRepository(pool)
 
-        poll = await poll_repo.get_by_telegram_poll_id(poll_id)
-        if not poll:
-            duty_dispatch = await DutyPollRepository(pool).get_dispatch_by_telegram_poll_id(
-                poll_id
-            )
-            if duty_dispatch:
-                logger.debug(
-                    "Получен голос по опросу дежурных telegram_poll_id=%s; "
-                    "результаты хранит Telegram",
-                    poll_id,
-                )
-            elif await poll_repo.is_telegram_poll_obsolete(poll_id):
-                logger.info(
-                    "Получен поздний голос по устаревшему опросу telegram_poll_id=%s, игнорируем",
-                    poll_id,
-                )
-            else:
-                logger.warning("Опрос с telegram_poll_id=%s не найден", poll_id)
+        kind, poll = await poll_repo.resolve_telegram_poll(poll_id)
+        if kind != POLL_KIND_DAILY:
+            # Неизвестный опрос не кэшируется: он может оказаться только что созданным
+            poll_kind_cache.remember(poll_id, kind)
+            _log_foreign_vote(kind, poll_id)
             return
 
         if poll.get("status") != "active":
-            logger.info(
+            vote_logger.info(
                 "Получен поздний голос по опросу telegram_poll_id=%s со статусом %s, игнорируем",
                 poll_id,
                 poll.get("status"),
@@ -188,11 +206,14 @@ async def handle_poll_answer(
                             custom_bucket = results["custom"].setdefault(custom_key, [])
                             custom_bucket.append(member_data)
 
-                await conn.execute(
+                # Версии нужны кэшу отчетов: results_version увеличивает триггер БД
+                versions = await conn.fetchrow(
                     """
                     UPDATE daily_polls
                     SET results = $1::jsonb
                     WHERE id = $2
+                    RETURNING results_version,
+                        (SELECT members_version FROM groups WHERE id = daily_polls.group_id) AS members_version
                     """,
                     json.dumps(results),
                     poll["id"],
@@ -206,11 +227,27 @@ async def handle_poll_answer(
             option_indexes=list(option_ids),
         )
 
-        persisted_member = await member_repo.get_by_group_and_telegram_id(group["id"], user.id)
-        logger.info(
+        if versions is not None:
+            not_voted_tracker.record_vote(
+                str(poll["id"]),
+                member,
+                voted=bool(option_ids),
+                results_version=versions["results_version"],
+                members_version=versions["members_version"],
+            )
+
+        report_service = get_poll_report_service()
+        if report_service is not None and versions is not None:
+            report_service.schedule_refresh(
+                {**locked_poll, "results": results, "results_version": versions["results_version"]},
+                {**group, "members_version": versions["members_version"]},
+            )
+        invalidate_stats()
+
+        vote_logger.info(
             "Голос сохранен: group=%s, member=%s, options=%s",
             group.get("name"),
-            persisted_member.get("full_name") if persisted_member else full_name,
+            member_data["name"],
             option_ids,
         )
     except Exception as e:
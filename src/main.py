@@ -4,6 +4,7 @@
 """
 import asyncio
 import logging
+import signal
 import sys
 from pathlib import Path
 
@@ -17,10 +18,16 @@ from aiogram.enums import ParseMode
 from aiogram.exceptions import TelegramNetworkError
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.fsm.storage.redis import RedisStorage
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 
 from config.settings import settings
+from src.middlewares.activity_middleware import ActivityMiddleware
 from src.middlewares.auth_middleware import AdminMiddleware
-from src.middlewares.database_middleware import DatabaseMiddleware
+from src.middlewares.database_middleware import (
+    DatabaseMiddleware,
+    get_cached_db_pool_size,
+    get_cached_redis_connections,
+)
 from src.middlewares.verification_middleware import VerificationMiddleware
 from src.handlers import admin
 from src.handlers import admin_panel_navigation
@@ -31,6 +38,7 @@ from src.handlers import admin_broadcast
 from src.handlers import admin_employees
 from src.handlers import admin_monitoring
 from src.handlers import admin_scheduler
+from src.handlers import admin_diagnostics
 from src.handlers import poll_handlers
 from src.handlers import user_handlers
 from src.handlers import group_membership
@@ -39,42 +47,68 @@ from src.utils.db_pool import get_db_pool, close_db_pool
 from src.services.scheduler_service import SchedulerService
 from src.services.poll_service import PollService
 from src.services.group_service import GroupService
-from src.services.service_registry import set_scheduler_service, set_poll_service
+from src.services.service_registry import (
+    set_scheduler_service,
+    set_poll_service,
+    set_metrics_service,
+    set_loop_watchdog,
+    set_poll_report_service,
+    set_report_archive,
+    set_report_image_service,
+    set_stats_service,
+    set_retention_service,
+)
+from src.services.metrics_service import SystemMetricsService
+from src.services.health_service import HealthService
+from src.services.leader_election import LeaderElector
+from src.services.memory_watchdog import MemoryWatchdog
+from src.utils.loop_watchdog import LoopWatchdog
 from src.repositories.poll_repository import PollRepository
 from src.repositories.group_repository import GroupRepository
 from src.repositories.duty_poll_repository import DutyPollRepository
+from src.repositories.scheduler_job_repository import SchedulerJobRepository
+from src.services.scheduler_job_store import PostgresJobStore
+from src.services.report_archive import ReportArchive
+from src.services.report_image_service import ReportImageService
+from src.services.stats_service import StatsService
+from src.services.retention_service import RetentionService
 from src.services.duty_poll_service import DutyPollService
 from src.utils.redis_client import create_redis_client
+from src.utils.logging_setup import setup_logging
 
-# Создаём директорию для логов перед настройкой логирования
-# Используем абсолютный путь для надежности
-logs_dir = PROJECT_ROOT / "logs"
-logs_dir.mkdir(parents=True, exist_ok=True)
-
-
-class SchedulerNoiseFilter(logging.Filter):
-    """Скрывает шумные штатные логи APScheduler для recovery-job."""
-
-    SUPPRESSED_TEXT = "Проверка пропущенных автоматизаций"
-
-    def filter(self, record: logging.LogRecord) -> bool:
-        message = record.getMessage()
-        return self.SUPPRESSED_TEXT not in message
+# Процессы отрисовки картинок (spawn) импортируют этот модуль как __mp_main__:
+# файл лога с ротацией должен открывать только сам бот
+if __name__ == "__main__":
+    # Создаём директорию для логов перед настройкой логирования
+    # Используем абсолютный путь для надежности
+    logs_dir = PROJECT_ROOT / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Настройка логирования: запись в файл с ротацией выполняется вне event loop
+    setup_logging(logs_dir)
 
-# Настройка логирования
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(logs_dir / "bot.log", encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+logger = logging.getLogger(__name__)
 
-for scheduler_logger_name in ("apscheduler.scheduler", "apscheduler.executors.default"):
-    logging.getLogger(scheduler_logger_name).addFilter(SchedulerNoiseFilter())
 
-logger = logging.getLogger(__name__)
+async def serve_webhook(bot: Bot, dp: Dispatcher) -> None:
+    """
+    Принимать апдейты через webhook до сигнала остановки.
+    
+    Webhook регистрирует каждая реплика (вызов идемпотентен) и не удаляет
+    при остановке: апдейты продолжают принимать остальные реплики.
+    """
+    await bot.set_webhook(
+        settings.WEBHOOK_URL,
+        secret_token=settings.WEBHOOK_SECRET or None,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
+    logger.info("Webhook зарегистрирован, апдейты принимаются на %s", settings.WEBHOOK_PATH)
+    
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    await stop_event.wait()
 
 
 async def main() -> None:
@@ -137,6 +171,7 @@ async def main() -> None:
     dp.include_router(admin_employees.router)
     dp.include_router(admin_monitoring.router)
     dp.include_router(admin_scheduler.router)
+    dp.include_router(admin_diagnostics.router)
     dp.include_router(poll_handlers.router)
     dp.include_router(user_handlers.router)
     
@@ -150,6 +185,27 @@ async def main() -> None:
         logger.error("Ошибка инициализации пула соединений PostgreSQL: %s", e, exc_info=True)
         raise RuntimeError("PostgreSQL недоступен: безопасный запуск бота невозможен") from e
     
+    # Сторожевой таймер event loop: ловит блокирующие вызовы в корутинах
+    loop_watchdog = LoopWatchdog()
+    set_loop_watchdog(loop_watchdog)
+    await loop_watchdog.start()
+    
+    # Фоновый сбор системных метрик для экрана мониторинга
+    metrics_service = SystemMetricsService(db_pool=db_pool, redis=redis)
+    set_metrics_service(metrics_service)
+    await metrics_service.start()
+    
+    # Снимок статистики для экранов админ-панели
+    stats_service = StatsService(db_pool)
+    set_stats_service(stats_service)
+    await stats_service.start()
+    
+    # Процессы отрисовки картинок запускаются заранее, до первого закрытия опроса
+    report_image_service = ReportImageService()
+    set_report_image_service(report_image_service)
+    if settings.ENABLE_REPORT_IMAGES:
+        await report_image_service.start()
+    
     # Инициализируем планировщик
     try:
         poll_repo = PollRepository(db_pool)
@@ -158,33 +214,113 @@ async def main() -> None:
         poll_service = PollService(bot, poll_repo, group_repo)
         duty_poll_service = DutyPollService(bot, DutyPollRepository(db_pool))
             
+        report_archive = ReportArchive()
+        retention_service = RetentionService(db_pool)
         scheduler_service = SchedulerService(
             bot=bot,
             poll_service=poll_service,
             group_service=group_service,
             duty_poll_service=duty_poll_service,
+            job_store=PostgresJobStore(SchedulerJobRepository(db_pool)),
+            report_archive=report_archive,
+            report_images=report_image_service,
+            retention_service=retention_service,
         )
             
         # Сохраняем в глобальный реестр для доступа из handlers
         set_scheduler_service(scheduler_service)
         set_poll_service(poll_service)
+        set_poll_report_service(scheduler_service.report_service)
+        set_report_archive(report_archive)
+        set_retention_service(retention_service)
             
-        # Запускаем планировщик
-        await scheduler_service.start()
+        # Запускаем планировщик; при нескольких репликах его запустит ведущая
+        if not settings.ENABLE_LEADER_ELECTION:
+            await scheduler_service.start()
         logger.info("Планировщик задач инициализирован")
     except Exception as e:
         logger.error("Ошибка инициализации планировщика: %s", e, exc_info=True)
         raise RuntimeError("Планировщик не запущен: бот не будет работать частично") from e
     
+    # Сторож роста памяти: кэши, MemoryStorage и задачи планировщика не должны расти бесконечно
+    memory_watchdog = MemoryWatchdog(notify=scheduler_service.notify_admins)
+    memory_watchdog.add_probe("Задачи планировщика", lambda: len(scheduler_service.scheduler.get_jobs()))
+    memory_watchdog.add_probe("Повторы напоминаний", scheduler_service.get_pending_retry_count)
+    memory_watchdog.add_probe("asyncio-задачи", lambda: len(asyncio.all_tasks()))
+    memory_watchdog.add_probe("Соединения пула БД (middleware)", get_cached_db_pool_size)
+    memory_watchdog.add_probe("Соединения Redis (middleware)", get_cached_redis_connections)
+    if isinstance(storage, MemoryStorage):
+        memory_watchdog.add_probe("Записи MemoryStorage", lambda: len(storage.storage))
+    if settings.ENABLE_MEMORY_WATCHDOG:
+        await memory_watchdog.start()
+    
+    webhook_mode = bool(settings.WEBHOOK_URL)
+    
+    # Выбор ведущей реплики: только она выполняет задачи планировщика,
+    # а в режиме long polling ещё и получает апдейты
+    leader_elector = None
+    if settings.ENABLE_LEADER_ELECTION:
+        async def on_demoted() -> None:
+            await scheduler_service.stop()
+            if not webhook_mode:
+                try:
+                    await dp.stop_polling()
+                except RuntimeError:
+                    pass
+        
+        leader_elector = LeaderElector(
+            db_pool=db_pool,
+            on_elected=scheduler_service.start,
+            on_demoted=on_demoted,
+        )
+    
+    # HTTP-эндпоинты живости и готовности для healthcheck и мониторинга
+    health_service = HealthService(
+        db_pool=db_pool,
+        redis=redis,
+        scheduler_service=scheduler_service,
+        loop_watchdog=loop_watchdog,
+        leader_elector=leader_elector,
+    )
+    dp.update.outer_middleware(ActivityMiddleware(health_service))
+    
+    def configure_webhook(app) -> None:
+        SimpleRequestHandler(
+            dispatcher=dp,
+            bot=bot,
+            secret_token=settings.WEBHOOK_SECRET or None,
+        ).register(app, path=settings.WEBHOOK_PATH)
+        setup_application(app, dp, bot=bot)
+    
+    if webhook_mode:
+        # Без HTTP-сервера webhook-режим невозможен: ошибку не глушим
+        await health_service.start(configure_app=configure_webhook)
+    elif settings.ENABLE_HEALTH_SERVER:
+        try:
+            await health_service.start()
+        except OSError as e:
+            logger.error("Не удалось запустить health-сервер: %s", e)
+    
+    if leader_elector is not None:
+        await leader_elector.start()
+    
     # Запускаем бота
     polling_retry_delay = 5
     ready_path = Path("/tmp/telegram-shift-bot-ready")
     try:
         ready_path.touch()
         logger.info("Бот запущен и готов к работе")
-        while True:
+        if webhook_mode:
+            await serve_webhook(bot, dp)
+        while not webhook_mode:
+            if leader_elector is not None and not leader_elector.is_leader:
+                logger.info("Резервная реплика: long polling начнётся после получения лидерства")
+                await leader_elector.wait_until_leader()
             try:
                 await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+                if leader_elector is not None and not leader_elector.is_leader:
+                    # Polling остановлен из-за потери лидерства: ждём его снова
+                    continue
                 break
             except TelegramNetworkError as e:
                 logger.warning(
@@ -198,11 +334,20 @@ async def main() -> None:
                 raise
     finally:
         ready_path.unlink(missing_ok=True)
+        if leader_elector is not None:
+            await leader_elector.stop()
+        await health_service.stop()
         # Останавливаем планировщик
         from src.services.service_registry import get_scheduler_service
         scheduler_service = get_scheduler_service()
         if scheduler_service:
             await scheduler_service.stop()
+            await scheduler_service.report_archive.close()
+        await memory_watchdog.stop()
+        await metrics_service.stop()
+        await stats_service.stop()
+        await report_image_service.stop()
+        await loop_watchdog.stop()
         
         # Закрываем соединения
         await close_db_pool()
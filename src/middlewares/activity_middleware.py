@@ -0,0 +1,29 @@
+"""
+Middleware для учёта времени последнего обработанного апдейта.
+"""
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+
+from src.services.health_service import HealthService
+
+
+class ActivityMiddleware(BaseMiddleware):
+    """
+    Отмечает в HealthService каждый полученный апдейт.
+    
+    Регистрируется как outer-middleware на уровне update, поэтому
+    учитываются все апдейты, в том числе без подходящего handler.
+    """
+    
+    def __init__(self, health_service: HealthService):
+        self.health_service = health_service
+    
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any]
+    ) -> Any:
+        self.health_service.mark_update()
+        return await handler(event, data)
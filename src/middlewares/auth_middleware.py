@@ -30,6 +30,7 @@ class AdminMiddleware(BaseMiddleware):
                 "/force_poll",
                 "/manual_close",
                 "/get_report",
+                "/export_reports",
                 "/generate_all_reports",
                 "/set_admin",
                 "/remove_admin",
@@ -37,6 +38,7 @@ class AdminMiddleware(BaseMiddleware):
                 "/backup_db",
                 "/test_screenshot",
                 "/cleanup_old_data",
+                "/profile",
             ]
 
             if command in admin_commands:
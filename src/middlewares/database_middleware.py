@@ -25,6 +25,19 @@ _cached_db_pool: Pool | None = None
 _cached_redis: Redis | None = None
 
 
+def get_cached_db_pool_size() -> int:
+    """Число соединений в закэшированном пуле PostgreSQL (для сторожа памяти)."""
+    return _cached_db_pool.get_size() if _cached_db_pool is not None else 0
+
+
+def get_cached_redis_connections() -> int:
+    """Число соединений закэшированного Redis клиента (для сторожа памяти)."""
+    if _cached_redis is None:
+        return 0
+    pool = _cached_redis.connection_pool
+    return len(pool._available_connections) + len(pool._in_use_connections)
+
+
 class DatabaseMiddleware(BaseMiddleware):
     """
     Middleware для предоставления репозиториев и сервисов в handlers.
@@ -2,7 +2,7 @@
 Репозиторий для работы с сотрудниками групп.
 """
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from asyncpg import Pool
 
@@ -167,6 +167,86 @@ class GroupMemberRepository:
                 )
                 return result == "UPDATE 1"
 
+    async def get_not_voted_by_polls(
+        self,
+        poll_ids: Sequence[str],
+        exclude_user_ids: Sequence[int] = (),
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Активные сотрудники групп, не голосовавшие в опросах, одним запросом.
+
+        Анти-join с user_votes по индексу (poll_id, user_id): непривязанный
+        к Telegram сотрудник всегда считается неотметившимся, сотрудники
+        из exclude_user_ids (администраторы) не попадают в список.
+
+        Returns:
+            Списки сотрудников по id опроса в порядке ФИО
+        """
+        if not poll_ids:
+            return {}
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT p.id::text AS poll_id, m.*
+                FROM daily_polls p
+                JOIN group_members m
+                    ON m.group_id = p.group_id
+                   AND m.is_active = true
+                WHERE p.id = ANY($1::uuid[])
+                  AND (m.telegram_user_id IS NULL OR m.telegram_user_id <> ALL($2::bigint[]))
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM user_votes v
+                      WHERE v.poll_id = p.id
+                        AND v.user_id = m.telegram_user_id
+                  )
+                ORDER BY p.id, m.full_name, m.id
+                """,
+                [str(poll_id) for poll_id in poll_ids],
+                list(exclude_user_ids),
+            )
+        not_voted: Dict[str, List[Dict[str, Any]]] = {str(poll_id): [] for poll_id in poll_ids}
+        for row in rows:
+            member = dict(row)
+            not_voted[member.pop("poll_id")].append(member)
+        return not_voted
+
+    async def sync_to_group(
+        self,
+        group_id: int,
+        telegram_user_id: int,
+        full_name: str,
+        username: Optional[str],
+        create_if_missing: bool,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Привязать, восстановить, перенести или создать карточку курьера.
+
+        Вся логика — в функции sync_group_member (миграция 021): один запрос,
+        одна транзакция и блокировка по telegram_user_id, поэтому вступление
+        в чат и голос того же курьера не создают дублей.
+
+        Returns:
+            Итоговая карточка или None, если create_if_missing=False и карточки нет.
+            member_changed — карточка изменена этим вызовом, member_created —
+            создана им (время изменения совпадает со временем транзакции).
+        """
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT m.*,
+                    m.updated_at = LOCALTIMESTAMP AS member_changed,
+                    m.created_at = LOCALTIMESTAMP AS member_created
+                FROM sync_group_member($1, $2, $3, $4, $5) m
+                """,
+                group_id,
+                telegram_user_id,
+                full_name,
+                username,
+                create_if_missing,
+            )
+            return dict(row) if row else None
+
     async def update_name(self, member_id: int, full_name: str) -> bool:
         async with self.pool.acquire() as conn:
             result = await conn.execute(
@@ -238,3 +318,207 @@ class GroupMemberRepository:
 
     async def delete(self, member_id: int) -> bool:
         return await self.set_active(member_id, False)
+
+    async def reconcile_import(
+        self,
+        records: Sequence[Tuple[int, Optional[int], Optional[str], str, Optional[int]]],
+        apply: bool,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Сверить список курьеров из файла с group_members одной транзакцией.
+
+        Строки (line_no, group_id, group_name, full_name, telegram_user_id)
+        загружаются во временную таблицу через COPY, дальше вся сверка —
+        несколько запросов над множествами, без запроса на каждую строку.
+        Карточка ищется по Telegram ID, затем по ФИО в группе. Найденные
+        карточки переносятся, переименовываются и восстанавливаются, для
+        остальных строк создаются новые карточки, а активные курьеры
+        импортируемых групп, которых нет в файле, отключаются.
+
+        Args:
+            records: Строки файла; group_id None — группа ищется по group_name
+            apply: False — только посчитать изменения, ничего не меняя
+
+        Returns:
+            План по строкам файла (plan), повторы одной карточки (duplicates),
+            строки с неизвестной группой (unknown_groups) и отключённые
+            курьеры (deactivated)
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                # Импорты не должны пересекаться друг с другом
+                await conn.execute("SELECT pg_advisory_xact_lock(hashtext('group_members_import'))")
+                await conn.execute(
+                    """
+                    CREATE TEMP TABLE member_import (
+                        line_no INTEGER NOT NULL,
+                        group_id INTEGER,
+                        group_name TEXT,
+                        full_name TEXT NOT NULL,
+                        telegram_user_id BIGINT
+                    ) ON COMMIT DROP
+                    """
+                )
+                await conn.copy_records_to_table(
+                    "member_import",
+                    records=records,
+                    columns=["line_no", "group_id", "group_name", "full_name", "telegram_user_id"],
+                )
+                await conn.execute(
+                    """
+                    UPDATE member_import i
+                    SET group_id = g.id
+                    FROM groups g
+                    WHERE i.group_id IS NULL
+                      AND lower(g.name) = lower(i.group_name)
+                    """
+                )
+                unknown_groups = await conn.fetch(
+                    """
+                    SELECT line_no, group_name, full_name
+                    FROM member_import
+                    WHERE group_id IS NULL
+                    ORDER BY line_no
+                    """
+                )
+                # Те же блокировки, что и при привязке голосом (bind_telegram_user)
+                await conn.execute(
+                    """
+                    SELECT pg_advisory_xact_lock(telegram_user_id)
+                    FROM (
+                        SELECT DISTINCT telegram_user_id
+                        FROM member_import
+                        WHERE telegram_user_id IS NOT NULL
+                        ORDER BY telegram_user_id
+                    ) ids
+                    """
+                )
+                await conn.execute(
+                    """
+                    CREATE TEMP TABLE member_import_plan ON COMMIT DROP AS
+                    WITH matched AS (
+                        SELECT
+                            i.line_no,
+                            i.group_id,
+                            i.full_name,
+                            i.telegram_user_id,
+                            COALESCE(by_tg.id, by_name.id) AS member_id
+                        FROM member_import i
+                        LEFT JOIN group_members by_tg
+                            ON by_tg.telegram_user_id = i.telegram_user_id
+                        LEFT JOIN group_members by_name
+                            ON by_tg.id IS NULL
+                           AND by_name.group_id = i.group_id
+                           AND by_name.full_name = i.full_name
+                        WHERE i.group_id IS NOT NULL
+                    )
+                    SELECT DISTINCT ON (COALESCE(m.member_id, -m.line_no))
+                        m.line_no,
+                        m.group_id,
+                        m.full_name,
+                        m.telegram_user_id,
+                        m.member_id,
+                        gm.group_id AS old_group_id,
+                        gm.full_name AS old_name,
+                        gm.is_active AS old_active,
+                        gm.telegram_user_id AS old_telegram_user_id,
+                        CASE
+                            WHEN occupant.id IS NOT NULL AND occupant.id <> m.member_id THEN 'name_taken'
+                            WHEN gm.telegram_user_id <> m.telegram_user_id THEN 'other_account'
+                        END AS conflict
+                    FROM matched m
+                    LEFT JOIN group_members gm ON gm.id = m.member_id
+                    LEFT JOIN group_members occupant
+                        ON m.member_id IS NOT NULL
+                       AND occupant.group_id = m.group_id
+                       AND occupant.full_name = m.full_name
+                    ORDER BY COALESCE(m.member_id, -m.line_no), m.line_no
+                    """
+                )
+                plan = await conn.fetch(
+                    """
+                    SELECT p.*, g.name AS group_name, og.name AS old_group_name
+                    FROM member_import_plan p
+                    JOIN groups g ON g.id = p.group_id
+                    LEFT JOIN groups og ON og.id = p.old_group_id
+                    ORDER BY p.line_no
+                    """
+                )
+                duplicates = await conn.fetch(
+                    """
+                    SELECT i.line_no, g.name AS group_name, i.full_name
+                    FROM member_import i
+                    JOIN groups g ON g.id = i.group_id
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM member_import_plan p WHERE p.line_no = i.line_no
+                    )
+                    ORDER BY i.line_no
+                    """
+                )
+
+                missing_condition = """
+                    m.is_active = true
+                    AND m.group_id IN (SELECT group_id FROM member_import WHERE group_id IS NOT NULL)
+                    AND NOT EXISTS (
+                        SELECT 1 FROM member_import_plan p WHERE p.member_id = m.id
+                    )
+                """
+                if not apply:
+                    deactivated = await conn.fetch(
+                        f"""
+                        SELECT m.id, m.full_name, g.name AS group_name
+                        FROM group_members m
+                        JOIN groups g ON g.id = m.group_id
+                        WHERE {missing_condition}
+                        ORDER BY g.name, m.full_name
+                        """
+                    )
+                else:
+                    await conn.execute(
+                        """
+                        UPDATE group_members m
+                        SET group_id = p.group_id,
+                            full_name = p.full_name,
+                            is_active = true,
+                            telegram_user_id = COALESCE(p.telegram_user_id, m.telegram_user_id),
+                            updated_at = CURRENT_TIMESTAMP
+                        FROM member_import_plan p
+                        WHERE m.id = p.member_id
+                          AND p.conflict IS NULL
+                          AND (
+                              m.group_id <> p.group_id
+                              OR m.full_name <> p.full_name
+                              OR m.is_active IS NOT TRUE
+                              OR (p.telegram_user_id IS NOT NULL AND m.telegram_user_id IS NULL)
+                          )
+                        """
+                    )
+                    deactivated = await conn.fetch(
+                        f"""
+                        UPDATE group_members m
+                        SET is_active = false,
+                            updated_at = CURRENT_TIMESTAMP
+                        FROM groups g
+                        WHERE g.id = m.group_id
+                          AND {missing_condition}
+                        RETURNING m.id, m.full_name, g.name AS group_name
+                        """
+                    )
+                    # Новые карточки вставляются после отключения, чтобы не попасть под него
+                    await conn.execute(
+                        """
+                        INSERT INTO group_members (group_id, full_name, telegram_user_id)
+                        SELECT group_id, full_name, telegram_user_id
+                        FROM member_import_plan
+                        WHERE member_id IS NULL
+                        ORDER BY line_no
+                        """
+                    )
+                    deactivated = sorted(deactivated, key=lambda row: (row["group_name"], row["full_name"]))
+
+                return {
+                    "plan": [dict(row) for row in plan],
+                    "duplicates": [dict(row) for row in duplicates],
+                    "unknown_groups": [dict(row) for row in unknown_groups],
+                    "deactivated": [dict(row) for row in deactivated],
+                }
@@ -3,11 +3,13 @@
 """
 import logging
 from datetime import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 import asyncpg
 from asyncpg import Pool, Connection
 import json
 
+from src.repositories.pagination import KeysetPage, PageCursor, fetch_keyset_page
+
 logger = logging.getLogger(__name__)
 
 
@@ -123,6 +125,25 @@ class GroupRepository:
             )
             return _normalize_group_dict(dict(row)) if row else None
     
+    async def get_by_ids(self, group_ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Получить группы по списку ID одним запросом.
+        
+        Args:
+            group_ids: ID групп
+            
+        Returns:
+            Список словарей с данными найденных групп
+        """
+        if not group_ids:
+            return []
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT * FROM groups WHERE id = ANY($1::int[])",
+                list(group_ids),
+            )
+            return [_normalize_group_dict(dict(row)) for row in rows]
+    
     async def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """
         Получить группу по названию.
@@ -179,6 +200,26 @@ class GroupRepository:
             # Преобразуем строки в словари и обрабатываем JSONB поля
             return [_normalize_group_dict(dict(row)) for row in rows]
     
+    async def get_page(self, limit: int = 10, cursor: Optional[PageCursor] = None) -> KeysetPage:
+        """
+        Страница групп по названию.
+        
+        Args:
+            limit: Размер страницы
+            cursor: Курсор страницы или None для первой
+        """
+        async with self.pool.acquire() as conn:
+            return await fetch_keyset_page(
+                conn,
+                table="groups",
+                where="TRUE",
+                key=("name", "id"),
+                descending=False,
+                limit=limit,
+                cursor=cursor,
+                normalize=_normalize_group_dict,
+            )
+    
     async def update(
         self,
         group_id: int,
@@ -0,0 +1,132 @@
+"""
+Keyset-пагинация списков в админ-панели.
+
+Страница выбирается не через OFFSET, а условием «ключ сортировки больше
+(или меньше) ключа граничной записи», поэтому любая страница стоит
+столько же, сколько первая: индекс по ключу сразу находит начало.
+В callback_data хранится только id граничной записи и направление —
+это укладывается в лимит Telegram в 64 байта; ключ сортировки граничной
+записи дочитывается по первичному ключу.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from asyncpg import Connection
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """Граничная запись страницы и направление перехода."""
+
+    anchor_id: int
+    forward: bool = True
+
+    def encode(self) -> str:
+        """Компактное представление для callback_data: a<id> — дальше, b<id> — назад."""
+        return f"{'a' if self.forward else 'b'}{self.anchor_id}"
+
+    @classmethod
+    def decode(cls, value: Optional[str]) -> Optional["PageCursor"]:
+        """Разобрать курсор из callback_data (пустое значение — первая страница)."""
+        if not value or value[0] not in "ab":
+            return None
+        try:
+            return cls(anchor_id=int(value[1:]), forward=value[0] == "a")
+        except ValueError:
+            return None
+
+
+@dataclass
+class KeysetPage:
+    """Страница списка с курсорами соседних страниц."""
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[PageCursor] = None
+    prev_cursor: Optional[PageCursor] = None
+
+
+async def fetch_keyset_page(
+    conn: Connection,
+    *,
+    table: str,
+    where: str,
+    key: Sequence[str],
+    descending: bool,
+    limit: int,
+    cursor: Optional[PageCursor],
+    normalize: Callable[[Dict[str, Any]], Dict[str, Any]] = dict,
+) -> KeysetPage:
+    """
+    Прочитать страницу по ключу сортировки.
+
+    Args:
+        conn: Соединение PostgreSQL
+        table: Таблица
+        where: Постоянное условие списка (без параметров)
+        key: Выражения ключа сортировки; последним должен быть уникальный id
+        descending: Список отсортирован по убыванию ключа
+        limit: Размер страницы
+        cursor: Курсор страницы или None для первой
+        normalize: Преобразование строки в словарь
+
+    Returns:
+        Страница; если граничная запись пропала, возвращается первая страница
+    """
+    anchor = None
+    if cursor is not None:
+        anchor = await conn.fetchrow(
+            f"SELECT {', '.join(key)} FROM {table} WHERE id = $1",
+            cursor.anchor_id,
+        )
+        if anchor is None:
+            # Граничную запись удалили — показываем первую страницу
+            cursor = None
+
+    forward = cursor is None or cursor.forward
+    # Назад читаем от граничной записи в обратную сторону и затем разворачиваем
+    scan_descending = descending == forward
+    order = ", ".join(f"{expr} {'DESC' if scan_descending else 'ASC'}" for expr in key)
+
+    if anchor is not None and cursor is not None:
+        placeholders = ", ".join(f"${index}" for index in range(1, len(key) + 1))
+        rows = await conn.fetch(
+            f"""
+            SELECT * FROM {table}
+            WHERE {where} AND ({', '.join(key)}) {'<' if scan_descending else '>'} ({placeholders})
+            ORDER BY {order}
+            LIMIT ${len(key) + 1}
+            """,
+            *anchor.values(),
+            limit + 1,
+        )
+    else:
+        rows = await conn.fetch(
+            f"SELECT * FROM {table} WHERE {where} ORDER BY {order} LIMIT $1",
+            limit + 1,
+        )
+
+    items = [normalize(dict(row)) for row in rows[:limit]]
+    has_more = len(rows) > limit
+    if not forward:
+        items.reverse()
+    if not items:
+        if cursor is not None:
+            # За граничной записью ничего не осталось (записи удалили) — начинаем сначала
+            return await fetch_keyset_page(
+                conn, table=table, where=where, key=key, descending=descending,
+                limit=limit, cursor=None, normalize=normalize,
+            )
+        return KeysetPage()
+
+    first_id, last_id = items[0]["id"], items[-1]["id"]
+    if forward:
+        return KeysetPage(
+            items=items,
+            next_cursor=PageCursor(last_id, True) if has_more else None,
+            prev_cursor=PageCursor(first_id, False) if cursor is not None else None,
+        )
+    return KeysetPage(
+        items=items,
+        next_cursor=PageCursor(last_id, True),
+        prev_cursor=PageCursor(first_id, False) if has_more else None,
+    )
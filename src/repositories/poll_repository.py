@@ -2,7 +2,7 @@
 Репозиторий для работы с опросами в PostgreSQL.
 """
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Set, Tuple
 from datetime import date, datetime
 from asyncpg import Pool
 import json
@@ -104,6 +104,37 @@ class PollRepository:
             )
             return _normalize_poll_dict(dict(row)) if row else None
     
+    async def get_active_by_group_dates(
+        self,
+        keys: Sequence[Tuple[int, date]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Активные опросы по парам (group_id, poll_date) одним запросом.
+        
+        Args:
+            keys: Пары (ID группы, дата опроса)
+            
+        Returns:
+            Список словарей с данными найденных активных опросов
+            (более поздние опросы группы на дату идут последними)
+        """
+        if not keys:
+            return []
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT p.*
+                FROM daily_polls p
+                JOIN unnest($1::int[], $2::date[]) AS k(group_id, poll_date)
+                  ON p.group_id = k.group_id AND p.poll_date = k.poll_date
+                WHERE p.status = 'active'
+                ORDER BY p.created_at, p.id
+                """,
+                [group_id for group_id, _ in keys],
+                [poll_date for _, poll_date in keys],
+            )
+            return [_normalize_poll_dict(dict(row)) for row in rows]
+
     async def get_by_group_and_date(
         self,
         group_id: int,
@@ -174,6 +205,41 @@ class PollRepository:
             )
             return _normalize_poll_dict(dict(row)) if row else None
     
+    async def resolve_telegram_poll(self, telegram_poll_id: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Определить вид опроса по Telegram poll id одним запросом.
+
+        Сначала ищется ежедневный опрос, затем опрос дежурных и устаревший
+        опрос. COALESCE не вычисляет подзапросы после первого найденного,
+        поэтому голос по ежедневному опросу стоит одного поиска по индексу.
+
+        Returns:
+            Вид опроса (daily, duty, obsolete или unknown) и строка
+            daily_polls для ежедневного опроса
+        """
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT
+                    COALESCE(
+                        CASE WHEN p.id IS NOT NULL THEN 'daily' END,
+                        (SELECT 'duty' FROM duty_poll_dispatches WHERE telegram_poll_id = $1 LIMIT 1),
+                        (SELECT 'obsolete' FROM obsolete_telegram_polls WHERE telegram_poll_id = $1),
+                        'unknown'
+                    ) AS poll_kind,
+                    p.*
+                FROM (SELECT 1) AS lookup
+                LEFT JOIN daily_polls p ON p.telegram_poll_id = $1
+                LIMIT 1
+                """,
+                telegram_poll_id,
+            )
+            poll = dict(row)
+            kind = poll.pop("poll_kind")
+            if kind != "daily":
+                return kind, None
+            return kind, _normalize_poll_dict(poll)
+
     async def get_active_polls(self, group_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Получить все активные опросы.
@@ -515,6 +581,60 @@ class PollRepository:
             )
             return result == "DELETE 1"
 
+    async def claim_reminder_dispatches(
+        self,
+        claims: Sequence[Tuple[str, int, bool]],
+    ) -> Set[Tuple[str, int, bool]]:
+        """
+        Забрать в обработку напоминания сразу по многим опросам одним запросом.
+
+        Args:
+            claims: Кортежи (poll_id, reminder_hour, is_night)
+
+        Returns:
+            Кортежи, которые забрал текущий процесс; уже отправленные
+            или забранные другим процессом в результат не попадают
+        """
+        if not claims:
+            return set()
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                INSERT INTO poll_reminder_dispatches (poll_id, reminder_hour, is_night)
+                SELECT * FROM unnest($1::uuid[], $2::int[], $3::boolean[])
+                ON CONFLICT (poll_id, reminder_hour, is_night) DO NOTHING
+                RETURNING poll_id::text AS poll_id, reminder_hour, is_night
+                """,
+                [str(poll_id) for poll_id, _, _ in claims],
+                [reminder_hour for _, reminder_hour, _ in claims],
+                [is_night for _, _, is_night in claims],
+            )
+            return {(row["poll_id"], row["reminder_hour"], row["is_night"]) for row in rows}
+
+    async def release_reminder_dispatches(self, claims: Sequence[Tuple[str, int, bool]]) -> int:
+        """
+        Освободить claims напоминаний, отправка которых сорвалась.
+
+        Returns:
+            Количество освобождённых записей
+        """
+        if not claims:
+            return 0
+        async with self.pool.acquire() as conn:
+            result = await conn.execute(
+                """
+                DELETE FROM poll_reminder_dispatches r
+                USING unnest($1::uuid[], $2::int[], $3::boolean[]) AS c(poll_id, reminder_hour, is_night)
+                WHERE r.poll_id = c.poll_id
+                  AND r.reminder_hour = c.reminder_hour
+                  AND r.is_night = c.is_night
+                """,
+                [str(poll_id) for poll_id, _, _ in claims],
+                [reminder_hour for _, reminder_hour, _ in claims],
+                [is_night for _, _, is_night in claims],
+            )
+            return int(result.split()[-1])
+
     async def claim_for_closing(self, poll_id: str) -> bool:
         """
         Атомарно забрать активный опрос в обработку закрытия.
@@ -568,6 +688,52 @@ class PollRepository:
             )
             return row is not None
 
+    async def has_pending_reminders(
+        self,
+        poll_date: date,
+        reminder_hour: int,
+        is_night: bool,
+    ) -> bool:
+        """Есть ли активные опросы на дату, по которым напоминание ещё не отправлялось."""
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval(
+                """
+                SELECT EXISTS (
+                    SELECT 1
+                    FROM daily_polls p
+                    JOIN groups g ON g.id = p.group_id
+                    WHERE p.status = 'active'
+                      AND p.poll_date = $1
+                      AND COALESCE(g.is_night, false) = $3
+                      AND NOT EXISTS (
+                          SELECT 1
+                          FROM poll_reminder_dispatches r
+                          WHERE r.poll_id = p.id
+                            AND r.reminder_hour = $2
+                            AND r.is_night = $3
+                      )
+                )
+                """,
+                poll_date,
+                reminder_hour,
+                is_night,
+            )
+
+    async def get_sent_reminders(self, poll_ids: Sequence[str]) -> Set[Tuple[str, int, bool]]:
+        """Отправленные напоминания по опросам: кортежи (poll_id, reminder_hour, is_night)."""
+        if not poll_ids:
+            return set()
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT poll_id::text AS poll_id, reminder_hour, is_night
+                FROM poll_reminder_dispatches
+                WHERE poll_id = ANY($1::uuid[])
+                """,
+                [str(poll_id) for poll_id in poll_ids],
+            )
+            return {(row["poll_id"], row["reminder_hour"], row["is_night"]) for row in rows}
+
     async def mark_reminder_sent(
         self,
         poll_id: str,
@@ -0,0 +1,185 @@
+"""Перенос старой истории опросов в архив и очистка служебных таблиц."""
+
+from datetime import date, datetime
+from typing import Dict, List, Sequence, Union
+
+from asyncpg import Pool
+
+# Таблицы, размер которых показывается в отчете об очистке
+RETENTION_TABLES = (
+    "daily_polls",
+    "poll_options",
+    "user_votes",
+    "poll_reminder_dispatches",
+    "obsolete_telegram_polls",
+    "duty_poll_dispatches",
+    "daily_polls_archive",
+)
+
+# Служебные записи, которые просто удаляются по сроку: ключ и условие устаревания
+EXPIRED_ROWS = {
+    "poll_reminder_dispatches": ("id", "sent_at < $1"),
+    "obsolete_telegram_polls": ("telegram_poll_id", "retired_at < $1"),
+    "duty_poll_dispatches": ("id", "status = 'closed' AND poll_date < $1::date"),
+}
+
+
+class RetentionRepository:
+    """Пакетные операции очистки: каждый пакет — отдельная короткая транзакция."""
+
+    def __init__(self, pool: Pool):
+        self.pool = pool
+
+    async def archive_closed_polls(self, before: date, limit: int) -> Dict[str, int]:
+        """
+        Перенести пакет закрытых опросов старше before в daily_polls_archive.
+
+        Опрос, его варианты и голоса сворачиваются в одну строку архива,
+        затем опрос удаляется; poll_options, user_votes и
+        poll_reminder_dispatches удаляются каскадом. Строки, занятые другой
+        транзакцией, пропускаются (SKIP LOCKED) и попадут в следующий запуск.
+
+        Returns:
+            Число перенесённых опросов, удалённых строк по таблицам
+            и объём удалённых строк в байтах
+        """
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                WITH batch AS (
+                    SELECT id
+                    FROM daily_polls
+                    WHERE status = 'closed' AND poll_date < $1
+                    ORDER BY poll_date
+                    LIMIT $2
+                    FOR UPDATE SKIP LOCKED
+                ),
+                archived AS (
+                    INSERT INTO daily_polls_archive (
+                        id, group_id, group_name, poll_date, telegram_poll_id, status,
+                        results, options, votes, created_at, closed_at
+                    )
+                    SELECT
+                        p.id, p.group_id, g.name, p.poll_date, p.telegram_poll_id, p.status,
+                        COALESCE(p.results, '{}'::jsonb),
+                        COALESCE((
+                            SELECT jsonb_agg(
+                                jsonb_build_object(
+                                    'index', o.option_index,
+                                    'text', o.option_text,
+                                    'count', o.current_count
+                                )
+                                ORDER BY o.option_index
+                            )
+                            FROM poll_options o
+                            WHERE o.poll_id = p.id
+                        ), '[]'::jsonb),
+                        COALESCE((
+                            SELECT jsonb_agg(
+                                jsonb_build_object(
+                                    'user_id', v.user_id,
+                                    'user_name', v.user_name,
+                                    'full_name', v.full_name,
+                                    'option_index', o.option_index,
+                                    'voted_at', v.voted_at
+                                )
+                                ORDER BY v.voted_at, v.id
+                            )
+                            FROM user_votes v
+                            LEFT JOIN poll_options o ON o.id = v.option_id
+                            WHERE v.poll_id = p.id
+                        ), '[]'::jsonb),
+                        p.created_at, p.closed_at
+                    FROM daily_polls p
+                    JOIN batch b ON b.id = p.id
+                    LEFT JOIN groups g ON g.id = p.group_id
+                    ON CONFLICT (id) DO NOTHING
+                    RETURNING pg_column_size(daily_polls_archive.*) AS row_bytes
+                ),
+                options AS (
+                    SELECT COUNT(*) AS row_count, COALESCE(SUM(pg_column_size(o.*)), 0) AS row_bytes
+                    FROM poll_options o JOIN batch b ON o.poll_id = b.id
+                ),
+                votes AS (
+                    SELECT COUNT(*) AS row_count, COALESCE(SUM(pg_column_size(v.*)), 0) AS row_bytes
+                    FROM user_votes v JOIN batch b ON v.poll_id = b.id
+                ),
+                reminders AS (
+                    SELECT COUNT(*) AS row_count, COALESCE(SUM(pg_column_size(r.*)), 0) AS row_bytes
+                    FROM poll_reminder_dispatches r JOIN batch b ON r.poll_id = b.id
+                ),
+                deleted AS (
+                    DELETE FROM daily_polls p
+                    USING batch b
+                    WHERE p.id = b.id
+                    RETURNING pg_column_size(p.*) AS row_bytes
+                )
+                SELECT
+                    (SELECT COUNT(*) FROM deleted) AS daily_polls,
+                    options.row_count AS poll_options,
+                    votes.row_count AS user_votes,
+                    reminders.row_count AS poll_reminder_dispatches,
+                    (SELECT COALESCE(SUM(row_bytes), 0) FROM deleted)
+                        + options.row_bytes + votes.row_bytes + reminders.row_bytes AS freed_bytes,
+                    (SELECT COALESCE(SUM(row_bytes), 0) FROM archived) AS archived_bytes
+                FROM options, votes, reminders
+                """,
+                before,
+                limit,
+            )
+            return {key: int(value or 0) for key, value in dict(row).items()}
+
+    async def delete_expired(self, table: str, before: Union[date, datetime], limit: int) -> Dict[str, int]:
+        """
+        Удалить пакет устаревших служебных записей таблицы из EXPIRED_ROWS.
+
+        Returns:
+            Число удалённых строк и их объём в байтах
+        """
+        key, condition = EXPIRED_ROWS[table]
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                f"""
+                WITH batch AS (
+                    SELECT {key}
+                    FROM {table}
+                    WHERE {condition}
+                    LIMIT $2
+                    FOR UPDATE SKIP LOCKED
+                ),
+                deleted AS (
+                    DELETE FROM {table} t
+                    USING batch b
+                    WHERE t.{key} = b.{key}
+                    RETURNING pg_column_size(t.*) AS row_bytes
+                )
+                SELECT COUNT(*) AS rows, COALESCE(SUM(row_bytes), 0) AS freed_bytes
+                FROM deleted
+                """,
+                before,
+                limit,
+            )
+            return {key: int(value or 0) for key, value in dict(row).items()}
+
+    async def get_table_sizes(self, tables: Sequence[str] = RETENTION_TABLES) -> Dict[str, int]:
+        """Размер таблиц на диске вместе с индексами и TOAST, в байтах."""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT name, COALESCE(pg_total_relation_size(to_regclass(name)), 0) AS size
+                FROM unnest($1::text[]) AS name
+                """,
+                list(tables),
+            )
+            return {row["name"]: int(row["size"]) for row in rows}
+
+    async def vacuum(self, tables: List[str]) -> None:
+        """
+        VACUUM (ANALYZE) таблиц после очистки.
+
+        Освобождённое место становится доступно для новых строк, а пустой
+        хвост файла возвращается системе. VACUUM не блокирует чтение и запись.
+        """
+        async with self.pool.acquire() as conn:
+            for table in tables:
+                await conn.execute(f"VACUUM (ANALYZE) {table}")
@@ -0,0 +1,51 @@
+"""Хранение разовых задач планировщика между перезапусками."""
+
+from typing import Any, Dict, List, Optional
+
+from asyncpg import Pool
+
+
+class SchedulerJobRepository:
+    """Репозиторий сериализованных задач APScheduler."""
+
+    def __init__(self, pool: Pool):
+        self.pool = pool
+
+    async def get_all(self) -> List[Dict[str, Any]]:
+        """Все сохранённые задачи в порядке ближайшего запуска."""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, next_run_time, job_state
+                FROM scheduler_jobs
+                ORDER BY next_run_time NULLS LAST, id
+                """
+            )
+            return [dict(row) for row in rows]
+
+    async def upsert(self, job_id: str, next_run_time: Optional[float], job_state: bytes) -> None:
+        """Сохранить задачу или обновить время её следующего запуска."""
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO scheduler_jobs (id, next_run_time, job_state)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (id) DO UPDATE
+                SET next_run_time = EXCLUDED.next_run_time,
+                    job_state = EXCLUDED.job_state,
+                    updated_at = NOW()
+                """,
+                job_id,
+                next_run_time,
+                job_state,
+            )
+
+    async def delete(self, job_id: str) -> None:
+        """Удалить задачу."""
+        async with self.pool.acquire() as conn:
+            await conn.execute("DELETE FROM scheduler_jobs WHERE id = $1", job_id)
+
+    async def delete_all(self) -> None:
+        """Удалить все задачи."""
+        async with self.pool.acquire() as conn:
+            await conn.execute("DELETE FROM scheduler_jobs")
@@ -0,0 +1,100 @@
+"""Агрегаты для статистики админ-панели."""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from asyncpg import Pool
+
+
+class StatsRepository:
+    """Счётчики групп, опросов и голосов, посчитанные в PostgreSQL."""
+
+    def __init__(self, pool: Pool):
+        self.pool = pool
+
+    async def get_counts(self, today: date) -> Dict[str, int]:
+        """Счётчики групп, опросов и пользователей одним запросом."""
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT
+                    g.total_groups,
+                    g.active_groups,
+                    g.day_groups,
+                    g.night_groups,
+                    g.groups_with_slots,
+                    p.active_polls,
+                    p.active_today,
+                    p.active_tomorrow,
+                    p.today_polls,
+                    p.today_closed,
+                    u.verified_users,
+                    u.unverified_users
+                FROM (
+                    SELECT
+                        COUNT(*) AS total_groups,
+                        COUNT(*) FILTER (WHERE is_active) AS active_groups,
+                        COUNT(*) FILTER (WHERE NOT COALESCE(is_night, FALSE)) AS day_groups,
+                        COUNT(*) FILTER (WHERE COALESCE(is_night, FALSE)) AS night_groups,
+                        COUNT(*) FILTER (
+                            WHERE jsonb_typeof(settings->'slots') = 'array'
+                              AND jsonb_array_length(settings->'slots') > 0
+                        ) AS groups_with_slots
+                    FROM groups
+                ) g
+                CROSS JOIN (
+                    SELECT
+                        COUNT(*) FILTER (WHERE status = 'active') AS active_polls,
+                        COUNT(*) FILTER (WHERE status = 'active' AND poll_date = $1) AS active_today,
+                        COUNT(*) FILTER (WHERE status = 'active' AND poll_date = $2) AS active_tomorrow,
+                        COUNT(*) FILTER (WHERE poll_date = $1) AS today_polls,
+                        COUNT(*) FILTER (WHERE poll_date = $1 AND status = 'closed') AS today_closed
+                    FROM daily_polls
+                    WHERE status = 'active' OR poll_date = $1
+                ) p
+                CROSS JOIN (
+                    SELECT
+                        COUNT(*) FILTER (WHERE is_verified = true) AS verified_users,
+                        COUNT(*) FILTER (WHERE is_verified = false) AS unverified_users
+                    FROM users
+                ) u
+                """,
+                today,
+                today + timedelta(days=1),
+            )
+            return {key: int(value or 0) for key, value in dict(row).items()}
+
+    async def get_votes_by_day(self, since: date) -> List[Dict[str, Any]]:
+        """Голоса и проголосовавшие по дням начиная с since."""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT
+                    voted_at::date AS day,
+                    COUNT(*) AS votes,
+                    COUNT(DISTINCT user_id) AS voters
+                FROM user_votes
+                WHERE voted_at >= $1::date
+                GROUP BY voted_at::date
+                ORDER BY day
+                """,
+                since,
+            )
+            return [dict(row) for row in rows]
+
+    async def get_close_times(self) -> List[Dict[str, Any]]:
+        """Число активных групп по типу и времени закрытия опроса."""
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT
+                    COALESCE(is_night, FALSE) AS is_night,
+                    poll_close_time,
+                    COUNT(*) AS groups
+                FROM groups
+                WHERE is_active
+                GROUP BY 1, 2
+                ORDER BY 1, 2
+                """
+            )
+            return [dict(row) for row in rows]
@@ -5,8 +5,14 @@ import logging
 from typing import List, Optional, Dict, Any
 from asyncpg import Pool
 
+from src.repositories.pagination import KeysetPage, PageCursor, fetch_keyset_page
+
 logger = logging.getLogger(__name__)
 
+# Ключи сортировки списков; под них есть частичные индексы (migrations/018)
+VERIFIED_USERS_KEY = ("COALESCE(first_name, '')", "COALESCE(last_name, '')", "id")
+UNVERIFIED_USERS_KEY = ("COALESCE(created_at, 'epoch'::timestamp)", "id")
+
 
 class UserRepository:
     """
@@ -119,7 +125,7 @@ class UserRepository:
                 """
                 SELECT * FROM users
                 WHERE is_verified = true
-                ORDER BY first_name, last_name
+                ORDER BY COALESCE(first_name, ''), COALESCE(last_name, ''), id
                 LIMIT $1 OFFSET $2
                 """,
                 limit,
@@ -143,7 +149,7 @@ class UserRepository:
                 """
                 SELECT * FROM users
                 WHERE is_verified = false
-                ORDER BY created_at DESC
+                ORDER BY COALESCE(created_at, 'epoch'::timestamp) DESC, id DESC
                 LIMIT $1 OFFSET $2
                 """,
                 limit,
@@ -151,6 +157,44 @@ class UserRepository:
             )
             return [dict(row) for row in rows]
     
+    async def get_verified_page(self, limit: int = 10, cursor: Optional[PageCursor] = None) -> KeysetPage:
+        """
+        Страница верифицированных пользователей (по имени и фамилии).
+        
+        Args:
+            limit: Размер страницы
+            cursor: Курсор страницы или None для первой
+        """
+        async with self.pool.acquire() as conn:
+            return await fetch_keyset_page(
+                conn,
+                table="users",
+                where="is_verified = true",
+                key=VERIFIED_USERS_KEY,
+                descending=False,
+                limit=limit,
+                cursor=cursor,
+            )
+    
+    async def get_unverified_page(self, limit: int = 10, cursor: Optional[PageCursor] = None) -> KeysetPage:
+        """
+        Страница неверифицированных пользователей (сначала новые).
+        
+        Args:
+            limit: Размер страницы
+            cursor: Курсор страницы или None для первой
+        """
+        async with self.pool.acquire() as conn:
+            return await fetch_keyset_page(
+                conn,
+                table="users",
+                where="is_verified = false",
+                key=UNVERIFIED_USERS_KEY,
+                descending=True,
+                limit=limit,
+                cursor=cursor,
+            )
+    
     async def verify_user(
         self,
         user_id: int,
@@ -5,7 +5,32 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from asyncpg import Pool
 
+from config.settings import settings
 from src.repositories.group_member_repository import GroupMemberRepository
+from src.services.member_import import MemberImportResult, build_import_result, parse_member_import
+
+
+def build_member_name_maps(
+    members: List[Dict[str, Any]],
+) -> Tuple[Dict[int, str], Dict[int, str]]:
+    """Имена сотрудников по id карточки и по telegram_user_id."""
+    by_member_id: Dict[int, str] = {}
+    by_user_id: Dict[int, str] = {}
+
+    for member in members:
+        full_name = str(member.get("full_name") or "").strip()
+        if not full_name:
+            continue
+
+        member_id = member.get("id")
+        if member_id is not None:
+            by_member_id[int(member_id)] = full_name
+
+        telegram_user_id = member.get("telegram_user_id")
+        if telegram_user_id is not None:
+            by_user_id[int(telegram_user_id)] = full_name
+
+    return by_member_id, by_user_id
 
 
 class GroupMemberService:
@@ -25,23 +50,16 @@ class GroupMemberService:
         group_id: int,
     ) -> Tuple[Dict[int, str], Dict[int, str]]:
         members = await self.get_group_members(group_id=group_id, active_only=True)
-        by_member_id: Dict[int, str] = {}
-        by_user_id: Dict[int, str] = {}
-
-        for member in members:
-            full_name = str(member.get("full_name") or "").strip()
-            if not full_name:
-                continue
+        return build_member_name_maps(members)
 
-            member_id = member.get("id")
-            if member_id is not None:
-                by_member_id[int(member_id)] = full_name
+    async def get_not_voted_members(self, poll_id: str) -> List[Dict[str, Any]]:
+        """Сотрудники группы опроса, которые ещё не отметились (без администраторов)."""
+        not_voted = await self.get_not_voted_members_for_polls([poll_id])
+        return not_voted[str(poll_id)]
 
-            telegram_user_id = member.get("telegram_user_id")
-            if telegram_user_id is not None:
-                by_user_id[int(telegram_user_id)] = full_name
-
-        return by_member_id, by_user_id
+    async def get_not_voted_members_for_polls(self, poll_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Неотметившиеся сразу по нескольким опросам — для напоминаний всем группам."""
+        return await self.repository.get_not_voted_by_polls(poll_ids, exclude_user_ids=settings.ADMIN_IDS)
 
     def resolve_voter_display_name(
         self,
@@ -71,6 +89,30 @@ class GroupMemberService:
     async def move_member(self, member_id: int, group_id: int) -> bool:
         return await self.repository.move_to_group(member_id=member_id, group_id=group_id)
 
+    async def import_members(
+        self,
+        text: str,
+        group_id: Optional[int] = None,
+        apply: bool = False,
+    ) -> MemberImportResult:
+        """
+        Сверить файл импорта с карточками курьеров и при apply применить изменения.
+
+        Args:
+            text: Содержимое файла (см. src/services/member_import.py)
+            group_id: Группа импорта; None — группа указана в первом столбце файла
+            apply: False — только показать, что изменится
+        """
+        rows, skipped = parse_member_import(text, with_group=group_id is None)
+        diff: Dict[str, List[Dict[str, Any]]] = {}
+        if rows:
+            records = [
+                (row.line_no, group_id, row.group_name, row.full_name, row.telegram_user_id)
+                for row in rows
+            ]
+            diff = await self.repository.reconcile_import(records, apply=apply)
+        return build_import_result(diff, skipped, total_rows=len(rows) + len(skipped), applied=apply)
+
     async def deactivate_member_in_group(
         self,
         group_id: int,
@@ -89,67 +131,21 @@ class GroupMemberService:
         username: Optional[str],
         create_if_missing: bool = True,
     ) -> Optional[Dict[str, Any]]:
-        """Привязать, восстановить или перенести курьера в текущую группу."""
-        member = await self.repository.get_by_group_and_telegram_id(
-            group_id,
-            telegram_user_id,
-        )
-        if member:
-            if not member.get("is_active", True):
-                await self.repository.set_active(member_id=member["id"], is_active=True)
-            await self.repository.bind_telegram_user(
-                member_id=member["id"],
-                telegram_user_id=telegram_user_id,
-                username=username,
-            )
-            updated = await self.repository.get_by_id(member["id"])
-            return updated or member
-
-        member = await self.repository.get_by_telegram_id(telegram_user_id)
-        if member:
-            await self.repository.move_to_group(member_id=member["id"], group_id=group_id)
-            await self.repository.bind_telegram_user(
-                member_id=member["id"],
-                telegram_user_id=telegram_user_id,
-                username=username,
-            )
-            updated = await self.repository.get_by_id(member["id"])
-            return updated or member
-
-        # Настроенные администраторы группы не становятся курьерами случайно,
-        # но уже существующая карточка администратора выше всё равно переносится.
-        if not create_if_missing:
-            return None
-
-        normalized_name = full_name.strip() or f"User_{telegram_user_id}"
-        member = await self.repository.get_unlinked_by_name(group_id, normalized_name)
-        if member:
-            await self.repository.bind_telegram_user(
-                member_id=member["id"],
-                telegram_user_id=telegram_user_id,
-                username=username,
-            )
-            updated = await self.repository.get_by_id(member["id"])
-            return updated or member
-
-        member = await self.repository.get_by_group_and_name(group_id, normalized_name)
-        if member:
-            await self.repository.bind_telegram_user(
-                member_id=member["id"],
-                telegram_user_id=telegram_user_id,
-                username=username,
-            )
-            updated = await self.repository.get_by_id(member["id"])
-            return updated or member
-
-        created = await self.repository.create(group_id=group_id, full_name=normalized_name)
-        await self.repository.bind_telegram_user(
-            member_id=created["id"],
+        """
+        Привязать, восстановить или перенести курьера в текущую группу.
+
+        Карточка ищется по telegram_user_id (из другой группы переносится,
+        удалённая восстанавливается), затем по ФИО в реестре группы; если
+        ничего нет и create_if_missing, создаётся новая. Всё выполняется
+        одним запросом к БД.
+        """
+        return await self.repository.sync_to_group(
+            group_id=group_id,
             telegram_user_id=telegram_user_id,
+            full_name=full_name,
             username=username,
+            create_if_missing=create_if_missing,
         )
-        updated = await self.repository.get_by_id(created["id"])
-        return updated or created
 
     async def resolve_member_for_vote(
         self,
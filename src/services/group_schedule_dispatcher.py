@@ -0,0 +1,413 @@
+"""
+Диспетчер расписаний групп: создание, закрытие опросов и напоминания по времени каждой группы.
+
+Вместо общих cron-задач, срабатывающих для всех групп в одну секунду,
+все события групп лежат в одной куче, упорядоченной по времени запуска.
+Фоновая задача спит до ближайшего события, выполняет его и кладёт в кучу
+следующее срабатывание той же группы через сутки. Внутри окна
+GROUP_SCHEDULE_SPREAD_MINUTES группы разнесены детерминированным
+смещением, поэтому запросы к Telegram идут равномерным потоком.
+Создание опросов так же растягивается на окно POLL_CREATION_WINDOW_MINUTES.
+
+Для действий с пакетным обработчиком (напоминания) все события, наступившие
+к одному пробуждению, передаются одним вызовом: так отметки об отправке
+забираются одним запросом к БД, а не по запросу на группу.
+
+Изменение группы в админке пересчитывает события только этой группы:
+старые записи в куче помечаются устаревшими по номеру версии и
+отбрасываются при извлечении. Если новое время закрытия на сегодня уже
+прошло, а сегодняшнее закрытие ещё не выполнено, оно ставится разовым
+событием на сейчас. События, время которых прошло до пересборки кучи
+(rebuilt_at), диспетчер не выполняет — их догоняет планировщик при запуске.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+from collections import Counter
+from dataclasses import dataclass, replace
+from datetime import date, datetime, time, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.settings import settings
+from src.utils.schedule_spread import spread_offset_seconds
+
+logger = logging.getLogger(__name__)
+
+NIGHT_CLOSE_TIME = time(17, 0)
+NIGHT_REMINDER_HOUR = 12
+MAX_IDLE_SECONDS = 60.0
+
+ACTION_CREATE = "create"
+ACTION_CLOSE = "close"
+ACTION_REMIND = "remind"
+
+
+def group_close_time(group: Dict[str, Any]) -> time:
+    """Время закрытия опроса группы (poll_close_time или значение по умолчанию)."""
+    value = group.get("poll_close_time")
+    if isinstance(value, time):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return time.fromisoformat(value)
+        except ValueError:
+            logger.warning("Некорректное время закрытия у группы %s: %s", group.get("id"), value)
+    if group.get("is_night", False):
+        return NIGHT_CLOSE_TIME
+    return time(settings.POLL_CLOSING_HOUR, settings.POLL_CLOSING_MINUTE)
+
+
+def describe_close_times(close_times: Iterable[Tuple[bool, time, int]]) -> List[str]:
+    """
+    Окна закрытия по типам групп: «дневные 18:00–20:00 (групп: 12)».
+
+    Args:
+        close_times: Тройки (ночная ли группа, время закрытия, число групп)
+    """
+    windows: Dict[bool, List[time]] = {}
+    counts: Counter = Counter()
+    for is_night, close_time, groups in close_times:
+        windows.setdefault(bool(is_night), []).append(close_time)
+        counts[bool(is_night)] += int(groups)
+    lines = []
+    for is_night in (False, True):
+        if not windows.get(is_night):
+            continue
+        earliest, latest = min(windows[is_night]), max(windows[is_night])
+        window = f"{earliest:%H:%M}" if earliest == latest else f"{earliest:%H:%M}–{latest:%H:%M}"
+        lines.append(f"{'ночные' if is_night else 'дневные'} {window} (групп: {counts[is_night]})")
+    return lines
+
+
+@dataclass(frozen=True)
+class GroupEvent:
+    """Запланированное действие для одной группы."""
+
+    run_at: datetime
+    group_id: int
+    action: str
+    is_night: bool
+    version: int
+    reminder_hour: Optional[int] = None
+    # False — разовое догоняющее событие, через сутки не повторяется
+    repeat: bool = True
+
+    @property
+    def schedule_date(self) -> date:
+        """День, к которому относится срабатывание."""
+        return self.run_at.date()
+
+    @property
+    def target_date(self) -> date:
+        """Дата опроса: ночные группы работают по сегодняшнему, дневные — по завтрашнему."""
+        if self.is_night:
+            return self.schedule_date
+        return self.schedule_date + timedelta(days=1)
+
+
+def plan_group_events(
+    group: Dict[str, Any],
+    now: datetime,
+    version: int = 0,
+    spread_seconds: Optional[int] = None,
+    creation_window_seconds: Optional[int] = None,
+) -> List[GroupEvent]:
+    """
+    Ближайшие после now срабатывания создания, закрытия и напоминаний группы.
+
+    Args:
+        group: Группа из БД
+        now: Текущее время
+        version: Версия расписания группы
+        spread_seconds: Ширина окна распределения групп
+        creation_window_seconds: Ширина окна создания опросов
+            (0 — создание не планируется, его выполняет общая cron-задача)
+    """
+    if spread_seconds is None:
+        spread_seconds = settings.GROUP_SCHEDULE_SPREAD_MINUTES * 60
+    if creation_window_seconds is None:
+        creation_window_seconds = settings.POLL_CREATION_WINDOW_MINUTES * 60
+    group_id = group["id"]
+    is_night = bool(group.get("is_night", False))
+    reminder_hours = [NIGHT_REMINDER_HOUR] if is_night else list(settings.REMINDER_HOURS)
+
+    planned: List[Tuple[str, time, Optional[int], int]] = [
+        (ACTION_CLOSE, group_close_time(group), None, spread_offset_seconds(f"close:{group_id}", spread_seconds))
+    ]
+    if creation_window_seconds > 0:
+        planned.append((
+            ACTION_CREATE,
+            time(settings.POLL_CREATION_HOUR, settings.POLL_CREATION_MINUTE),
+            None,
+            spread_offset_seconds(f"create:{group_id}", creation_window_seconds),
+        ))
+    remind_offset = spread_offset_seconds(f"remind:{group_id}", spread_seconds)
+    for hour in reminder_hours:
+        planned.append((ACTION_REMIND, time(hour, 0), hour, remind_offset))
+
+    events = []
+    for action, at, reminder_hour, offset in planned:
+        run_at = datetime.combine(now.date(), at) + timedelta(seconds=offset)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        events.append(
+            GroupEvent(
+                run_at=run_at,
+                group_id=group_id,
+                action=action,
+                is_night=is_night,
+                version=version,
+                reminder_hour=reminder_hour,
+            )
+        )
+    return events
+
+
+class GroupScheduleDispatcher:
+    """Куча событий групп с одной фоновой задачей-исполнителем."""
+
+    def __init__(
+        self,
+        handler: Callable[[GroupEvent], Awaitable[None]],
+        on_window_complete: Optional[Callable[[str, bool, date], Awaitable[None]]] = None,
+        spread_seconds: Optional[int] = None,
+        creation_window_seconds: Optional[int] = None,
+        batch_handlers: Optional[Dict[str, Callable[[List[GroupEvent]], Awaitable[None]]]] = None,
+    ):
+        """
+        Инициализация диспетчера.
+
+        Args:
+            handler: Корутина, выполняющая событие группы
+            on_window_complete: Вызывается, когда выполнены все события одного
+                действия за день (например, закрыты все дневные опросы)
+            spread_seconds: Ширина окна распределения групп
+            creation_window_seconds: Ширина окна создания опросов
+            batch_handlers: Корутины по действиям, получающие все наступившие
+                события действия одним списком вместо вызова handler на каждое
+        """
+        self.handler = handler
+        self.on_window_complete = on_window_complete
+        self.batch_handlers = batch_handlers or {}
+        self.spread_seconds = (
+            settings.GROUP_SCHEDULE_SPREAD_MINUTES * 60 if spread_seconds is None else spread_seconds
+        )
+        self.creation_window_seconds = (
+            settings.POLL_CREATION_WINDOW_MINUTES * 60
+            if creation_window_seconds is None
+            else creation_window_seconds
+        )
+        self._heap: List[Tuple[datetime, int, GroupEvent]] = []
+        self._sequence = itertools.count()
+        self._versions: Dict[int, int] = {}
+        self._in_flight: Counter = Counter()
+        self._running_tasks: set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Момент последней пересборки: более ранние срабатывания перенесены на завтра
+        self.rebuilt_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return sum(1 for _, _, event in self._heap if self._is_current(event))
+
+    def _is_current(self, event: GroupEvent) -> bool:
+        return self._versions.get(event.group_id) == event.version
+
+    def _push(self, event: GroupEvent) -> None:
+        heapq.heappush(self._heap, (event.run_at, next(self._sequence), event))
+
+    def plan_events(self, group: Dict[str, Any], now: datetime, version: int = 0) -> List[GroupEvent]:
+        """События группы с параметрами окон этого диспетчера."""
+        return plan_group_events(group, now, version, self.spread_seconds, self.creation_window_seconds)
+
+    def rebuild(self, groups: List[Dict[str, Any]], now: Optional[datetime] = None) -> None:
+        """
+        Полностью пересобрать кучу по списку активных групп.
+
+        Наступившие, но ещё не выполненные события сохраняются разовыми:
+        новое планирование перенесло бы их на завтра.
+        """
+        now = now or datetime.now()
+        overdue = [event for run_at, _, event in self._heap if run_at <= now and self._is_current(event)]
+        self._heap = []
+        self._versions = {}
+        for group in groups:
+            if group.get("is_active", True):
+                self._versions[group["id"]] = 0
+                for event in self.plan_events(group, now, 0):
+                    self._push(event)
+        for event in overdue:
+            if event.group_id in self._versions:
+                self._push(replace(event, version=0, repeat=False))
+        self.rebuilt_at = now
+        self._wakeup.set()
+        logger.info("Расписание групп построено: %d групп, %d событий", len(self._versions), len(self._heap))
+
+    def upsert_group(self, group: Dict[str, Any], now: Optional[datetime] = None) -> None:
+        """Пересчитать события одной группы (новая группа или изменённое время)."""
+        if not group.get("is_active", True):
+            self.remove_group(group["id"])
+            return
+        now = now or datetime.now()
+        # Ближайшие невыполненные закрытие и напоминания по старому расписанию
+        pending: Dict[Tuple[str, Optional[int]], GroupEvent] = {}
+        for _, _, event in self._heap:
+            if (
+                event.group_id == group["id"]
+                and event.action in (ACTION_CLOSE, ACTION_REMIND)
+                and self._is_current(event)
+            ):
+                key = (event.action, event.reminder_hour)
+                if key not in pending or event.run_at < pending[key].run_at:
+                    pending[key] = event
+
+        version = self._versions.get(group["id"], -1) + 1
+        self._versions[group["id"]] = version
+        for event in self.plan_events(group, now, version):
+            self._push(event)
+            previous = pending.get((event.action, event.reminder_hour))
+            if previous is not None and previous.schedule_date < event.schedule_date:
+                # Новое время на сегодня уже прошло, а сегодняшнее событие не выполнено
+                self._push(replace(previous, run_at=min(previous.run_at, now), version=version, repeat=False))
+        self._compact()
+        self._wakeup.set()
+
+    def remove_group(self, group_id: int) -> None:
+        """Исключить группу из расписания."""
+        if self._versions.pop(group_id, None) is not None:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Убрать устаревшие записи, когда их стало больше половины кучи."""
+        current = len(self)
+        if len(self._heap) > 2 * current + 16:
+            self._heap = [entry for entry in self._heap if self._is_current(entry[2])]
+            heapq.heapify(self._heap)
+
+    def next_run_at(self) -> Optional[datetime]:
+        """Время ближайшего актуального события."""
+        while self._heap and not self._is_current(self._heap[0][2]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[GroupEvent]:
+        """
+        Извлечь наступившие события и запланировать их следующее срабатывание.
+
+        Следующее срабатывание — ровно через сутки от предыдущего, поэтому
+        смещение группы внутри окна сохраняется.
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, event = heapq.heappop(self._heap)
+            if not self._is_current(event):
+                continue
+            due.append(event)
+            if not event.repeat:
+                continue
+            next_run = event.run_at + timedelta(days=1)
+            while next_run <= now:
+                next_run += timedelta(days=1)
+            self._push(
+                GroupEvent(
+                    run_at=next_run,
+                    group_id=event.group_id,
+                    action=event.action,
+                    is_night=event.is_night,
+                    version=event.version,
+                    reminder_hour=event.reminder_hour,
+                )
+            )
+        return due
+
+    def has_pending(self, action: str, is_night: bool, schedule_date: date) -> bool:
+        """Остались ли невыполненные события действия за указанный день."""
+        key = (action, is_night, schedule_date)
+        if self._in_flight[key]:
+            return True
+        return any(
+            self._is_current(event)
+            and (event.action, event.is_night, event.schedule_date) == key
+            for _, _, event in self._heap
+        )
+
+    async def start(self) -> None:
+        """Запустить фоновую задачу-исполнитель."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name="group-schedule-dispatcher")
+
+    async def stop(self) -> None:
+        """Остановить исполнитель и дождаться выполняемых событий."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._running_tasks:
+            await asyncio.gather(*self._running_tasks, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            batches: Dict[str, List[GroupEvent]] = {}
+            for event in self.pop_due(datetime.now()):
+                if event.action in self.batch_handlers:
+                    batches.setdefault(event.action, []).append(event)
+                else:
+                    self._spawn([event])
+            for events in batches.values():
+                self._spawn(events)
+
+            next_at = self.next_run_at()
+            # Спим до ближайшего события, но не дольше минуты: переживаем сдвиги часов
+            timeout = MAX_IDLE_SECONDS
+            if next_at is not None:
+                timeout = min(MAX_IDLE_SECONDS, max(0.0, (next_at - datetime.now()).total_seconds()))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _spawn(self, events: List[GroupEvent]) -> None:
+        """Запустить выполнение событий отдельной задачей."""
+        keys = [(event.action, event.is_night, event.schedule_date) for event in events]
+        for key in keys:
+            self._in_flight[key] += 1
+        task = asyncio.create_task(self._dispatch(events, keys))
+        self._running_tasks.add(task)
+        task.add_done_callback(self._running_tasks.discard)
+
+    async def _dispatch(self, events: List[GroupEvent], keys: List[Tuple[str, bool, date]]) -> None:
+        batch_handler = self.batch_handlers.get(events[0].action)
+        try:
+            if batch_handler is not None:
+                await batch_handler(events)
+            else:
+                await self.handler(events[0])
+        except Exception as e:
+            logger.error(
+                "Ошибка события %s для групп %s: %s",
+                events[0].action,
+                ", ".join(str(event.group_id) for event in events),
+                e,
+                exc_info=True,
+            )
+        finally:
+            for key in keys:
+                self._in_flight[key] -= 1
+                if self._in_flight[key] <= 0:
+                    del self._in_flight[key]
+
+        if self.on_window_complete is None:
+            return
+        for key in dict.fromkeys(keys):
+            if self.has_pending(*key):
+                continue
+            try:
+                await self.on_window_complete(*key)
+            except Exception as e:
+                logger.error("Ошибка завершения окна %s: %s", key, e, exc_info=True)
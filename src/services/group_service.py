@@ -2,10 +2,13 @@
 Сервис для работы с группами.
 """
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence
 from asyncpg import Pool
 
 from src.repositories.group_repository import GroupRepository
+from src.repositories.pagination import KeysetPage, PageCursor
+from src.repositories.stats_repository import StatsRepository
+from src.services.stats_service import build_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -116,6 +119,18 @@ class GroupService:
         """
         return await self.repository.get_by_id(group_id)
     
+    async def get_groups_by_ids(self, group_ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Получить группы по списку ID одним запросом.
+        
+        Args:
+            group_ids: ID групп
+            
+        Returns:
+            Список словарей с данными найденных групп
+        """
+        return await self.repository.get_by_ids(group_ids)
+    
     async def get_group_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """
         Получить группу по названию.
@@ -152,6 +167,19 @@ class GroupService:
         """
         return await self.repository.get_all(active_only=active_only)
     
+    async def get_groups_page(self, limit: int = 10, cursor: Optional[PageCursor] = None) -> KeysetPage:
+        """
+        Получить страницу групп по названию (keyset-пагинация).
+        
+        Args:
+            limit: Размер страницы
+            cursor: Курсор страницы или None для первой
+            
+        Returns:
+            Страница групп с курсорами соседних страниц
+        """
+        return await self.repository.get_page(limit=limit, cursor=cursor)
+    
     async def update_group(
         self,
         group_id: int,
@@ -284,11 +312,5 @@ class GroupService:
         Returns:
             Словарь со статистикой
         """
-        stats = await self.repository.get_statistics()
-        
-        # Добавляем дополнительные статистики
-        # TODO: Добавить статистику по опросам и голосам
-        stats['active_polls'] = 0
-        stats['today_votes'] = 0
-        
-        return stats
+        snapshot = await build_snapshot(StatsRepository(self.db_pool), history_days=1)
+        return snapshot.as_dict()
@@ -0,0 +1,228 @@
+"""
+HTTP-эндпоинты живости и готовности бота для оркестратора и мониторинга.
+
+- GET /health/live — процесс жив и event loop отвечает (без обращений к зависимостям)
+- GET /health/ready — готовность: PostgreSQL отвечает, у ведущей реплики запущен планировщик
+- GET /health — полный отчёт: задержки БД и Redis, возраст последнего апдейта,
+  последние запуски задач планировщика, глубина очереди исходящих повторов
+
+Отчёт кэшируется на HEALTH_CACHE_SECONDS, а одновременные запросы ждут
+одну проверку, поэтому частые пробы не нагружают БД и Redis.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from aiohttp import web
+
+from config.settings import settings
+
+if TYPE_CHECKING:
+    from src.services.leader_election import LeaderElector
+    from src.services.scheduler_service import SchedulerService
+    from src.utils.loop_watchdog import LoopWatchdog
+
+logger = logging.getLogger(__name__)
+
+PING_TIMEOUT_SECONDS = 2.0
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat(timespec="seconds") if value is not None else None
+
+
+class HealthService:
+    """Проверки состояния бота с кэшированием и HTTP-сервером на aiohttp."""
+
+    def __init__(
+        self,
+        db_pool: Any = None,
+        redis: Any = None,
+        scheduler_service: Optional["SchedulerService"] = None,
+        loop_watchdog: Optional["LoopWatchdog"] = None,
+        cache_seconds: Optional[float] = None,
+        leader_elector: Optional["LeaderElector"] = None,
+    ):
+        """
+        Инициализация сервиса.
+
+        Args:
+            db_pool: Пул соединений PostgreSQL
+            redis: Клиент Redis (None, если бот работает на MemoryStorage)
+            scheduler_service: Сервис планировщика
+            loop_watchdog: Сторожевой таймер event loop
+            cache_seconds: Время жизни кэшированного отчёта
+            leader_elector: Выбор ведущей реплики (None — реплика единственная)
+        """
+        self.db_pool = db_pool
+        self.redis = redis
+        self.scheduler_service = scheduler_service
+        self.loop_watchdog = loop_watchdog
+        self.leader_elector = leader_elector
+        self.cache_seconds = (
+            settings.HEALTH_CACHE_SECONDS if cache_seconds is None else cache_seconds
+        )
+        self.started_at = time.monotonic()
+        self.last_update_at: Optional[float] = None
+
+        self._report: Optional[Dict[str, Any]] = None
+        self._report_at = 0.0
+        self._lock = asyncio.Lock()
+        self._runner: Optional[web.AppRunner] = None
+
+    def mark_update(self) -> None:
+        """Отметить обработку очередного апдейта Telegram."""
+        self.last_update_at = time.monotonic()
+
+    async def _ping_db(self) -> Dict[str, Any]:
+        if self.db_pool is None:
+            return {"status": "error", "error": "пул не инициализирован"}
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.db_pool.fetchval("SELECT 1"), timeout=PING_TIMEOUT_SECONDS)
+        except Exception as e:
+            return {"status": "error", "error": str(e) or type(e).__name__}
+        return {"status": "ok", "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    async def _ping_redis(self) -> Dict[str, Any]:
+        if self.redis is None:
+            return {"status": "disabled"}
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.redis.ping(), timeout=PING_TIMEOUT_SECONDS)
+        except Exception as e:
+            return {"status": "error", "error": str(e) or type(e).__name__}
+        return {"status": "ok", "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    def _scheduler_report(self) -> Dict[str, Any]:
+        if self.scheduler_service is None:
+            return {"running": False, "jobs": [], "outbound_queue": 0}
+        jobs = [
+            {
+                "id": job["id"],
+                "next_run": _isoformat(job["next_run"]),
+                "last_run": _isoformat(job["last_run"]),
+                "status": job["status"],
+                "error": job["error"],
+            }
+            for job in self.scheduler_service.get_jobs_status()
+        ]
+        return {
+            "running": self.scheduler_service.is_running,
+            "jobs": jobs,
+            "outbound_queue": self.scheduler_service.get_pending_retry_count(),
+        }
+
+    async def _build_report(self) -> Dict[str, Any]:
+        database, redis = await asyncio.gather(self._ping_db(), self._ping_redis())
+        scheduler = self._scheduler_report()
+        now = time.monotonic()
+        is_leader = self.leader_elector is None or self.leader_elector.is_leader
+        # Резервной реплике планировщик не нужен: она готова принимать апдейты
+        ready = database["status"] == "ok" and (scheduler["running"] or not is_leader)
+        return {
+            "status": "ok" if ready else "degraded",
+            "ready": ready,
+            "role": "leader" if is_leader else "standby",
+            "checked_at": datetime.now().isoformat(timespec="seconds"),
+            "uptime_seconds": round(now - self.started_at),
+            "last_update_age_seconds": (
+                round(now - self.last_update_at, 1) if self.last_update_at is not None else None
+            ),
+            "loop_lag_ms": (
+                round(self.loop_watchdog.current_lag_ms, 1) if self.loop_watchdog is not None else None
+            ),
+            "asyncio_tasks": len(asyncio.all_tasks()),
+            "database": database,
+            "redis": redis,
+            "scheduler": scheduler,
+        }
+
+    async def get_report(self) -> Dict[str, Any]:
+        """
+        Получить отчёт о состоянии.
+
+        Пока отчёт не старше cache_seconds, возвращается кэш; параллельные
+        запросы во время проверки дожидаются её результата.
+        """
+        if self._report is not None and time.monotonic() - self._report_at < self.cache_seconds:
+            return self._report
+        async with self._lock:
+            if self._report is not None and time.monotonic() - self._report_at < self.cache_seconds:
+                return self._report
+            self._report = await self._build_report()
+            self._report_at = time.monotonic()
+            return self._report
+
+    async def _handle_live(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"status": "ok", "uptime_seconds": round(time.monotonic() - self.started_at)}
+        )
+
+    async def _handle_ready(self, request: web.Request) -> web.Response:
+        report = await self.get_report()
+        return web.json_response(
+            {
+                "ready": report["ready"],
+                "database": report["database"]["status"],
+                "scheduler": report["scheduler"]["running"],
+                "role": report["role"],
+                "checked_at": report["checked_at"],
+            },
+            status=200 if report["ready"] else 503,
+        )
+
+    async def _handle_health(self, request: web.Request) -> web.Response:
+        report = await self.get_report()
+        return web.json_response(report, status=200 if report["ready"] else 503)
+
+    def create_app(self) -> web.Application:
+        """Создать aiohttp-приложение с эндпоинтами проверки."""
+        app = web.Application()
+        app.router.add_get("/health/live", self._handle_live)
+        app.router.add_get("/health/ready", self._handle_ready)
+        app.router.add_get("/health", self._handle_health)
+        return app
+
+    async def start(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        configure_app: Optional[Callable[[web.Application], None]] = None,
+    ) -> None:
+        """
+        Запустить HTTP-сервер проверок.
+
+        Args:
+            host: Адрес для прослушивания
+            port: Порт (0 — выбрать свободный)
+            configure_app: Дополнительная настройка приложения (например, маршрут webhook)
+        """
+        if self._runner is not None:
+            return
+        host = host or settings.HEALTH_SERVER_HOST
+        port = settings.HEALTH_SERVER_PORT if port is None else port
+        app = self.create_app()
+        if configure_app is not None:
+            configure_app(app)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        self._runner = runner
+        logger.info("Health-эндпоинты доступны на http://%s:%d/health", host, port)
+
+    @property
+    def bound_port(self) -> Optional[int]:
+        """Фактический порт сервера (полезно при запуске на порту 0)."""
+        if self._runner is None or not self._runner.addresses:
+            return None
+        return self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        """Остановить HTTP-сервер."""
+        if self._runner is None:
+            return
+        await self._runner.cleanup()
+        self._runner = None
@@ -0,0 +1,150 @@
+"""
+Выбор ведущей реплики бота через advisory-lock PostgreSQL.
+
+Задачи планировщика (создание, закрытие опросов, напоминания) должна
+выполнять ровно одна реплика. Каждая реплика держит отдельное соединение
+из пула и периодически пытается взять pg_try_advisory_lock: кто взял —
+ведущий. Блокировка сессионная, поэтому при падении процесса или обрыве
+соединения PostgreSQL снимает её сам, и лидерство переходит к следующей
+реплике при ближайшей попытке.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+LEADER_CHECK_TIMEOUT_SECONDS = 5.0
+
+
+class LeaderElector:
+    """Лидерство реплики на сессионной advisory-блокировке PostgreSQL."""
+
+    def __init__(
+        self,
+        db_pool: Any,
+        on_elected: Callable[[], Awaitable[None]],
+        on_demoted: Callable[[], Awaitable[None]],
+        lock_key: Optional[int] = None,
+        retry_seconds: Optional[float] = None,
+        check_seconds: Optional[float] = None,
+    ):
+        """
+        Инициализация выбора лидера.
+
+        Args:
+            db_pool: Пул соединений PostgreSQL
+            on_elected: Корутина, вызываемая при получении лидерства
+            on_demoted: Корутина, вызываемая при потере лидерства
+            lock_key: Ключ advisory-блокировки (общий для всех реплик)
+            retry_seconds: Период попыток взять блокировку для резервной реплики
+            check_seconds: Период проверки соединения у ведущей реплики
+        """
+        self.db_pool = db_pool
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.lock_key = settings.LEADER_LOCK_KEY if lock_key is None else lock_key
+        self.retry_seconds = retry_seconds or settings.LEADER_RETRY_SECONDS
+        self.check_seconds = check_seconds or settings.LEADER_CHECK_SECONDS
+        self.is_leader = False
+
+        self._connection = None
+        self._elected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Запустить фоновые попытки получить лидерство."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name="leader-election")
+        logger.info("Выбор ведущей реплики запущен (ключ блокировки %s)", self.lock_key)
+
+    async def stop(self) -> None:
+        """Остановить выбор, сложить лидерство и вернуть соединение в пул."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        was_leader = self.is_leader
+        await self._demote()
+        if was_leader and self._connection is not None:
+            try:
+                await self._connection.execute("SELECT pg_advisory_unlock($1)", self.lock_key)
+            except Exception as e:
+                logger.debug("Не удалось снять advisory-блокировку: %s", e)
+        await self._release_connection()
+
+    async def wait_until_leader(self) -> None:
+        """Дождаться, пока эта реплика станет ведущей."""
+        await self._elected.wait()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Соединение выбора лидера потеряно: %s", e)
+                await self._demote()
+                await self._release_connection()
+            await asyncio.sleep(self.check_seconds if self.is_leader else self.retry_seconds)
+
+    async def tick(self) -> None:
+        """
+        Один шаг выбора.
+
+        Резервная реплика пытается взять блокировку, ведущая проверяет,
+        что соединение с блокировкой живо. Ошибка соединения пробрасывается
+        вызывающему, который снимает лидерство.
+        """
+        if self._connection is None:
+            self._connection = await self.db_pool.acquire()
+
+        if self.is_leader:
+            await asyncio.wait_for(
+                self._connection.fetchval("SELECT 1"),
+                timeout=LEADER_CHECK_TIMEOUT_SECONDS,
+            )
+            return
+
+        acquired = await self._connection.fetchval("SELECT pg_try_advisory_lock($1)", self.lock_key)
+        if acquired:
+            await self._promote()
+
+    async def _promote(self) -> None:
+        self.is_leader = True
+        self._elected.set()
+        logger.info("Реплика стала ведущей: запускаю задачи планировщика")
+        try:
+            await self.on_elected()
+        except Exception as e:
+            logger.error("Ошибка при получении лидерства: %s", e, exc_info=True)
+            # Уступаем лидерство: возможно, другая реплика справится
+            await self._demote()
+            await self._connection.execute("SELECT pg_advisory_unlock($1)", self.lock_key)
+
+    async def _demote(self) -> None:
+        if not self.is_leader:
+            return
+        self.is_leader = False
+        self._elected.clear()
+        logger.warning("Реплика больше не ведущая: задачи планировщика остановлены")
+        try:
+            await self.on_demoted()
+        except Exception as e:
+            logger.error("Ошибка при снятии лидерства: %s", e, exc_info=True)
+
+    async def _release_connection(self) -> None:
+        if self._connection is None:
+            return
+        connection, self._connection = self._connection, None
+        try:
+            await self.db_pool.release(connection)
+        except Exception as e:
+            logger.debug("Не удалось вернуть соединение в пул: %s", e)
@@ -0,0 +1,280 @@
+"""
+Сервис чтения логов бота для админ-панели.
+
+Файлы читаются с конца блоками фиксированного размера в отдельном потоке,
+поэтому объём памяти и время ответа не зависят от размера лога, а event loop
+не блокируется. Поддерживаются ротированные файлы, фильтр по уровню,
+поиск подстроки и постраничный переход к более старым записям.
+"""
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_PATH = Path(__file__).resolve().parent.parent.parent / "logs" / "bot.log"
+
+LOG_LEVELS: Tuple[str, ...] = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+# Начало записи: "2024-01-01 12:00:00,123 - name - LEVEL - message"
+RECORD_HEADER_RE = re.compile(rb"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}")
+RECORD_LEVEL_RE = re.compile(r" - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - ")
+# Суффикс ротированного файла: bot.log.1 (RotatingFileHandler) или
+# bot.log.2024-01-01[_12[-00[-00]]] (TimedRotatingFileHandler). Сжатые копии
+# (bot.log.1.gz) и служебные файлы под него не подходят
+ROTATED_SUFFIX_RE = re.compile(r"^(\d+|\d{4}-\d{2}-\d{2}(_\d{2}(-\d{2}){0,2})?)$")
+
+CHUNK_SIZE = 64 * 1024
+# Сколько байт максимум просматривается за одну страницу (редкий поиск)
+MAX_SCAN_BYTES = 16 * 1024 * 1024
+# Сколько строк продолжения (traceback) хранится для одной записи
+MAX_CONTINUATION_LINES = 40
+MAX_LINE_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class LogCursor:
+    """
+    Позиция в логах для следующей страницы.
+
+    file_index — индекс файла в списке (0 — текущий лог), offset — смещение,
+    до которого файл ещё не прочитан (None — с конца файла).
+    """
+
+    file_index: int
+    offset: Optional[int] = None
+
+    def encode(self) -> str:
+        """Компактное представление для callback_data."""
+        offset = "" if self.offset is None else str(self.offset)
+        return f"{self.file_index}.{offset}"
+
+    @classmethod
+    def decode(cls, value: Optional[str]) -> Optional["LogCursor"]:
+        """Разобрать курсор из callback_data."""
+        if not value:
+            return None
+        try:
+            file_index, offset = value.split(".", 1)
+            return cls(
+                file_index=max(0, int(file_index)),
+                offset=max(0, int(offset)) if offset else None,
+            )
+        except ValueError:
+            return None
+
+
+@dataclass
+class LogPage:
+    """Страница логов в хронологическом порядке."""
+
+    records: List[str] = field(default_factory=list)
+    next_cursor: Optional[LogCursor] = None
+    source_files: List[str] = field(default_factory=list)
+    scanned_bytes: int = 0
+
+
+def _record_level(record: str) -> Optional[str]:
+    """Уровень записи лога или None, если формат не распознан."""
+    match = RECORD_LEVEL_RE.search(record.split("\n", 1)[0])
+    return match.group(1) if match else None
+
+
+def _matches(record: str, min_level: Optional[str], query: Optional[str]) -> bool:
+    """Проверить запись по минимальному уровню и подстроке (без учёта регистра)."""
+    if min_level:
+        level = _record_level(record)
+        if level is None or LOG_LEVELS.index(level) < LOG_LEVELS.index(min_level):
+            return False
+    if query and query.lower() not in record.lower():
+        return False
+    return True
+
+
+class LogService:
+    """Постраничное чтение логов с конца файла."""
+
+    def __init__(
+        self,
+        log_path: Path = DEFAULT_LOG_PATH,
+        chunk_size: int = CHUNK_SIZE,
+        max_scan_bytes: int = MAX_SCAN_BYTES,
+    ):
+        """
+        Инициализация сервиса.
+
+        Args:
+            log_path: Путь к текущему файлу лога
+            chunk_size: Размер блока при чтении с конца
+            max_scan_bytes: Лимит просматриваемых байт на одну страницу
+        """
+        self.log_path = Path(log_path)
+        self.chunk_size = chunk_size
+        self.max_scan_bytes = max_scan_bytes
+
+    def list_log_files(self) -> List[Path]:
+        """
+        Текущий лог и ротированные файлы, от новых к старым.
+
+        Поддерживает имена RotatingFileHandler (bot.log.1) и
+        TimedRotatingFileHandler (bot.log.2024-01-01). Сжатые архивы
+        (bot.log.1.gz) не читаются: это не текст, и их содержимое уже
+        встречалось в несжатом файле до сжатия.
+        """
+        files: List[Path] = []
+        if self.log_path.exists():
+            files.append(self.log_path)
+
+        rotated = [
+            path
+            for path in self.log_path.parent.glob(f"{self.log_path.name}.*")
+            if ROTATED_SUFFIX_RE.match(path.name[len(self.log_path.name) + 1:]) and path.is_file()
+        ]
+        rotated.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+        files.extend(rotated)
+        return files
+
+    async def read_page(
+        self,
+        limit: int = 50,
+        min_level: Optional[str] = None,
+        query: Optional[str] = None,
+        cursor: Optional[LogCursor] = None,
+        max_chars: int = 3500,
+    ) -> LogPage:
+        """
+        Прочитать страницу записей, более старых, чем курсор.
+
+        Args:
+            limit: Максимум записей на странице
+            min_level: Минимальный уровень (INFO, WARNING, ...) или None
+            query: Подстрока для поиска или None
+            cursor: Курсор предыдущей страницы или None для самых свежих записей
+            max_chars: Ограничение суммарной длины текста страницы
+
+        Returns:
+            Страница логов и курсор для следующей (более старой) страницы
+        """
+        return await asyncio.to_thread(
+            self._read_page_sync,
+            limit,
+            min_level.upper() if min_level else None,
+            query,
+            cursor,
+            max_chars,
+        )
+
+    def _read_page_sync(
+        self,
+        limit: int,
+        min_level: Optional[str],
+        query: Optional[str],
+        cursor: Optional[LogCursor],
+        max_chars: int,
+    ) -> LogPage:
+        """Синхронное чтение страницы (выполняется в рабочем потоке)."""
+        page = LogPage()
+        files = self.list_log_files()
+        collected: List[str] = []
+        total_chars = 0
+        file_index = cursor.file_index if cursor else 0
+        end_offset = cursor.offset if cursor else None
+
+        while file_index < len(files) and page.next_cursor is None:
+            path = files[file_index]
+            try:
+                with open(path, "rb") as log_file:
+                    size = log_file.seek(0, 2)
+                    current_end = size if end_offset is None else min(end_offset, size)
+                    for record_offset, record in self._iter_records_backward(log_file, current_end):
+                        page.scanned_bytes += current_end - record_offset
+                        if _matches(record, min_level, query):
+                            if collected and total_chars + len(record) > max_chars:
+                                # Запись не поместилась — следующая страница начнётся с неё
+                                page.next_cursor = LogCursor(file_index, current_end)
+                                break
+                            collected.append(record)
+                            total_chars += len(record) + 1
+                            if path.name not in page.source_files:
+                                page.source_files.append(path.name)
+                        current_end = record_offset
+                        if len(collected) >= limit or page.scanned_bytes >= self.max_scan_bytes:
+                            page.next_cursor = LogCursor(file_index, record_offset)
+                            break
+            except OSError as e:
+                logger.warning("Не удалось прочитать файл лога %s: %s", path, e)
+
+            if page.next_cursor is None:
+                # Файл дочитан до начала — переходим к более старому
+                file_index += 1
+                end_offset = None
+
+        # Курсор на начале файла означает переход к следующему (более старому) файлу
+        if page.next_cursor is not None and page.next_cursor.offset == 0:
+            next_index = page.next_cursor.file_index + 1
+            page.next_cursor = LogCursor(next_index) if next_index < len(files) else None
+
+        collected.reverse()
+        page.records = collected
+        return page
+
+    def _iter_lines_backward(self, log_file, end_offset: int) -> Iterator[Tuple[int, bytes]]:
+        """
+        Строки файла в обратном порядке до позиции end_offset.
+
+        Returns:
+            Итератор пар (смещение начала строки, строка без перевода строки)
+        """
+        position = end_offset
+        remainder = b""
+        while position > 0:
+            read_size = min(self.chunk_size, position)
+            position -= read_size
+            log_file.seek(position)
+            buffer = log_file.read(read_size) + remainder
+            lines = buffer.split(b"\n")
+            # Первая строка блока может быть неполной — дочитаем её со следующим блоком
+            remainder = lines.pop(0)
+            line_end = position + len(buffer)
+            for line in reversed(lines):
+                line_start = line_end - len(line)
+                yield line_start, line
+                line_end = line_start - 1
+            if len(remainder) > MAX_LINE_BYTES:
+                # Аномально длинная строка: отдаём её хвост, чтобы не расти в памяти
+                yield position, remainder[-self.chunk_size:]
+                remainder = b""
+        if remainder:
+            yield 0, remainder
+
+    def _iter_records_backward(self, log_file, end_offset: int) -> Iterator[Tuple[int, str]]:
+        """
+        Записи лога в обратном порядке; строки traceback приклеиваются к своей записи.
+
+        Returns:
+            Итератор пар (смещение начала записи, текст записи)
+        """
+        continuation: List[bytes] = []
+        dropped = 0
+        for line_start, line in self._iter_lines_backward(log_file, end_offset):
+            if not line.strip():
+                continue
+            if RECORD_HEADER_RE.match(line):
+                parts = [line]
+                if dropped:
+                    parts.append(f"... пропущено строк: {dropped}".encode("utf-8"))
+                parts.extend(reversed(continuation))
+                continuation = []
+                dropped = 0
+                yield line_start, b"\n".join(parts).decode("utf-8", "replace").rstrip()
+            elif len(continuation) < MAX_CONTINUATION_LINES:
+                continuation.append(line)
+            else:
+                dropped += 1
+
+        # Строки без заголовка в самом начале файла
+        if continuation:
+            yield 0, b"\n".join(reversed(continuation)).decode("utf-8", "replace").rstrip()
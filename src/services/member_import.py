@@ -0,0 +1,279 @@
+"""
+Массовый импорт курьеров из CSV или текстового файла.
+
+Файл — список курьеров, по строке на курьера. Если импорт идёт в выбранную
+группу, в строке ФИО и необязательный Telegram ID:
+
+    Иванов Иван;123456789
+    Петров Пётр
+
+Если группа указана в файле, она идёт первым столбцом:
+
+    ЗИЗ-1;Иванов Иван;123456789
+
+Разделитель — «;», «,» или табуляция, первая строка с заголовком
+пропускается. Файл считается полным списком курьеров перечисленных групп:
+активные курьеры этих групп, которых нет в файле, отключаются.
+
+Сверка с group_members выполняется в репозитории одной транзакцией
+(см. GroupMemberRepository.reconcile_import), здесь — разбор файла
+и отчет о различиях.
+"""
+import csv
+import html
+import io
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Ограничения на загружаемый файл
+MAX_IMPORT_FILE_BYTES = 2 * 1024 * 1024
+MAX_IMPORT_ROWS = 10000
+MAX_FULL_NAME_LENGTH = 255
+
+# Сколько строк каждого вида показывать в сообщении, остальное — в файле отчета
+REPORT_PREVIEW_LIMIT = 15
+
+HEADER_CELLS = {"фио", "имя", "курьер", "full_name", "name", "группа", "group", "telegram_id"}
+
+CHANGE_TITLES = {
+    "added": "➕ Новые",
+    "moved": "🔄 Перенесены",
+    "renamed": "✏️ Переименованы",
+    "reactivated": "♻️ Восстановлены",
+    "linked": "🔗 Привязан Telegram",
+    "deactivated": "🚫 Отключены",
+    "skipped": "⚠️ Пропущены",
+}
+
+CONFLICT_REASONS = {
+    "name_taken": "в группе уже есть другой курьер с таким ФИО",
+    "other_account": "карточка привязана к другому Telegram ID",
+    "duplicate": "карточка уже указана в другой строке",
+    "unknown_group": "группа не найдена",
+}
+
+
+@dataclass(frozen=True)
+class ImportRow:
+    """Строка файла импорта."""
+
+    line_no: int
+    full_name: str
+    group_name: Optional[str] = None
+    telegram_user_id: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ImportChange:
+    """Одно изменение в отчете импорта."""
+
+    action: str
+    group_name: str
+    full_name: str
+    detail: str = ""
+
+
+@dataclass
+class MemberImportResult:
+    """Итог сверки файла с карточками курьеров."""
+
+    applied: bool
+    total_rows: int = 0
+    unchanged: int = 0
+    changes: List[ImportChange] = field(default_factory=list)
+
+    def by_action(self, action: str) -> List[ImportChange]:
+        return [change for change in self.changes if change.action == action]
+
+    @property
+    def has_changes(self) -> bool:
+        return any(change.action != "skipped" for change in self.changes)
+
+
+def decode_import_file(content: bytes) -> str:
+    """Текст файла: UTF-8 (с BOM или без), иначе cp1251 — так сохраняет Excel."""
+    try:
+        return content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return content.decode("cp1251", errors="replace")
+
+
+def _detect_delimiter(text: str) -> str:
+    first_line = next((line for line in text.splitlines() if line.strip()), "")
+    for delimiter in (";", "\t"):
+        if delimiter in first_line:
+            return delimiter
+    return ","
+
+
+def parse_member_import(text: str, with_group: bool) -> Tuple[List[ImportRow], List[ImportChange]]:
+    """
+    Разобрать файл импорта.
+
+    Args:
+        text: Содержимое файла
+        with_group: Первый столбец — название группы
+
+    Returns:
+        Строки для сверки и пропущенные строки с причиной
+    """
+    rows: List[ImportRow] = []
+    skipped: List[ImportChange] = []
+    seen_names: Dict[Tuple[str, str], int] = {}
+    seen_ids: Dict[int, int] = {}
+
+    reader = csv.reader(io.StringIO(text), delimiter=_detect_delimiter(text))
+    for line_no, cells in enumerate(reader, start=1):
+        cells = [cell.strip() for cell in cells]
+        if not any(cells):
+            continue
+        if not rows and not skipped and cells[0].lower() in HEADER_CELLS:
+            continue
+
+        group_name = None
+        if with_group:
+            group_name = " ".join(cells[0].split())
+            cells = cells[1:]
+        full_name = " ".join(cells[0].split()) if cells else ""
+        telegram_text = cells[1] if len(cells) > 1 else ""
+
+        def skip(reason: str) -> None:
+            skipped.append(ImportChange("skipped", group_name or "", full_name, f"строка {line_no}: {reason}"))
+
+        if with_group and not group_name:
+            skip("не указана группа")
+            continue
+        if not full_name:
+            skip("не указано ФИО")
+            continue
+        if len(full_name) > MAX_FULL_NAME_LENGTH:
+            skip("слишком длинное ФИО")
+            continue
+        telegram_user_id = None
+        if telegram_text:
+            if not telegram_text.isdigit():
+                skip(f"Telegram ID «{telegram_text}» не число")
+                continue
+            telegram_user_id = int(telegram_text)
+
+        name_key = ((group_name or "").lower(), full_name.lower())
+        if name_key in seen_names:
+            skip(f"повтор строки {seen_names[name_key]}")
+            continue
+        if telegram_user_id is not None and telegram_user_id in seen_ids:
+            skip(f"Telegram ID уже указан в строке {seen_ids[telegram_user_id]}")
+            continue
+        if len(rows) >= MAX_IMPORT_ROWS:
+            skip(f"больше {MAX_IMPORT_ROWS} строк в файле")
+            continue
+
+        seen_names[name_key] = line_no
+        if telegram_user_id is not None:
+            seen_ids[telegram_user_id] = line_no
+        rows.append(ImportRow(line_no, full_name, group_name, telegram_user_id))
+
+    return rows, skipped
+
+
+def build_import_result(
+    diff: Dict[str, List[Dict[str, Any]]],
+    skipped: List[ImportChange],
+    total_rows: int,
+    applied: bool,
+) -> MemberImportResult:
+    """Разложить результат GroupMemberRepository.reconcile_import по видам изменений."""
+    result = MemberImportResult(applied=applied, total_rows=total_rows)
+    result.changes.extend(skipped)
+
+    for row in diff.get("unknown_groups", []):
+        result.changes.append(ImportChange(
+            "skipped", row["group_name"] or "", row["full_name"],
+            f"строка {row['line_no']}: {CONFLICT_REASONS['unknown_group']}",
+        ))
+
+    for row in diff.get("plan", []):
+        group_name = row["group_name"]
+        full_name = row["full_name"]
+        if row["conflict"]:
+            reason = CONFLICT_REASONS.get(row["conflict"], row["conflict"])
+            result.changes.append(ImportChange(
+                "skipped", group_name, full_name, f"строка {row['line_no']}: {reason}",
+            ))
+            continue
+        if row["member_id"] is None:
+            result.changes.append(ImportChange("added", group_name, full_name))
+            continue
+
+        changed = False
+        if row["old_group_id"] != row["group_id"]:
+            result.changes.append(ImportChange("moved", group_name, full_name, f"из {row['old_group_name']}"))
+            changed = True
+        if row["old_name"] != full_name:
+            result.changes.append(ImportChange("renamed", group_name, full_name, f"было: {row['old_name']}"))
+            changed = True
+        if not row["old_active"]:
+            result.changes.append(ImportChange("reactivated", group_name, full_name))
+            changed = True
+        if row["telegram_user_id"] is not None and row["old_telegram_user_id"] is None:
+            result.changes.append(ImportChange("linked", group_name, full_name, str(row["telegram_user_id"])))
+            changed = True
+        if not changed:
+            result.unchanged += 1
+
+    for row in diff.get("duplicates", []):
+        result.changes.append(ImportChange(
+            "skipped", row["group_name"] or "", row["full_name"],
+            f"строка {row['line_no']}: {CONFLICT_REASONS['duplicate']}",
+        ))
+
+    for row in diff.get("deactivated", []):
+        result.changes.append(ImportChange("deactivated", row["group_name"], row["full_name"]))
+
+    return result
+
+
+def format_import_report(result: MemberImportResult, limit: int = REPORT_PREVIEW_LIMIT) -> str:
+    """Отчет об импорте для администратора (HTML)."""
+    title = "✅ <b>Импорт курьеров выполнен</b>" if result.applied else "📥 <b>Проверка файла импорта</b>"
+    lines = [
+        title,
+        "",
+        f"Строк в файле: <b>{result.total_rows}</b>",
+        f"Без изменений: <b>{result.unchanged}</b>",
+    ]
+    truncated = False
+    for action, action_title in CHANGE_TITLES.items():
+        changes = result.by_action(action)
+        if not changes:
+            continue
+        lines.append("")
+        lines.append(f"{action_title}: <b>{len(changes)}</b>")
+        for change in changes[:limit]:
+            line = f"• {html.escape(change.full_name)}"
+            if change.group_name:
+                line += f" — {html.escape(change.group_name)}"
+            if change.detail:
+                line += f" ({html.escape(change.detail)})"
+            lines.append(line)
+        if len(changes) > limit:
+            lines.append(f"... и еще {len(changes) - limit}")
+            truncated = True
+
+    if not result.has_changes:
+        lines.extend(["", "Изменений нет."])
+    if truncated:
+        lines.extend(["", "📎 Полный список изменений — в файле отчета."])
+    if not result.applied and result.has_changes:
+        lines.extend(["", "Проверьте изменения и нажмите «Применить»."])
+    return "\n".join(lines)
+
+
+def render_import_diff(result: MemberImportResult) -> bytes:
+    """Полный отчет об изменениях в CSV (разделитель «;», кодировка UTF-8 с BOM для Excel)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    writer.writerow(["изменение", "группа", "ФИО", "подробности"])
+    for action in CHANGE_TITLES:
+        for change in result.by_action(action):
+            writer.writerow([action, change.group_name, change.full_name, change.detail])
+    return buffer.getvalue().encode("utf-8-sig")
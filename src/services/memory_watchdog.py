@@ -0,0 +1,267 @@
+"""
+Сторож роста памяти долгоживущего процесса бота.
+
+Периодически снимает RSS, число объектов по типам (gc) и, если включено,
+снимок tracemalloc. Каждый замер сравнивается с базовым, снятым после
+прогрева: при росте RSS, отдельного места аллокаций или счётчика
+(например, числа задач планировщика) сверх порога администраторы
+получают уведомление.
+"""
+import asyncio
+import gc
+import logging
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import psutil
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+TOP_ENTRIES = 10
+TRACEMALLOC_EXCLUDE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass
+class MemorySnapshot:
+    """Замер памяти процесса."""
+
+    taken_at: datetime
+    rss_bytes: int
+    type_counts: Counter
+    probes: Dict[str, int]
+    tracemalloc_snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+@dataclass
+class MemoryReport:
+    """Сравнение текущего замера с базовым."""
+
+    rss_growth_bytes: int
+    top_types: List[tuple] = field(default_factory=list)
+    top_sites: List[tuple] = field(default_factory=list)
+    probe_growth: Dict[str, int] = field(default_factory=dict)
+    alerts: List[str] = field(default_factory=list)
+
+
+def _count_object_types() -> Counter:
+    """Число живых объектов, отслеживаемых gc, по именам типов."""
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+class MemoryWatchdog:
+    """Периодическая проверка роста памяти с уведомлением администраторов."""
+
+    def __init__(
+        self,
+        notify: Optional[Callable[[str], Awaitable[None]]] = None,
+        interval_seconds: Optional[float] = None,
+        rss_growth_mb: Optional[int] = None,
+        site_growth_mb: Optional[int] = None,
+        probe_growth: Optional[int] = None,
+        use_tracemalloc: Optional[bool] = None,
+    ):
+        """
+        Инициализация сторожа.
+
+        Args:
+            notify: Корутина отправки уведомления администраторам
+            interval_seconds: Период между замерами
+            rss_growth_mb: Порог роста RSS относительно базового замера
+            site_growth_mb: Порог роста одного места аллокаций (tracemalloc)
+            probe_growth: Порог роста пользовательских счётчиков
+            use_tracemalloc: Включать ли tracemalloc
+        """
+        self.notify = notify
+        self.interval_seconds = interval_seconds or settings.MEMORY_WATCHDOG_INTERVAL_MINUTES * 60
+        self.rss_growth_bytes = (rss_growth_mb or settings.MEMORY_WATCHDOG_RSS_GROWTH_MB) * MB
+        self.site_growth_bytes = (site_growth_mb or settings.MEMORY_WATCHDOG_SITE_GROWTH_MB) * MB
+        self.probe_growth = probe_growth or settings.MEMORY_WATCHDOG_PROBE_GROWTH
+        self.use_tracemalloc = (
+            settings.MEMORY_WATCHDOG_TRACEMALLOC if use_tracemalloc is None else use_tracemalloc
+        )
+
+        self.baseline: Optional[MemorySnapshot] = None
+        self.last_report: Optional[MemoryReport] = None
+        self._probes: Dict[str, Callable[[], int]] = {}
+        self._alerted: Dict[str, int] = {}
+        self._process = psutil.Process()
+        self._task: Optional[asyncio.Task] = None
+
+    def add_probe(self, name: str, probe: Callable[[], int]) -> None:
+        """
+        Добавить счётчик, рост которого нужно отслеживать.
+
+        Args:
+            name: Название для отчёта
+            probe: Функция, возвращающая текущее значение счётчика
+        """
+        self._probes[name] = probe
+
+    async def start(self) -> None:
+        """Запустить периодическую проверку."""
+        if self._task is not None and not self._task.done():
+            return
+        if self.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start(settings.PROFILER_TRACEMALLOC_FRAMES)
+        self._task = asyncio.create_task(self._run(), name="memory-watchdog")
+        logger.info(
+            "Сторож памяти запущен: интервал %.0f мин, порог RSS %d MB, tracemalloc=%s",
+            self.interval_seconds / 60,
+            self.rss_growth_bytes // MB,
+            self.use_tracemalloc,
+        )
+
+    async def stop(self) -> None:
+        """Остановить проверку."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        # Базовый замер снимаем после прогрева: кэши и пулы уже заполнены
+        await asyncio.sleep(self.interval_seconds)
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                logger.warning("Ошибка проверки памяти: %s", e, exc_info=True)
+            await asyncio.sleep(self.interval_seconds)
+
+    def _read_probes(self) -> Dict[str, int]:
+        values = {}
+        for name, probe in self._probes.items():
+            try:
+                values[name] = int(probe())
+            except Exception as e:
+                logger.debug("Счётчик %s недоступен: %s", name, e)
+        return values
+
+    async def take_snapshot(self) -> MemorySnapshot:
+        """Снять замер памяти; тяжёлые части выполняются в рабочем потоке."""
+        type_counts = await asyncio.to_thread(_count_object_types)
+        trace_snapshot = None
+        if tracemalloc.is_tracing():
+            trace_snapshot = await asyncio.to_thread(
+                lambda: tracemalloc.take_snapshot().filter_traces(TRACEMALLOC_EXCLUDE)
+            )
+        return MemorySnapshot(
+            taken_at=datetime.now(),
+            rss_bytes=self._process.memory_info().rss,
+            type_counts=type_counts,
+            probes=self._read_probes(),
+            tracemalloc_snapshot=trace_snapshot,
+        )
+
+    async def check(self) -> Optional[MemoryReport]:
+        """
+        Снять замер и сравнить с базовым.
+
+        Returns:
+            Отчёт о росте или None, если это был базовый замер
+        """
+        snapshot = await self.take_snapshot()
+        if self.baseline is None:
+            self.baseline = snapshot
+            logger.info("Базовый замер памяти: RSS %.1f MB", snapshot.rss_bytes / MB)
+            return None
+
+        report = await asyncio.to_thread(self._compare, self.baseline, snapshot)
+        self.last_report = report
+        if report.alerts:
+            logger.warning("Рост памяти: %s", "; ".join(report.alerts))
+            if self.notify is not None:
+                await self.notify(self.format_report(report, snapshot))
+        return report
+
+    def _should_alert(self, key: str, value: int, threshold: int) -> bool:
+        """
+        Уведомлять при превышении порога и далее при каждом новом шаге роста.
+
+        Повторное уведомление по тому же ключу приходит, только если значение
+        выросло ещё на порог относительно прошлого уведомления.
+        """
+        if value < threshold:
+            return False
+        last = self._alerted.get(key)
+        if last is not None and value < last + threshold:
+            return False
+        self._alerted[key] = value
+        return True
+
+    def _compare(self, baseline: MemorySnapshot, current: MemorySnapshot) -> MemoryReport:
+        report = MemoryReport(rss_growth_bytes=current.rss_bytes - baseline.rss_bytes)
+
+        if self._should_alert("rss", report.rss_growth_bytes, self.rss_growth_bytes):
+            report.alerts.append(f"RSS вырос на {report.rss_growth_bytes / MB:.1f} MB")
+
+        type_growth = current.type_counts.copy()
+        type_growth.subtract(baseline.type_counts)
+        report.top_types = [item for item in type_growth.most_common(TOP_ENTRIES) if item[1] > 0]
+
+        if baseline.tracemalloc_snapshot is not None and current.tracemalloc_snapshot is not None:
+            diff = current.tracemalloc_snapshot.compare_to(baseline.tracemalloc_snapshot, "lineno")
+            for stat in diff[:TOP_ENTRIES]:
+                if stat.size_diff <= 0:
+                    continue
+                frame = stat.traceback[0]
+                site = f"{frame.filename.rsplit('/', 1)[-1]}:{frame.lineno}"
+                report.top_sites.append((site, stat.size_diff, stat.count_diff))
+                if self._should_alert(f"site:{site}", stat.size_diff, self.site_growth_bytes):
+                    report.alerts.append(f"{site} вырос на {stat.size_diff / MB:.1f} MB")
+
+        for name, value in current.probes.items():
+            growth = value - baseline.probes.get(name, value)
+            report.probe_growth[name] = growth
+            if self._should_alert(f"probe:{name}", growth, self.probe_growth):
+                report.alerts.append(f"{name}: +{growth}")
+
+        return report
+
+    def format_report(self, report: MemoryReport, current: MemorySnapshot) -> str:
+        """HTML-текст уведомления для администраторов."""
+        baseline = self.baseline
+        lines = [
+            "🧠 <b>Рост памяти бота</b>",
+            "",
+            f"RSS: <b>{current.rss_bytes / MB:.1f} MB</b> "
+            f"(+{report.rss_growth_bytes / MB:.1f} MB с {baseline.taken_at.strftime('%d.%m %H:%M')})",
+        ]
+        if report.alerts:
+            lines.append("")
+            lines.append("⚠️ <b>Превышены пороги:</b>")
+            lines.extend(f"• {alert}" for alert in report.alerts)
+        if report.top_sites:
+            lines.append("")
+            lines.append("📍 <b>Места аллокаций:</b>")
+            lines.extend(
+                f"• <code>{site}</code>: +{size / 1024:.0f} KiB ({count:+d} блоков)"
+                for site, size, count in report.top_sites[:5]
+            )
+        if report.top_types:
+            lines.append("")
+            lines.append("📦 <b>Рост объектов по типам:</b>")
+            lines.extend(f"• <code>{name}</code>: +{count}" for name, count in report.top_types[:5])
+        if current.probes:
+            lines.append("")
+            lines.append("🔢 <b>Счётчики:</b>")
+            lines.extend(
+                f"• {name}: {value} ({report.probe_growth.get(name, 0):+d})"
+                for name, value in current.probes.items()
+            )
+        return "\n".join(lines)
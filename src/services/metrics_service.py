@@ -0,0 +1,214 @@
+"""
+Фоновый сбор системных метрик бота.
+
+Сэмплер работает в отдельной asyncio-задаче и складывает замеры в кольцевой
+буфер фиксированного размера. Экран мониторинга читает готовые значения
+из буфера и не выполняет блокирующих замеров на event loop.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+import psutil
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Окна трендов для экрана мониторинга: 1, 15 и 60 минут
+TREND_WINDOWS_SECONDS: tuple[int, ...] = (60, 15 * 60, 60 * 60)
+
+# Метрики, по которым считаются тренды min/avg/max
+TREND_FIELDS: tuple[str, ...] = (
+    "cpu_percent",
+    "rss_bytes",
+    "open_fds",
+    "loop_lag_ms",
+    "db_pool_in_use",
+    "redis_latency_ms",
+)
+
+REDIS_PING_TIMEOUT_SECONDS = 2.0
+
+
+@dataclass(frozen=True)
+class MetricsSample:
+    """Один замер системных метрик."""
+
+    timestamp: float
+    cpu_percent: float
+    system_cpu_percent: float
+    rss_bytes: int
+    open_fds: Optional[int]
+    loop_lag_ms: float
+    db_pool_size: Optional[int]
+    db_pool_max_size: Optional[int]
+    db_pool_in_use: Optional[int]
+    redis_latency_ms: Optional[float]
+
+
+class SystemMetricsService:
+    """Фоновый сэмплер метрик процесса, пула БД и Redis."""
+
+    def __init__(
+        self,
+        db_pool: Any = None,
+        redis: Any = None,
+        interval_seconds: Optional[float] = None,
+        history_seconds: Optional[int] = None,
+    ):
+        """
+        Инициализация сэмплера.
+
+        Args:
+            db_pool: Пул соединений asyncpg (опционально)
+            redis: Клиент Redis (опционально)
+            interval_seconds: Период между замерами
+            history_seconds: Глубина истории в кольцевом буфере
+        """
+        self.db_pool = db_pool
+        self.redis = redis
+        self.interval_seconds = max(
+            1.0,
+            float(interval_seconds or settings.METRICS_SAMPLE_INTERVAL_SECONDS),
+        )
+        history_seconds = history_seconds or settings.METRICS_HISTORY_MINUTES * 60
+        maxlen = max(1, int(history_seconds // self.interval_seconds) + 1)
+        self._samples: Deque[MetricsSample] = deque(maxlen=maxlen)
+        self._process = psutil.Process()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Запустить фоновый сбор метрик."""
+        if self._task is not None and not self._task.done():
+            return
+
+        # Первый вызов cpu_percent(None) только фиксирует точку отсчёта
+        self._process.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None)
+
+        self._task = asyncio.create_task(self._run(), name="system-metrics-sampler")
+        logger.info(
+            "Сбор системных метрик запущен: интервал %.0f сек, буфер %d замеров",
+            self.interval_seconds,
+            self._samples.maxlen,
+        )
+
+    async def stop(self) -> None:
+        """Остановить фоновый сбор метрик."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Цикл сэмплера: задержка event loop считается по опозданию пробуждения."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected_wakeup = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            loop_lag = max(0.0, loop.time() - expected_wakeup)
+            try:
+                self._samples.append(await self.collect_sample(loop_lag))
+            except Exception as e:
+                logger.warning("Не удалось собрать системные метрики: %s", e)
+
+    async def collect_sample(self, loop_lag_seconds: float = 0.0) -> MetricsSample:
+        """Собрать один замер без блокирующих ожиданий."""
+        with self._process.oneshot():
+            cpu_percent = self._process.cpu_percent(interval=None)
+            rss_bytes = self._process.memory_info().rss
+            open_fds = self._get_open_fds()
+
+        pool_size, pool_max_size, pool_in_use = self._get_db_pool_usage()
+
+        return MetricsSample(
+            timestamp=time.time(),
+            cpu_percent=cpu_percent,
+            system_cpu_percent=psutil.cpu_percent(interval=None),
+            rss_bytes=rss_bytes,
+            open_fds=open_fds,
+            loop_lag_ms=loop_lag_seconds * 1000,
+            db_pool_size=pool_size,
+            db_pool_max_size=pool_max_size,
+            db_pool_in_use=pool_in_use,
+            redis_latency_ms=await self._measure_redis_latency(),
+        )
+
+    def _get_open_fds(self) -> Optional[int]:
+        """Количество открытых файловых дескрипторов (только POSIX)."""
+        try:
+            return self._process.num_fds()
+        except (AttributeError, psutil.Error):
+            return None
+
+    def _get_db_pool_usage(self) -> tuple[Optional[int], Optional[int], Optional[int]]:
+        """Размер пула БД, его максимум и число занятых соединений."""
+        if self.db_pool is None:
+            return None, None, None
+        try:
+            size = self.db_pool.get_size()
+            idle = self.db_pool.get_idle_size()
+            return size, self.db_pool.get_max_size(), max(0, size - idle)
+        except Exception as e:
+            logger.debug("Не удалось получить состояние пула БД: %s", e)
+            return None, None, None
+
+    async def _measure_redis_latency(self) -> Optional[float]:
+        """Время ответа Redis на PING в миллисекундах."""
+        if self.redis is None:
+            return None
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.redis.ping(), timeout=REDIS_PING_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.debug("Redis не ответил на PING: %s", e)
+            return None
+        return (time.perf_counter() - started) * 1000
+
+    def get_latest(self) -> Optional[MetricsSample]:
+        """Последний замер или None, если замеров ещё нет."""
+        return self._samples[-1] if self._samples else None
+
+    def get_trends(
+        self,
+        window_seconds: int,
+        now: Optional[float] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Посчитать min/avg/max по метрикам за последние window_seconds.
+
+        Args:
+            window_seconds: Размер окна в секундах
+            now: Текущее время (для тестов)
+
+        Returns:
+            Словарь {метрика: {"min", "avg", "max"}}; метрики без данных пропускаются
+        """
+        threshold = (now if now is not None else time.time()) - window_seconds
+        values: Dict[str, list] = {field: [] for field in TREND_FIELDS}
+
+        for sample in reversed(self._samples):
+            if sample.timestamp < threshold:
+                break
+            for field in TREND_FIELDS:
+                value = getattr(sample, field)
+                if value is not None:
+                    values[field].append(value)
+
+        return {
+            field: {
+                "min": min(field_values),
+                "avg": sum(field_values) / len(field_values),
+                "max": max(field_values),
+            }
+            for field, field_values in values.items()
+            if field_values
+        }
@@ -0,0 +1,202 @@
+"""
+Списки неотметившихся по активным опросам в памяти.
+
+Список заводится при создании опроса из реестра группы (а после перезапуска
+и при каждой сборке отчета — из отчета) и дальше меняется по событиям: голос
+убирает курьера из списка, отзыв голоса возвращает, вступление в чат группы
+добавляет карточку, выход убирает. Напоминание берёт готовый список без
+запросов к БД.
+
+Каждый список помнит версии данных, которым он соответствует: results_version
+опроса и members_version группы (их увеличивают триггеры БД, см. миграцию 016).
+Событие применяется, только если версии сходятся с ожидаемыми, иначе список
+сбрасывается. Перед напоминанием версии сверяются с только что прочитанными
+опросом и группой: голос, принятый другой репликой, правка реестра из
+админ-панели или импорт дают расхождение, и список берётся из БД.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Активных опросов одновременно немного; ограничение — на случай пропущенного закрытия
+MAX_TRACKED_POLLS = 1000
+
+# Поля карточки, нужные для тегов в напоминании
+MEMBER_FIELDS = ("id", "group_id", "full_name", "telegram_user_id", "username")
+
+
+@dataclass
+class _TrackedPoll:
+    group_id: int
+    results_version: int
+    members_version: int
+    not_voted: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+
+def _version(value: Any) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+class NotVotedTracker:
+    """Неотметившиеся по активным опросам с проверкой по версиям данных."""
+
+    def __init__(self) -> None:
+        self._polls: Dict[str, _TrackedPoll] = {}
+
+    def __len__(self) -> int:
+        return len(self._polls)
+
+    @staticmethod
+    def _is_admin(member: Dict[str, Any]) -> bool:
+        telegram_user_id = member.get("telegram_user_id")
+        return telegram_user_id is not None and int(telegram_user_id) in settings.ADMIN_IDS
+
+    @staticmethod
+    def _record(member: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: member.get(key) for key in MEMBER_FIELDS}
+
+    def seed(
+        self,
+        poll: Dict[str, Any],
+        group: Dict[str, Any],
+        not_voted: Iterable[Dict[str, Any]],
+    ) -> None:
+        """
+        Завести список опроса.
+
+        not_voted должен соответствовать голосам из poll["results"], а реестр
+        читаться после group: тогда версия списка не новее его данных, и
+        любое расхождение приводит к сбросу, а не к неверному списку.
+        Более свежий список, уже обновлённый событиями, не заменяется.
+        """
+        results_version = _version(poll.get("results_version"))
+        members_version = _version(group.get("members_version"))
+        if results_version is None or members_version is None:
+            # Миграция 016 не применена: сверять не по чему
+            return
+        current = self._polls.get(str(poll["id"]))
+        if (
+            current is not None
+            and current.results_version >= results_version
+            and current.members_version >= members_version
+        ):
+            return
+        tracked = _TrackedPoll(
+            group_id=int(group["id"]),
+            results_version=results_version,
+            members_version=members_version,
+        )
+        for member in not_voted:
+            if not self._is_admin(member):
+                tracked.not_voted[int(member["id"])] = self._record(member)
+        poll_id = str(poll["id"])
+        self._polls.pop(poll_id, None)
+        self._polls[poll_id] = tracked
+        while len(self._polls) > MAX_TRACKED_POLLS:
+            self._polls.pop(next(iter(self._polls)))
+
+    def get(self, poll: Dict[str, Any], group: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Неотметившиеся в порядке ФИО или None, если списка нет или он устарел."""
+        tracked = self._polls.get(str(poll["id"]))
+        if tracked is None:
+            return None
+        if (
+            tracked.results_version != _version(poll.get("results_version"))
+            or tracked.members_version != _version(group.get("members_version"))
+        ):
+            self._polls.pop(str(poll["id"]), None)
+            return None
+        return sorted(
+            (dict(member) for member in tracked.not_voted.values()),
+            key=lambda member: (member.get("full_name") or "", member["id"]),
+        )
+
+    def forget(self, poll_id: str) -> None:
+        """Убрать список закрытого или удалённого опроса."""
+        self._polls.pop(str(poll_id), None)
+
+    def clear(self) -> None:
+        self._polls.clear()
+
+    def record_vote(
+        self,
+        poll_id: str,
+        member: Dict[str, Any],
+        voted: bool,
+        results_version: int,
+        members_version: int,
+    ) -> None:
+        """
+        Учесть голос курьера.
+
+        Args:
+            member: Карточка курьера после привязки (sync_group_member)
+            voted: False — голос отозван
+            results_version, members_version: Версии после записи голоса
+        """
+        tracked = self._polls.get(str(poll_id))
+        if tracked is None:
+            return
+        # Привязка карточки при голосе сама меняет members_version
+        expected_members_version = tracked.members_version + (1 if member.get("member_changed") else 0)
+        if (
+            results_version != tracked.results_version + 1
+            or members_version != expected_members_version
+            or int(member.get("group_id") or tracked.group_id) != tracked.group_id
+        ):
+            logger.debug("Список неотметившихся опроса %s устарел, будет пересобран", poll_id)
+            self._polls.pop(str(poll_id), None)
+            return
+
+        tracked.results_version = results_version
+        tracked.members_version = members_version
+        member_id = int(member["id"])
+        if voted or self._is_admin(member):
+            tracked.not_voted.pop(member_id, None)
+        else:
+            tracked.not_voted[member_id] = self._record(member)
+
+    def member_joined(self, member: Dict[str, Any]) -> None:
+        """
+        Учесть карточку после вступления курьера в чат группы.
+
+        Новая карточка добавляется в списки группы: голосов по ней ещё нет.
+        Изменённая карточка обновляется, если курьер уже числится
+        неотметившимся; иначе неизвестно, голосовал ли он, и список
+        сбрасывается. Списки других групп с этой карточкой сбрасываются —
+        курьер перенесён.
+        """
+        if not member.get("member_changed"):
+            return
+        member_id = int(member["id"])
+        group_id = int(member["group_id"])
+        for poll_id, tracked in list(self._polls.items()):
+            if tracked.group_id != group_id:
+                if member_id in tracked.not_voted:
+                    self._polls.pop(poll_id, None)
+                continue
+            if not (member.get("member_created") or member_id in tracked.not_voted):
+                self._polls.pop(poll_id, None)
+                continue
+            tracked.members_version += 1
+            if member.get("is_active", True) and not self._is_admin(member):
+                tracked.not_voted[member_id] = self._record(member)
+            else:
+                tracked.not_voted.pop(member_id, None)
+
+    def member_left(self, group_id: int, telegram_user_id: int) -> None:
+        """Учесть отключение курьера после выхода из чата группы."""
+        for tracked in self._polls.values():
+            if tracked.group_id != int(group_id):
+                continue
+            tracked.members_version += 1
+            for member_id, member in list(tracked.not_voted.items()):
+                if member.get("telegram_user_id") == telegram_user_id:
+                    del tracked.not_voted[member_id]
+
+
+not_voted_tracker = NotVotedTracker()
@@ -0,0 +1,193 @@
+"""
+Сервис готовых отчетов по опросам.
+
+Текст итогов и список неотметившихся собираются один раз на версию данных:
+ключ кэша — results_version опроса и members_version группы (оба счётчика
+увеличивают триггеры БД). Пока голоса не менялись, закрытие опроса и
+просмотр результатов в админке получают готовый текст без запросов к БД
+и повторной сборки строк. После голосов отчет пересобирается в фоне с
+небольшой задержкой, чтобы серия голосов давала одну пересборку.
+"""
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from src.services.group_member_service import build_member_name_maps
+from src.services.not_voted_tracker import not_voted_tracker
+from src.services.report_renderer import format_not_voted_report, layout_for_group, render_results
+
+if TYPE_CHECKING:
+    from src.services.group_member_service import GroupMemberService
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_REPORTS = 1000
+REFRESH_DELAY_SECONDS = 2.0
+
+
+def normalize_results(results: Dict[str, Any] | None) -> Dict[str, Any]:
+    if isinstance(results, dict):
+        results.setdefault("slots", {})
+        results.setdefault("curator", [])
+        results.setdefault("day_off", [])
+        results.setdefault("night_out", [])
+        results.setdefault("not_going", [])
+        results.setdefault("custom", {})
+        return results
+    return {"slots": {}, "curator": [], "day_off": [], "night_out": [], "not_going": [], "custom": {}}
+
+
+def extract_voted_user_ids(results: Dict[str, Any] | None) -> set[int]:
+    results = normalize_results(results)
+    user_ids: set[int] = set()
+    for voters in results.get("slots", {}).values():
+        if isinstance(voters, list):
+            for voter in voters:
+                if isinstance(voter, dict) and voter.get("user_id"):
+                    user_ids.add(int(voter["user_id"]))
+    for voter in results.get("day_off", []):
+        if isinstance(voter, dict) and voter.get("user_id"):
+            user_ids.add(int(voter["user_id"]))
+    for key in ("curator", "night_out", "not_going"):
+        for voter in results.get(key, []):
+            if isinstance(voter, dict) and voter.get("user_id"):
+                user_ids.add(int(voter["user_id"]))
+    custom_results = results.get("custom", {})
+    if isinstance(custom_results, dict):
+        for voters in custom_results.values():
+            if isinstance(voters, list):
+                for voter in voters:
+                    if isinstance(voter, dict) and voter.get("user_id"):
+                        user_ids.add(int(voter["user_id"]))
+    return user_ids
+
+
+def select_not_voted(members: List[Dict[str, Any]], voted_user_ids: set[int]) -> List[Dict[str, Any]]:
+    """Сотрудники реестра, которые не отметились (администраторы не учитываются)."""
+    not_voted: List[Dict[str, Any]] = []
+    for member in members:
+        telegram_user_id = member.get("telegram_user_id")
+        if telegram_user_id is not None and int(telegram_user_id) in settings.ADMIN_IDS:
+            continue
+        if telegram_user_id is None or int(telegram_user_id) not in voted_user_ids:
+            not_voted.append(member)
+    return not_voted
+
+
+@dataclass(frozen=True)
+class PollReport:
+    """Готовый отчет по опросу для одной версии данных."""
+
+    version: Optional[Tuple[int, int]]
+    body: str
+    not_voted: List[Dict[str, Any]]
+    not_voted_text: str
+
+
+class PollReportService:
+    """Кэш отчетов по опросам с инвалидацией по версиям данных."""
+
+    def __init__(self, group_member_service: "GroupMemberService"):
+        """
+        Инициализация сервиса.
+
+        Args:
+            group_member_service: Сервис сотрудников групп
+        """
+        self.group_member_service = group_member_service
+        self._reports: "OrderedDict[str, PollReport]" = OrderedDict()
+        self._pending_refresh: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _version(poll: Dict[str, Any], group: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+        results_version = poll.get("results_version")
+        members_version = group.get("members_version")
+        if results_version is None or members_version is None:
+            # Миграция 016 ещё не применена: кэшировать не по чему
+            return None
+        return int(results_version), int(members_version)
+
+    def get_cached(self, poll: Dict[str, Any], group: Dict[str, Any]) -> Optional[PollReport]:
+        """Готовый отчет, если он собран для текущих версий данных."""
+        version = self._version(poll, group)
+        report = self._reports.get(str(poll["id"])) if "id" in poll else None
+        if version is None or report is None or report.version != version:
+            return None
+        self._reports.move_to_end(str(poll["id"]))
+        return report
+
+    async def get_report(self, poll: Dict[str, Any], group: Dict[str, Any]) -> PollReport:
+        """Отчет по опросу: из кэша или собранный заново."""
+        cached = self.get_cached(poll, group)
+        if cached is not None:
+            return cached
+
+        members = await self.group_member_service.get_group_members(group["id"])
+        report = self.build_report(poll, group, members)
+        if report.version is not None and "id" in poll:
+            # Список собран по тем же голосам: им же заводится список напоминаний
+            not_voted_tracker.seed(poll, group, report.not_voted)
+            self._reports[str(poll["id"])] = report
+            self._reports.move_to_end(str(poll["id"]))
+            while len(self._reports) > MAX_CACHED_REPORTS:
+                self._reports.popitem(last=False)
+        return report
+
+    def build_report(
+        self,
+        poll: Dict[str, Any],
+        group: Dict[str, Any],
+        members: List[Dict[str, Any]],
+    ) -> PollReport:
+        """Собрать отчет из голосов опроса и реестра сотрудников группы."""
+        member_names_by_id, member_names_by_user_id = build_member_name_maps(members)
+        not_voted = select_not_voted(members, extract_voted_user_ids(poll.get("results")))
+        return PollReport(
+            version=self._version(poll, group),
+            body=self.render_body(poll, group, member_names_by_id, member_names_by_user_id),
+            not_voted=not_voted,
+            not_voted_text=format_not_voted_report(not_voted),
+        )
+
+    def schedule_refresh(self, poll: Dict[str, Any], group: Dict[str, Any]) -> None:
+        """
+        Пересобрать отчет в фоне после голоса.
+
+        Серия голосов за REFRESH_DELAY_SECONDS даёт одну пересборку
+        по последнему состоянию опроса.
+        """
+        poll_id = str(poll["id"])
+        already_scheduled = poll_id in self._pending_refresh
+        self._pending_refresh[poll_id] = (poll, group)
+        if already_scheduled:
+            return
+        task = asyncio.create_task(self._refresh_later(poll_id))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh_later(self, poll_id: str) -> None:
+        await asyncio.sleep(REFRESH_DELAY_SECONDS)
+        poll, group = self._pending_refresh.pop(poll_id)
+        try:
+            await self.get_report(poll, group)
+        except Exception as e:
+            logger.warning("Не удалось обновить отчет по опросу %s: %s", poll_id, e)
+
+    def render_body(
+        self,
+        poll: Dict[str, Any],
+        group: Dict[str, Any],
+        member_names_by_id: Dict[int, str],
+        member_names_by_user_id: Dict[int, str],
+    ) -> str:
+        """Текст итогов по вариантам ответа (без заголовка с датой и временем)."""
+        resolve = self.group_member_service.resolve_voter_display_name
+        return render_results(
+            layout_for_group(group),
+            normalize_results(poll.get("results")),
+            lambda voter: resolve(voter, member_names_by_id, member_names_by_user_id),
+        )
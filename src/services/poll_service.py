@@ -10,8 +10,18 @@ from aiogram.exceptions import TelegramNetworkError
 
 from src.repositories.poll_repository import PollRepository
 from src.repositories.group_repository import GroupRepository
+from src.repositories.group_member_repository import GroupMemberRepository
+from src.services.not_voted_tracker import not_voted_tracker
+from src.utils.logging_setup import get_rate_limited_logger
 
 logger = logging.getLogger(__name__)
+# Записи по каждой группе при массовом создании опросов
+creation_logger = get_rate_limited_logger(f"{__name__}.creation")
+
+# Результат создания опроса одной группы
+CREATION_CREATED = "created"
+CREATION_EXISTS = "exists"
+CREATION_FAILED = "failed"
 
 
 class PollService:
@@ -168,7 +178,7 @@ class PollService:
                     message_id=message_id,
                     disable_notification=False,
                 )
-                logger.info(
+                creation_logger.info(
                     "Опрос закреплен в группе %s: chat_id=%s, message_id=%s",
                     group_name,
                     chat_id,
@@ -241,6 +251,22 @@ class PollService:
             raise last_error
         raise RuntimeError(f"Не удалось отправить опрос для группы {group_name}")
     
+    async def _track_not_voted(self, poll: Dict[str, Any], group: Dict[str, Any]) -> None:
+        """
+        Завести список неотметившихся нового опроса: пока это весь реестр группы.
+
+        Ошибка здесь не мешает созданию опроса: напоминание тогда возьмёт
+        список из БД.
+        """
+        if poll.get("results_version") is None or group.get("members_version") is None:
+            return
+        try:
+            members = await GroupMemberRepository(self.poll_repo.pool).get_by_group(group["id"])
+        except Exception as e:
+            logger.warning("Не удалось завести список неотметившихся для группы %s: %s", group.get("name"), e)
+            return
+        not_voted_tracker.seed(poll, group, members)
+
     async def create_daily_polls(self, target_date: Optional[date] = None) -> Tuple[int, List[str]]:
         """
         Создать опросы на указанную дату для всех активных групп.
@@ -257,10 +283,12 @@ class PollService:
             len(groups),
         )
         
-        # Логируем список найденных групп
+        # Список групп пишем только на DEBUG: при сотнях групп он раздувает лог
         if groups:
-            group_names = [g.get('name', f"ID:{g.get('id', '?')}") for g in groups]
-            logger.info("Группы: %s", ", ".join(group_names))
+            logger.debug(
+                "Группы: %s",
+                ", ".join(g.get('name', f"ID:{g.get('id', '?')}") for g in groups),
+            )
         else:
             logger.warning("⚠️ Не найдено активных групп для создания опросов!")
         
@@ -268,97 +296,118 @@ class PollService:
         errors = []
         
         for group in groups:
-            try:
-                group_target_date = self.get_target_date_for_group(group, target_date)
-                # Проверяем, не создан ли уже опрос для этой группы и даты
-                existing = await self.poll_repo.get_by_group_and_date(
-                    group['id'],
+            status, error = await self.create_daily_poll_for_group(group, target_date)
+            if status == CREATION_CREATED:
+                created_count += 1
+            if error:
+                errors.append(error)
+        
+        return created_count, errors
+    
+    async def create_daily_poll_for_group(
+        self,
+        group: Dict[str, Any],
+        target_date: Optional[date] = None,
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Создать ежедневный опрос одной группы, если активного опроса ещё нет.
+        
+        Args:
+            group: Данные группы
+            target_date: Дата опроса (если None - по типу группы)
+            
+        Returns:
+            Кортеж (статус CREATION_*, текст ошибки для отчета или None)
+        """
+        try:
+            group_target_date = self.get_target_date_for_group(group, target_date)
+            # Проверяем, не создан ли уже опрос для этой группы и даты
+            existing = await self.poll_repo.get_by_group_and_date(
+                group['id'],
+                group_target_date
+            )
+            if existing and existing.get("status") == "active":
+                logger.debug(
+                    "Активный опрос уже существует для группы %s на дату %s",
+                    group['name'],
                     group_target_date
                 )
-                if existing and existing.get("status") == "active":
-                    logger.info(
-                        "Активный опрос уже существует для группы %s на дату %s",
-                        group['name'],
-                        group_target_date
-                    )
-                    continue
-                
-                # Получаем слоты из настроек группы
-                settings_data = group.get('settings', {})
-                slots = settings_data.get('slots', [])
-                
-                is_night = group.get('is_night', False)
-                
-                # Для дневных групп требуются слоты
-                if not is_night and not slots:
-                    logger.warning(
-                        "Нет слотов для дневной группы %s, пропускаем создание опроса",
-                        group['name']
-                    )
-                    errors.append(f"Группа {group['name']}: нет настроенных слотов")
-                    continue
-                
-                # Формируем варианты ответов для опроса
-                options = self._format_poll_options(group, slots)
-                question = self._format_poll_question(group, group_target_date)
-                
-                chat_id = group['telegram_chat_id']
-                
-                # Создаем опрос в Telegram
-                try:
-                    poll_message = await self._send_poll_with_retry(
-                        chat_id=chat_id,
-                        question=question,
-                        options=options,
-                        group_name=group['name'],
-                    )
+                return CREATION_EXISTS, None
+            
+            # Получаем слоты из настроек группы
+            settings_data = group.get('settings', {})
+            slots = settings_data.get('slots', [])
+            
+            is_night = group.get('is_night', False)
+            
+            # Для дневных групп требуются слоты
+            if not is_night and not slots:
+                logger.warning(
+                    "Нет слотов для дневной группы %s, пропускаем создание опроса",
+                    group['name']
+                )
+                return CREATION_FAILED, f"Группа {group['name']}: нет настроенных слотов"
+            
+            # Формируем варианты ответов для опроса
+            options = self._format_poll_options(group, slots)
+            question = self._format_poll_question(group, group_target_date)
+            
+            chat_id = group['telegram_chat_id']
+            
+            # Создаем опрос в Telegram
+            try:
+                poll_message = await self._send_poll_with_retry(
+                    chat_id=chat_id,
+                    question=question,
+                    options=options,
+                    group_name=group['name'],
+                )
 
-                    # Закрепляем сразу после отправки. Ошибка БД не должна мешать
-                    # Telegram закрепить уже опубликованный опрос.
-                    pin_error = await self._pin_poll_message(
-                        chat_id=chat_id,
-                        message_id=poll_message.message_id,
-                        group_name=group['name'],
-                    )
-                    
-                    # Сохраняем опрос в БД
-                    poll = await self.poll_repo.create(
-                        group_id=group['id'],
-                        poll_date=group_target_date,
-                        telegram_poll_id=str(poll_message.poll.id),
-                        telegram_message_id=poll_message.message_id,
-                        status="active",
-                    )
+                # Закрепляем сразу после отправки. Ошибка БД не должна мешать
+                # Telegram закрепить уже опубликованный опрос.
+                pin_error = await self._pin_poll_message(
+                    chat_id=chat_id,
+                    message_id=poll_message.message_id,
+                    group_name=group['name'],
+                )
+                
+                # Сохраняем опрос в БД
+                poll = await self.poll_repo.create(
+                    group_id=group['id'],
+                    poll_date=group_target_date,
+                    telegram_poll_id=str(poll_message.poll.id),
+                    telegram_message_id=poll_message.message_id,
+                    status="active",
+                )
+                await self._track_not_voted(poll, group)
 
-                    await self.poll_repo.replace_poll_options(
-                        str(poll["id"]),
-                        self._build_poll_option_rows(group, slots, options),
-                    )
+                await self.poll_repo.replace_poll_options(
+                    str(poll["id"]),
+                    self._build_poll_option_rows(group, slots, options),
+                )
 
-                    created_count += 1
-                    if pin_error:
-                        errors.append(
-                            f"Группа {group['name']}: опрос создан, но не закреплен. "
-                            "Выдайте боту право «Закрепление сообщений». "
-                            f"Telegram: {pin_error}"
-                        )
-                    logger.info(
-                        "Создан опрос для группы %s на дату %s",
-                        group['name'],
-                        group_target_date
+                creation_logger.info(
+                    "Создан опрос для группы %s на дату %s",
+                    group['name'],
+                    group_target_date
+                )
+                if pin_error:
+                    return CREATION_CREATED, (
+                        f"Группа {group['name']}: опрос создан, но не закреплен. "
+                        "Выдайте боту право «Закрепление сообщений». "
+                        f"Telegram: {pin_error}"
                     )
-                    
-                except Exception as e:
-                    error_msg = f"Группа {group['name']}: ошибка создания опроса - {str(e)}"
-                    logger.error(error_msg, exc_info=True)
-                    errors.append(error_msg)
-                    
+                return CREATION_CREATED, None
+                
             except Exception as e:
-                error_msg = f"Группа {group['name']}: ошибка - {str(e)}"
+                error_msg = f"Группа {group['name']}: ошибка создания опроса - {str(e)}"
                 logger.error(error_msg, exc_info=True)
-                errors.append(error_msg)
-        
-        return created_count, errors
+                return CREATION_FAILED, error_msg
+                
+        except Exception as e:
+            error_msg = f"Группа {group['name']}: ошибка - {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return CREATION_FAILED, error_msg
     
     async def create_poll_for_group(
         self,
@@ -422,6 +471,7 @@ class PollService:
                 telegram_message_id=poll_message.message_id,
                 status="active",
             )
+            await self._track_not_voted(poll, group)
 
             await self.poll_repo.replace_poll_options(
                 str(poll["id"]),
@@ -0,0 +1,279 @@
+"""
+Профилирование работающего бота по запросу администратора.
+
+Поддерживаемые режимы:
+- cpu — семплирующий профайлер стека потока event loop (низкие накладные расходы)
+- cprofile — детерминированный cProfile на потоке event loop
+- memory — разница снимков tracemalloc за время замера
+- tasks — дамп всех asyncio-задач со стеками
+
+Каждый замер ограничен по времени, одновременно выполняется только один.
+"""
+import asyncio
+import cProfile
+import io
+import pstats
+import signal
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from config.settings import settings
+
+PROFILE_MODES: Dict[str, str] = {
+    "cpu": "семплирующий CPU-профиль",
+    "cprofile": "CPU-профиль cProfile",
+    "memory": "снимок аллокаций tracemalloc",
+    "tasks": "дамп asyncio-задач",
+}
+
+MAX_SAMPLED_STACK_DEPTH = 40
+TOP_ENTRIES = 40
+
+
+class ProfilerBusyError(RuntimeError):
+    """Замер уже выполняется."""
+
+
+@dataclass(frozen=True)
+class ProfileResult:
+    """Результат замера: файл для отправки и краткая сводка."""
+
+    filename: str
+    content: bytes
+    summary: str
+
+
+class ProfilerService:
+    """Ограниченные по времени замеры производительности работающего процесса."""
+
+    def __init__(self, max_seconds: Optional[int] = None):
+        """
+        Инициализация сервиса.
+
+        Args:
+            max_seconds: Жёсткий предел длительности одного замера
+        """
+        self.max_seconds = max_seconds or settings.PROFILER_MAX_SECONDS
+        self._lock = asyncio.Lock()
+
+    def clamp_duration(self, seconds: Optional[int]) -> int:
+        """Привести длительность замера к допустимому диапазону."""
+        if not seconds:
+            return min(10, self.max_seconds)
+        return max(1, min(int(seconds), self.max_seconds))
+
+    async def capture(self, mode: str, seconds: Optional[int] = None) -> ProfileResult:
+        """
+        Выполнить замер в выбранном режиме.
+
+        Args:
+            mode: Режим из PROFILE_MODES
+            seconds: Длительность замера (ограничивается max_seconds)
+
+        Returns:
+            Результат замера
+
+        Raises:
+            ValueError: Неизвестный режим
+            ProfilerBusyError: Другой замер ещё не завершён
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Неизвестный режим профилирования: {mode}")
+        if self._lock.locked():
+            raise ProfilerBusyError("Другой замер уже выполняется")
+
+        duration = self.clamp_duration(seconds)
+        async with self._lock:
+            if mode == "cpu":
+                return await self._capture_sampling(duration)
+            if mode == "cprofile":
+                return await self._capture_cprofile(duration)
+            if mode == "memory":
+                return await self._capture_memory(duration)
+            return self._capture_tasks()
+
+    @staticmethod
+    def _filename(mode: str, extension: str = "txt") -> str:
+        return f"profile_{mode}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+    async def _capture_sampling(self, duration: int) -> ProfileResult:
+        """
+        Семплирование стека потока event loop.
+
+        Если loop работает в главном потоке, используется таймер ITIMER_PROF:
+        замеры идут по процессорному времени и снимаются ровно в месте
+        выполнения. Иначе стек снимается из отдельного потока (замеры смещены
+        к моментам освобождения GIL, например к вызову select).
+        """
+        loop_thread_id = threading.get_ident()
+        interval = settings.PROFILER_SAMPLE_INTERVAL_MS / 1000
+        stacks: Counter = Counter()
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        samples = 0
+
+        def record(frame) -> None:
+            nonlocal samples
+            names = []
+            while frame is not None and len(names) < MAX_SAMPLED_STACK_DEPTH:
+                code = frame.f_code
+                names.append(
+                    f"{code.co_qualname} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if not names:
+                return
+            names.reverse()
+            samples += 1
+            stacks[";".join(names)] += 1
+            self_counts[names[-1]] += 1
+            for name in set(names):
+                total_counts[name] += 1
+
+        use_timer = (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        )
+        if use_timer:
+            previous_handler = signal.signal(signal.SIGPROF, lambda signum, frame: record(frame))
+            signal.setitimer(signal.ITIMER_PROF, interval, interval)
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                signal.setitimer(signal.ITIMER_PROF, 0, 0)
+                signal.signal(signal.SIGPROF, previous_handler)
+            backend = "ITIMER_PROF (процессорное время)"
+        else:
+            stop_event = threading.Event()
+
+            def sampler() -> None:
+                while not stop_event.wait(interval):
+                    frame = sys._current_frames().get(loop_thread_id)
+                    if frame is not None:
+                        record(frame)
+
+            thread = threading.Thread(target=sampler, name="profiler-sampler", daemon=True)
+            thread.start()
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                stop_event.set()
+                await asyncio.to_thread(thread.join, 1)
+            backend = "поток-семплер (реальное время)"
+
+        output = io.StringIO()
+        output.write(f"Семплирующий профиль event loop: {duration} сек, {samples} замеров\n")
+        output.write(f"Источник замеров: {backend}\n")
+        output.write("Замеры в select/epoll означают, что loop простаивает.\n\n")
+        output.write("=== Собственное время (функция на вершине стека) ===\n")
+        for name, count in self_counts.most_common(TOP_ENTRIES):
+            output.write(f"{count / max(samples, 1) * 100:6.1f}%  {count:6d}  {name}\n")
+        output.write("\n=== Включённое время (функция в любом месте стека) ===\n")
+        for name, count in total_counts.most_common(TOP_ENTRIES):
+            output.write(f"{count / max(samples, 1) * 100:6.1f}%  {count:6d}  {name}\n")
+        output.write("\n=== Свёрнутые стеки (формат flamegraph.pl) ===\n")
+        for stack, count in stacks.most_common():
+            output.write(f"{stack} {count}\n")
+
+        top = self_counts.most_common(1)
+        summary = f"Замеров: {samples}"
+        if top:
+            summary += f", чаще всего на вершине: {top[0][0]}"
+        return ProfileResult(self._filename("cpu"), output.getvalue().encode("utf-8"), summary)
+
+    async def _capture_cprofile(self, duration: int) -> ProfileResult:
+        """cProfile на потоке event loop: все корутины, выполнявшиеся за время замера."""
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+
+        def render() -> str:
+            output = io.StringIO()
+            output.write(f"cProfile event loop: {duration} сек\n\n")
+            stats = pstats.Stats(profiler, stream=output)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_ENTRIES)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(TOP_ENTRIES)
+            return output.getvalue()
+
+        text = await asyncio.to_thread(render)
+        return ProfileResult(
+            self._filename("cprofile"),
+            text.encode("utf-8"),
+            f"cProfile за {duration} сек",
+        )
+
+    async def _capture_memory(self, duration: int) -> ProfileResult:
+        """Разница снимков tracemalloc между началом и концом замера."""
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(settings.PROFILER_TRACEMALLOC_FRAMES)
+        try:
+            before = tracemalloc.take_snapshot()
+            await asyncio.sleep(duration)
+            after = tracemalloc.take_snapshot()
+        finally:
+            if started_here:
+                tracemalloc.stop()
+
+        def render() -> tuple[str, str]:
+            output = io.StringIO()
+            current = sum(stat.size for stat in after.statistics("filename"))
+            output.write(
+                f"tracemalloc за {duration} сек, отслеживается {current / 1024 / 1024:.1f} MB\n"
+            )
+            if started_here:
+                output.write(
+                    "Трассировка включена только на время замера: "
+                    "видны аллокации, сделанные за эти секунды.\n"
+                )
+            output.write("\n=== Рост по строкам кода ===\n")
+            diff = after.compare_to(before, "lineno")
+            for stat in diff[:TOP_ENTRIES]:
+                output.write(f"{stat}\n")
+            output.write("\n=== Крупнейшие места аллокаций (с трассой) ===\n")
+            for stat in after.statistics("traceback")[:10]:
+                output.write(f"\n{stat.size / 1024:.1f} KiB в {stat.count} блоках\n")
+                for line in stat.traceback.format(limit=settings.PROFILER_TRACEMALLOC_FRAMES):
+                    output.write(f"{line}\n")
+            top_line = str(diff[0]) if diff else "изменений нет"
+            return output.getvalue(), top_line
+
+        text, top_line = await asyncio.to_thread(render)
+        return ProfileResult(
+            self._filename("memory"),
+            text.encode("utf-8"),
+            f"Наибольший рост: {top_line}",
+        )
+
+    def _capture_tasks(self) -> ProfileResult:
+        """Дамп всех asyncio-задач со стеками."""
+        tasks = sorted(asyncio.all_tasks(), key=lambda task: task.get_name())
+        output = io.StringIO()
+        output.write(f"asyncio-задач: {len(tasks)}, {datetime.now().isoformat(timespec='seconds')}\n")
+        states = Counter()
+        for task in tasks:
+            coro = task.get_coro()
+            coro_name = getattr(coro, "__qualname__", repr(coro))
+            state = "done" if task.done() else "pending"
+            states[coro_name] += 1
+            output.write(f"\n--- {task.get_name()} [{state}] {coro_name}\n")
+            task.print_stack(limit=15, file=output)
+
+        output.write("\n=== Задачи по корутинам ===\n")
+        for coro_name, count in states.most_common():
+            output.write(f"{count:5d}  {coro_name}\n")
+
+        return ProfileResult(
+            self._filename("tasks"),
+            output.getvalue().encode("utf-8"),
+            f"Задач: {len(tasks)}",
+        )
+
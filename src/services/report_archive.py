@@ -0,0 +1,223 @@
+"""
+Архив отчетов по опросам.
+
+Отчеты групп складываются в помесячные файлы reports/<группа>/<ГГГГ-ММ>.gz.
+Каждый отчет дописывается в конец файла отдельным gzip-блоком, поэтому
+файл только растёт и уже записанные данные не переписываются. Рядом лежит
+общий индекс reports/index.tsv: группа, дата, файл, смещение и длина блока.
+Индекс держится в памяти и дочитывается только по новым строкам, поэтому
+поиск отчета — это словарь и один seek, а выгрузка месяца читает только
+нужные блоки.
+
+Вся работа с диском идёт в отдельном потоке: один поток-писатель
+сохраняет порядок записей и не блокирует event loop.
+"""
+import asyncio
+import gzip
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = "index.tsv"
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    """Положение одного отчета в архиве."""
+
+    group_name: str
+    report_date: date
+    bundle: str
+    offset: int
+    length: int
+
+    def to_line(self) -> str:
+        return (
+            f"{self.group_name}\t{self.report_date.isoformat()}\t"
+            f"{self.bundle}\t{self.offset}\t{self.length}\n"
+        )
+
+    @classmethod
+    def from_line(cls, line: str) -> "ArchiveEntry":
+        group_name, report_date, bundle, offset, length = line.rstrip("\n").split("\t")
+        return cls(group_name, date.fromisoformat(report_date), bundle, int(offset), int(length))
+
+
+def _clean_name(value: str) -> str:
+    """
+    Имя группы, пригодное для индекса и имени каталога.
+
+    Результат — ровно один сегмент пути внутри каталога архива: разделители
+    и NUL заменяются, а «.», «..» и имя файла индекса не допускаются.
+    """
+    cleaned = " ".join(str(value).split())
+    for char in ("/", "\\", "\0"):
+        cleaned = cleaned.replace(char, "_")
+    if not cleaned:
+        return "unknown"
+    if set(cleaned) == {"."} or cleaned == INDEX_FILE_NAME:
+        return f"_{cleaned}"
+    return cleaned
+
+
+class ReportArchive:
+    """Сжатый помесячный архив отчетов с индексом."""
+
+    def __init__(self, base_dir: Optional[Path] = None, compress_level: Optional[int] = None):
+        """
+        Инициализация архива.
+
+        Args:
+            base_dir: Каталог архива (по умолчанию REPORTS_DIR)
+            compress_level: Уровень gzip-сжатия 1–9 (по умолчанию REPORTS_COMPRESS_LEVEL)
+        """
+        self.base_dir = Path(base_dir or settings.REPORTS_DIR)
+        self.compress_level = compress_level or settings.REPORTS_COMPRESS_LEVEL
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-archive")
+        self._index: Dict[Tuple[str, date], ArchiveEntry] = {}
+        self._index_offset = 0
+
+    @property
+    def index_path(self) -> Path:
+        return self.base_dir / INDEX_FILE_NAME
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _ensure_index(self) -> None:
+        # Поток архива один, поэтому дочитывание индекса не пересекается с записью
+        await self._run(self._refresh_index_sync)
+
+    def _refresh_index_sync(self) -> None:
+        """
+        Дочитать индекс с места, где остановились в прошлый раз.
+
+        Индекс только дописывается, поэтому новые записи — в том числе
+        сделанные другой репликой — дочитываются с сохранённого смещения.
+        """
+        try:
+            size = self.index_path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size == self._index_offset:
+            return
+        if size < self._index_offset:
+            # Индекс пересоздали — читаем заново
+            self._index.clear()
+            self._index_offset = 0
+
+        with self.index_path.open("rb") as index_file:
+            index_file.seek(self._index_offset)
+            data = index_file.read(size - self._index_offset)
+        # Недописанный хвост без перевода строки дочитаем в следующий раз
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            try:
+                entry = ArchiveEntry.from_line(line)
+            except ValueError:
+                logger.warning("Пропущена повреждённая строка индекса отчетов: %r", line[:200])
+                continue
+            # Повторно сохранённый отчет за ту же дату заменяет прежний
+            self._index[(entry.group_name, entry.report_date)] = entry
+        if self._index_offset == 0:
+            logger.info("Индекс архива отчетов загружен: %d записей", len(self._index))
+        self._index_offset += len(complete)
+
+    def _append_sync(self, group_name: str, report_date: date, text: str) -> ArchiveEntry:
+        bundle = Path(group_name) / f"{report_date.strftime('%Y-%m')}.gz"
+        bundle_path = self.base_dir / bundle
+        bundle_path.parent.mkdir(parents=True, exist_ok=True)
+        block = gzip.compress(text.encode("utf-8"), compresslevel=self.compress_level)
+
+        with bundle_path.open("ab") as bundle_file:
+            offset = bundle_file.seek(0, os.SEEK_END)
+            bundle_file.write(block)
+
+        entry = ArchiveEntry(group_name, report_date, bundle.as_posix(), offset, len(block))
+        # Индекс дописывается после блока: при сбое между ними блок просто не виден
+        line = entry.to_line().encode("utf-8")
+        with self.index_path.open("a+b") as index_file:
+            end = index_file.seek(0, os.SEEK_END)
+            if end:
+                index_file.seek(end - 1)
+                # Хвост, оборванный аварийной остановкой, не должен склеиться с новой строкой
+                if index_file.read(1) != b"\n":
+                    line = b"\n" + line
+            index_file.write(line)
+        self._refresh_index_sync()
+        return entry
+
+    def _read_sync(self, entry: ArchiveEntry) -> str:
+        with (self.base_dir / entry.bundle).open("rb") as bundle_file:
+            bundle_file.seek(entry.offset)
+            block = bundle_file.read(entry.length)
+        return gzip.decompress(block).decode("utf-8")
+
+    async def append(self, group_name: str, report_date: date, text: str) -> str:
+        """
+        Сохранить отчет группы за дату.
+
+        Returns:
+            Путь к помесячному файлу архива
+        """
+        entry = await self._run(self._append_sync, _clean_name(group_name), report_date, text)
+        return str(self.base_dir / entry.bundle)
+
+    def _save_image_sync(self, group_name: str, report_date: date, data: bytes) -> Path:
+        image_path = self.base_dir / group_name / f"{report_date.isoformat()}.png"
+        image_path.parent.mkdir(parents=True, exist_ok=True)
+        image_path.write_bytes(data)
+        return image_path
+
+    async def save_image(self, group_name: str, report_date: date, data: bytes) -> str:
+        """
+        Сохранить картинку с итогами рядом с архивом группы.
+
+        Returns:
+            Путь к PNG-файлу
+        """
+        return str(await self._run(self._save_image_sync, _clean_name(group_name), report_date, data))
+
+    async def get(self, group_name: str, report_date: date) -> Optional[str]:
+        """Текст отчета группы за дату или None."""
+        await self._ensure_index()
+        entry = self._index.get((_clean_name(group_name), report_date))
+        if entry is None:
+            return None
+        return await self._run(self._read_sync, entry)
+
+    def _list_dates_sync(self, group_name: str, year: int, month: int) -> List[date]:
+        return sorted(
+            report_date
+            for entry_group, report_date in self._index
+            if entry_group == group_name and report_date.year == year and report_date.month == month
+        )
+
+    async def list_dates(self, group_name: str, year: int, month: int) -> List[date]:
+        """Даты отчетов группы за месяц."""
+        await self._ensure_index()
+        # Индекс меняется только в потоке архива, там же его и обходим
+        return await self._run(self._list_dates_sync, _clean_name(group_name), year, month)
+
+    def _export_month_sync(self, group_name: str, year: int, month: int) -> List[Tuple[date, str]]:
+        return [
+            (report_date, self._read_sync(self._index[(group_name, report_date)]))
+            for report_date in self._list_dates_sync(group_name, year, month)
+        ]
+
+    async def export_month(self, group_name: str, year: int, month: int) -> List[Tuple[date, str]]:
+        """Все отчеты группы за месяц по порядку дат."""
+        await self._ensure_index()
+        return await self._run(self._export_month_sync, _clean_name(group_name), year, month)
+
+    async def close(self) -> None:
+        """Дождаться записи отчетов из очереди и остановить поток архива."""
+        await asyncio.to_thread(self._executor.shutdown, True)
@@ -0,0 +1,307 @@
+"""
+Картинки с итогами опросов.
+
+Диаграмма по вариантам ответа рисуется Pillow в отдельных процессах
+(ProcessPoolExecutor): отрисовка занимает процессор на десятки
+миллисекунд и в event loop задерживала бы обработку голосов. Процессы
+запускаются заранее при старте бота и держат загруженные шрифты, поэтому
+закрытие опроса не платит за запуск интерпретатора. Очередь ограничена:
+если отрисовок в работе больше REPORT_IMAGE_QUEUE_SIZE, картинка
+пропускается — текстовый отчет уходит в любом случае.
+"""
+import asyncio
+import importlib.util
+import io
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ReportRow = Tuple[str, str, int]
+
+IMAGE_WIDTH = 960
+PADDING = 32
+HEADER_HEIGHT = 110
+SECTION_HEIGHT = 52
+ROW_HEIGHT = 46
+LABEL_WIDTH = 330
+COUNT_WIDTH = 70
+
+BACKGROUND = (255, 255, 255)
+TEXT_COLOR = (33, 37, 41)
+MUTED_COLOR = (108, 117, 125)
+TRACK_COLOR = (236, 239, 242)
+# Смены — зелёным, дополнительные ответы — синим
+SECTION_COLORS = ((46, 160, 67), (56, 120, 200))
+EMPTY_COLOR = (214, 69, 65)
+
+_fonts: Dict[int, Any] = {}
+_font_path: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ReportImage:
+    """Готовая картинка и время её получения."""
+
+    data: bytes
+    render_ms: float
+    total_ms: float
+
+
+def _load_font(size: int) -> Any:
+    from PIL import ImageFont
+
+    font = _fonts.get(size)
+    if font is None:
+        try:
+            font = ImageFont.truetype(_font_path, size) if _font_path else ImageFont.load_default(size)
+        except OSError:
+            # Встроенный шрифт Pillow без кириллицы, но картинка хотя бы получится
+            font = ImageFont.load_default(size)
+        _fonts[size] = font
+    return font
+
+
+def _init_worker(font_path: Optional[str]) -> None:
+    """Подготовка процесса: импорт Pillow и загрузка шрифтов до первого отчета."""
+    global _font_path
+    _font_path = font_path
+    for size in (16, 20, 28):
+        _load_font(size)
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _fit_text(draw: Any, text: str, font: Any, width: int) -> str:
+    if draw.textlength(text, font=font) <= width:
+        return text
+    while text and draw.textlength(text + "…", font=font) > width:
+        text = text[:-1]
+    return text + "…"
+
+
+def render_report_image(title: str, subtitle: str, rows: Sequence[ReportRow]) -> Tuple[bytes, float]:
+    """
+    Нарисовать диаграмму итогов опроса (выполняется в процессе пула).
+
+    Args:
+        title: Заголовок (название группы)
+        subtitle: Подзаголовок (дата опроса)
+        rows: Тройки (раздел, вариант, число голосов)
+
+    Returns:
+        PNG и время отрисовки в миллисекундах
+    """
+    from PIL import Image, ImageDraw
+
+    started = time.perf_counter()
+    sections = [section for index, (section, _, _) in enumerate(rows) if index == 0 or rows[index - 1][0] != section]
+    height = HEADER_HEIGHT + len(sections) * SECTION_HEIGHT + len(rows) * ROW_HEIGHT + PADDING
+    image = Image.new("RGB", (IMAGE_WIDTH, height), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    title_font, text_font, small_font = _load_font(28), _load_font(20), _load_font(16)
+
+    draw.text((PADDING, PADDING), _fit_text(draw, title, title_font, IMAGE_WIDTH - 2 * PADDING), font=title_font, fill=TEXT_COLOR)
+    draw.text((PADDING, PADDING + 42), subtitle, font=small_font, fill=MUTED_COLOR)
+
+    max_count = max((count for _, _, count in rows), default=0) or 1
+    bar_left = PADDING + LABEL_WIDTH
+    bar_width = IMAGE_WIDTH - bar_left - COUNT_WIDTH - PADDING
+    y = HEADER_HEIGHT
+    seen_sections: List[str] = []
+    for section, label, count in rows:
+        if not seen_sections or seen_sections[-1] != section:
+            draw.text((PADDING, y + 18), section, font=text_font, fill=MUTED_COLOR)
+            y += SECTION_HEIGHT
+            seen_sections.append(section)
+        color = EMPTY_COLOR if count == 0 else SECTION_COLORS[min(len(seen_sections), len(SECTION_COLORS)) - 1]
+
+        draw.text((PADDING, y + 10), _fit_text(draw, label, text_font, LABEL_WIDTH - 16), font=text_font, fill=TEXT_COLOR)
+        draw.rounded_rectangle((bar_left, y + 8, bar_left + bar_width, y + ROW_HEIGHT - 8), radius=6, fill=TRACK_COLOR)
+        if count:
+            filled = max(12, round(bar_width * count / max_count))
+            draw.rounded_rectangle((bar_left, y + 8, bar_left + filled, y + ROW_HEIGHT - 8), radius=6, fill=color)
+        draw.text((bar_left + bar_width + 14, y + 10), str(count), font=text_font, fill=color if count == 0 else TEXT_COLOR)
+        y += ROW_HEIGHT
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue(), (time.perf_counter() - started) * 1000
+
+
+class ReportImageService:
+    """Пул процессов для отрисовки картинок с итогами опросов."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        font_path: Optional[str] = None,
+    ):
+        """
+        Инициализация сервиса.
+
+        Args:
+            workers: Число процессов отрисовки (по умолчанию REPORT_IMAGE_WORKERS)
+            queue_size: Сколько отрисовок может ждать одновременно (REPORT_IMAGE_QUEUE_SIZE)
+            timeout_seconds: Предельное время одной отрисовки (REPORT_IMAGE_TIMEOUT_SECONDS)
+            font_path: TTF-шрифт с кириллицей (REPORT_IMAGE_FONT)
+        """
+        self.workers = max(1, workers or settings.REPORT_IMAGE_WORKERS)
+        self.queue_size = max(1, queue_size or settings.REPORT_IMAGE_QUEUE_SIZE)
+        self.timeout_seconds = timeout_seconds or settings.REPORT_IMAGE_TIMEOUT_SECONDS
+        self.font_path = font_path if font_path is not None else settings.REPORT_IMAGE_FONT
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self.rendered = 0
+        self.skipped = 0
+        self.failed = 0
+        self.restarts = 0
+        self.last_render_ms: Optional[float] = None
+        self.max_render_ms = 0.0
+
+    @property
+    def available(self) -> bool:
+        return self._pool is not None
+
+    async def start(self) -> None:
+        """Запустить процессы и дождаться их готовности."""
+        if self._pool is not None:
+            return
+        if importlib.util.find_spec("PIL") is None:
+            logger.warning("Pillow не установлен: картинки с итогами опросов отключены")
+            return
+        if self.font_path and not os.path.exists(self.font_path):
+            logger.warning("Шрифт %s не найден, кириллица на картинках может не отображаться", self.font_path)
+
+        started = time.perf_counter()
+        self._pool = self._create_pool()
+        loop = asyncio.get_running_loop()
+        try:
+            pids = await asyncio.gather(
+                *(loop.run_in_executor(self._pool, _warm_up) for _ in range(self.workers))
+            )
+        except Exception as e:
+            logger.error("Не удалось запустить процессы отрисовки отчетов: %s", e, exc_info=True)
+            await self.stop()
+            return
+        logger.info(
+            "Процессы отрисовки отчетов готовы: %d за %.0f мс (pid %s)",
+            len(set(pids)),
+            (time.perf_counter() - started) * 1000,
+            ", ".join(str(pid) for pid in sorted(set(pids))),
+        )
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        # spawn: процессы не наследуют потоки и соединения бота
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.font_path,),
+        )
+
+    async def _replace_broken_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Пересоздать пул, в котором упал процесс: сломанный пул больше не принимает задачи."""
+        if self._pool is broken:
+            self._pool = self._create_pool()
+            self.restarts += 1
+            logger.warning("Процесс отрисовки отчетов упал, пул процессов пересоздан")
+        await asyncio.to_thread(broken.shutdown, False, cancel_futures=True)
+
+    async def stop(self) -> None:
+        """Остановить процессы отрисовки."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, True, cancel_futures=True)
+
+    async def render(self, title: str, subtitle: str, rows: List[ReportRow]) -> Optional[ReportImage]:
+        """
+        Нарисовать картинку с итогами.
+
+        Если процесс отрисовки упал (BrokenProcessPool), пул пересоздаётся
+        и отрисовка повторяется один раз.
+
+        Returns:
+            Картинку или None, если пул не запущен, очередь заполнена
+            или отрисовка не удалась
+        """
+        if self._pool is None:
+            return None
+        if self._pending >= self.queue_size:
+            self.skipped += 1
+            logger.warning("Очередь отрисовки отчетов заполнена (%d), картинка для %s пропущена", self._pending, title)
+            return None
+
+        started = time.perf_counter()
+        for attempt in range(2):
+            pool = self._pool
+            if pool is None:
+                return None
+            try:
+                data, render_ms = await self._render_in_pool(pool, title, subtitle, rows)
+                break
+            except BrokenProcessPool as e:
+                await self._replace_broken_pool(pool)
+                if attempt == 0:
+                    logger.warning("Пул отрисовки сломан (%r), повторяем отрисовку для %s", e, title)
+                    continue
+                self.failed += 1
+                logger.error("Ошибка отрисовки отчета для %s: %r", title, e)
+                return None
+            except Exception as e:
+                self.failed += 1
+                logger.error("Ошибка отрисовки отчета для %s: %r", title, e)
+                return None
+
+        total_ms = (time.perf_counter() - started) * 1000
+        self.rendered += 1
+        self.last_render_ms = render_ms
+        self.max_render_ms = max(self.max_render_ms, render_ms)
+        logger.info(
+            "Картинка отчета для %s: отрисовка %.0f мс, с очередью %.0f мс, %d КБ",
+            title, render_ms, total_ms, len(data) // 1024,
+        )
+        return ReportImage(data=data, render_ms=render_ms, total_ms=total_ms)
+
+    async def _render_in_pool(
+        self, pool: ProcessPoolExecutor, title: str, subtitle: str, rows: List[ReportRow]
+    ) -> Tuple[bytes, float]:
+        future = asyncio.get_running_loop().run_in_executor(pool, render_report_image, title, subtitle, rows)
+        # Место в очереди освобождается, когда процесс закончил отрисовку,
+        # а не когда истекло ожидание: после таймаута процесс ещё занят
+        self._pending += 1
+        future.add_done_callback(self._release_slot)
+        return await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout_seconds)
+
+    def _release_slot(self, future: "asyncio.Future[Tuple[bytes, float]]") -> None:
+        self._pending -= 1
+        if not future.cancelled() and future.exception() is not None:
+            # Ошибку отрисовки, которую уже не ждут, не оставляем непрочитанной
+            logger.debug("Отрисовка отчета завершилась с ошибкой: %r", future.exception())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Счётчики для админских команд."""
+        return {
+            "available": self.available,
+            "workers": self.workers,
+            "pending": self._pending,
+            "queue_size": self.queue_size,
+            "rendered": self.rendered,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "restarts": self.restarts,
+            "last_render_ms": self.last_render_ms,
+            "max_render_ms": self.max_render_ms,
+        }
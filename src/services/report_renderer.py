@@ -0,0 +1,239 @@
+"""
+Сборка текста отчетов по опросам.
+
+Раскладка отчета (какие блоки, в каком порядке, с какими подписями и
+лимитами имён) зависит только от настроек группы: типа группы, слотов и
+дополнительных ответов. Она компилируется один раз на конфигурацию и
+кэшируется; при рендере остаётся пройти по готовым блокам и собрать
+строки через join. Длинные сообщения делятся по границам строк под
+лимит Telegram.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from html import escape
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+VoterName = Callable[[Any], str]
+
+
+def format_people_count(count: int) -> str:
+    if count % 10 == 1 and count % 100 != 11:
+        return f"{count} человек"
+    if count % 10 in (2, 3, 4) and count % 100 not in (12, 13, 14):
+        return f"{count} человека"
+    return f"{count} человек"
+
+
+def format_member_tag(member: Dict[str, Any]) -> str:
+    full_name = escape(member.get("full_name", "Неизвестный курьер"))
+    username = member.get("username")
+    if username:
+        username = str(username)
+        username = username if username.startswith("@") else f"@{username}"
+        return f"{full_name} ({escape(username)})"
+    telegram_user_id = member.get("telegram_user_id")
+    if telegram_user_id:
+        return f'<a href="tg://user?id={telegram_user_id}">{full_name}</a>'
+    return full_name
+
+
+def format_not_voted_report(not_voted: List[Dict[str, Any]]) -> str:
+    if not not_voted:
+        return "✅ <b>Все курьеры из реестра отметились в опросе.</b>"
+
+    lines = "\n".join(f"• {format_member_tag(member)}" for member in not_voted[:50])
+    if len(not_voted) > 50:
+        lines += f"\n... и еще {len(not_voted) - 50}"
+    return "❌ <b>Не отметились:</b>\n" + lines
+
+
+@dataclass(frozen=True)
+class VoterBlock:
+    """Блок одного варианта ответа: заголовок с числом людей и имена."""
+
+    path: Tuple[str, ...]
+    label: str
+    head: str
+    empty_line: Optional[str]
+    limit: int
+    show_remaining: bool
+
+
+@dataclass(frozen=True)
+class BlockGroup:
+    """Подряд идущие блоки с общим заголовком, который выводится перед первым непустым блоком."""
+
+    heading: str
+    blocks: Tuple[VoterBlock, ...]
+    always_show_heading: bool
+
+
+@dataclass(frozen=True)
+class ReportLayout:
+    """Скомпилированная раскладка отчета для одной конфигурации группы."""
+
+    groups: Tuple[BlockGroup, ...]
+
+
+def _voter_block(
+    path: Tuple[str, ...],
+    label: str,
+    filled_prefix: str,
+    empty_prefix: Optional[str],
+    limit: int,
+    show_remaining: bool,
+) -> VoterBlock:
+    return VoterBlock(
+        path=path,
+        label=label,
+        head=f"{filled_prefix}{label} — ",
+        empty_line=f"{empty_prefix}{label} — нет курьеров\n\n" if empty_prefix is not None else None,
+        limit=limit,
+        show_remaining=show_remaining,
+    )
+
+
+@lru_cache(maxsize=512)
+def compile_layout(
+    is_night: bool,
+    slots: Tuple[Tuple[str, str], ...],
+    extra_options: Tuple[str, ...],
+) -> ReportLayout:
+    """
+    Скомпилировать раскладку отчета.
+
+    Args:
+        is_night: Ночная группа
+        slots: Пары (начало, конец) слотов дневной группы
+        extra_options: Тексты дополнительных ответов
+    """
+    # Ночные группы показывают до 20 имён без хвоста, дневные — до 10 с «и еще N»
+    limit, show_remaining = (20, False) if is_night else (10, True)
+    groups: List[BlockGroup] = []
+
+    if is_night:
+        shifts = tuple(
+            _voter_block((key,), title, "✅ ", "❌ ", limit, show_remaining)
+            for title, key in (("Выхожу", "night_out"), ("Не выхожу", "not_going"))
+        )
+        groups.append(BlockGroup("Рабочие смены\n\n", shifts, True))
+    elif slots:
+        shifts = tuple(
+            _voter_block(("slots", f"slot_{index}"), f"{start}–{end}", "✅ ", "❌ ", limit, show_remaining)
+            for index, (start, end) in enumerate(slots)
+        )
+        groups.append(BlockGroup("Рабочие смены\n\n", shifts, True))
+
+    additional = [_voter_block(("day_off",), "Выходной", "🏖 ", None, limit, show_remaining)]
+    additional.extend(
+        _voter_block(("custom", f"option_{index}"), option_text, "📝 ", None, limit, show_remaining)
+        for index, option_text in enumerate(extra_options)
+    )
+    groups.append(BlockGroup("Дополнительно\n\n", tuple(additional), False))
+    return ReportLayout(tuple(groups))
+
+
+def layout_for_group(group: Dict[str, Any]) -> ReportLayout:
+    """Раскладка отчета по настройкам группы."""
+    settings_data = group.get("settings") or {}
+    slots = settings_data.get("slots") or []
+    extra_options = settings_data.get("extra_options") or []
+    if not isinstance(extra_options, list):
+        extra_options = []
+    return compile_layout(
+        bool(group.get("is_night", False)),
+        tuple((str(slot.get("start", "?")), str(slot.get("end", "?"))) for slot in slots),
+        tuple(str(option) for option in extra_options),
+    )
+
+
+def _lookup_voters(results: Dict[str, Any], path: Tuple[str, ...]) -> List[Any]:
+    value: Any = results
+    for key in path:
+        if not isinstance(value, dict):
+            return []
+        value = value.get(key)
+    return value if isinstance(value, list) else []
+
+
+def render_results(layout: ReportLayout, results: Dict[str, Any], voter_name: VoterName) -> str:
+    """
+    Текст итогов по вариантам ответа.
+
+    Args:
+        layout: Скомпилированная раскладка группы
+        results: Голоса опроса (daily_polls.results)
+        voter_name: Имя голосовавшего для отчета
+    """
+    parts: List[str] = []
+    for group in layout.groups:
+        if group.always_show_heading:
+            parts.append(group.heading)
+        heading_shown = group.always_show_heading
+        for block in group.blocks:
+            voters = _lookup_voters(results, block.path)
+            if not voters:
+                if block.empty_line is not None:
+                    parts.append(block.empty_line)
+                continue
+            if not heading_shown:
+                parts.append(group.heading)
+                heading_shown = True
+            parts.append(block.head)
+            parts.append(format_people_count(len(voters)))
+            parts.append("\n")
+            for voter in voters[:block.limit]:
+                parts.append(f"• {voter_name(voter)}\n")
+            if block.show_remaining and len(voters) > block.limit:
+                parts.append(f"... и еще {len(voters) - block.limit}\n")
+            parts.append("\n")
+    return "".join(parts)
+
+
+def summarize_results(layout: ReportLayout, results: Dict[str, Any]) -> List[Tuple[str, str, int]]:
+    """
+    Число голосов по вариантам в порядке текстового отчета.
+
+    Возвращает тройки (раздел, вариант, число голосов). Как и в тексте,
+    пустые варианты дополнительного раздела пропускаются.
+    """
+    rows: List[Tuple[str, str, int]] = []
+    for group in layout.groups:
+        section = group.heading.strip()
+        for block in group.blocks:
+            count = len(_lookup_voters(results, block.path))
+            if count or block.empty_line is not None:
+                rows.append((section, block.label, count))
+    return rows
+
+
+def split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """
+    Разбить текст на сообщения не длиннее limit.
+
+    Режем по границам строк, чтобы не разорвать HTML-теги: каждая строка
+    отчета замкнута сама по себе. Строка длиннее лимита режется жёстко.
+    """
+    if len(text) <= limit:
+        return [text]
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_length = 0
+    for line in text.splitlines(keepends=True):
+        while len(line) > limit:
+            if current:
+                chunks.append("".join(current))
+                current, current_length = [], 0
+            chunks.append(line[:limit])
+            line = line[limit:]
+        if current_length + len(line) > limit:
+            chunks.append("".join(current))
+            current, current_length = [], 0
+        current.append(line)
+        current_length += len(line)
+    if current:
+        chunks.append("".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
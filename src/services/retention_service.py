@@ -0,0 +1,199 @@
+"""
+Хранение истории опросов.
+
+Закрытые опросы старше POLL_RETENTION_DAYS переносятся в компактную
+таблицу daily_polls_archive (одна строка на опрос, варианты и голоса —
+в JSONB) и удаляются из рабочих таблиц вместе с вариантами, голосами и
+отметками напоминаний. Служебные записи (отметки напоминаний, отметки
+пересозданных опросов, отправки опросов дежурных) старше
+DISPATCH_RETENTION_DAYS просто удаляются.
+
+Всё делается пакетами по RETENTION_BATCH_SIZE строк: каждый пакет — одна
+короткая транзакция, между пакетами пауза, поэтому очистка не держит
+долгих блокировок и не мешает голосованию. Очистка запускается
+планировщиком раз в сутки и командой /cleanup_old_data.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+from config.settings import settings
+from src.repositories.retention_repository import EXPIRED_ROWS, RETENTION_TABLES, RetentionRepository
+
+logger = logging.getLogger(__name__)
+
+# Свежие опросы нужны отчетам и повторному закрытию: раньше этого срока не удаляем
+MIN_POLL_RETENTION_DAYS = 14
+
+
+class RetentionBusyError(RuntimeError):
+    """Очистка уже выполняется."""
+
+
+@dataclass
+class RetentionReport:
+    """Итог одного запуска очистки."""
+
+    poll_cutoff: date
+    dispatch_cutoff: date
+    archived_polls: int = 0
+    deleted_rows: Dict[str, int] = field(default_factory=dict)
+    freed_bytes: int = 0
+    archived_bytes: int = 0
+    size_before: int = 0
+    size_after: int = 0
+    batches: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        """На сколько уменьшились таблицы на диске (с учётом роста архива)."""
+        return max(0, self.size_before - self.size_after)
+
+    def add_deleted(self, table: str, rows: int) -> None:
+        if rows:
+            self.deleted_rows[table] = self.deleted_rows.get(table, 0) + rows
+
+
+def _format_bytes(value: int) -> str:
+    if value >= 1024 * 1024:
+        return f"{value / 1024 / 1024:.1f} МБ"
+    return f"{value / 1024:.1f} КБ"
+
+
+def format_retention_report(report: RetentionReport) -> str:
+    """Текст отчета об очистке для администратора."""
+    lines = [
+        "🧹 <b>Очистка старых данных</b>\n",
+        f"Опросы закрыты до: <b>{report.poll_cutoff.strftime('%d.%m.%Y')}</b>",
+        f"Служебные записи до: <b>{report.dispatch_cutoff.strftime('%d.%m.%Y')}</b>\n",
+        f"📦 Перенесено в архив опросов: <b>{report.archived_polls}</b>",
+    ]
+    if report.deleted_rows:
+        lines.append("🗑️ Удалено строк:")
+        lines.extend(
+            f"• {table}: <b>{rows}</b>" for table, rows in sorted(report.deleted_rows.items())
+        )
+    else:
+        lines.append("🗑️ Удалять нечего")
+    lines.extend([
+        "",
+        f"💾 Освобождено в таблицах: <b>{_format_bytes(report.freed_bytes)}</b>",
+        f"📦 Занято архивом: <b>{_format_bytes(report.archived_bytes)}</b>",
+        f"📉 Размер таблиц: {_format_bytes(report.size_before)} → {_format_bytes(report.size_after)}"
+        f" (возвращено системе: {_format_bytes(report.reclaimed_bytes)})",
+        f"⏱️ {report.batches} пакетов за {report.duration_seconds:.1f} сек",
+    ])
+    return "\n".join(lines)
+
+
+class RetentionService:
+    """Пакетный перенос старых опросов в архив и очистка служебных таблиц."""
+
+    def __init__(
+        self,
+        db_pool: Any,
+        poll_retention_days: Optional[int] = None,
+        dispatch_retention_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_pause_seconds: Optional[float] = None,
+    ):
+        """
+        Инициализация сервиса.
+
+        Args:
+            db_pool: Пул соединений asyncpg
+            poll_retention_days: Сколько дней хранить закрытые опросы (POLL_RETENTION_DAYS)
+            dispatch_retention_days: Сколько дней хранить служебные записи (DISPATCH_RETENTION_DAYS)
+            batch_size: Строк в одном пакете (RETENTION_BATCH_SIZE)
+            batch_pause_seconds: Пауза между пакетами (RETENTION_BATCH_PAUSE_SECONDS)
+        """
+        self.repository = RetentionRepository(db_pool)
+        self.poll_retention_days = poll_retention_days or settings.POLL_RETENTION_DAYS
+        self.dispatch_retention_days = dispatch_retention_days or settings.DISPATCH_RETENTION_DAYS
+        self.batch_size = max(1, batch_size or settings.RETENTION_BATCH_SIZE)
+        self.batch_pause_seconds = (
+            settings.RETENTION_BATCH_PAUSE_SECONDS if batch_pause_seconds is None else batch_pause_seconds
+        )
+        self._lock = asyncio.Lock()
+        self.last_report: Optional[RetentionReport] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+    async def run(self, poll_retention_days: Optional[int] = None) -> RetentionReport:
+        """
+        Выполнить очистку.
+
+        Args:
+            poll_retention_days: Срок хранения опросов для этого запуска
+                (не меньше MIN_POLL_RETENTION_DAYS)
+
+        Raises:
+            RetentionBusyError: очистка уже выполняется
+        """
+        if self._lock.locked():
+            raise RetentionBusyError("Очистка уже выполняется")
+        async with self._lock:
+            days = max(MIN_POLL_RETENTION_DAYS, poll_retention_days or self.poll_retention_days)
+            today = date.today()
+            report = RetentionReport(
+                poll_cutoff=today - timedelta(days=days),
+                dispatch_cutoff=today - timedelta(days=self.dispatch_retention_days),
+            )
+            started = time.monotonic()
+            report.size_before = sum((await self.repository.get_table_sizes()).values())
+
+            await self._archive_polls(report)
+            for table in EXPIRED_ROWS:
+                await self._delete_expired(report, table)
+
+            if report.deleted_rows and settings.RETENTION_VACUUM:
+                touched = set(report.deleted_rows)
+                if report.archived_polls:
+                    touched.add("daily_polls_archive")
+                await self.repository.vacuum([table for table in RETENTION_TABLES if table in touched])
+            report.size_after = sum((await self.repository.get_table_sizes()).values())
+            report.duration_seconds = time.monotonic() - started
+            self.last_report = report
+
+            logger.info(
+                "Очистка истории: в архив %d опросов, удалено %s, освобождено ~%d КБ за %.1f сек (%d пакетов)",
+                report.archived_polls,
+                report.deleted_rows or "ничего",
+                report.freed_bytes // 1024,
+                report.duration_seconds,
+                report.batches,
+            )
+            return report
+
+    async def _archive_polls(self, report: RetentionReport) -> None:
+        while True:
+            result = await self.repository.archive_closed_polls(report.poll_cutoff, self.batch_size)
+            report.batches += 1
+            report.archived_polls += result["daily_polls"]
+            for table in ("daily_polls", "poll_options", "user_votes", "poll_reminder_dispatches"):
+                report.add_deleted(table, result[table])
+            report.freed_bytes += result["freed_bytes"]
+            report.archived_bytes += result["archived_bytes"]
+            if result["daily_polls"] < self.batch_size:
+                return
+            await asyncio.sleep(self.batch_pause_seconds)
+
+    async def _delete_expired(self, report: RetentionReport, table: str) -> None:
+        before = datetime.combine(report.dispatch_cutoff, datetime.min.time())
+        if table == "duty_poll_dispatches":
+            # Дежурные опросы хранят дату, а не время
+            before = report.dispatch_cutoff
+        while True:
+            result = await self.repository.delete_expired(table, before, self.batch_size)
+            report.batches += 1
+            report.add_deleted(table, result["rows"])
+            report.freed_bytes += result["freed_bytes"]
+            if result["rows"] < self.batch_size:
+                return
+            await asyncio.sleep(self.batch_pause_seconds)
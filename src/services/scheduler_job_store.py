@@ -0,0 +1,155 @@
+"""
+Хранилище задач APScheduler в PostgreSQL.
+
+Методы хранилища APScheduler синхронные и вызываются из event loop, а
+asyncpg — асинхронный. Поэтому хранилище держит задачи в памяти,
+отсортированными по времени следующего запуска (как MemoryJobStore:
+выборка задач к запуску — бинарный поиск без обращения к БД), а каждое
+изменение ставит в очередь записи, которую последовательно выполняет
+фоновая задача. При старте планировщика задачи загружаются из таблицы
+scheduler_jobs.
+"""
+import asyncio
+import logging
+import pickle
+from typing import Any, Dict, List, Optional, Tuple
+
+from apscheduler.job import Job
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.util import datetime_to_utc_timestamp
+
+from src.repositories.scheduler_job_repository import SchedulerJobRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresJobStore(MemoryJobStore):
+    """Хранилище задач в памяти с записью изменений в PostgreSQL."""
+
+    def __init__(
+        self,
+        repository: SchedulerJobRepository,
+        pickle_protocol: int = pickle.HIGHEST_PROTOCOL,
+    ):
+        """
+        Инициализация хранилища.
+
+        Args:
+            repository: Репозиторий таблицы scheduler_jobs
+            pickle_protocol: Протокол сериализации состояния задач
+        """
+        super().__init__()
+        self.repository = repository
+        self.pickle_protocol = pickle_protocol
+        self._loaded_rows: List[Dict[str, Any]] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    async def preload(self) -> None:
+        """
+        Загрузить задачи из БД; вызывается перед scheduler.start().
+
+        Сами объекты Job восстанавливаются в start(), когда хранилищу
+        уже известен планировщик.
+        """
+        self._ensure_writer()
+        await self.flush()
+        self._loaded_rows = await self.repository.get_all()
+
+    async def flush(self) -> None:
+        """Дождаться записи всех изменений в БД."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Записать оставшиеся изменения и остановить фоновую запись."""
+        await self.flush()
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+        self._writer = None
+        self._queue = None
+
+    def start(self, scheduler, alias) -> None:
+        super().start(scheduler, alias)
+        MemoryJobStore.remove_all_jobs(self)
+        restored = 0
+        for row in self._loaded_rows:
+            try:
+                job = self._reconstitute_job(row["job_state"])
+            except Exception as e:
+                logger.error("Не удалось восстановить задачу %s, удаляю: %s", row["id"], e)
+                self._enqueue(("delete", row["id"]))
+                continue
+            MemoryJobStore.add_job(self, job)
+            restored += 1
+        self._loaded_rows = []
+        if restored:
+            logger.info("Восстановлено задач планировщика из БД: %d", restored)
+
+    def shutdown(self) -> None:
+        # Остановка планировщика очищает только память: строки в БД остаются
+        MemoryJobStore.remove_all_jobs(self)
+
+    def add_job(self, job: Job) -> None:
+        state = self._serialize(job)
+        super().add_job(job)
+        self._enqueue(("upsert", job.id, datetime_to_utc_timestamp(job.next_run_time), state))
+
+    def update_job(self, job: Job) -> None:
+        state = self._serialize(job)
+        super().update_job(job)
+        self._enqueue(("upsert", job.id, datetime_to_utc_timestamp(job.next_run_time), state))
+
+    def remove_job(self, job_id: str) -> None:
+        super().remove_job(job_id)
+        self._enqueue(("delete", job_id))
+
+    def remove_all_jobs(self) -> None:
+        super().remove_all_jobs()
+        self._enqueue(("delete_all",))
+
+    def _serialize(self, job: Job) -> bytes:
+        # Задача должна ссылаться на функцию уровня модуля, иначе __getstate__ бросит ValueError
+        return pickle.dumps(job.__getstate__(), self.pickle_protocol)
+
+    def _reconstitute_job(self, job_state: bytes) -> Job:
+        job = Job.__new__(Job)
+        job.__setstate__(pickle.loads(job_state))
+        job._scheduler = self._scheduler
+        job._jobstore_alias = self._alias
+        return job
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and not self._writer.done():
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._writer = asyncio.create_task(self._write_loop(), name="scheduler-job-store-writer")
+
+    def _enqueue(self, operation: Tuple) -> None:
+        self._ensure_writer()
+        self._queue.put_nowait(operation)
+
+    async def _write_loop(self) -> None:
+        while True:
+            operation = await self._queue.get()
+            try:
+                await self._apply(operation)
+            except Exception as e:
+                logger.error("Ошибка записи задачи планировщика в БД (%s): %s", operation[0], e)
+            finally:
+                self._queue.task_done()
+
+    async def _apply(self, operation: Tuple) -> None:
+        action = operation[0]
+        if action == "upsert":
+            _, job_id, next_run_time, state = operation
+            await self.repository.upsert(job_id, next_run_time, state)
+        elif action == "delete":
+            await self.repository.delete(operation[1])
+        elif action == "delete_all":
+            await self.repository.delete_all()
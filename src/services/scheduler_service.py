@@ -3,34 +3,123 @@
 """
 import logging
 import asyncio
-from html import escape
+from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
 from typing import TYPE_CHECKING, Optional, List, Dict, Any, Callable, Awaitable
-from pathlib import Path
 
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MISSED,
+    JobExecutionEvent,
+)
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 from aiogram import Bot
 from aiogram.exceptions import TelegramBadRequest, TelegramNetworkError
+from aiogram.types import BufferedInputFile
 
 from config.settings import settings
 from src.services.group_member_service import GroupMemberService
+from src.services.group_schedule_dispatcher import (
+    ACTION_CLOSE,
+    ACTION_CREATE,
+    ACTION_REMIND,
+    GroupEvent,
+    GroupScheduleDispatcher,
+    describe_close_times,
+    group_close_time,
+)
+from src.services.not_voted_tracker import not_voted_tracker
+from src.services.poll_report_service import PollReportService, extract_voted_user_ids, normalize_results
+from src.services.poll_service import CREATION_CREATED, CREATION_EXISTS
+from src.services.report_archive import ReportArchive
+from src.services.report_renderer import (
+    format_member_tag,
+    format_not_voted_report,
+    layout_for_group,
+    split_message,
+    summarize_results,
+)
+from src.services.retention_service import RetentionBusyError, RetentionService
+from src.utils.logging_setup import get_rate_limited_logger
 
 if TYPE_CHECKING:
     from src.services.duty_poll_service import DutyPollService
     from src.services.group_service import GroupService
     from src.services.poll_service import PollService
+    from src.services.report_image_service import ReportImageService
+    from src.services.scheduler_job_store import PostgresJobStore
 
 logger = logging.getLogger(__name__)
+# Записи по каждой группе в массовых задачах (закрытие, отчеты)
+group_logger = get_rate_limited_logger(f"{__name__}.groups")
 
 
-def _format_people_count(count: int) -> str:
-    if count % 10 == 1 and count % 100 != 11:
-        return f"{count} человек"
-    if count % 10 in (2, 3, 4) and count % 100 not in (12, 13, 14):
-        return f"{count} человека"
-    return f"{count} человек"
+PERSISTENT_JOBSTORE = "persistent"
+
+
+@dataclass
+class _ReminderTarget:
+    """Напоминание одной группе в пакетной отправке."""
+
+    poll: Dict[str, Any]
+    group: Dict[str, Any]
+    reminder_hour: int
+    is_night: bool
+    hours_left: int
+
+    @property
+    def claim(self) -> tuple:
+        return (str(self.poll["id"]), self.reminder_hour, self.is_night)
+
+
+def create_scheduler(
+    job_store: Optional["PostgresJobStore"] = None,
+    misfire_grace_seconds: Optional[int] = None,
+    coalesce: Optional[bool] = None,
+) -> AsyncIOScheduler:
+    """
+    Создать планировщик с настройками пропуска и склейки запусков.
+    
+    Args:
+        job_store: Хранилище разовых задач, переживающих перезапуск
+        misfire_grace_seconds: Сколько секунд после срока задачу ещё можно выполнить
+        coalesce: Выполнять пропущенные запуски один раз вместо каждого
+    """
+    jobstores = {"default": MemoryJobStore()}
+    if job_store is not None:
+        jobstores[PERSISTENT_JOBSTORE] = job_store
+    return AsyncIOScheduler(
+        timezone="Europe/Moscow",
+        jobstores=jobstores,
+        job_defaults={
+            "misfire_grace_time": (
+                settings.SCHEDULER_MISFIRE_GRACE_SECONDS
+                if misfire_grace_seconds is None
+                else misfire_grace_seconds
+            ),
+            "coalesce": settings.SCHEDULER_COALESCE if coalesce is None else coalesce,
+        },
+    )
+
+
+async def run_reminder_retry(**kwargs: Any) -> None:
+    """
+    Точка входа сохраняемой задачи повтора напоминания.
+    
+    Задачи в PostgreSQL хранят ссылку на функцию уровня модуля:
+    методы экземпляра сериализовать нельзя.
+    """
+    from src.services.service_registry import get_scheduler_service
+
+    scheduler_service = get_scheduler_service()
+    if scheduler_service is None:
+        logger.warning("Повтор напоминания пропущен: планировщик не инициализирован")
+        return
+    await scheduler_service._retry_single_reminder(**kwargs)
 
 
 class SchedulerService:
@@ -50,6 +139,10 @@ class SchedulerService:
         poll_service: "PollService",
         group_service: "GroupService",
         duty_poll_service: Optional["DutyPollService"] = None,
+        job_store: Optional["PostgresJobStore"] = None,
+        report_archive: Optional[ReportArchive] = None,
+        report_images: Optional["ReportImageService"] = None,
+        retention_service: Optional[RetentionService] = None,
     ):
         """
         Инициализация планировщика.
@@ -58,15 +151,98 @@ class SchedulerService:
             bot: Экземпляр бота Telegram
             poll_service: Сервис для работы с опросами
             group_service: Сервис для работы с группами
+            job_store: Хранилище задач в PostgreSQL (повторы напоминаний)
+            report_archive: Архив отчетов по опросам
+            report_images: Пул отрисовки картинок с итогами (без него картинки не отправляются)
+            retention_service: Очистка старой истории опросов (без него не запускается)
         """
         self.bot = bot
         self.poll_service = poll_service
         self.group_service = group_service
         self.duty_poll_service = duty_poll_service
         self.group_member_service = GroupMemberService(group_service.db_pool)
-        self.scheduler = AsyncIOScheduler(timezone="Europe/Moscow")
+        self.report_service = PollReportService(self.group_member_service)
+        self.report_archive = report_archive or ReportArchive()
+        self.report_images = report_images
+        self.retention_service = retention_service
+        self.job_store = job_store
+        self.scheduler = create_scheduler(job_store)
+        # Закрытие и напоминания по времени каждой группы (вместо общих cron-задач)
+        self.group_dispatcher: Optional[GroupScheduleDispatcher] = None
+        if settings.ENABLE_PER_GROUP_SCHEDULES:
+            self.group_dispatcher = GroupScheduleDispatcher(
+                handler=self._handle_group_event,
+                on_window_complete=self._on_group_window_complete,
+                batch_handlers={ACTION_REMIND: self._handle_reminder_events},
+            )
+        self._group_close_results: Dict[tuple, Dict[str, Any]] = {}
+        self._group_create_results: Dict[date, Dict[str, Any]] = {}
         self._is_running = False
         self._close_lock = asyncio.Lock()
+        # Последний запуск каждой задачи (для health-эндпоинта)
+        self.job_runs: Dict[str, Dict[str, Any]] = {}
+        self.scheduler.add_listener(
+            self._on_job_event,
+            EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED,
+        )
+    
+    @property
+    def streams_poll_creation(self) -> bool:
+        """Создаются ли опросы потоком по окну вместо одной общей задачи."""
+        return self.group_dispatcher is not None and self.group_dispatcher.creation_window_seconds > 0
+    
+    @property
+    def is_running(self) -> bool:
+        """Запущен ли планировщик."""
+        return self._is_running
+    
+    def _on_job_event(self, event: JobExecutionEvent) -> None:
+        """Запомнить время и результат последнего запуска задачи."""
+        # Разовые повторы напоминаний сворачиваем в один ключ, чтобы словарь не рос
+        job_key = "retry_reminder" if event.job_id.startswith("retry_reminder_") else event.job_id
+        if event.code == EVENT_JOB_MISSED:
+            status = "missed"
+        elif event.exception is not None:
+            status = "error"
+        else:
+            status = "ok"
+        self.job_runs[job_key] = {
+            "last_run": datetime.now(),
+            "scheduled_at": event.scheduled_run_time,
+            "status": status,
+            "error": str(event.exception) if event.exception is not None else None,
+        }
+    
+    def get_jobs_status(self) -> List[Dict[str, Any]]:
+        """Состояние задач планировщика: следующий и последний запуск."""
+        jobs = []
+        for job in self.scheduler.get_jobs():
+            if job.id.startswith("retry_reminder_"):
+                continue
+            run = self.job_runs.get(job.id, {})
+            jobs.append({
+                "id": job.id,
+                "name": job.name,
+                "next_run": job.next_run_time,
+                "last_run": run.get("last_run"),
+                "status": run.get("status"),
+                "error": run.get("error"),
+            })
+        if "retry_reminder" in self.job_runs:
+            run = self.job_runs["retry_reminder"]
+            jobs.append({
+                "id": "retry_reminder",
+                "name": "Повторы напоминаний",
+                "next_run": None,
+                "last_run": run.get("last_run"),
+                "status": run.get("status"),
+                "error": run.get("error"),
+            })
+        return jobs
+    
+    def get_pending_retry_count(self) -> int:
+        """Количество сообщений в очереди повторной отправки."""
+        return sum(1 for job in self.scheduler.get_jobs() if job.id.startswith("retry_reminder_"))
     
     async def start(self) -> None:
         """Запуск планировщика с основными задачами."""
@@ -75,26 +251,42 @@ class SchedulerService:
             return
         
         # Добавляем задачи
-        self._add_poll_creation_job()
-        self._add_reminder_jobs()
-        self._add_poll_closing_job()
-        self._add_night_poll_closing_job()
+        if not self.streams_poll_creation:
+            self._add_poll_creation_job()
+        if self.group_dispatcher is not None:
+            self._add_group_schedule_rebuild_job()
+            await self.rebuild_group_schedules()
+            await self.group_dispatcher.start()
+        else:
+            self._add_reminder_jobs()
+            self._add_poll_closing_job()
+            self._add_night_poll_closing_job()
         self._add_recovery_job()
         self._add_duty_poll_jobs()
+        self._add_retention_job()
+        
+        if self.job_store is not None:
+            await self.job_store.preload()
         
         # Запускаем планировщик
         self.scheduler.start()
         self._is_running = True
 
-        await self._recover_missed_automation()
+        await self._rebuild_not_voted_tracker()
+        await self._recover_missed_automation(startup=True)
         
         logger.info("✅ Планировщик запущен")
-        logger.info("   - Создание опросов: %s:%s", 
+        logger.info("   - Создание опросов: %s:%s (окно %d мин)", 
                    settings.POLL_CREATION_HOUR, 
-                   str(settings.POLL_CREATION_MINUTE).zfill(2))
-        logger.info("   - Закрытие опросов: %s:%s",
-                   settings.POLL_CLOSING_HOUR,
-                   str(settings.POLL_CLOSING_MINUTE).zfill(2))
+                   str(settings.POLL_CREATION_MINUTE).zfill(2),
+                   settings.POLL_CREATION_WINDOW_MINUTES if self.streams_poll_creation else 0)
+        if self.group_dispatcher is not None:
+            logger.info("   - Закрытие опросов: по времени каждой группы (разнос %d мин)",
+                       self.group_dispatcher.spread_seconds // 60)
+        else:
+            logger.info("   - Закрытие опросов: %s:%s",
+                       settings.POLL_CLOSING_HOUR,
+                       str(settings.POLL_CLOSING_MINUTE).zfill(2))
         logger.info("   - Напоминания: %s", settings.REMINDER_HOURS)
         logger.info(
             "   - Опрос дежурных: %s:%s",
@@ -108,6 +300,13 @@ class SchedulerService:
             return
         
         self.scheduler.shutdown(wait=False)
+        if self.group_dispatcher is not None:
+            await self.group_dispatcher.stop()
+        # AsyncIOScheduler выполняет shutdown через call_soon: отдаём управление,
+        # чтобы после потери и повторного получения лидерства start() сработал
+        await asyncio.sleep(0)
+        if self.job_store is not None:
+            await self.job_store.close()
         self._is_running = False
         logger.info("Планировщик остановлен")
     
@@ -177,6 +376,297 @@ class SchedulerService:
             replace_existing=True,
         )
 
+    def _add_group_schedule_rebuild_job(self) -> None:
+        """Ежесуточная пересборка расписаний групп на случай изменений в обход админки."""
+        self.scheduler.add_job(
+            self.rebuild_group_schedules,
+            CronTrigger(hour=0, minute=1, timezone="Europe/Moscow"),
+            id="rebuild_group_schedules",
+            name="Пересборка расписаний групп",
+            replace_existing=True,
+        )
+
+    async def rebuild_group_schedules(self) -> None:
+        """Построить расписание закрытия и напоминаний для всех активных групп."""
+        if self.group_dispatcher is None:
+            return
+        groups = await self.group_service.get_all_groups(active_only=True)
+        self.group_dispatcher.rebuild(groups)
+        windows = describe_close_times(
+            (bool(group.get("is_night", False)), group_close_time(group), 1) for group in groups
+        )
+        if windows:
+            logger.info("Закрытие опросов по группам: %s", "; ".join(windows))
+
+    async def reschedule_group(self, group_id: int) -> None:
+        """
+        Пересчитать расписание одной группы после её изменения.
+        
+        Вызывается из админки при создании группы и смене времени закрытия.
+        """
+        if self.group_dispatcher is None:
+            return
+        group = await self.group_service.get_group_by_id(group_id)
+        if group is None:
+            self.group_dispatcher.remove_group(group_id)
+            return
+        self.group_dispatcher.upsert_group(group)
+        logger.info(
+            "Расписание группы %s обновлено: закрытие в %s",
+            group.get("name", group_id),
+            group_close_time(group).strftime("%H:%M"),
+        )
+
+    def _hours_until_close(self, group: Dict[str, Any]) -> int:
+        time_left = datetime.combine(date.today(), group_close_time(group)) - datetime.now()
+        return max(0, int(time_left.total_seconds() // 3600))
+
+    async def _handle_group_event(self, event: GroupEvent) -> None:
+        """Выполнить создание, закрытие или напоминание для одной группы."""
+        if event.action == ACTION_REMIND:
+            await self._handle_reminder_events([event])
+            return
+
+        group = await self.group_service.get_group_by_id(event.group_id)
+        if not group or not group.get("is_active", True):
+            self.group_dispatcher.remove_group(event.group_id)
+            return
+
+        if event.action == ACTION_CREATE:
+            await self._create_group_poll(event, group)
+            return
+
+        poll = await self.poll_service.poll_repo.get_by_group_and_date(event.group_id, event.target_date)
+        if not poll or poll.get("status") != "active":
+            return
+
+        if event.action == ACTION_CLOSE:
+            await self._close_group_poll(event, poll, group)
+
+    async def _close_group_poll(self, event: GroupEvent, poll: Dict[str, Any], group: Dict[str, Any]) -> None:
+        """Закрыть опрос группы и учесть результат в сводке окна закрытия."""
+        results = self._group_close_results.setdefault(
+            (event.is_night, event.schedule_date),
+            {"target_date": event.target_date, "closed": 0, "errors": []},
+        )
+        try:
+            if await self.close_single_poll_with_reporting(poll, group):
+                results["closed"] += 1
+                group_logger.info("Закрыт опрос для группы %s", group["name"])
+        except Exception as e:
+            logger.error("Ошибка закрытия опроса для группы %s: %s", group.get("name"), e, exc_info=True)
+            results["errors"].append(f"Группа {group.get('name', event.group_id)}: {e}")
+
+    async def _handle_reminder_events(self, events: List[GroupEvent]) -> None:
+        """
+        Отправить напоминания, наступившие к одному пробуждению диспетчера.
+
+        Группы, опросы и отметки об отправке читаются общими запросами,
+        поэтому число обращений к БД не зависит от числа групп.
+        """
+        groups = {
+            group["id"]: group
+            for group in await self.group_service.get_groups_by_ids(sorted({event.group_id for event in events}))
+        }
+        live_events = []
+        for event in events:
+            group = groups.get(event.group_id)
+            if not group or not group.get("is_active", True):
+                self.group_dispatcher.remove_group(event.group_id)
+                continue
+            live_events.append((event, group))
+
+        polls = await self.poll_service.poll_repo.get_active_by_group_dates(
+            [(event.group_id, event.target_date) for event, _ in live_events]
+        )
+        polls_by_key = {(poll["group_id"], poll["poll_date"]): poll for poll in polls}
+        targets = []
+        for event, group in live_events:
+            poll = polls_by_key.get((event.group_id, event.target_date))
+            if poll is not None:
+                targets.append(_ReminderTarget(
+                    poll=poll,
+                    group=group,
+                    reminder_hour=event.reminder_hour,
+                    is_night=event.is_night,
+                    hours_left=self._hours_until_close(group),
+                ))
+        await self._send_group_reminders(targets)
+
+    async def _create_group_poll(self, event: GroupEvent, group: Dict[str, Any]) -> None:
+        """Создать опрос группы в её слоте окна создания и учесть результат в сводке."""
+        results = self._group_create_results.setdefault(
+            event.schedule_date,
+            {"created": 0, "existing": 0, "errors": [], "started_at": datetime.now()},
+        )
+        # Повторная проверка существующего опроса внутри: окно могли запустить
+        # вручную или опрос создан другой репликой до наступления слота группы
+        status, error = await self.poll_service.create_daily_poll_for_group(group, event.target_date)
+        if status == CREATION_CREATED:
+            results["created"] += 1
+        elif status == CREATION_EXISTS:
+            results["existing"] += 1
+        if error:
+            results["errors"].append(error)
+
+    async def _on_group_window_complete(self, action: str, is_night: bool, schedule_date: date) -> None:
+        """Сводка админам, когда выполнены события всех групп за день."""
+        if action == ACTION_CREATE:
+            # Дневные и ночные группы создаются в одном окне: сводка одна на оба типа
+            if self.group_dispatcher.has_pending(ACTION_CREATE, not is_night, schedule_date):
+                return
+            await self._report_poll_creation(schedule_date)
+            return
+        if action != ACTION_CLOSE:
+            return
+        results = self._group_close_results.pop((is_night, schedule_date), None)
+        if not results or (not results["closed"] and not results["errors"]):
+            return
+
+        errors = results["errors"]
+        report = (
+            f"🔒 <b>Автоматическое закрытие опросов</b>\n\n"
+            f"📅 Дата опросов: {results['target_date'].strftime('%d.%m.%Y')}\n"
+            f"✅ Закрыто: {results['closed']}\n"
+        )
+        if errors:
+            report += f"\n❌ <b>Ошибки ({len(errors)}):</b>\n"
+            for error in errors[:5]:
+                report += f"• {error}\n"
+        await self._notify_admins(report)
+        logger.info(
+            "Закрытие опросов завершено: закрыто=%d, ошибок=%d",
+            results["closed"],
+            len(errors),
+        )
+
+    async def _report_poll_creation(self, schedule_date: date) -> None:
+        """Отправить админам итог окна создания опросов."""
+        results = self._group_create_results.pop(schedule_date, None)
+        if not results:
+            return
+
+        errors = results["errors"]
+        finished_at = datetime.now()
+        report = (
+            f"📊 <b>Автоматическое создание опросов</b>\n\n"
+            f"📅 Дата запуска: {schedule_date.strftime('%d.%m.%Y')}\n"
+            f"⏱ Окно: {results['started_at'].strftime('%H:%M')}–{finished_at.strftime('%H:%M')}\n"
+            f"✅ Создано: {results['created']}\n"
+            f"⏭ Уже были: {results['existing']}\n"
+        )
+        if errors:
+            report += f"\n❌ <b>Ошибки ({len(errors)}):</b>\n"
+            for error in errors[:5]:
+                report += f"• {error}\n"
+            if len(errors) > 5:
+                report += f"... и еще {len(errors) - 5} ошибок\n"
+
+        if settings.ENABLE_POLL_CREATION_NOTIFICATIONS:
+            await self._notify_admins(report)
+        logger.info(
+            "Создание опросов завершено: создано=%d, уже были=%d, ошибок=%d",
+            results["created"],
+            results["existing"],
+            len(errors),
+        )
+
+    async def _recover_missed_group_creations(self, now: datetime) -> None:
+        """
+        Догнать создание опросов, если бот перезапустился во время окна создания.
+        
+        Слоты групп, прошедшие не раньше чем SCHEDULER_MISFIRE_GRACE_SECONDS до
+        конца окна, выполняются сразу; более старые пропускаются, как и cron-задача.
+
+        Args:
+            now: Момент пересборки расписания: слоты до него диспетчер
+                перенёс на завтра, более поздние выполнит сам
+        """
+        window_start = datetime.combine(
+            now.date(),
+            time(settings.POLL_CREATION_HOUR, settings.POLL_CREATION_MINUTE),
+        )
+        window_end = window_start + timedelta(seconds=self.group_dispatcher.creation_window_seconds)
+        if now < window_start or now > window_end + timedelta(seconds=settings.SCHEDULER_MISFIRE_GRACE_SECONDS):
+            return
+
+        recovered = False
+        for group in await self.group_service.get_all_groups(active_only=True):
+            events = self.group_dispatcher.plan_events(group, datetime.combine(now.date(), time.min))
+            create_event = next((event for event in events if event.action == ACTION_CREATE), None)
+            if create_event is None or create_event.run_at > now:
+                continue
+            poll = await self.poll_service.poll_repo.get_by_group_and_date(group["id"], create_event.target_date)
+            if poll and poll.get("status") == "active":
+                continue
+            logger.warning(
+                "⏱ Опрос группы %s не создан в %s. Запускаю догоняющее создание.",
+                group.get("name"),
+                create_event.run_at.strftime("%H:%M"),
+            )
+            await self._create_group_poll(create_event, group)
+            recovered = True
+
+        if recovered and not self.group_dispatcher.has_pending(ACTION_CREATE, False, now.date()) \
+                and not self.group_dispatcher.has_pending(ACTION_CREATE, True, now.date()):
+            await self._report_poll_creation(now.date())
+
+    async def _recover_missed_group_events(self, now: datetime) -> None:
+        """
+        Догнать закрытия и напоминания групп, время которых прошло, пока бот не работал.
+        
+        Пропущенные напоминания всех групп отправляются одной пачкой.
+
+        Args:
+            now: Момент пересборки расписания: события до него включительно
+                диспетчер перенёс на завтра, более поздние выполнит сам
+        """
+        recovered_windows = set()
+        active_polls = await self.poll_service.poll_repo.get_active_polls()
+        groups = {group["id"]: group for group in await self.group_service.get_all_groups()}
+        sent_reminders = await self.poll_service.poll_repo.get_sent_reminders(
+            [str(poll["id"]) for poll in active_polls]
+        )
+        missed_reminders = []
+        for poll in active_polls:
+            group = groups.get(poll["group_id"])
+            if not group or not group.get("is_active", True):
+                continue
+            is_night = bool(group.get("is_night", False))
+            schedule_date = poll.get("poll_date") if is_night else poll.get("poll_date") - timedelta(days=1)
+            # Планируем события от начала дня срабатывания, чтобы получить их время в этот день
+            events = self.group_dispatcher.plan_events(group, datetime.combine(schedule_date, time.min))
+            close_event = next(event for event in events if event.action == ACTION_CLOSE)
+            if close_event.run_at <= now:
+                logger.warning(
+                    "⏱ Опрос группы %s не закрыт в %s. Запускаю догоняющее закрытие.",
+                    group.get("name"),
+                    close_event.run_at.strftime("%d.%m %H:%M"),
+                )
+                await self._close_group_poll(close_event, poll, group)
+                recovered_windows.add((close_event.is_night, close_event.schedule_date))
+                continue
+
+            for event in events:
+                if event.action != ACTION_REMIND or event.run_at > now:
+                    continue
+                if (str(poll["id"]), event.reminder_hour, is_night) not in sent_reminders:
+                    missed_reminders.append(_ReminderTarget(
+                        poll=poll,
+                        group=group,
+                        reminder_hour=event.reminder_hour,
+                        is_night=is_night,
+                        hours_left=self._hours_until_close(group),
+                    ))
+
+        if missed_reminders:
+            logger.warning("⏱ Пропущено напоминаний: %d. Отправляю догоняющие.", len(missed_reminders))
+            await self._send_group_reminders(missed_reminders)
+
+        for is_night, schedule_date in recovered_windows:
+            if not self.group_dispatcher.has_pending(ACTION_CLOSE, is_night, schedule_date):
+                await self._on_group_window_complete(ACTION_CLOSE, is_night, schedule_date)
+
     def _add_recovery_job(self) -> None:
         self.scheduler.add_job(
             self._recover_missed_automation,
@@ -221,6 +711,33 @@ class SchedulerService:
                 "❌ <b>Ошибки опроса дежурных:</b>\n" + "\n".join(errors[:5])
             )
 
+    def _add_retention_job(self) -> None:
+        """Добавить ежесуточный перенос старых опросов в архив."""
+        if not self.retention_service or not settings.ENABLE_DATA_RETENTION:
+            return
+
+        self.scheduler.add_job(
+            self._run_retention,
+            CronTrigger(
+                hour=settings.RETENTION_HOUR,
+                minute=settings.RETENTION_MINUTE,
+                timezone="Europe/Moscow",
+            ),
+            id="data_retention",
+            name="Очистка старой истории опросов",
+            replace_existing=True,
+        )
+
+    async def _run_retention(self) -> None:
+        """Перенести старые опросы в архив и удалить устаревшие служебные записи."""
+        try:
+            await self.retention_service.run()
+        except RetentionBusyError:
+            logger.info("Очистка истории уже выполняется, плановый запуск пропущен")
+        except Exception as e:
+            logger.error("Ошибка очистки истории опросов: %s", e, exc_info=True)
+            await self._notify_admins(f"❌ Ошибка очистки истории опросов: {e}")
+
     async def _close_expired_duty_polls(self) -> None:
         """Закрыть опросы дежурных, дата которых уже закончилась."""
         if not self.duty_poll_service:
@@ -234,24 +751,12 @@ class SchedulerService:
         logger.info("🔄 Запуск автоматического создания опросов...")
         
         try:
-            logger.info("📅 Создание опросов для дневных и ночных групп")
-            
             # Проверяем, что group_service доступен
             if not self.group_service:
                 logger.error("❌ GroupService не инициализирован в планировщике!")
                 await self._notify_admins("❌ Ошибка: GroupService не инициализирован в планировщике")
                 return
             
-            # Получаем список активных групп для проверки
-            try:
-                test_groups = await self.group_service.get_all_groups(active_only=True)
-                logger.info("🔍 Проверка: найдено активных групп в GroupService: %d", len(test_groups) if test_groups else 0)
-                if test_groups:
-                    group_names = [g.get('name', f"ID:{g.get('id', '?')}") for g in test_groups]
-                    logger.info("🔍 Активные группы: %s", ", ".join(group_names))
-            except Exception as e:
-                logger.error("Ошибка при проверке групп: %s", e, exc_info=True)
-            
             created_count, errors = await self.poll_service.create_daily_polls()
             
             # Формируем отчет
@@ -294,10 +799,11 @@ class SchedulerService:
             today = date.today()
             tomorrow = today + timedelta(days=1)
             active_polls = await self.poll_service.poll_repo.get_active_polls()
+            groups = {group["id"]: group for group in await self.group_service.get_all_groups()}
 
             target_polls = []
             for poll in active_polls:
-                group = await self.group_service.get_group_by_id(poll['group_id'])
+                group = groups.get(poll['group_id'])
                 target_date = today if is_night else tomorrow
                 if (
                     group
@@ -322,32 +828,94 @@ class SchedulerService:
             
             hours_left = max(0, int(time_left.total_seconds() // 3600))
             
-            sent_count = 0
-            
-            for poll, group in target_polls:
-                try:
-                    reminder_sent = await self._send_reminder_for_poll(
-                        poll=poll,
-                        group=group,
-                        reminder_hour=reminder_hour,
-                        hours_left=hours_left,
-                        is_night=is_night,
-                    )
-                    if reminder_sent:
-                        sent_count += 1
-                    
-                except Exception as e:
-                    logger.error(
-                        "Ошибка отправки напоминания в группу %s: %s",
-                        poll.get('group_id'),
-                        e
-                    )
+            sent_count = await self._send_group_reminders([
+                _ReminderTarget(
+                    poll=poll,
+                    group=group,
+                    reminder_hour=reminder_hour,
+                    is_night=is_night,
+                    hours_left=hours_left,
+                )
+                for poll, group in target_polls
+            ])
             
             logger.info("Отправлено напоминаний: %d", sent_count)
             
         except Exception as e:
             logger.error("Ошибка при отправке напоминаний: %s", e, exc_info=True)
 
+    async def _send_group_reminders(self, targets: List[_ReminderTarget]) -> int:
+        """
+        Отправить напоминания нескольким группам с общими запросами к БД.
+
+        Отметки об отправке забираются одним запросом, неотметившиеся
+        берутся из памяти или одним запросом по всем опросам, несостоявшиеся
+        отправки освобождаются разом до постановки повторов.
+
+        Returns:
+            Количество отправленных напоминаний
+        """
+        if not targets:
+            return 0
+        claimed = await self.poll_service.poll_repo.claim_reminder_dispatches(
+            [target.claim for target in targets]
+        )
+        claimed_targets = [target for target in targets if target.claim in claimed]
+        if len(claimed_targets) < len(targets):
+            logger.debug(
+                "Пропуск повторных напоминаний: %d групп уже получили напоминание",
+                len(targets) - len(claimed_targets),
+            )
+
+        # Списки, которые ведутся по голосам, берутся из памяти; остальные
+        # неотметившиеся по всем группам — одним запросом
+        not_voted_by_poll: Dict[str, List[Dict[str, Any]]] = {}
+        for target in claimed_targets:
+            tracked = not_voted_tracker.get(target.poll, target.group)
+            if tracked is not None:
+                not_voted_by_poll[str(target.poll["id"])] = tracked
+        missing_poll_ids = [
+            str(target.poll["id"]) for target in claimed_targets if str(target.poll["id"]) not in not_voted_by_poll
+        ]
+        if missing_poll_ids:
+            not_voted_by_poll.update(
+                await self.group_member_service.get_not_voted_members_for_polls(missing_poll_ids)
+            )
+
+        sent_count = 0
+        failed = []
+        for target in claimed_targets:
+            not_voted = not_voted_by_poll.get(str(target.poll["id"]), [])
+            if not not_voted:
+                continue
+            try:
+                await self._post_reminder(
+                    target.group,
+                    not_voted,
+                    target.reminder_hour,
+                    target.hours_left,
+                    target.is_night,
+                )
+                sent_count += 1
+            except Exception as e:
+                logger.error(
+                    "Ошибка отправки напоминания в группу %s: %s",
+                    target.poll.get('group_id'),
+                    e
+                )
+                failed.append(target)
+
+        if failed:
+            await self.poll_service.poll_repo.release_reminder_dispatches([target.claim for target in failed])
+            for target in failed:
+                self._schedule_reminder_retry(
+                    poll=target.poll,
+                    group=target.group,
+                    reminder_hour=target.reminder_hour,
+                    is_night=target.is_night,
+                )
+        return sent_count
+
     async def _send_reminder_for_poll(
         self,
         poll: Dict[str, Any],
@@ -356,6 +924,7 @@ class SchedulerService:
         hours_left: int,
         is_night: bool,
     ) -> bool:
+        """Повторно отправить напоминание одной группе (задача повтора после сбоя)."""
         reminder_claimed = await self.poll_service.poll_repo.claim_reminder_dispatch(
             poll_id=str(poll["id"]),
             reminder_hour=reminder_hour,
@@ -372,19 +941,8 @@ class SchedulerService:
         if not not_voted:
             return False
 
-        title = (
-            f"🌙 <b>Напоминание {reminder_hour}:00</b>"
-            if is_night
-            else f"⏰ <b>Напоминание {reminder_hour}:00</b>"
-        )
-        message = self._build_reminder_message(not_voted, hours_left, title=title)
-
         try:
-            await self.bot.send_message(
-                chat_id=group['telegram_chat_id'],
-                text=message,
-                parse_mode="HTML",
-            )
+            await self._post_reminder(group, not_voted, reminder_hour, hours_left, is_night)
             return True
         except Exception:
             await self.poll_service.poll_repo.release_reminder_dispatch(
@@ -400,6 +958,27 @@ class SchedulerService:
             )
             raise
 
+    async def _post_reminder(
+        self,
+        group: Dict[str, Any],
+        not_voted: List[Dict[str, Any]],
+        reminder_hour: int,
+        hours_left: int,
+        is_night: bool,
+    ) -> None:
+        """Отправить в чат группы напоминание со списком неотметившихся."""
+        title = (
+            f"🌙 <b>Напоминание {reminder_hour}:00</b>"
+            if is_night
+            else f"⏰ <b>Напоминание {reminder_hour}:00</b>"
+        )
+        message = self._build_reminder_message(not_voted, hours_left, title=title)
+        await self.bot.send_message(
+            chat_id=group['telegram_chat_id'],
+            text=message,
+            parse_mode="HTML",
+        )
+
     def _build_reminder_retry_job_id(
         self,
         group_id: int,
@@ -430,11 +1009,13 @@ class SchedulerService:
 
         run_at = datetime.now() + timedelta(minutes=2)
         self.scheduler.add_job(
-            self._retry_single_reminder,
+            run_reminder_retry,
             DateTrigger(run_date=run_at, timezone="Europe/Moscow"),
             id=job_id,
             name=f"Повтор напоминания для группы {group.get('name', group['id'])}",
             replace_existing=True,
+            jobstore=PERSISTENT_JOBSTORE if self.job_store is not None else "default",
+            misfire_grace_time=settings.REMINDER_RETRY_MISFIRE_GRACE_SECONDS,
             kwargs={
                 "poll_id": poll["id"],
                 "group_id": group["id"],
@@ -461,9 +1042,7 @@ class SchedulerService:
             if not poll or not group or poll.get("status") != "active":
                 return
 
-            closing_time = time(17, 0) if is_night else time(settings.POLL_CLOSING_HOUR, settings.POLL_CLOSING_MINUTE)
-            time_left = datetime.combine(date.today(), closing_time) - datetime.now()
-            hours_left = max(0, int(time_left.total_seconds() // 3600))
+            hours_left = self._hours_until_close(group)
 
             reminder_sent = await self._send_reminder_for_poll(
                 poll=poll,
@@ -490,23 +1069,11 @@ class SchedulerService:
         is_night: bool,
         target_date: date,
     ) -> bool:
-        active_polls = await self.poll_service.poll_repo.get_active_polls()
-        for poll in active_polls:
-            if poll.get("poll_date") != target_date:
-                continue
-
-            group = await self.group_service.get_group_by_id(poll["group_id"])
-            if not group or bool(group.get("is_night", False)) != is_night:
-                continue
-
-            reminder_already_sent = await self.poll_service.poll_repo.reminder_already_sent(
-                poll_id=str(poll["id"]),
-                reminder_hour=reminder_hour,
-                is_night=is_night,
-            )
-            if not reminder_already_sent:
-                return True
-        return False
+        return await self.poll_service.poll_repo.has_pending_reminders(
+            poll_date=target_date,
+            reminder_hour=reminder_hour,
+            is_night=is_night,
+        )
 
     async def _close_daily_polls(self) -> None:
         """Закрыть дневные опросы на завтра."""
@@ -552,7 +1119,7 @@ class SchedulerService:
                     closed = await self.close_single_poll_with_reporting(poll, group)
                     if closed:
                         closed_count += 1
-                        logger.info("Закрыт опрос для группы %s", group['name'])
+                        group_logger.info("Закрыт опрос для группы %s", group['name'])
                     
                 except Exception as e:
                     error_msg = f"Группа {group.get('name', poll['group_id'])}: {e}"
@@ -583,8 +1150,36 @@ class SchedulerService:
             logger.error("Ошибка при закрытии опросов: %s", e, exc_info=True)
             await self._notify_admins(f"❌ Ошибка при закрытии опросов: {e}")
 
-    async def _recover_missed_automation(self) -> None:
-        """Догоняющее выполнение, если бот пропустил окно по времени."""
+    async def _rebuild_not_voted_tracker(self) -> None:
+        """
+        Собрать списки неотметившихся по активным опросам после запуска.
+
+        Списки собираются вместе с отчетами, поэтому и первое закрытие
+        получает готовый отчет. Ошибка только логируется: без списка
+        напоминание возьмёт неотметившихся из БД.
+        """
+        try:
+            active_polls = await self.poll_service.poll_repo.get_active_polls()
+            groups: Dict[int, Optional[Dict[str, Any]]] = {}
+            for poll in active_polls:
+                group_id = poll["group_id"]
+                if group_id not in groups:
+                    groups[group_id] = await self.group_service.get_group_by_id(group_id)
+                if groups[group_id]:
+                    await self.report_service.get_report(poll, groups[group_id])
+            logger.info("Списки неотметившихся собраны: %d", len(not_voted_tracker))
+        except Exception as e:
+            logger.warning("Не удалось собрать списки неотметившихся: %s", e)
+
+    async def _recover_missed_automation(self, startup: bool = False) -> None:
+        """
+        Догоняющее выполнение, если бот пропустил окно по времени.
+
+        Args:
+            startup: Проверка при запуске планировщика (в том числе когда
+                реплика стала лидером). Расписания групп догоняются только
+                тогда: дальше наступившие события выполняет диспетчер.
+        """
         try:
             now = datetime.now()
             current_date = date.today()
@@ -598,19 +1193,38 @@ class SchedulerService:
                 if now.time() >= duty_creation_time:
                     await self._create_duty_polls()
 
+            if self.group_dispatcher is not None:
+                if startup:
+                    scheduled_at = self.group_dispatcher.rebuilt_at or now
+                    if self.streams_poll_creation:
+                        await self._recover_missed_group_creations(scheduled_at)
+                    await self._recover_missed_group_events(scheduled_at)
+                return
+
             night_close_time = time(17, 0)
             day_close_time = time(settings.POLL_CLOSING_HOUR, settings.POLL_CLOSING_MINUTE)
             day_target_date = current_date + timedelta(days=1)
+            active_polls: Optional[List[Dict[str, Any]]] = None
+            groups_by_id: Dict[int, Dict[str, Any]] = {}
+
+            async def has_pending_polls(is_night: bool, target_date: date) -> bool:
+                nonlocal active_polls
+                if active_polls is None:
+                    active_polls = await self.poll_service.poll_repo.get_active_polls()
+                    if active_polls:
+                        groups_by_id.update(
+                            (group["id"], group) for group in await self.group_service.get_all_groups()
+                        )
+                return any(
+                    poll.get("poll_date") == target_date
+                    and poll["group_id"] in groups_by_id
+                    and bool(groups_by_id[poll["group_id"]].get("is_night", False)) == is_night
+                    for poll in active_polls
+                )
 
             if now.time() > night_close_time:
                 night_target_date = current_date
-                night_active_polls = await self.poll_service.poll_repo.get_active_polls()
-                has_pending_night = False
-                for poll in night_active_polls:
-                    group = await self.group_service.get_group_by_id(poll["group_id"])
-                    if group and group.get("is_night", False) and poll.get("poll_date") == night_target_date:
-                        has_pending_night = True
-                        break
+                has_pending_night = await has_pending_polls(is_night=True, target_date=night_target_date)
                 if has_pending_night:
                     logger.warning("⏱ Обнаружены незакрытые ночные опросы после 17:00. Запускаю догоняющее закрытие.")
                     await self._close_polls(is_night=True, target_date=night_target_date)
@@ -624,13 +1238,7 @@ class SchedulerService:
                     await self._send_reminders(reminder_hour=12, is_night=True)
 
             if now.time() > day_close_time:
-                day_active_polls = await self.poll_service.poll_repo.get_active_polls()
-                has_pending_day = False
-                for poll in day_active_polls:
-                    group = await self.group_service.get_group_by_id(poll["group_id"])
-                    if group and not group.get("is_night", False) and poll.get("poll_date") == day_target_date:
-                        has_pending_day = True
-                        break
+                has_pending_day = await has_pending_polls(is_night=False, target_date=day_target_date)
                 if has_pending_day:
                     logger.warning("⏱ Обнаружены незакрытые дневные опросы после времени закрытия. Запускаю догоняющее закрытие.")
                     await self._close_polls(is_night=False, target_date=day_target_date)
@@ -665,16 +1273,7 @@ class SchedulerService:
         """
         poll_date = poll.get('poll_date')
         group_name = group.get('name', 'Неизвестная группа')
-        
-        # Получаем настройки слотов
-        settings_data = group.get('settings', {})
-        slots = settings_data.get('slots', [])
-        extra_options = settings_data.get('extra_options', [])
-        if not isinstance(extra_options, list):
-            extra_options = []
-        
-        results = self._normalize_results(poll.get('results'))
-        member_names_by_id, member_names_by_user_id = await self.group_member_service.get_member_name_maps(group["id"])
+        prepared = await self.report_service.get_report(poll, group)
         
         report = (
             f"📊 <b>Результаты опроса</b>\n"
@@ -682,95 +1281,7 @@ class SchedulerService:
             f"📍 Группа: {group_name}\n"
             f"⏰ Опрос закрыт: в {datetime.now().strftime('%H:%M')}\n\n"
         )
-        
-        if group.get("is_night", False):
-            report += "Рабочие смены\n\n"
-            for title, key in (
-                ("Выхожу", "night_out"),
-                ("Не выхожу", "not_going"),
-            ):
-                voters = results.get(key, [])
-                if voters:
-                    report += f"✅ {title} — {_format_people_count(len(voters))}\n"
-                    for voter in voters[:20]:
-                        report += f"• {self.group_member_service.resolve_voter_display_name(voter, member_names_by_id, member_names_by_user_id)}\n"
-                else:
-                    report += f"❌ {title} — нет курьеров\n"
-                report += "\n"
-            has_additional = False
-            dayoff_votes = results.get("day_off", [])
-            if dayoff_votes:
-                report += "Дополнительно\n\n"
-                has_additional = True
-                report += f"🏖 Выходной — {_format_people_count(len(dayoff_votes))}\n"
-                for voter in dayoff_votes[:20]:
-                    report += f"• {self.group_member_service.resolve_voter_display_name(voter, member_names_by_id, member_names_by_user_id)}\n"
-                report += "\n"
-            custom_results = results.get("custom", {})
-            if isinstance(custom_results, dict):
-                for index, option_text in enumerate(extra_options):
-                    voters = custom_results.get(f"option_{index}", [])
-                    if voters:
-                        if not has_additional:
-                            report += "Дополнительно\n\n"
-                            has_additional = True
-                        report += f"📝 {option_text} — {_format_people_count(len(voters))}\n"
-                        for voter in voters[:20]:
-                            report += f"• {self.group_member_service.resolve_voter_display_name(voter, member_names_by_id, member_names_by_user_id)}\n"
-                        report += "\n"
-        elif slots:
-            report += "Рабочие смены\n\n"
-            for i, slot in enumerate(slots):
-                start = slot.get('start', '?')
-                end = slot.get('end', '?')
-                
-                slot_votes = results.get('slots', {}).get(f'slot_{i}', [])
-                current_count = len(slot_votes) if isinstance(slot_votes, list) else 0
-
-                status = "✅" if current_count > 0 else "❌"
-                dash = "–"
-                if current_count > 0:
-                    report += f"{status} {start}{dash}{end} — {_format_people_count(current_count)}\n"
-                else:
-                    report += f"{status} {start}{dash}{end} — нет курьеров\n"
-                
-                if isinstance(slot_votes, list) and slot_votes:
-                    for voter in slot_votes[:10]:  # Максимум 10 имен
-                        report += f"• {self.group_member_service.resolve_voter_display_name(voter, member_names_by_id, member_names_by_user_id)}\n"
-                    if len(slot_votes) > 10:
-                        report += f"... и еще {len(slot_votes) - 10}\n"
-                report += "\n"
-        
-        if not group.get("is_night", False):
-            has_additional = False
-            dayoff_votes = results.get('day_off', [])
-            if dayoff_votes:
-                if not has_additional:
-                    report += "Дополнительно\n\n"
-                    has_additional = True
-                report += f"🏖 Выходной — {_format_people_count(len(dayoff_votes))}\n"
-                for voter in dayoff_votes[:10]:
-                    report += f"• {self.group_member_service.resolve_voter_display_name(voter, member_names_by_id, member_names_by_user_id)}\n"
-                if len(dayoff_votes) > 10:
-                    report += f"... и еще {len(dayoff_votes) - 10}\n"
-                report += "\n"
-
-            custom_results = results.get("custom", {})
-            if isinstance(custom_results, dict):
-                for index, option_text in enumerate(extra_options):
-                    voters = custom_results.get(f"option_{index}", [])
-                    if voters:
-                        if not has_additional:
-                            report += "Дополнительно\n\n"
-                            has_additional = True
-                        report += f"📝 {option_text} — {_format_people_count(len(voters))}\n"
-                        for voter in voters[:10]:
-                            report += f"• {self.group_member_service.resolve_voter_display_name(voter, member_names_by_id, member_names_by_user_id)}\n"
-                        if len(voters) > 10:
-                            report += f"... и еще {len(voters) - 10}\n"
-                        report += "\n"
-        
-        return report
+        return report + prepared.body
     
     async def _save_poll_report(
         self,
@@ -779,7 +1290,7 @@ class SchedulerService:
         report: str
     ) -> str:
         """
-        Сохранить отчет в файл.
+        Сохранить отчет в архив.
         
         Args:
             poll: Данные опроса
@@ -787,27 +1298,18 @@ class SchedulerService:
             report: Текст отчета
             
         Returns:
-            Путь к сохраненному файлу
+            Путь к помесячному файлу архива
         """
         try:
-            poll_date = poll.get('poll_date')
+            poll_date = poll.get('poll_date') or date.today()
             group_name = group.get('name', 'unknown')
             
-            # Создаем директорию для отчетов
-            reports_dir = Path("reports") / group_name
-            reports_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Сохраняем текстовый отчет
-            date_str = poll_date.strftime('%Y-%m-%d') if poll_date else 'unknown'
-            report_path = reports_dir / f"{date_str}.txt"
-            
             # Убираем HTML теги для текстового файла
             clean_report = report.replace("<b>", "").replace("</b>", "")
             
-            report_path.write_text(clean_report, encoding='utf-8')
-            
-            logger.info("Отчет сохранен: %s", report_path)
-            return str(report_path)
+            report_path = await self.report_archive.append(group_name, poll_date, clean_report)
+            group_logger.info("Отчет сохранен: %s", report_path)
+            return report_path
             
         except Exception as e:
             logger.error("Ошибка сохранения отчета: %s", e, exc_info=True)
@@ -890,24 +1392,22 @@ class SchedulerService:
             not_voted_report = self._format_not_voted_report(not_voted)
             screenshot_path = await self._save_poll_report(fresh_poll, group, report)
 
-            await self._call_telegram_with_retry(
-                lambda: self.bot.send_message(
-                    chat_id=group['telegram_chat_id'],
-                    text=report,
-                    parse_mode="HTML",
-                ),
-                operation_name="отправка итогов опроса",
-                group_name=group_name,
-            )
-            await self._call_telegram_with_retry(
-                lambda: self.bot.send_message(
-                    chat_id=group['telegram_chat_id'],
-                    text=not_voted_report,
-                    parse_mode="HTML",
-                ),
-                operation_name="отправка списка неотметившихся",
-                group_name=group_name,
-            )
+            # Отчет по большой группе может не влезть в одно сообщение Telegram
+            for operation_name, text in (
+                ("отправка итогов опроса", report),
+                ("отправка списка неотметившихся", not_voted_report),
+            ):
+                for chunk in split_message(text):
+                    await self._call_telegram_with_retry(
+                        lambda chunk=chunk: self.bot.send_message(
+                            chat_id=group['telegram_chat_id'],
+                            text=chunk,
+                            parse_mode="HTML",
+                        ),
+                        operation_name=operation_name,
+                        group_name=group_name,
+                    )
+            screenshot_path = await self._send_report_image(fresh_poll, group) or screenshot_path
 
             updated = await self.poll_service.poll_repo.update(
                 poll_id=fresh_poll['id'],
@@ -917,57 +1417,58 @@ class SchedulerService:
             )
             if not updated:
                 raise RuntimeError(f"Не удалось сохранить закрытие опроса для группы {group_name}")
+            not_voted_tracker.forget(poll_id)
             return True
         except Exception:
             await self.poll_service.poll_repo.release_closing_claim(poll_id)
             raise
 
+    async def _send_report_image(self, poll: Dict[str, Any], group: Dict[str, Any]) -> Optional[str]:
+        """
+        Отправить в группу картинку с итогами и сохранить её в архив.
+
+        Картинка дополняет текстовый отчет, поэтому любая ошибка здесь только
+        логируется и не мешает закрытию опроса.
+
+        Returns:
+            Путь к PNG или None, если картинка не отправлена
+        """
+        if self.report_images is None or not self.report_images.available:
+            return None
+
+        group_name = group.get('name', 'unknown')
+        poll_date = poll.get('poll_date') or date.today()
+        try:
+            rows = summarize_results(layout_for_group(group), normalize_results(poll.get('results')))
+            image = await self.report_images.render(
+                group_name,
+                f"Итоги опроса на {poll_date.strftime('%d.%m.%Y')}",
+                rows,
+            )
+            if image is None:
+                return None
+
+            await self._call_telegram_with_retry(
+                lambda: self.bot.send_photo(
+                    chat_id=group['telegram_chat_id'],
+                    photo=BufferedInputFile(image.data, filename=f"{poll_date.isoformat()}.png"),
+                ),
+                operation_name="отправка картинки с итогами",
+                group_name=group_name,
+            )
+            return await self.report_archive.save_image(group_name, poll_date, image.data)
+        except Exception as e:
+            logger.warning("Картинка с итогами для группы %s не отправлена: %s", group_name, e, exc_info=True)
+            return None
+
     def _normalize_results(self, results: Dict[str, Any] | None) -> Dict[str, Any]:
-        if isinstance(results, dict):
-            results.setdefault("slots", {})
-            results.setdefault("curator", [])
-            results.setdefault("day_off", [])
-            results.setdefault("night_out", [])
-            results.setdefault("not_going", [])
-            results.setdefault("custom", {})
-            return results
-        return {"slots": {}, "curator": [], "day_off": [], "night_out": [], "not_going": [], "custom": {}}
+        return normalize_results(results)
 
     def _extract_voted_user_ids(self, poll: Dict[str, Any]) -> set[int]:
-        results = self._normalize_results(poll.get("results"))
-        user_ids: set[int] = set()
-        for voters in results.get("slots", {}).values():
-            if isinstance(voters, list):
-                for voter in voters:
-                    if isinstance(voter, dict) and voter.get("user_id"):
-                        user_ids.add(int(voter["user_id"]))
-        for voter in results.get("day_off", []):
-            if isinstance(voter, dict) and voter.get("user_id"):
-                user_ids.add(int(voter["user_id"]))
-        for key in ("curator", "night_out", "not_going"):
-            for voter in results.get(key, []):
-                if isinstance(voter, dict) and voter.get("user_id"):
-                    user_ids.add(int(voter["user_id"]))
-        custom_results = results.get("custom", {})
-        if isinstance(custom_results, dict):
-            for voters in custom_results.values():
-                if isinstance(voters, list):
-                    for voter in voters:
-                        if isinstance(voter, dict) and voter.get("user_id"):
-                            user_ids.add(int(voter["user_id"]))
-        return user_ids
+        return extract_voted_user_ids(poll.get("results"))
 
     def _format_member_tag(self, member: Dict[str, Any]) -> str:
-        full_name = escape(member.get("full_name", "Неизвестный курьер"))
-        username = member.get("username")
-        if username:
-            username = str(username)
-            username = username if username.startswith("@") else f"@{username}"
-            return f"{full_name} ({escape(username)})"
-        telegram_user_id = member.get("telegram_user_id")
-        if telegram_user_id:
-            return f'<a href="tg://user?id={telegram_user_id}">{full_name}</a>'
-        return full_name
+        return format_member_tag(member)
 
     def _build_reminder_message(
         self,
@@ -988,25 +1489,18 @@ class SchedulerService:
         poll: Dict[str, Any],
         group: Dict[str, Any],
     ) -> List[Dict[str, Any]]:
-        members = await self.group_member_service.get_group_members(group["id"])
-        voted_user_ids = self._extract_voted_user_ids(poll)
-        not_voted: List[Dict[str, Any]] = []
-        for member in members:
-            telegram_user_id = member.get("telegram_user_id")
-            if telegram_user_id is not None and int(telegram_user_id) in settings.ADMIN_IDS:
-                continue
-            if telegram_user_id is None or int(telegram_user_id) not in voted_user_ids:
-                not_voted.append(member)
-        return not_voted
+        # Список, который ведётся по голосам, — без запросов к БД
+        tracked = not_voted_tracker.get(poll, group)
+        if tracked is not None:
+            return tracked
+        # При закрытии отчет уже собран: список берётся из него без запросов
+        prepared = self.report_service.get_cached(poll, group)
+        if prepared is not None:
+            return prepared.not_voted
+        return await self.group_member_service.get_not_voted_members(str(poll["id"]))
 
     def _format_not_voted_report(self, not_voted: List[Dict[str, Any]]) -> str:
-        if not not_voted:
-            return "✅ <b>Все курьеры из реестра отметились в опросе.</b>"
-
-        lines = "\n".join(f"• {self._format_member_tag(member)}" for member in not_voted[:50])
-        if len(not_voted) > 50:
-            lines += f"\n... и еще {len(not_voted) - 50}"
-        return "❌ <b>Не отметились:</b>\n" + lines
+        return format_not_voted_report(not_voted)
 
     async def send_manual_reminder_for_group(self, group_id: int) -> tuple[bool, str]:
         group = await self.group_service.get_group_by_id(group_id)
@@ -1063,6 +1557,15 @@ class SchedulerService:
     
     # Публичные методы для ручного управления
     
+    async def notify_admins(self, message: str) -> None:
+        """
+        Отправить уведомление всем админам (для внешних сторожей, например MemoryWatchdog).
+        
+        Args:
+            message: Текст уведомления
+        """
+        await self._notify_admins(message)
+    
     async def force_create_polls(self, target_date: Optional[date] = None) -> tuple:
         """
         Принудительно создать опросы (для админов).
@@ -7,10 +7,24 @@ from typing import Optional
 
 from src.services.scheduler_service import SchedulerService
 from src.services.poll_service import PollService
+from src.services.metrics_service import SystemMetricsService
+from src.services.poll_report_service import PollReportService
+from src.services.report_archive import ReportArchive
+from src.services.report_image_service import ReportImageService
+from src.services.retention_service import RetentionService
+from src.services.stats_service import StatsService
+from src.utils.loop_watchdog import LoopWatchdog
 
 # Глобальные переменные для сервисов
 scheduler_service: Optional[SchedulerService] = None
 poll_service: Optional[PollService] = None
+metrics_service: Optional[SystemMetricsService] = None
+loop_watchdog: Optional[LoopWatchdog] = None
+poll_report_service: Optional[PollReportService] = None
+report_archive: Optional[ReportArchive] = None
+report_image_service: Optional[ReportImageService] = None
+stats_service: Optional[StatsService] = None
+retention_service: Optional[RetentionService] = None
 
 
 def set_scheduler_service(service: SchedulerService) -> None:
@@ -25,6 +39,48 @@ def set_poll_service(service: PollService) -> None:
     poll_service = service
 
 
+def set_metrics_service(service: SystemMetricsService) -> None:
+    """Установить глобальный metrics_service."""
+    global metrics_service
+    metrics_service = service
+
+
+def set_loop_watchdog(watchdog: LoopWatchdog) -> None:
+    """Установить глобальный сторожевой таймер event loop."""
+    global loop_watchdog
+    loop_watchdog = watchdog
+
+
+def set_poll_report_service(service: PollReportService) -> None:
+    """Установить глобальный кэш отчетов по опросам."""
+    global poll_report_service
+    poll_report_service = service
+
+
+def set_report_archive(archive: ReportArchive) -> None:
+    """Установить глобальный архив отчетов."""
+    global report_archive
+    report_archive = archive
+
+
+def set_report_image_service(service: ReportImageService) -> None:
+    """Установить глобальный сервис картинок с итогами опросов."""
+    global report_image_service
+    report_image_service = service
+
+
+def set_stats_service(service: StatsService) -> None:
+    """Установить глобальный снимок статистики."""
+    global stats_service
+    stats_service = service
+
+
+def set_retention_service(service: RetentionService) -> None:
+    """Установить глобальный сервис очистки истории опросов."""
+    global retention_service
+    retention_service = service
+
+
 def get_scheduler_service() -> Optional[SchedulerService]:
     """Получить глобальный scheduler_service."""
     return scheduler_service
@@ -33,3 +89,44 @@ def get_scheduler_service() -> Optional[SchedulerService]:
 def get_poll_service() -> Optional[PollService]:
     """Получить глобальный poll_service."""
     return poll_service
+
+
+def get_metrics_service() -> Optional[SystemMetricsService]:
+    """Получить глобальный metrics_service."""
+    return metrics_service
+
+
+def get_loop_watchdog() -> Optional[LoopWatchdog]:
+    """Получить глобальный сторожевой таймер event loop."""
+    return loop_watchdog
+
+
+def get_poll_report_service() -> Optional[PollReportService]:
+    """Получить глобальный кэш отчетов по опросам."""
+    return poll_report_service
+
+
+def get_report_archive() -> Optional[ReportArchive]:
+    """Получить глобальный архив отчетов."""
+    return report_archive
+
+
+def get_report_image_service() -> Optional[ReportImageService]:
+    """Получить глобальный сервис картинок с итогами опросов."""
+    return report_image_service
+
+
+def get_stats_service() -> Optional[StatsService]:
+    """Получить глобальный снимок статистики."""
+    return stats_service
+
+
+def get_retention_service() -> Optional[RetentionService]:
+    """Получить глобальный сервис очистки истории опросов."""
+    return retention_service
+
+
+def invalidate_stats() -> None:
+    """Пометить снимок статистики устаревшим после изменения данных."""
+    if stats_service is not None:
+        stats_service.invalidate()
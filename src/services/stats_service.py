@@ -0,0 +1,210 @@
+"""
+Снимок статистики для экранов админ-панели.
+
+Счётчики групп, опросов, пользователей, голосов по дням и времена закрытия
+групп считаются агрегатами в PostgreSQL и хранятся готовым снимком. Снимок обновляется в фоне каждые
+STATS_REFRESH_SECONDS, а после изменений (голос, создание или удаление
+группы) помечается устаревшим и пересчитывается при следующем чтении.
+Экраны статистики и заголовки постраничных списков читают снимок и не
+ходят в базу сами.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, time as day_time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from src.repositories.stats_repository import StatsRepository
+from src.services.group_schedule_dispatcher import describe_close_times, group_close_time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DailyVotes:
+    """Голоса за один день."""
+
+    day: date
+    votes: int
+    voters: int
+
+
+@dataclass(frozen=True)
+class StatsSnapshot:
+    """Статистика системы на момент built_at."""
+
+    built_at: datetime
+    today: date
+    total_groups: int
+    active_groups: int
+    day_groups: int
+    night_groups: int
+    groups_with_slots: int
+    active_polls: int
+    active_today: int
+    active_tomorrow: int
+    today_polls: int
+    today_closed: int
+    verified_users: int
+    unverified_users: int
+    votes_by_day: List[DailyVotes]
+    # (ночная ли группа, время закрытия, число активных групп)
+    close_times: List[Tuple[bool, day_time, int]]
+
+    @property
+    def today_votes(self) -> int:
+        return next((item.votes for item in self.votes_by_day if item.day == self.today), 0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Счётчики в виде словаря (формат GroupService.get_system_stats)."""
+        return {
+            "total_groups": self.total_groups,
+            "active_groups": self.active_groups,
+            "day_groups": self.day_groups,
+            "night_groups": self.night_groups,
+            "groups_with_slots": self.groups_with_slots,
+            "active_polls": self.active_polls,
+            "today_votes": self.today_votes,
+        }
+
+
+async def build_snapshot(repository: StatsRepository, history_days: int) -> StatsSnapshot:
+    """Посчитать снимок статистики: три агрегирующих запроса."""
+    today = date.today()
+    counts = await repository.get_counts(today)
+    votes = await repository.get_votes_by_day(today - timedelta(days=max(1, history_days) - 1))
+    close_times = await repository.get_close_times()
+    return StatsSnapshot(
+        built_at=datetime.now(),
+        today=today,
+        votes_by_day=[
+            DailyVotes(day=row["day"], votes=int(row["votes"]), voters=int(row["voters"]))
+            for row in votes
+        ],
+        close_times=[
+            (bool(row["is_night"]), group_close_time(row), int(row["groups"]))
+            for row in close_times
+        ],
+        **counts,
+    )
+
+
+class StatsService:
+    """Кэш снимка статистики с фоновым обновлением."""
+
+    def __init__(
+        self,
+        db_pool: Any,
+        refresh_seconds: Optional[float] = None,
+        history_days: Optional[int] = None,
+    ):
+        """
+        Инициализация сервиса.
+
+        Args:
+            db_pool: Пул соединений asyncpg
+            refresh_seconds: Период фонового обновления (по умолчанию STATS_REFRESH_SECONDS)
+            history_days: За сколько дней показывать голоса (по умолчанию STATS_VOTE_HISTORY_DAYS)
+        """
+        self.repository = StatsRepository(db_pool)
+        self.refresh_seconds = max(1.0, float(refresh_seconds or settings.STATS_REFRESH_SECONDS))
+        self.history_days = history_days or settings.STATS_VOTE_HISTORY_DAYS
+        self._snapshot: Optional[StatsSnapshot] = None
+        self._stale = True
+        self._refresh_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.last_refresh_ms: Optional[float] = None
+
+    async def start(self) -> None:
+        """Запустить фоновое обновление снимка."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run(), name="stats-snapshot")
+        logger.info("Снимок статистики обновляется каждые %.0f сек", self.refresh_seconds)
+
+    async def stop(self) -> None:
+        """Остановить фоновое обновление."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh(force=True)
+            except Exception as e:
+                logger.warning("Не удалось обновить снимок статистики: %s", e)
+            await asyncio.sleep(self.refresh_seconds)
+
+    def invalidate(self) -> None:
+        """Пометить снимок устаревшим: следующее чтение пересчитает его."""
+        self._stale = True
+
+    def _is_fresh(self) -> bool:
+        snapshot = self._snapshot
+        return snapshot is not None and not self._stale and snapshot.today == date.today()
+
+    async def refresh(self, force: bool = False) -> StatsSnapshot:
+        """
+        Пересчитать снимок.
+
+        Одновременные читатели ждут один пересчёт: после него снимок уже
+        свежий, и повторно в базу никто не идёт.
+        """
+        async with self._refresh_lock:
+            if not force and self._is_fresh():
+                return self._snapshot
+            # Изменения во время пересчёта снова пометят снимок устаревшим
+            self._stale = False
+            started = time.monotonic()
+            try:
+                snapshot = await build_snapshot(self.repository, self.history_days)
+            except Exception:
+                self._stale = True
+                raise
+            self.last_refresh_ms = (time.monotonic() - started) * 1000
+            self._snapshot = snapshot
+            return snapshot
+
+    async def get_snapshot(self) -> StatsSnapshot:
+        """Текущий снимок; пересчитывается, только если устарел."""
+        if self._is_fresh():
+            return self._snapshot
+        return await self.refresh()
+
+
+async def load_snapshot(service: Optional[StatsService], db_pool: Any) -> StatsSnapshot:
+    """Снимок из сервиса, а без запущенного сервиса — посчитанный сразу."""
+    if service is not None:
+        return await service.get_snapshot()
+    return await build_snapshot(StatsRepository(db_pool), settings.STATS_VOTE_HISTORY_DAYS)
+
+
+def format_votes_by_day(snapshot: StatsSnapshot) -> str:
+    """Строки «дата — голоса» за последние дни, начиная с сегодняшнего."""
+    if not snapshot.votes_by_day:
+        return "• Голосов пока нет\n"
+    return "".join(
+        f"• {item.day.strftime('%d.%m')}: <b>{item.votes}</b> (курьеров: {item.voters})\n"
+        for item in reversed(snapshot.votes_by_day)
+    )
+
+
+def format_close_times(snapshot: StatsSnapshot) -> str:
+    """Строки о времени закрытия опросов: по группам или общее (старый режим)."""
+    if not settings.ENABLE_PER_GROUP_SCHEDULES:
+        return f"• Закрытие: {settings.POLL_CLOSING_HOUR}:{str(settings.POLL_CLOSING_MINUTE).zfill(2)}\n"
+    windows = describe_close_times(snapshot.close_times)
+    if not windows:
+        return "• Закрытие: активных групп нет\n"
+    lines = "".join(f"• Закрытие: {window}\n" for window in windows)
+    if settings.GROUP_SCHEDULE_SPREAD_MINUTES > 0:
+        lines += f"• Разнос групп: до {settings.GROUP_SCHEDULE_SPREAD_MINUTES} мин после своего времени\n"
+    return lines
@@ -5,6 +5,7 @@ import logging
 from typing import Optional, Dict, Any, List
 from asyncpg import Pool
 
+from src.repositories.pagination import KeysetPage, PageCursor
 from src.repositories.user_repository import UserRepository
 
 logger = logging.getLogger(__name__)
@@ -147,6 +148,38 @@ class UserService:
         
         return await self.repository.get_unverified(limit=limit, offset=offset)
     
+    async def get_verified_page(self, limit: int = 10, cursor: Optional[PageCursor] = None) -> KeysetPage:
+        """
+        Получить страницу верифицированных пользователей (keyset-пагинация).
+        
+        Args:
+            limit: Размер страницы
+            cursor: Курсор страницы или None для первой
+            
+        Returns:
+            Страница пользователей с курсорами соседних страниц
+        """
+        if not self.repository:
+            return KeysetPage()
+        
+        return await self.repository.get_verified_page(limit=limit, cursor=cursor)
+    
+    async def get_unverified_page(self, limit: int = 10, cursor: Optional[PageCursor] = None) -> KeysetPage:
+        """
+        Получить страницу неверифицированных пользователей (keyset-пагинация).
+        
+        Args:
+            limit: Размер страницы
+            cursor: Курсор страницы или None для первой
+            
+        Returns:
+            Страница пользователей с курсорами соседних страниц
+        """
+        if not self.repository:
+            return KeysetPage()
+        
+        return await self.repository.get_unverified_page(limit=limit, cursor=cursor)
+    
     async def verify_user(
         self,
         user_id: int,
@@ -47,6 +47,11 @@ class AdminPanelStates(StatesGroup):
     waiting_for_employee_group = State()  # Выбор группы для сотрудника
     waiting_for_employee_rename = State()  # Новое ФИО сотрудника
     waiting_for_employee_transfer_group = State()  # Выбор новой группы для сотрудника
+    waiting_for_employee_import = State()  # Файл или текст со списком курьеров
+    waiting_for_employee_import_confirm = State()  # Подтверждение импорта после проверки
+    
+    # Мониторинг
+    waiting_for_log_query = State()  # Ввод подстроки для поиска по логам
     
     # Верификация пользователей
     waiting_for_user_name = State()  # Ожидание ввода имени и фамилии для верификации
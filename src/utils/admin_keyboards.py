@@ -80,6 +80,7 @@ def get_monitoring_menu_keyboard() -> InlineKeyboardMarkup:
     keyboard = [
         [InlineKeyboardButton(text="📊 Статистика", callback_data="admin:monitoring:stats")],
         [InlineKeyboardButton(text="🔍 Статус системы", callback_data="admin:monitoring:system")],
+        [InlineKeyboardButton(text="🐢 Задержки event loop", callback_data="admin:monitoring:loop")],
         [InlineKeyboardButton(text="📜 Логи", callback_data="admin:monitoring:logs")],
         [InlineKeyboardButton(text="👤 Верификация", callback_data="admin:monitoring:verification")],
         [InlineKeyboardButton(text="◀️ Назад", callback_data="admin:back_to_main")],
@@ -87,6 +88,51 @@ def get_monitoring_menu_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
+def get_logs_keyboard(
+    level: str = "all",
+    next_cursor: Optional[str] = None,
+    has_query: bool = False,
+) -> InlineKeyboardMarkup:
+    """
+    Клавиатура просмотра логов: фильтр по уровню, поиск и переход к старым записям.
+    
+    Args:
+        level: Текущий фильтр уровня (all, INFO, WARNING, ERROR)
+        next_cursor: Курсор следующей (более старой) страницы или None
+        has_query: Активен ли поиск по подстроке
+        
+    Returns:
+        InlineKeyboardMarkup для экрана логов
+    """
+    level_buttons = []
+    for code, title in (("all", "Все"), ("INFO", "INFO+"), ("WARNING", "WARN+"), ("ERROR", "ERROR")):
+        marker = "• " if code == level else ""
+        level_buttons.append(
+            InlineKeyboardButton(text=f"{marker}{title}", callback_data=f"admin:logs:page:{code}:")
+        )
+    
+    nav_buttons = [InlineKeyboardButton(text="🔄 Свежие", callback_data=f"admin:logs:page:{level}:")]
+    if next_cursor:
+        nav_buttons.insert(0, InlineKeyboardButton(
+            text="⏪ Старее",
+            callback_data=f"admin:logs:page:{level}:{next_cursor}",
+        ))
+    
+    search_buttons = [InlineKeyboardButton(text="🔍 Поиск", callback_data=f"admin:logs:search:{level}")]
+    if has_query:
+        search_buttons.append(
+            InlineKeyboardButton(text="✖️ Сбросить поиск", callback_data=f"admin:logs:clear:{level}")
+        )
+    
+    keyboard = [
+        level_buttons,
+        nav_buttons,
+        search_buttons,
+        [InlineKeyboardButton(text="◀️ Назад", callback_data="admin:monitoring_menu")],
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
 def get_broadcast_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для запуска рассылки."""
     keyboard = [
@@ -120,28 +166,24 @@ def get_user_actions_keyboard(user_id: int) -> InlineKeyboardMarkup:
 def get_users_list_keyboard(
     users: List[Dict[str, Any]],
     action: str = "verify",
-    page: int = 0,
-    per_page: int = 10,
+    next_cursor: Optional[str] = None,
+    prev_cursor: Optional[str] = None,
 ) -> InlineKeyboardMarkup:
     """
-    Клавиатура со списком пользователей для выбора.
+    Клавиатура со страницей пользователей для выбора.
     
     Args:
-        users: Список пользователей
-        action: Действие (verify, edit, delete)
-        page: Номер страницы (для пагинации)
-        per_page: Количество пользователей на странице
+        users: Пользователи текущей страницы
+        action: Действие (verify, view)
+        next_cursor: Курсор следующей страницы или None
+        prev_cursor: Курсор предыдущей страницы или None
         
     Returns:
         InlineKeyboardMarkup с кнопками пользователей
     """
     keyboard = []
     
-    start_idx = page * per_page
-    end_idx = start_idx + per_page
-    page_users = users[start_idx:end_idx]
-    
-    for user in page_users:
+    for user in users:
         user_id = user.get("id")
         first_name = user.get("first_name", "")
         last_name = user.get("last_name", "")
@@ -149,7 +191,7 @@ def get_users_list_keyboard(
         
         # Формируем текст кнопки
         if first_name or last_name:
-            display_name = f"{first_name} {last_name}".strip()
+            display_name = f"{first_name or ''} {last_name or ''}".strip()
         else:
             display_name = f"ID: {telegram_id}"
         
@@ -162,17 +204,17 @@ def get_users_list_keyboard(
             InlineKeyboardButton(text=display_name, callback_data=callback_data)
         ])
     
-    # Кнопки пагинации
+    # Кнопки пагинации: в callback_data только курсор граничной записи
     nav_buttons = []
-    if page > 0:
+    if prev_cursor:
         nav_buttons.append(InlineKeyboardButton(
             text="◀️",
-            callback_data=f"admin:verification:{action}:page:{page-1}"
+            callback_data=f"admin:verification:{action}:page:{prev_cursor}"
         ))
-    if end_idx < len(users):
+    if next_cursor:
         nav_buttons.append(InlineKeyboardButton(
             text="▶️",
-            callback_data=f"admin:verification:{action}:page:{page+1}"
+            callback_data=f"admin:verification:{action}:page:{next_cursor}"
         ))
     if nav_buttons:
         keyboard.append(nav_buttons)
@@ -191,6 +233,7 @@ def get_employee_menu_keyboard() -> InlineKeyboardMarkup:
         [InlineKeyboardButton(text="🔄 Перенести в другую группу", callback_data="admin:employees:move")],
         [InlineKeyboardButton(text="🔗 Статус привязки Telegram", callback_data="admin:employees:bindings")],
         [InlineKeyboardButton(text="🗑️ Удалить курьера", callback_data="admin:employees:delete")],
+        [InlineKeyboardButton(text="📥 Импорт из файла", callback_data="admin:employees:import")],
         [InlineKeyboardButton(text="◀️ Назад", callback_data="admin:groups_menu")],
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
@@ -207,33 +250,29 @@ def get_topic_type_keyboard() -> InlineKeyboardMarkup:
 
 def get_groups_list_keyboard(
     groups: List[Dict[str, Any]], 
-    page: int = 0, 
-    per_page: int = 10,
     action: Optional[str] = None,
-    back_callback: str = "admin:groups_menu"
+    back_callback: str = "admin:groups_menu",
+    next_cursor: Optional[str] = None,
+    prev_cursor: Optional[str] = None,
 ) -> InlineKeyboardMarkup:
     """
-    Клавиатура со списком групп для выбора.
+    Клавиатура со страницей групп для выбора.
     
     Args:
-        groups: Список групп
-        page: Номер страницы (для пагинации)
-        per_page: Количество групп на странице
+        groups: Группы текущей страницы
         action: Действие (delete, rename, slots) или None для простого просмотра
         back_callback: Callback для кнопки "Назад"
+        next_cursor: Курсор следующей страницы или None
+        prev_cursor: Курсор предыдущей страницы или None
         
     Returns:
         InlineKeyboardMarkup с кнопками групп (если action указан) или только пагинацией
     """
     keyboard = []
     
-    start_idx = page * per_page
-    end_idx = start_idx + per_page
-    page_groups = groups[start_idx:end_idx]
-    
     # Если action указан, создаем кнопки для выбора группы
     if action:
-        for group in page_groups:
+        for group in groups:
             group_name = group.get("name", f"Группа {group.get('id', '?')}")
             # Очищаем название для отображения
             from src.utils.group_formatters import clean_group_name_for_display
@@ -250,21 +289,15 @@ def get_groups_list_keyboard(
                 )
             ])
     
-    # Кнопки пагинации (только если групп больше чем per_page)
+    # Кнопки пагинации: в callback_data только курсор граничной записи
+    page_prefix = f"admin:groups:{action or 'list'}:page:"
     nav_buttons = []
-    if len(groups) > per_page:
-        if page > 0:
-            if action:
-                nav_buttons.append(InlineKeyboardButton(text="◀️", callback_data=f"admin:groups:{action}:page:{page-1}"))
-            else:
-                nav_buttons.append(InlineKeyboardButton(text="◀️", callback_data=f"admin:groups:list:page:{page-1}"))
-        if end_idx < len(groups):
-            if action:
-                nav_buttons.append(InlineKeyboardButton(text="▶️", callback_data=f"admin:groups:{action}:page:{page+1}"))
-            else:
-                nav_buttons.append(InlineKeyboardButton(text="▶️", callback_data=f"admin:groups:list:page:{page+1}"))
-        if nav_buttons:
-            keyboard.append(nav_buttons)
+    if prev_cursor:
+        nav_buttons.append(InlineKeyboardButton(text="◀️", callback_data=f"{page_prefix}{prev_cursor}"))
+    if next_cursor:
+        nav_buttons.append(InlineKeyboardButton(text="▶️", callback_data=f"{page_prefix}{next_cursor}"))
+    if nav_buttons:
+        keyboard.append(nav_buttons)
     
     keyboard.append([InlineKeyboardButton(text="◀️ Назад", callback_data=back_callback)])
     
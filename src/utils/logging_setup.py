@@ -0,0 +1,191 @@
+"""
+Настройка логирования бота.
+
+Записи из event loop попадают в очередь (QueueHandler), а запись в файл
+с ротацией и вывод в консоль выполняет отдельный поток QueueListener.
+Для горячих путей (голоса, массовое создание опросов, планировщик)
+есть логгеры с ограничением частоты, чтобы объём логов не рос вместе
+с числом голосов.
+"""
+import atexit
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from config.settings import settings
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_FILE_NAME = "bot.log"
+
+_listener: Optional[QueueListener] = None
+
+
+class SchedulerNoiseFilter(logging.Filter):
+    """Скрывает шумные штатные логи APScheduler для recovery-job."""
+
+    SUPPRESSED_TEXT = "Проверка пропущенных автоматизаций"
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        return self.SUPPRESSED_TEXT not in message
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Ограничение частоты однотипных записей.
+
+    Однотипными считаются записи одного логгера с одним шаблоном сообщения.
+    За окно interval_seconds пропускается не больше max_records таких записей;
+    число подавленных добавляется к первой записи следующего окна.
+    Предупреждения и ошибки не ограничиваются.
+    """
+
+    def __init__(
+        self,
+        max_records: int,
+        interval_seconds: float,
+        min_passthrough_level: int = logging.WARNING,
+    ):
+        super().__init__()
+        self.max_records = max(1, max_records)
+        self.interval_seconds = interval_seconds
+        self.min_passthrough_level = min_passthrough_level
+        # ключ -> (начало окна, пропущено в окне, подавлено в окне)
+        self._windows: Dict[Tuple[str, str], Tuple[float, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.min_passthrough_level:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window_start, passed, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - window_start >= self.interval_seconds:
+                if suppressed:
+                    record.msg = f"{record.msg} [подавлено похожих записей: {suppressed}]"
+                self._windows[key] = (now, 1, 0)
+                return True
+            if passed < self.max_records:
+                self._windows[key] = (window_start, passed + 1, suppressed)
+                return True
+            self._windows[key] = (window_start, passed, suppressed + 1)
+            return False
+
+
+def get_rate_limited_logger(
+    name: str,
+    max_records: Optional[int] = None,
+    interval_seconds: Optional[float] = None,
+) -> logging.Logger:
+    """
+    Логгер для горячих путей с ограничением частоты INFO/DEBUG записей.
+
+    Args:
+        name: Имя логгера (обычно f"{__name__}.<участок>")
+        max_records: Максимум однотипных записей за окно
+        interval_seconds: Длина окна в секундах
+
+    Returns:
+        Логгер с установленным RateLimitFilter
+    """
+    hot_logger = logging.getLogger(name)
+    if not any(isinstance(item, RateLimitFilter) for item in hot_logger.filters):
+        hot_logger.addFilter(
+            RateLimitFilter(
+                max_records=max_records or settings.HOT_PATH_LOG_LIMIT,
+                interval_seconds=interval_seconds or settings.HOT_PATH_LOG_INTERVAL_SECONDS,
+            )
+        )
+    return hot_logger
+
+
+def _build_file_handler(log_path: Path) -> logging.Handler:
+    """Файловый обработчик с ротацией по размеру или по времени."""
+    if settings.LOG_ROTATION == "time":
+        return TimedRotatingFileHandler(
+            log_path,
+            when=settings.LOG_ROTATION_WHEN,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding='utf-8',
+        )
+    return RotatingFileHandler(
+        log_path,
+        maxBytes=settings.LOG_MAX_BYTES,
+        backupCount=settings.LOG_BACKUP_COUNT,
+        encoding='utf-8',
+    )
+
+
+def setup_logging(logs_dir: Path) -> QueueListener:
+    """
+    Настроить корневой логгер на запись через очередь.
+
+    Args:
+        logs_dir: Директория для файлов логов
+
+    Returns:
+        Запущенный QueueListener (останавливается автоматически при выходе)
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    file_handler = _build_file_handler(logs_dir / LOG_FILE_NAME)
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
+
+    _listener = QueueListener(
+        log_queue,
+        file_handler,
+        stream_handler,
+        respect_handler_level=True,
+    )
+    _listener.start()
+    atexit.register(stop_logging)
+
+    for scheduler_logger_name in ("apscheduler.scheduler", "apscheduler.executors.default"):
+        scheduler_logger = logging.getLogger(scheduler_logger_name)
+        scheduler_logger.addFilter(SchedulerNoiseFilter())
+        scheduler_logger.addFilter(
+            RateLimitFilter(
+                max_records=settings.HOT_PATH_LOG_LIMIT,
+                interval_seconds=settings.HOT_PATH_LOG_INTERVAL_SECONDS,
+            )
+        )
+
+    return _listener
+
+
+def stop_logging() -> None:
+    """Дописать оставшиеся записи из очереди и остановить поток логирования."""
+    global _listener
+    if _listener is None:
+        return
+    listener = _listener
+    _listener = None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
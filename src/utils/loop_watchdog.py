@@ -0,0 +1,267 @@
+"""
+Сторожевой таймер event loop.
+
+Корутина-пульс на event loop регулярно отмечается и измеряет задержку
+пробуждения. Отдельный поток следит за пульсом: если loop не отвечает
+дольше порога, поток снимает стек потока event loop и запоминает корутину,
+которая его заблокировала. История задержек хранится поминутно
+в виде перцентилей.
+"""
+import asyncio
+import inspect
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from types import FrameType
+from typing import Deque, Dict, List, Optional
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_OFFENDERS = 20
+MAX_STACK_FRAMES = 15
+COROUTINE_FLAGS = inspect.CO_COROUTINE | inspect.CO_ITERABLE_COROUTINE | inspect.CO_ASYNC_GENERATOR
+
+
+@dataclass
+class LoopStall:
+    """Эпизод блокировки event loop."""
+
+    started_at: datetime
+    duration_ms: float
+    coroutine: str
+    task: str
+    stack: str
+
+
+@dataclass(frozen=True)
+class LagBucket:
+    """Перцентили задержки event loop за одну минуту."""
+
+    minute: datetime
+    samples: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Перцентиль по отсортированному списку (ближайший ранг)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(percent / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def describe_blocking_frame(frame: Optional[FrameType]) -> tuple[str, str, str]:
+    """
+    Найти корутину, заблокировавшую loop, по стеку его потока.
+
+    Returns:
+        (самая внутренняя корутина с местом вызова, корневая корутина задачи, текст стека)
+    """
+    if frame is None:
+        return "неизвестно", "неизвестно", ""
+
+    innermost: Optional[str] = None
+    outermost: Optional[str] = None
+    current: Optional[FrameType] = frame
+    while current is not None:
+        code = current.f_code
+        if code.co_flags & COROUTINE_FLAGS:
+            name = f"{current.f_globals.get('__name__', '?')}.{code.co_qualname}"
+            if innermost is None:
+                innermost = f"{name} ({code.co_filename.rsplit('/', 1)[-1]}:{current.f_lineno})"
+            outermost = name
+        current = current.f_back
+
+    stack = "".join(traceback.format_stack(frame, limit=MAX_STACK_FRAMES))
+    return innermost or "не корутина (callback)", outermost or "—", stack
+
+
+class LoopWatchdog:
+    """Измерение задержки event loop и поиск блокирующих корутин."""
+
+    def __init__(
+        self,
+        threshold_ms: Optional[float] = None,
+        tick_interval_ms: Optional[float] = None,
+        history_minutes: Optional[int] = None,
+    ):
+        """
+        Инициализация сторожевого таймера.
+
+        Args:
+            threshold_ms: Порог блокировки, после которого снимается стек
+            tick_interval_ms: Период пульса на event loop
+            history_minutes: Сколько минут хранить историю перцентилей
+        """
+        self.threshold = (threshold_ms or settings.LOOP_WATCHDOG_THRESHOLD_MS) / 1000
+        self.tick_interval = (tick_interval_ms or settings.LOOP_WATCHDOG_INTERVAL_MS) / 1000
+        self.offenders: Deque[LoopStall] = deque(maxlen=MAX_OFFENDERS)
+        self.history: Deque[LagBucket] = deque(
+            maxlen=history_minutes or settings.METRICS_HISTORY_MINUTES
+        )
+        self.current_lag_ms = 0.0
+
+        self._current_minute: Optional[datetime] = None
+        self._current_samples: List[float] = []
+        self._last_beat = time.monotonic()
+        self._active_stall: Optional[LoopStall] = None
+        self._stall_started = 0.0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Запустить пульс на event loop и поток-наблюдатель."""
+        if self._task is not None and not self._task.done():
+            return
+
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._heartbeat(), name="loop-watchdog-heartbeat")
+        self._thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(
+            "Сторожевой таймер event loop запущен: порог %.0f мс",
+            self.threshold * 1000,
+        )
+
+    async def stop(self) -> None:
+        """Остановить пульс и поток-наблюдатель."""
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    async def _heartbeat(self) -> None:
+        """Пульс: отмечается на loop и измеряет опоздание пробуждения."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.tick_interval
+            await asyncio.sleep(self.tick_interval)
+            lag = max(0.0, loop.time() - expected)
+            with self._lock:
+                self._last_beat = time.monotonic()
+                self.current_lag_ms = lag * 1000
+                self._record_lag(lag * 1000)
+                stall = self._active_stall
+                self._active_stall = None
+
+            if stall is not None:
+                stall.duration_ms = max(stall.duration_ms, lag * 1000)
+                logger.warning(
+                    "Event loop был заблокирован %.0f мс: %s (задача %s)",
+                    stall.duration_ms,
+                    stall.coroutine,
+                    stall.task,
+                )
+
+    def _record_lag(self, lag_ms: float) -> None:
+        """Добавить замер в текущую минуту и закрыть прошедшую минуту."""
+        minute = datetime.now().replace(second=0, microsecond=0)
+        if self._current_minute is not None and minute != self._current_minute:
+            self._flush_bucket()
+        self._current_minute = minute
+        self._current_samples.append(lag_ms)
+
+    def _flush_bucket(self) -> None:
+        """Сохранить перцентили завершённой минуты."""
+        if not self._current_samples or self._current_minute is None:
+            return
+        values = sorted(self._current_samples)
+        self.history.append(
+            LagBucket(
+                minute=self._current_minute,
+                samples=len(values),
+                p50_ms=_percentile(values, 50),
+                p95_ms=_percentile(values, 95),
+                p99_ms=_percentile(values, 99),
+                max_ms=values[-1],
+            )
+        )
+        self._current_samples = []
+
+    def _monitor(self) -> None:
+        """Поток-наблюдатель: снимает стек loop, если пульс пропал дольше порога."""
+        check_interval = max(0.01, self.threshold / 4)
+        while not self._stop_event.wait(check_interval):
+            with self._lock:
+                silence = time.monotonic() - self._last_beat - self.tick_interval
+                if silence < self.threshold:
+                    continue
+                if self._active_stall is not None:
+                    self._active_stall.duration_ms = silence * 1000
+                    continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            coroutine, task, stack = describe_blocking_frame(frame)
+            stall = LoopStall(
+                started_at=datetime.now(),
+                duration_ms=silence * 1000,
+                coroutine=coroutine,
+                task=task,
+                stack=stack,
+            )
+            with self._lock:
+                self._active_stall = stall
+                self.offenders.append(stall)
+            logger.warning(
+                "Event loop не отвечает более %.0f мс, блокирует: %s\n%s",
+                self.threshold * 1000,
+                coroutine,
+                stack,
+            )
+
+    def get_recent_offenders(self) -> List[LoopStall]:
+        """Последние блокировки, от новых к старым."""
+        with self._lock:
+            return list(reversed(self.offenders))
+
+    def get_lag_history(self) -> List[LagBucket]:
+        """Поминутная история перцентилей, включая текущую неполную минуту."""
+        with self._lock:
+            history = list(self.history)
+            if self._current_samples and self._current_minute is not None:
+                values = sorted(self._current_samples)
+                history.append(
+                    LagBucket(
+                        minute=self._current_minute,
+                        samples=len(values),
+                        p50_ms=_percentile(values, 50),
+                        p95_ms=_percentile(values, 95),
+                        p99_ms=_percentile(values, 99),
+                        max_ms=values[-1],
+                    )
+                )
+        return history
+
+    def get_summary(self, minutes: int) -> Dict[str, float]:
+        """Худшие перцентили за последние minutes минут."""
+        buckets = self.get_lag_history()[-minutes:]
+        if not buckets:
+            return {}
+        return {
+            "p50_ms": max(bucket.p50_ms for bucket in buckets),
+            "p95_ms": max(bucket.p95_ms for bucket in buckets),
+            "p99_ms": max(bucket.p99_ms for bucket in buckets),
+            "max_ms": max(bucket.max_ms for bucket in buckets),
+        }
@@ -0,0 +1,75 @@
+"""
+Кэш вида опроса по telegram_poll_id.
+
+Голос приходит по любому опросу бота: ежедневному (daily_polls), опросу
+дежурных (duty_poll_dispatches) или уже устаревшему (obsolete_telegram_polls).
+Голоса по опросам дежурных и устаревшим опросам бот не хранит, поэтому вид
+такого опроса запоминается в памяти и следующие голоса отбрасываются без
+запроса к БД. Вид таких опросов уже не меняется. Неизвестный опрос не
+кэшируется: запись в daily_polls появляется чуть позже отправки опроса
+(в режиме webhook — возможно, на другой реплике), и отрицательная запись
+отбросила бы первые голоса нового опроса.
+"""
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from config.settings import settings
+
+POLL_KIND_DAILY = "daily"
+POLL_KIND_DUTY = "duty"
+POLL_KIND_OBSOLETE = "obsolete"
+POLL_KIND_UNKNOWN = "unknown"
+
+# Виды опросов, голоса по которым бот не хранит и которые уже не меняются
+CACHED_KINDS = frozenset({POLL_KIND_DUTY, POLL_KIND_OBSOLETE})
+
+
+class PollKindCache:
+    """LRU-кэш видов опросов с временем жизни записей."""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_size: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = settings.POLL_KIND_CACHE_SECONDS if ttl_seconds is None else ttl_seconds
+        self.max_size = max(1, max_size or settings.POLL_KIND_CACHE_SIZE)
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, telegram_poll_id: str) -> Optional[str]:
+        """Вид опроса из кэша или None, если записи нет или она устарела."""
+        entry = self._entries.get(telegram_poll_id)
+        if entry is None:
+            return None
+        kind, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[telegram_poll_id]
+            return None
+        self._entries.move_to_end(telegram_poll_id)
+        return kind
+
+    def remember(self, telegram_poll_id: str, kind: str) -> None:
+        """
+        Запомнить вид опроса дежурных или устаревшего опроса.
+
+        Ежедневные опросы не кэшируются — их статус меняется, неизвестные —
+        их запись может появиться в любой момент.
+        """
+        if kind not in CACHED_KINDS or self.ttl_seconds <= 0:
+            return
+        self._entries[telegram_poll_id] = (kind, self._clock() + self.ttl_seconds)
+        self._entries.move_to_end(telegram_poll_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+poll_kind_cache = PollKindCache()
@@ -0,0 +1,23 @@
+"""
+Детерминированное распределение групп по окну времени.
+
+Смещение считается по crc32 от ключа (например, id группы), поэтому
+не меняется между перезапусками и одинаково на всех репликах.
+"""
+import zlib
+
+
+def spread_offset_seconds(key: str, window_seconds: int) -> int:
+    """
+    Смещение ключа внутри окна.
+
+    Args:
+        key: Стабильный ключ, например "close:15"
+        window_seconds: Ширина окна в секундах
+
+    Returns:
+        Смещение от 0 до window_seconds - 1 (0, если окно пустое)
+    """
+    if window_seconds <= 0:
+        return 0
+    return zlib.crc32(key.encode("utf-8")) % window_seconds
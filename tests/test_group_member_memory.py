@@ -1,76 +1,63 @@
 import unittest
+from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock
 
 from src.services.group_member_service import GroupMemberService
 
 
+class FakeConnection:
+    def __init__(self, row):
+        self.row = row
+        self.queries = []
+
+    async def fetchrow(self, query, *args):
+        self.queries.append((query, args))
+        return self.row
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
 class GroupMemberMemoryTests(unittest.IsolatedAsyncioTestCase):
     def _build_service(self):
         service = GroupMemberService.__new__(GroupMemberService)
         service.repository = AsyncMock()
         return service
 
-    async def test_reuses_courier_already_linked_to_current_group(self):
+    async def test_vote_resolves_member_with_single_sync_call(self):
         service = self._build_service()
-        existing = {
-            "id": 12,
-            "group_id": 3,
-            "telegram_user_id": 42,
-            "is_active": True,
-        }
-        service.repository.get_by_group_and_telegram_id.return_value = existing
-        service.repository.get_by_id.return_value = existing
+        moved = {"id": 12, "group_id": 3, "telegram_user_id": 42, "is_active": True}
+        service.repository.sync_to_group.return_value = moved
 
         resolved = await service.resolve_member_for_vote(3, 42, "Курьер", "@courier")
 
-        self.assertEqual(resolved, existing)
-        service.repository.bind_telegram_user.assert_awaited_once_with(
-            member_id=12,
+        self.assertEqual(resolved, moved)
+        service.repository.sync_to_group.assert_awaited_once_with(
+            group_id=3,
             telegram_user_id=42,
+            full_name="Курьер",
             username="@courier",
-        )
-        service.repository.get_by_telegram_id.assert_not_awaited()
-        service.repository.create.assert_not_awaited()
-
-    async def test_reactivates_courier_who_returned_to_same_group(self):
-        service = self._build_service()
-        inactive = {
-            "id": 12,
-            "group_id": 3,
-            "telegram_user_id": 42,
-            "is_active": False,
-        }
-        active = {**inactive, "is_active": True}
-        service.repository.get_by_group_and_telegram_id.return_value = inactive
-        service.repository.get_by_id.return_value = active
-
-        resolved = await service.sync_member_to_group(3, 42, "Курьер", None)
-
-        self.assertEqual(resolved, active)
-        service.repository.set_active.assert_awaited_once_with(
-            member_id=12,
-            is_active=True,
+            create_if_missing=True,
         )
         service.repository.create.assert_not_awaited()
+        service.repository.bind_telegram_user.assert_not_awaited()
 
-    async def test_moves_remembered_courier_instead_of_creating_duplicate(self):
-        service = self._build_service()
-        remembered = {"id": 12, "group_id": 2, "telegram_user_id": 42}
-        moved = {"id": 12, "group_id": 3, "telegram_user_id": 42}
-        service.repository.get_by_group_and_telegram_id.return_value = None
-        service.repository.get_by_telegram_id.return_value = remembered
-        service.repository.get_by_id.return_value = moved
+    async def test_sync_takes_one_round_trip(self):
+        conn = FakeConnection({"id": 15, "group_id": 3, "telegram_user_id": 42, "is_active": True})
+        service = GroupMemberService(FakePool(conn))
 
-        resolved = await service.resolve_member_for_vote(3, 42, "Курьер", "@courier")
+        resolved = await service.resolve_member_for_vote(3, 42, "Курьер", None)
 
-        self.assertEqual(resolved, moved)
-        service.repository.move_to_group.assert_awaited_once_with(member_id=12, group_id=3)
-        service.repository.bind_telegram_user.assert_awaited_once_with(
-            member_id=12,
-            telegram_user_id=42,
-            username="@courier",
-        )
-        service.repository.create.assert_not_awaited()
+        self.assertEqual(resolved["id"], 15)
+        self.assertLessEqual(len(conn.queries), 2)
+        self.assertIn("sync_group_member", conn.queries[0][0])
+        self.assertEqual(conn.queries[0][1], (3, 42, "Курьер", None, True))
 
     async def test_deactivates_only_in_the_group_from_the_event(self):
         service = self._build_service()
@@ -86,8 +73,7 @@ class GroupMemberMemoryTests(unittest.IsolatedAsyncioTestCase):
 
     async def test_does_not_create_unknown_configured_admin(self):
         service = self._build_service()
-        service.repository.get_by_group_and_telegram_id.return_value = None
-        service.repository.get_by_telegram_id.return_value = None
+        service.repository.sync_to_group.return_value = None
 
         resolved = await service.sync_member_to_group(
             3,
@@ -98,27 +84,14 @@ class GroupMemberMemoryTests(unittest.IsolatedAsyncioTestCase):
         )
 
         self.assertIsNone(resolved)
-        service.repository.get_unlinked_by_name.assert_not_awaited()
-        service.repository.create.assert_not_awaited()
+        self.assertFalse(service.repository.sync_to_group.await_args.kwargs["create_if_missing"])
 
-    async def test_binds_existing_unlinked_roster_entry(self):
+    async def test_vote_fails_loudly_when_member_was_not_resolved(self):
         service = self._build_service()
-        roster_entry = {"id": 15, "group_id": 3, "telegram_user_id": None}
-        linked = {"id": 15, "group_id": 3, "telegram_user_id": 42}
-        service.repository.get_by_group_and_telegram_id.return_value = None
-        service.repository.get_by_telegram_id.return_value = None
-        service.repository.get_unlinked_by_name.return_value = roster_entry
-        service.repository.get_by_id.return_value = linked
-
-        resolved = await service.resolve_member_for_vote(3, 42, "Курьер", None)
+        service.repository.sync_to_group.return_value = None
 
-        self.assertEqual(resolved, linked)
-        service.repository.bind_telegram_user.assert_awaited_once_with(
-            member_id=15,
-            telegram_user_id=42,
-            username=None,
-        )
-        service.repository.create.assert_not_awaited()
+        with self.assertRaises(RuntimeError):
+            await service.resolve_member_for_vote(3, 42, "Курьер", None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,337 @@
+import asyncio
+import unittest
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from config.settings import settings
+from src.services.group_schedule_dispatcher import (
+    ACTION_CLOSE,
+    ACTION_CREATE,
+    ACTION_REMIND,
+    GroupEvent,
+    GroupScheduleDispatcher,
+    plan_group_events,
+)
+from src.services.poll_service import CREATION_CREATED, CREATION_EXISTS, CREATION_FAILED
+from src.services.scheduler_service import SchedulerService
+
+NOW = datetime(2026, 3, 2, 8, 0)
+
+
+def _group(group_id: int, close: time = time(19, 0), is_night: bool = False) -> dict:
+    return {"id": group_id, "name": f"ЗИЗ-{group_id}", "is_night": is_night, "poll_close_time": close}
+
+
+class PlanGroupEventsTests(unittest.TestCase):
+    def test_events_use_group_close_time_and_spread_window(self):
+        events = plan_group_events(_group(1, time(18, 30)), NOW, spread_seconds=600)
+        close = next(event for event in events if event.action == ACTION_CLOSE)
+
+        self.assertGreaterEqual(close.run_at, datetime(2026, 3, 2, 18, 30))
+        self.assertLess(close.run_at, datetime(2026, 3, 2, 18, 40))
+        self.assertEqual(close.target_date, date(2026, 3, 3))
+        self.assertTrue(any(event.action == ACTION_REMIND for event in events))
+
+    def test_night_group_defaults_and_targets_today(self):
+        group = {"id": 7, "is_night": True, "poll_close_time": None}
+
+        events = plan_group_events(group, NOW, spread_seconds=0)
+
+        close = next(event for event in events if event.action == ACTION_CLOSE)
+        remind = next(event for event in events if event.action == ACTION_REMIND)
+        self.assertEqual(close.run_at, datetime(2026, 3, 2, 17, 0))
+        self.assertEqual(close.target_date, date(2026, 3, 2))
+        self.assertEqual(remind.reminder_hour, 12)
+
+    def test_past_time_moves_to_next_day(self):
+        events = plan_group_events(_group(1, time(7, 0)), NOW, spread_seconds=0)
+        close = next(event for event in events if event.action == ACTION_CLOSE)
+
+        self.assertEqual(close.run_at, datetime(2026, 3, 3, 7, 0))
+
+    def test_groups_with_same_time_are_spread(self):
+        run_times = {
+            next(e for e in plan_group_events(_group(group_id), NOW, spread_seconds=3600) if e.action == ACTION_CLOSE).run_at
+            for group_id in range(1, 51)
+        }
+
+        self.assertGreater(len(run_times), 40)
+        self.assertLess(max(run_times) - min(run_times), timedelta(hours=1))
+
+    def test_poll_creation_is_spread_over_creation_window(self):
+        start = datetime.combine(NOW.date(), time(settings.POLL_CREATION_HOUR, settings.POLL_CREATION_MINUTE))
+        now = start - timedelta(minutes=1)
+        run_times = []
+        for group_id in range(1, 101):
+            events = plan_group_events(_group(group_id), now, spread_seconds=0, creation_window_seconds=900)
+            create = next(event for event in events if event.action == ACTION_CREATE)
+            self.assertEqual(create.target_date, start.date() + timedelta(days=1))
+            run_times.append(create.run_at)
+
+        self.assertGreaterEqual(min(run_times), start)
+        self.assertLess(max(run_times), start + timedelta(minutes=15))
+        # Поток равномерный: в каждой трети окна есть заметная доля групп
+        for third in range(3):
+            lower = start + timedelta(minutes=5 * third)
+            upper = lower + timedelta(minutes=5)
+            self.assertGreater(sum(lower <= run_at < upper for run_at in run_times), 15)
+
+    def test_zero_creation_window_leaves_creation_to_cron(self):
+        events = plan_group_events(_group(1), NOW, spread_seconds=0, creation_window_seconds=0)
+
+        self.assertNotIn(ACTION_CREATE, [event.action for event in events])
+
+
+class GroupScheduleDispatcherTests(unittest.IsolatedAsyncioTestCase):
+    def test_upsert_replaces_only_changed_group(self):
+        dispatcher = GroupScheduleDispatcher(handler=AsyncMock(), spread_seconds=0)
+        dispatcher.rebuild([_group(1), _group(2)], now=NOW)
+        events_before = len(dispatcher)
+
+        dispatcher.upsert_group(_group(1, time(9, 0)), now=NOW)
+
+        self.assertEqual(len(dispatcher), events_before)
+        self.assertEqual(dispatcher.next_run_at(), datetime(2026, 3, 2, 9, 0))
+        due = dispatcher.pop_due(datetime(2026, 3, 2, 9, 0))
+        self.assertEqual([(event.group_id, event.action) for event in due], [(1, ACTION_CLOSE)])
+
+    def test_due_event_is_rescheduled_for_next_day(self):
+        dispatcher = GroupScheduleDispatcher(handler=AsyncMock(), spread_seconds=0)
+        dispatcher.rebuild([_group(1)], now=NOW)
+
+        due = dispatcher.pop_due(datetime(2026, 3, 2, 19, 0))
+
+        self.assertIn(ACTION_CLOSE, [event.action for event in due])
+        self.assertFalse(dispatcher.has_pending(ACTION_CLOSE, False, date(2026, 3, 2)))
+        self.assertTrue(dispatcher.has_pending(ACTION_CLOSE, False, date(2026, 3, 3)))
+
+    def test_removed_group_events_are_skipped(self):
+        dispatcher = GroupScheduleDispatcher(handler=AsyncMock(), spread_seconds=0)
+        dispatcher.rebuild([_group(1), _group(2)], now=NOW)
+
+        dispatcher.remove_group(1)
+
+        due = dispatcher.pop_due(datetime(2026, 3, 2, 23, 0))
+        self.assertEqual({event.group_id for event in due}, {2})
+
+    def test_rebuild_keeps_overdue_events_once(self):
+        dispatcher = GroupScheduleDispatcher(handler=AsyncMock(), spread_seconds=0)
+        dispatcher.rebuild([_group(1)], now=NOW)
+        dispatcher.pop_due(datetime(2026, 3, 2, 18, 0))
+
+        # Закрытие в 19:00 ещё не извлечено, а расписание уже пересобирается
+        dispatcher.rebuild([_group(1)], now=datetime(2026, 3, 2, 19, 1))
+
+        due = dispatcher.pop_due(datetime(2026, 3, 2, 19, 1))
+        self.assertEqual([(event.action, event.schedule_date) for event in due], [(ACTION_CLOSE, date(2026, 3, 2))])
+        # Разовое событие не повторяется: на завтра одно закрытие
+        closes = [event for _, _, event in dispatcher._heap if event.action == ACTION_CLOSE]
+        self.assertEqual([event.run_at for event in closes], [datetime(2026, 3, 3, 19, 0)])
+
+    def test_close_time_moved_into_past_closes_today_immediately(self):
+        dispatcher = GroupScheduleDispatcher(handler=AsyncMock(), spread_seconds=0)
+        dispatcher.rebuild([_group(1)], now=NOW)
+        dispatcher.pop_due(datetime(2026, 3, 2, 18, 0))
+        changed_at = datetime(2026, 3, 2, 18, 30)
+
+        dispatcher.upsert_group(_group(1, time(18, 5)), now=changed_at)
+
+        self.assertTrue(dispatcher.has_pending(ACTION_CLOSE, False, date(2026, 3, 2)))
+        due = dispatcher.pop_due(changed_at)
+        self.assertEqual(len(due), 1)
+        self.assertEqual((due[0].action, due[0].target_date), (ACTION_CLOSE, date(2026, 3, 3)))
+        closes = [
+            event for _, _, event in dispatcher._heap
+            if event.action == ACTION_CLOSE and dispatcher._is_current(event)
+        ]
+        self.assertEqual([event.run_at for event in closes], [datetime(2026, 3, 3, 18, 5)])
+
+    def test_close_time_change_after_closing_does_not_close_again(self):
+        dispatcher = GroupScheduleDispatcher(handler=AsyncMock(), spread_seconds=0)
+        dispatcher.rebuild([_group(1)], now=NOW)
+        dispatcher.pop_due(datetime(2026, 3, 2, 19, 0))
+
+        dispatcher.upsert_group(_group(1, time(18, 5)), now=datetime(2026, 3, 2, 20, 0))
+
+        self.assertEqual(dispatcher.pop_due(datetime(2026, 3, 2, 20, 0)), [])
+
+    async def test_window_completion_is_reported_once_after_all_groups(self):
+        handled = []
+        completed = []
+
+        async def handler(event):
+            await asyncio.sleep(0.01 * event.group_id)
+            handled.append(event.group_id)
+
+        async def on_window_complete(action, is_night, schedule_date):
+            completed.append((action, len(handled)))
+
+        dispatcher = GroupScheduleDispatcher(handler, on_window_complete, spread_seconds=0)
+        due_at = datetime.now() - timedelta(seconds=1)
+        for group_id in (1, 2, 3):
+            dispatcher._versions[group_id] = 0
+            dispatcher._push(GroupEvent(due_at, group_id, ACTION_CLOSE, False, 0))
+
+        await dispatcher.start()
+        for _ in range(50):
+            if completed:
+                break
+            await asyncio.sleep(0.02)
+        await dispatcher.stop()
+
+        self.assertEqual(sorted(handled), [1, 2, 3])
+        self.assertEqual(completed, [(ACTION_CLOSE, 3)])
+
+
+class SchedulerGroupEventTests(unittest.IsolatedAsyncioTestCase):
+    async def test_group_closings_are_summarised_for_admins(self):
+        service = SchedulerService.__new__(SchedulerService)
+        service.group_dispatcher = GroupScheduleDispatcher(handler=AsyncMock(), spread_seconds=0)
+        service.group_service = SimpleNamespace(
+            get_group_by_id=AsyncMock(side_effect=lambda group_id: {**_group(group_id), "is_active": True})
+        )
+        repo = AsyncMock()
+        repo.get_by_group_and_date.side_effect = lambda group_id, target: {"id": f"p{group_id}", "status": "active"}
+        service.poll_service = SimpleNamespace(poll_repo=repo)
+        service.close_single_poll_with_reporting = AsyncMock(side_effect=[True, RuntimeError("flood")])
+        service._notify_admins = AsyncMock()
+        service._group_close_results = {}
+
+        run_at = datetime(2026, 3, 2, 19, 0)
+        await service._handle_group_event(GroupEvent(run_at, 1, ACTION_CLOSE, False, 0))
+        await service._handle_group_event(GroupEvent(run_at, 2, ACTION_CLOSE, False, 0))
+        await service._on_group_window_complete(ACTION_CLOSE, False, run_at.date())
+
+        repo.get_by_group_and_date.assert_any_await(1, date(2026, 3, 3))
+        service._notify_admins.assert_awaited_once()
+        report = service._notify_admins.await_args.args[0]
+        self.assertIn("Закрыто: 1", report)
+        self.assertIn("ЗИЗ-2: flood", report)
+        self.assertEqual(service._group_close_results, {})
+
+    async def test_creation_summary_is_sent_once_for_day_and_night_groups(self):
+        service = SchedulerService.__new__(SchedulerService)
+        service.group_dispatcher = GroupScheduleDispatcher(handler=AsyncMock(), spread_seconds=0)
+        service.group_service = SimpleNamespace(
+            get_group_by_id=AsyncMock(side_effect=lambda group_id: {**_group(group_id, is_night=group_id == 3), "is_active": True})
+        )
+        service.poll_service = SimpleNamespace(
+            create_daily_poll_for_group=AsyncMock(side_effect=[
+                (CREATION_CREATED, None),
+                (CREATION_EXISTS, None),
+                (CREATION_FAILED, "Группа ЗИЗ-3: нет настроенных слотов"),
+            ])
+        )
+        service._notify_admins = AsyncMock()
+        service._group_create_results = {}
+
+        run_at = datetime(2026, 3, 2, 9, 5)
+        service.group_dispatcher._versions[3] = 0
+        service.group_dispatcher._push(GroupEvent(run_at, 3, ACTION_CREATE, True, 0))
+        for group_id in (1, 2):
+            await service._handle_group_event(GroupEvent(run_at, group_id, ACTION_CREATE, False, 0))
+        await service._on_group_window_complete(ACTION_CREATE, False, run_at.date())
+        service._notify_admins.assert_not_awaited()
+
+        service.group_dispatcher.remove_group(3)
+        await service._handle_group_event(GroupEvent(run_at, 3, ACTION_CREATE, True, 0))
+        await service._on_group_window_complete(ACTION_CREATE, True, run_at.date())
+
+        first_call = service.poll_service.create_daily_poll_for_group.await_args_list[0]
+        self.assertEqual(first_call.args[1], date(2026, 3, 3))
+        service._notify_admins.assert_awaited_once()
+        report = service._notify_admins.await_args.args[0]
+        self.assertIn("Создано: 1", report)
+        self.assertIn("Уже были: 1", report)
+        self.assertIn("нет настроенных слотов", report)
+
+    async def test_close_due_just_before_restart_is_recovered(self):
+        service = SchedulerService.__new__(SchedulerService)
+        service.group_dispatcher = GroupScheduleDispatcher(handler=AsyncMock(), spread_seconds=0)
+        service.duty_poll_service = None
+        group = {**_group(1, time(19, 5, 16)), "is_active": True}
+        poll = {"id": "p1", "group_id": 1, "poll_date": date(2026, 3, 3), "status": "active"}
+        repo = AsyncMock()
+        repo.get_active_polls.return_value = [poll]
+        repo.get_sent_reminders.return_value = {("p1", hour, False) for hour in settings.REMINDER_HOURS}
+        service.poll_service = SimpleNamespace(poll_repo=repo)
+        service.group_service = AsyncMock()
+        service.group_service.get_all_groups.return_value = [group]
+        service._close_group_poll = AsyncMock()
+        service._on_group_window_complete = AsyncMock()
+
+        # Перезапуск через минуту после закрытия: пересборка перенесла его на завтра
+        service.group_dispatcher.rebuild([group], now=datetime(2026, 3, 2, 19, 6, 16))
+        await service._recover_missed_automation(startup=True)
+
+        service._close_group_poll.assert_awaited_once()
+        event, closed_poll, _ = service._close_group_poll.await_args.args
+        self.assertEqual(closed_poll, poll)
+        self.assertEqual(event.target_date, date(2026, 3, 3))
+
+    async def test_creation_slot_just_before_restart_is_recovered(self):
+        service = SchedulerService.__new__(SchedulerService)
+        service.group_dispatcher = GroupScheduleDispatcher(
+            handler=AsyncMock(),
+            spread_seconds=0,
+            creation_window_seconds=1800,
+        )
+        groups = [{**_group(group_id), "is_active": True} for group_id in range(1, 30)]
+        slots = {
+            group["id"]: next(
+                event.run_at
+                for event in service.group_dispatcher.plan_events(group, datetime(2026, 3, 2))
+                if event.action == ACTION_CREATE
+            )
+            for group in groups
+        }
+        restarted_at = sorted(slots.values())[len(slots) // 2] + timedelta(minutes=1)
+        service.group_service = AsyncMock()
+        service.group_service.get_all_groups.return_value = groups
+        service.poll_service = SimpleNamespace(poll_repo=AsyncMock())
+        service.poll_service.poll_repo.get_by_group_and_date.return_value = None
+        service._create_group_poll = AsyncMock()
+        service._report_poll_creation = AsyncMock()
+
+        service.group_dispatcher.rebuild(groups, now=restarted_at)
+        await service._recover_missed_group_creations(service.group_dispatcher.rebuilt_at)
+
+        recovered = {call.args[1]["id"] for call in service._create_group_poll.await_args_list}
+        self.assertEqual(recovered, {group_id for group_id, run_at in slots.items() if run_at <= restarted_at})
+        # Слот меньше чем за минуту до перезапуска догнан, а не потерян
+        last_before = max((run_at, group_id) for group_id, run_at in slots.items() if run_at <= restarted_at)
+        self.assertLessEqual(restarted_at - last_before[0], timedelta(minutes=1))
+        self.assertIn(last_before[1], recovered)
+        # Остальные слоты остались в куче на сегодня
+        for group_id, run_at in slots.items():
+            if run_at > restarted_at:
+                self.assertTrue(any(
+                    event.group_id == group_id and event.action == ACTION_CREATE and event.run_at == run_at
+                    for _, _, event in service.group_dispatcher._heap
+                ))
+
+    async def test_group_events_are_recovered_only_on_start(self):
+        service = SchedulerService.__new__(SchedulerService)
+        service.group_dispatcher = GroupScheduleDispatcher(
+            handler=AsyncMock(),
+            spread_seconds=0,
+            creation_window_seconds=1800,
+        )
+        service.duty_poll_service = None
+        service._recover_missed_group_creations = AsyncMock()
+        service._recover_missed_group_events = AsyncMock()
+
+        # Периодическая проверка: наступившие события выполняет диспетчер
+        await service._recover_missed_automation()
+        service._recover_missed_group_creations.assert_not_awaited()
+        service._recover_missed_group_events.assert_not_awaited()
+
+        # Запуск планировщика, в том числе после получения лидерства
+        await service._recover_missed_automation(startup=True)
+        service._recover_missed_group_creations.assert_awaited_once()
+        service._recover_missed_group_events.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import asyncio
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import aiohttp
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, JobExecutionEvent
+
+from src.services.health_service import HealthService
+from src.services.scheduler_service import SchedulerService
+
+
+def _scheduler_stub(running: bool = True) -> SimpleNamespace:
+    return SimpleNamespace(
+        is_running=running,
+        get_jobs_status=lambda: [
+            {
+                "id": "close_polls",
+                "name": "Закрытие опросов",
+                "next_run": datetime(2026, 1, 1, 19, 0),
+                "last_run": datetime(2026, 1, 1, 18, 0),
+                "status": "ok",
+                "error": None,
+            }
+        ],
+        get_pending_retry_count=lambda: 3,
+    )
+
+
+class HealthServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def test_report_is_cached_between_probes(self):
+        db_pool = MagicMock()
+        db_pool.fetchval = AsyncMock(return_value=1)
+        redis = MagicMock()
+        redis.ping = AsyncMock(return_value=True)
+        service = HealthService(db_pool, redis, _scheduler_stub(), cache_seconds=60)
+        service.mark_update()
+
+        reports = await asyncio.gather(*(service.get_report() for _ in range(5)))
+        await service.get_report()
+
+        self.assertEqual(db_pool.fetchval.await_count, 1)
+        self.assertEqual(redis.ping.await_count, 1)
+        report = reports[0]
+        self.assertTrue(report["ready"])
+        self.assertEqual(report["database"]["status"], "ok")
+        self.assertIn("latency_ms", report["redis"])
+        self.assertEqual(report["scheduler"]["outbound_queue"], 3)
+        self.assertEqual(report["scheduler"]["jobs"][0]["last_run"], "2026-01-01T18:00:00")
+        self.assertIsNotNone(report["last_update_age_seconds"])
+
+    async def test_database_failure_makes_bot_not_ready(self):
+        db_pool = MagicMock()
+        db_pool.fetchval = AsyncMock(side_effect=ConnectionError("connection refused"))
+        service = HealthService(db_pool, None, _scheduler_stub(), cache_seconds=0)
+
+        report = await service.get_report()
+
+        self.assertFalse(report["ready"])
+        self.assertEqual(report["database"]["status"], "error")
+        self.assertEqual(report["redis"]["status"], "disabled")
+
+    async def test_standby_replica_is_ready_without_scheduler(self):
+        db_pool = MagicMock()
+        db_pool.fetchval = AsyncMock(return_value=1)
+        elector = SimpleNamespace(is_leader=False)
+        service = HealthService(
+            db_pool, None, _scheduler_stub(running=False), cache_seconds=0, leader_elector=elector
+        )
+
+        standby = await service.get_report()
+        elector.is_leader = True
+        leader = await service.get_report()
+
+        self.assertTrue(standby["ready"])
+        self.assertEqual(standby["role"], "standby")
+        self.assertFalse(leader["ready"])
+
+    async def test_http_endpoints(self):
+        db_pool = MagicMock()
+        db_pool.fetchval = AsyncMock(return_value=1)
+        service = HealthService(db_pool, None, _scheduler_stub(running=False), cache_seconds=0)
+        await service.start(host="127.0.0.1", port=0)
+        base_url = f"http://127.0.0.1:{service.bound_port}"
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{base_url}/health/live") as response:
+                    self.assertEqual(response.status, 200)
+                async with session.get(f"{base_url}/health/ready") as response:
+                    self.assertEqual(response.status, 503)
+                    self.assertFalse((await response.json())["scheduler"])
+                async with session.get(f"{base_url}/health") as response:
+                    body = await response.json()
+                    self.assertEqual(body["database"]["status"], "ok")
+        finally:
+            await service.stop()
+
+        db_pool.fetchval.assert_awaited()
+
+    def test_scheduler_records_last_runs_and_collapses_retries(self):
+        scheduler_service = SchedulerService(
+            bot=MagicMock(),
+            poll_service=MagicMock(),
+            group_service=MagicMock(),
+            duty_poll_service=MagicMock(),
+        )
+        scheduled = datetime(2026, 1, 1, 9, 0)
+
+        scheduler_service._on_job_event(
+            JobExecutionEvent(EVENT_JOB_EXECUTED, "create_polls", "default", scheduled)
+        )
+        scheduler_service._on_job_event(
+            JobExecutionEvent(
+                EVENT_JOB_ERROR,
+                "retry_reminder_day_1_2026-01-01_17",
+                "default",
+                scheduled,
+                exception=RuntimeError("flood"),
+            )
+        )
+
+        self.assertEqual(scheduler_service.job_runs["create_polls"]["status"], "ok")
+        self.assertEqual(scheduler_service.job_runs["retry_reminder"]["status"], "error")
+        self.assertEqual(scheduler_service.job_runs["retry_reminder"]["error"], "flood")
+        self.assertEqual(len(scheduler_service.job_runs), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+
+from src.repositories.pagination import PageCursor, fetch_keyset_page
+
+KEY = ("name", "id")
+
+
+class FakeConnection:
+    """Таблица в памяти: ключ (name, id), фильтрует и сортирует как PostgreSQL."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetchrow(self, query, anchor_id):
+        self.queries.append(query)
+        for row in self.rows:
+            if row["id"] == anchor_id:
+                return {"name": row["name"], "id": row["id"]}
+        return None
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        descending = "DESC" in query
+        rows = sorted(self.rows, key=lambda row: (row["name"], row["id"]), reverse=descending)
+        if len(args) > 1:
+            anchor = tuple(args[:-1])
+            if ") <" in query:
+                rows = [row for row in rows if (row["name"], row["id"]) < anchor]
+            else:
+                rows = [row for row in rows if (row["name"], row["id"]) > anchor]
+        return rows[:args[-1]]
+
+
+def _names(page):
+    return [item["name"] for item in page.items]
+
+
+class KeysetPaginationTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.conn = FakeConnection([
+            {"id": index, "name": f"ZIZ-{index:02d}"} for index in range(1, 8)
+        ])
+
+    async def _page(self, cursor, limit=3):
+        return await fetch_keyset_page(
+            self.conn, table="groups", where="true", key=KEY,
+            descending=False, limit=limit, cursor=cursor,
+        )
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(PageCursor.decode(PageCursor(42, True).encode()), PageCursor(42, True))
+        self.assertEqual(PageCursor.decode(PageCursor(7, False).encode()), PageCursor(7, False))
+        self.assertIsNone(PageCursor.decode("0"))
+        self.assertIsNone(PageCursor.decode("ax"))
+        self.assertIsNone(PageCursor.decode(""))
+
+    async def test_forward_and_backward_pages(self):
+        first = await self._page(None)
+        self.assertEqual(_names(first), ["ZIZ-01", "ZIZ-02", "ZIZ-03"])
+        self.assertIsNone(first.prev_cursor)
+
+        second = await self._page(first.next_cursor)
+        self.assertEqual(_names(second), ["ZIZ-04", "ZIZ-05", "ZIZ-06"])
+
+        last = await self._page(second.next_cursor)
+        self.assertEqual(_names(last), ["ZIZ-07"])
+        self.assertIsNone(last.next_cursor)
+
+        back = await self._page(last.prev_cursor)
+        self.assertEqual(_names(back), ["ZIZ-04", "ZIZ-05", "ZIZ-06"])
+        self.assertIsNotNone(back.next_cursor)
+
+        start = await self._page(back.prev_cursor)
+        self.assertEqual(_names(start), ["ZIZ-01", "ZIZ-02", "ZIZ-03"])
+        self.assertIsNone(start.prev_cursor)
+
+    async def test_pages_are_read_by_key_without_offset(self):
+        first = await self._page(None)
+        await self._page(first.next_cursor)
+
+        page_query = self.conn.queries[-1]
+        self.assertIn("(name, id) > ($1, $2)", page_query)
+        self.assertNotIn("OFFSET", page_query.upper())
+        self.assertIn("LIMIT $3", page_query)
+
+    async def test_missing_anchor_falls_back_to_first_page(self):
+        page = await self._page(PageCursor(999, True))
+
+        self.assertEqual(_names(page), ["ZIZ-01", "ZIZ-02", "ZIZ-03"])
+        self.assertIsNone(page.prev_cursor)
+
+    async def test_empty_page_after_deletions_restarts_list(self):
+        first = await self._page(None, limit=7)
+        self.conn.rows = self.conn.rows[:2] + [self.conn.rows[-1]]
+
+        page = await self._page(PageCursor(first.items[-1]["id"], True))
+
+        self.assertEqual(_names(page), ["ZIZ-01", "ZIZ-02", "ZIZ-07"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import AsyncMock
+
+from src.services.leader_election import LeaderElector
+
+
+class _FakeLockServer:
+    """Advisory-блокировки PostgreSQL: держатель снимает блокировку при обрыве соединения."""
+
+    def __init__(self):
+        self.holders = {}
+
+
+class _FakeConnection:
+    def __init__(self, server: _FakeLockServer):
+        self.server = server
+        self.broken = False
+
+    async def fetchval(self, query, *args):
+        if self.broken:
+            raise ConnectionError("connection is closed")
+        if "pg_try_advisory_lock" in query:
+            holder = self.server.holders.setdefault(args[0], self)
+            return holder is self
+        return 1
+
+    async def execute(self, query, *args):
+        if "pg_advisory_unlock" in query and self.server.holders.get(args[0]) is self:
+            del self.server.holders[args[0]]
+
+    def drop(self):
+        self.broken = True
+        self.server.holders = {key: conn for key, conn in self.server.holders.items() if conn is not self}
+
+
+class _FakePool:
+    def __init__(self, server: _FakeLockServer):
+        self.server = server
+        self.connections = []
+
+    async def acquire(self):
+        connection = _FakeConnection(self.server)
+        self.connections.append(connection)
+        return connection
+
+    async def release(self, connection):
+        await connection.execute("SELECT pg_advisory_unlock($1)", 1)
+
+
+def _elector(pool: _FakePool) -> LeaderElector:
+    return LeaderElector(
+        db_pool=pool,
+        on_elected=AsyncMock(),
+        on_demoted=AsyncMock(),
+        lock_key=1,
+        retry_seconds=0.01,
+        check_seconds=0.01,
+    )
+
+
+class LeaderElectorTests(unittest.IsolatedAsyncioTestCase):
+    async def test_only_one_replica_becomes_leader(self):
+        server = _FakeLockServer()
+        first, second = _elector(_FakePool(server)), _elector(_FakePool(server))
+
+        await first.tick()
+        await second.tick()
+        await second.tick()
+
+        self.assertTrue(first.is_leader)
+        self.assertFalse(second.is_leader)
+        first.on_elected.assert_awaited_once()
+        second.on_elected.assert_not_awaited()
+
+    async def test_leadership_fails_over_when_connection_is_lost(self):
+        server = _FakeLockServer()
+        first_pool = _FakePool(server)
+        first, second = _elector(first_pool), _elector(_FakePool(server))
+        await first.start()
+        await second.start()
+        await first.wait_until_leader()
+
+        first_pool.connections[0].drop()
+        await second.wait_until_leader()
+        await first.stop()
+        await second.stop()
+
+        first.on_demoted.assert_awaited()
+        second.on_elected.assert_awaited_once()
+        self.assertFalse(second.is_leader)
+        second.on_demoted.assert_awaited_once()
+
+    async def test_stop_releases_lock_for_next_replica(self):
+        server = _FakeLockServer()
+        first, second = _elector(_FakePool(server)), _elector(_FakePool(server))
+        await first.tick()
+
+        await first.stop()
+        await second.tick()
+
+        self.assertTrue(second.is_leader)
+        first.on_demoted.assert_awaited_once()
+
+    async def test_failed_promotion_gives_up_lock(self):
+        server = _FakeLockServer()
+        first, second = _elector(_FakePool(server)), _elector(_FakePool(server))
+        first.on_elected.side_effect = RuntimeError("scheduler failed")
+
+        await first.tick()
+        await second.tick()
+
+        self.assertFalse(first.is_leader)
+        self.assertTrue(second.is_leader)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.services.log_service import LogCursor, LogService
+
+
+def _line(index: int, level: str = "INFO", message: str = "") -> str:
+    return f"2024-05-01 12:00:{index % 60:02d},000 - src.test - {level} - запись {index} {message}\n"
+
+
+class LogServiceTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log_path = Path(self._tmp.name) / "bot.log"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _service(self) -> LogService:
+        # Маленький блок, чтобы проверить склейку строк на границах блоков
+        return LogService(log_path=self.log_path, chunk_size=64)
+
+    async def test_returns_latest_records_in_chronological_order(self):
+        self.log_path.write_text("".join(_line(i) for i in range(100)), encoding="utf-8")
+
+        page = await self._service().read_page(limit=5)
+
+        self.assertEqual(len(page.records), 5)
+        self.assertIn("запись 95", page.records[0])
+        self.assertIn("запись 99", page.records[-1])
+        self.assertIsNotNone(page.next_cursor)
+
+    async def test_paging_walks_back_without_gaps_or_duplicates(self):
+        self.log_path.write_text("".join(_line(i) for i in range(23)), encoding="utf-8")
+        service = self._service()
+
+        seen = []
+        cursor = None
+        while True:
+            page = await service.read_page(limit=5, cursor=cursor)
+            seen = page.records + seen
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+            cursor = LogCursor.decode(cursor.encode())
+
+        self.assertEqual([int(record.split("запись ")[1]) for record in seen], list(range(23)))
+
+    async def test_level_and_query_filters(self):
+        content = (
+            _line(1, "INFO", "голос сохранен")
+            + _line(2, "ERROR", "ошибка отправки")
+            + "Traceback (most recent call last):\n  File \"x.py\", line 1\nValueError: boom\n"
+            + _line(3, "WARNING", "медленно")
+            + _line(4, "INFO", "ещё голос")
+        )
+        self.log_path.write_text(content, encoding="utf-8")
+        service = self._service()
+
+        errors = await service.read_page(min_level="WARNING")
+        self.assertEqual(len(errors.records), 2)
+        self.assertIn("ValueError: boom", errors.records[0])
+
+        found = await service.read_page(query="ГОЛОС")
+        self.assertEqual(len(found.records), 2)
+        self.assertIn("ещё голос", found.records[-1])
+
+    async def test_continues_into_rotated_file(self):
+        rotated = self.log_path.with_name("bot.log.1")
+        rotated.write_text("".join(_line(i) for i in range(3)), encoding="utf-8")
+        old_time = os.path.getmtime(rotated) - 100
+        os.utime(rotated, (old_time, old_time))
+        self.log_path.write_text("".join(_line(i) for i in range(3, 5)), encoding="utf-8")
+        service = self._service()
+
+        first = await service.read_page(limit=2)
+        second = await service.read_page(limit=10, cursor=first.next_cursor)
+
+        self.assertIn("запись 3", first.records[0])
+        self.assertEqual(len(second.records), 3)
+        self.assertEqual(second.source_files, ["bot.log.1"])
+        self.assertIsNone(second.next_cursor)
+
+    async def test_compressed_and_service_files_are_not_read(self):
+        self.log_path.write_text(_line(1), encoding="utf-8")
+        for name in ("bot.log.1", "bot.log.2024-01-01", "bot.log.2024-01-01_12-00"):
+            self.log_path.with_name(name).write_text(_line(0), encoding="utf-8")
+        for name in ("bot.log.1.gz", "bot.log.2024-01-01.gz", "bot.log.lock", "bot.log.bak"):
+            self.log_path.with_name(name).write_bytes(b"\x1f\x8b")
+
+        names = sorted(path.name for path in self._service().list_log_files())
+
+        self.assertEqual(names, ["bot.log", "bot.log.1", "bot.log.2024-01-01", "bot.log.2024-01-01_12-00"])
+
+    async def test_missing_log_returns_empty_page(self):
+        page = await self._service().read_page()
+
+        self.assertEqual(page.records, [])
+        self.assertIsNone(page.next_cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
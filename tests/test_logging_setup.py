@@ -0,0 +1,45 @@
+import logging
+import unittest
+from unittest.mock import patch
+
+from src.utils.logging_setup import RateLimitFilter
+
+
+def _record(msg: str, level: int = logging.INFO, *args) -> logging.LogRecord:
+    return logging.LogRecord("src.test.votes", level, __file__, 1, msg, args, None)
+
+
+class RateLimitFilterTests(unittest.TestCase):
+    def test_limits_same_template_within_window(self):
+        rate_filter = RateLimitFilter(max_records=3, interval_seconds=60)
+
+        with patch("src.utils.logging_setup.time.monotonic", return_value=100.0):
+            passed = [rate_filter.filter(_record("Голос сохранен: %s", logging.INFO, i)) for i in range(10)]
+            other = rate_filter.filter(_record("Другое сообщение"))
+
+        self.assertEqual(passed, [True, True, True] + [False] * 7)
+        self.assertTrue(other)
+
+    def test_reports_suppressed_count_in_next_window(self):
+        rate_filter = RateLimitFilter(max_records=1, interval_seconds=60)
+
+        with patch("src.utils.logging_setup.time.monotonic", return_value=100.0):
+            for i in range(5):
+                rate_filter.filter(_record("Голос сохранен: %s", logging.INFO, i))
+        record = _record("Голос сохранен: %s", logging.INFO, 42)
+        with patch("src.utils.logging_setup.time.monotonic", return_value=200.0):
+            self.assertTrue(rate_filter.filter(record))
+
+        self.assertIn("подавлено похожих записей: 4", record.getMessage())
+        self.assertIn("42", record.getMessage())
+
+    def test_warnings_are_never_suppressed(self):
+        rate_filter = RateLimitFilter(max_records=1, interval_seconds=60)
+
+        results = [rate_filter.filter(_record("Ошибка", logging.WARNING)) for _ in range(5)]
+
+        self.assertEqual(results, [True] * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
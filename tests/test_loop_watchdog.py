@@ -0,0 +1,54 @@
+import asyncio
+import time
+import unittest
+
+from src.utils.loop_watchdog import LoopWatchdog, _percentile
+
+
+async def _blocking_report_writer() -> None:
+    # Имитация синхронной записи файла внутри корутины
+    time.sleep(0.4)
+
+
+class LoopWatchdogTests(unittest.IsolatedAsyncioTestCase):
+    async def test_blocking_coroutine_is_reported_with_stack(self):
+        watchdog = LoopWatchdog(threshold_ms=100, tick_interval_ms=20, history_minutes=5)
+        await watchdog.start()
+        try:
+            await asyncio.sleep(0.05)
+            await _blocking_report_writer()
+            await asyncio.sleep(0.1)
+        finally:
+            await watchdog.stop()
+
+        offenders = watchdog.get_recent_offenders()
+        self.assertEqual(len(offenders), 1)
+        self.assertIn("_blocking_report_writer", offenders[0].coroutine)
+        self.assertIn("time.sleep(0.4)", offenders[0].stack)
+        self.assertGreaterEqual(offenders[0].duration_ms, 300)
+
+    async def test_lag_history_has_percentiles(self):
+        watchdog = LoopWatchdog(threshold_ms=500, tick_interval_ms=10, history_minutes=5)
+        await watchdog.start()
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            await watchdog.stop()
+
+        history = watchdog.get_lag_history()
+        self.assertTrue(history)
+        self.assertGreater(history[-1].samples, 0)
+        self.assertLessEqual(history[-1].p50_ms, history[-1].max_ms)
+        self.assertEqual(watchdog.get_recent_offenders(), [])
+        self.assertIn("p99_ms", watchdog.get_summary(1))
+
+    def test_percentile_uses_nearest_rank(self):
+        values = [float(i) for i in range(1, 101)]
+
+        self.assertEqual(_percentile(values, 50), 50.0)
+        self.assertEqual(_percentile(values, 99), 99.0)
+        self.assertEqual(_percentile([], 95), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+import unittest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+from src.repositories.group_member_repository import GroupMemberRepository
+from src.services.group_member_service import GroupMemberService
+from src.services.member_import import (
+    build_import_result,
+    decode_import_file,
+    format_import_report,
+    parse_member_import,
+    render_import_diff,
+)
+
+
+class FakeConnection:
+    """Записывает запросы сверки; COPY принимает строки целиком."""
+
+    def __init__(self):
+        self.queries = []
+        self.copied = []
+
+    @asynccontextmanager
+    async def _transaction(self):
+        yield
+
+    def transaction(self):
+        return self._transaction()
+
+    async def execute(self, query, *args):
+        self.queries.append(query)
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        return []
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copied.append((table, list(records), columns))
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def _plan_row(line_no, full_name, member_id=None, **old):
+    row = {
+        "line_no": line_no,
+        "group_id": 1,
+        "group_name": "ЗИЗ-1",
+        "full_name": full_name,
+        "telegram_user_id": None,
+        "member_id": member_id,
+        "old_group_id": 1 if member_id else None,
+        "old_group_name": "ЗИЗ-1" if member_id else None,
+        "old_name": full_name if member_id else None,
+        "old_active": True if member_id else None,
+        "old_telegram_user_id": None,
+        "conflict": None,
+    }
+    row.update(old)
+    return row
+
+
+class MemberImportParsingTests(unittest.TestCase):
+    def test_parses_names_with_optional_telegram_id(self):
+        rows, skipped = parse_member_import("ФИО;Telegram ID\nИванов  Иван;123\nПетров Пётр\n\n", with_group=False)
+
+        self.assertEqual(skipped, [])
+        self.assertEqual([(row.line_no, row.full_name, row.telegram_user_id) for row in rows], [
+            (2, "Иванов Иван", 123),
+            (3, "Петров Пётр", None),
+        ])
+
+    def test_group_column_and_delimiters(self):
+        rows, _ = parse_member_import("ЗИЗ-1\tИванов Иван\nЗИЗ-2\tПетров Пётр\t77", with_group=True)
+
+        self.assertEqual([(row.group_name, row.full_name, row.telegram_user_id) for row in rows], [
+            ("ЗИЗ-1", "Иванов Иван", None),
+            ("ЗИЗ-2", "Петров Пётр", 77),
+        ])
+
+    def test_invalid_and_repeated_rows_are_skipped(self):
+        rows, skipped = parse_member_import(
+            "Иванов Иван;1\nиванов иван\nСидоров Сидор;1\nКозлов Павел;abc\n;5",
+            with_group=False,
+        )
+
+        self.assertEqual([row.full_name for row in rows], ["Иванов Иван"])
+        self.assertEqual(
+            [change.detail for change in skipped],
+            [
+                "строка 2: повтор строки 1",
+                "строка 3: Telegram ID уже указан в строке 1",
+                "строка 4: Telegram ID «abc» не число",
+                "строка 5: не указано ФИО",
+            ],
+        )
+
+    def test_excel_cp1251_file_is_decoded(self):
+        self.assertEqual(decode_import_file("Иванов Иван".encode("cp1251")), "Иванов Иван")
+        self.assertEqual(decode_import_file("﻿Иванов Иван".encode("utf-8")), "Иванов Иван")
+
+
+class MemberImportResultTests(unittest.TestCase):
+    def test_plan_rows_are_split_by_change(self):
+        diff = {
+            "plan": [
+                _plan_row(1, "Новый Курьер"),
+                _plan_row(2, "Иванов Иван", member_id=10, old_group_id=2, old_group_name="ЗИЗ-2"),
+                _plan_row(3, "Петров Пётр", member_id=11, old_name="Петров Петр"),
+                _plan_row(4, "Сидоров Сидор", member_id=12, old_active=False, telegram_user_id=5),
+                _plan_row(5, "Козлов Павел", member_id=13),
+                _plan_row(6, "Орлов Олег", member_id=14, conflict="name_taken"),
+            ],
+            "duplicates": [{"line_no": 7, "group_name": "ЗИЗ-1", "full_name": "Иванов И."}],
+            "unknown_groups": [{"line_no": 8, "group_name": "ЗИЗ-9", "full_name": "Лосев Лев"}],
+            "deactivated": [{"id": 15, "group_name": "ЗИЗ-1", "full_name": "Уволенный Курьер"}],
+        }
+
+        result = build_import_result(diff, [], total_rows=8, applied=False)
+
+        actions = {
+            action: [change.full_name for change in result.by_action(action)]
+            for action in ("added", "moved", "renamed", "reactivated", "linked", "deactivated", "skipped")
+        }
+        self.assertEqual(actions, {
+            "added": ["Новый Курьер"],
+            "moved": ["Иванов Иван"],
+            "renamed": ["Петров Пётр"],
+            "reactivated": ["Сидоров Сидор"],
+            "linked": ["Сидоров Сидор"],
+            "deactivated": ["Уволенный Курьер"],
+            "skipped": ["Лосев Лев", "Орлов Олег", "Иванов И."],
+        })
+        self.assertEqual(result.unchanged, 1)
+
+        text = format_import_report(result, limit=15)
+        self.assertIn("🚫 Отключены: <b>1</b>", text)
+        self.assertIn("Петров Пётр — ЗИЗ-1 (было: Петров Петр)", text)
+        self.assertIn("Применить", text)
+        self.assertIn("deactivated;ЗИЗ-1;Уволенный Курьер;", render_import_diff(result).decode("utf-8-sig"))
+
+
+class MemberImportReconcileTests(unittest.IsolatedAsyncioTestCase):
+    async def test_thousands_of_rows_take_one_copy_and_fixed_statements(self):
+        conn = FakeConnection()
+        service = GroupMemberService(FakePool(conn))
+        text = "\n".join(f"Курьер {index};{100000 + index}" for index in range(3000))
+
+        await service.import_members(text, group_id=1, apply=True)
+
+        self.assertEqual(len(conn.copied), 1)
+        table, records, _ = conn.copied[0]
+        self.assertEqual(table, "member_import")
+        self.assertEqual(len(records), 3000)
+        self.assertEqual(records[0], (1, 1, None, "Курьер 0", 100000))
+        self.assertLess(len(conn.queries), 15)
+
+    async def test_preview_does_not_modify_members(self):
+        conn = FakeConnection()
+        repository = GroupMemberRepository(FakePool(conn))
+
+        await repository.reconcile_import([(1, 1, None, "Иванов Иван", None)], apply=False)
+
+        changes = [
+            query for query in conn.queries
+            if "UPDATE group_members" in query or "INSERT INTO group_members" in query
+        ]
+        self.assertEqual(changes, [])
+
+    async def test_nothing_is_sent_to_database_for_empty_file(self):
+        service = GroupMemberService(None)
+        service.repository = AsyncMock()
+
+        result = await service.import_members("ФИО\n\n", group_id=1)
+
+        service.repository.reconcile_import.assert_not_awaited()
+        self.assertFalse(result.has_changes)
+
+
+if __name__ == "__main__":
+    unittest.main()
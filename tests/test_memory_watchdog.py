@@ -0,0 +1,91 @@
+import tracemalloc
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.middlewares import database_middleware
+
+from src.services.memory_watchdog import MemoryWatchdog
+
+
+class _LeakedItem:
+    def __init__(self):
+        self.payload = bytearray(1024)
+
+
+class MemoryWatchdogTests(unittest.IsolatedAsyncioTestCase):
+    async def test_first_check_sets_baseline(self):
+        watchdog = MemoryWatchdog(notify=AsyncMock(), use_tracemalloc=False)
+
+        report = await watchdog.check()
+
+        self.assertIsNone(report)
+        self.assertIsNotNone(watchdog.baseline)
+        self.assertGreater(watchdog.baseline.rss_bytes, 0)
+        watchdog.notify.assert_not_awaited()
+
+    async def test_probe_growth_alerts_admins_once_per_step(self):
+        notify = AsyncMock()
+        jobs = {"count": 10}
+        watchdog = MemoryWatchdog(
+            notify=notify,
+            rss_growth_mb=10_000,
+            probe_growth=100,
+            use_tracemalloc=False,
+        )
+        watchdog.add_probe("Задачи планировщика", lambda: jobs["count"])
+
+        await watchdog.check()
+        jobs["count"] = 50
+        quiet = await watchdog.check()
+        jobs["count"] = 150
+        first_alert = await watchdog.check()
+        jobs["count"] = 180
+        repeated = await watchdog.check()
+        jobs["count"] = 260
+        next_step = await watchdog.check()
+
+        self.assertEqual(quiet.alerts, [])
+        self.assertEqual(first_alert.alerts, ["Задачи планировщика: +140"])
+        self.assertEqual(repeated.alerts, [])
+        self.assertEqual(next_step.alerts, ["Задачи планировщика: +250"])
+        self.assertEqual(notify.await_count, 2)
+        self.assertIn("Задачи планировщика", notify.await_args.args[0])
+
+    async def test_growing_allocation_site_is_reported(self):
+        watchdog = MemoryWatchdog(
+            notify=AsyncMock(),
+            rss_growth_mb=10_000,
+            site_growth_mb=1,
+            use_tracemalloc=True,
+        )
+        await watchdog.start()
+        await watchdog.stop()
+        leak = []
+        try:
+            await watchdog.check()
+            leak.extend(_LeakedItem() for _ in range(3000))
+            report = await watchdog.check()
+        finally:
+            tracemalloc.stop()
+
+        self.assertTrue(any("test_memory_watchdog.py" in site for site, _, _ in report.top_sites))
+        self.assertTrue(any("test_memory_watchdog.py" in alert for alert in report.alerts))
+        self.assertTrue(any(name == "_LeakedItem" for name, _ in report.top_types))
+
+    async def test_middleware_cache_probes_count_connections(self):
+        self.assertEqual(database_middleware.get_cached_db_pool_size(), 0)
+        self.assertEqual(database_middleware.get_cached_redis_connections(), 0)
+
+        pool = MagicMock()
+        pool.get_size.return_value = 5
+        redis = MagicMock()
+        redis.connection_pool._available_connections = [object(), object()]
+        redis.connection_pool._in_use_connections = {object()}
+        with patch.object(database_middleware, "_cached_db_pool", pool), \
+                patch.object(database_middleware, "_cached_redis", redis):
+            self.assertEqual(database_middleware.get_cached_db_pool_size(), 5)
+            self.assertEqual(database_middleware.get_cached_redis_connections(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
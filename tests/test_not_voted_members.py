@@ -0,0 +1,117 @@
+import unittest
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.repositories.group_member_repository import GroupMemberRepository
+from src.services.group_member_service import GroupMemberService
+from src.services.scheduler_service import SchedulerService
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def fetch(self, query, *args):
+        self.calls.append((query, args))
+        return self.rows
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+class NotVotedQueryTests(unittest.IsolatedAsyncioTestCase):
+    async def test_members_of_all_polls_come_from_one_anti_join(self):
+        conn = FakeConnection([
+            {"poll_id": "poll-1", "id": 10, "full_name": "Иван Петров", "telegram_user_id": 100},
+            {"poll_id": "poll-1", "id": 12, "full_name": "Сергей Орлов", "telegram_user_id": None},
+            {"poll_id": "poll-2", "id": 20, "full_name": "Пётр Сидоров", "telegram_user_id": 200},
+        ])
+        service = GroupMemberService(FakePool(conn))
+
+        with patch("src.services.group_member_service.settings.ADMIN_IDS", [999]):
+            not_voted = await service.get_not_voted_members_for_polls(["poll-1", "poll-2", "poll-3"])
+
+        self.assertEqual(len(conn.calls), 1)
+        query, args = conn.calls[0]
+        self.assertIn("NOT EXISTS", query)
+        self.assertIn("user_votes", query)
+        self.assertEqual(args, (["poll-1", "poll-2", "poll-3"], [999]))
+        self.assertEqual([member["id"] for member in not_voted["poll-1"]], [10, 12])
+        self.assertEqual([member["id"] for member in not_voted["poll-2"]], [20])
+        self.assertEqual(not_voted["poll-3"], [])
+        self.assertNotIn("poll_id", not_voted["poll-2"][0])
+
+    async def test_no_polls_means_no_query(self):
+        conn = FakeConnection([])
+
+        self.assertEqual(await GroupMemberRepository(FakePool(conn)).get_not_voted_by_polls([]), {})
+        self.assertEqual(conn.calls, [])
+
+
+class SchedulerNotVotedTests(unittest.IsolatedAsyncioTestCase):
+    def _build_service(self):
+        service = SchedulerService.__new__(SchedulerService)
+        service.report_service = SimpleNamespace(get_cached=Mock(return_value=None))
+        service.group_member_service = AsyncMock()
+        return service
+
+    async def test_uses_cached_report_before_querying(self):
+        service = self._build_service()
+        service.report_service.get_cached.return_value = SimpleNamespace(not_voted=[{"id": 1}])
+
+        not_voted = await service._get_not_voted_members({"id": "poll-1"}, {"id": 1})
+
+        self.assertEqual(not_voted, [{"id": 1}])
+        service.group_member_service.get_not_voted_members.assert_not_awaited()
+
+    async def test_reminder_without_report_runs_anti_join(self):
+        service = self._build_service()
+        service.group_member_service.get_not_voted_members.return_value = [{"id": 2}]
+
+        not_voted = await service._get_not_voted_members({"id": "poll-1"}, {"id": 1})
+
+        self.assertEqual(not_voted, [{"id": 2}])
+        service.group_member_service.get_not_voted_members.assert_awaited_once_with("poll-1")
+
+    async def test_reminder_run_fetches_not_voted_for_all_groups_at_once(self):
+        service = self._build_service()
+        tomorrow = date.today() + timedelta(days=1)
+        polls = [
+            {"id": "poll-1", "group_id": 1, "poll_date": tomorrow},
+            {"id": "poll-2", "group_id": 2, "poll_date": tomorrow},
+        ]
+        service.poll_service = SimpleNamespace(poll_repo=AsyncMock())
+        service.poll_service.poll_repo.get_active_polls.return_value = polls
+        service.poll_service.poll_repo.claim_reminder_dispatches.return_value = {
+            ("poll-1", 17, False),
+            ("poll-2", 17, False),
+        }
+        service.group_service = AsyncMock()
+        service.group_service.get_all_groups.return_value = [
+            {"id": 1, "is_night": False},
+            {"id": 2, "is_night": False},
+        ]
+        service.group_member_service.get_not_voted_members_for_polls.return_value = {
+            "poll-1": [{"id": 10}],
+            "poll-2": [],
+        }
+        service._post_reminder = AsyncMock()
+
+        await service._send_reminders(reminder_hour=17)
+
+        service.group_member_service.get_not_voted_members_for_polls.assert_awaited_once_with(["poll-1", "poll-2"])
+        passed = [call.args[1] for call in service._post_reminder.await_args_list]
+        self.assertEqual(passed, [[{"id": 10}]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.services.not_voted_tracker import NotVotedTracker, not_voted_tracker
+from src.services.scheduler_service import SchedulerService
+
+
+def _member(member_id, full_name, telegram_user_id=None, group_id=1, **flags):
+    return {
+        "id": member_id,
+        "group_id": group_id,
+        "full_name": full_name,
+        "telegram_user_id": telegram_user_id,
+        "username": None,
+        **flags,
+    }
+
+
+POLL = {"id": "poll-1", "results_version": 0}
+GROUP = {"id": 1, "members_version": 5}
+
+
+class NotVotedTrackerTests(unittest.TestCase):
+    def setUp(self):
+        self.tracker = NotVotedTracker()
+        with patch("src.services.not_voted_tracker.settings.ADMIN_IDS", [999]):
+            self.tracker.seed(POLL, GROUP, [
+                _member(2, "Сергей Орлов", 200),
+                _member(1, "Иван Петров", 100),
+                _member(3, "Админ", 999),
+            ])
+
+    def test_list_is_sorted_and_excludes_admins(self):
+        not_voted = self.tracker.get(POLL, GROUP)
+
+        self.assertEqual([member["id"] for member in not_voted], [1, 2])
+
+    def test_vote_and_retraction_update_list_without_database(self):
+        self.tracker.record_vote("poll-1", _member(1, "Иван Петров", 100), True, 1, 5)
+        self.assertEqual(
+            [member["id"] for member in self.tracker.get({**POLL, "results_version": 1}, GROUP)],
+            [2],
+        )
+
+        self.tracker.record_vote("poll-1", _member(1, "Иван Петров", 100), False, 2, 5)
+        self.assertEqual(
+            [member["id"] for member in self.tracker.get({**POLL, "results_version": 2}, GROUP)],
+            [1, 2],
+        )
+
+    def test_linking_card_on_vote_is_expected_members_change(self):
+        member = _member(1, "Иван Петров", 100, member_changed=True)
+
+        self.tracker.record_vote("poll-1", member, True, 1, 6)
+
+        self.assertEqual(
+            [item["id"] for item in self.tracker.get({**POLL, "results_version": 1}, {**GROUP, "members_version": 6})],
+            [2],
+        )
+
+    def test_missed_vote_drops_list(self):
+        # Голос с версией 1 принят другой репликой
+        self.tracker.record_vote("poll-1", _member(1, "Иван Петров", 100), True, 2, 5)
+
+        self.assertIsNone(self.tracker.get({**POLL, "results_version": 2}, GROUP))
+
+    def test_stale_versions_are_not_served(self):
+        self.assertIsNone(self.tracker.get(POLL, {**GROUP, "members_version": 6}))
+        self.assertEqual(len(self.tracker), 0)
+
+    def test_new_member_is_added_and_leaver_removed(self):
+        self.tracker.member_joined(_member(4, "Анна Смирнова", 400, member_changed=True, member_created=True))
+        self.tracker.member_left(1, 200)
+
+        not_voted = self.tracker.get(POLL, {**GROUP, "members_version": 7})
+        self.assertEqual([member["id"] for member in not_voted], [4, 1])
+
+    def test_member_moved_from_tracked_group_drops_both_lists(self):
+        self.tracker.seed({"id": "poll-2", "results_version": 0}, {"id": 2, "members_version": 1}, [])
+
+        self.tracker.member_joined(_member(2, "Сергей Орлов", 200, group_id=2, member_changed=True))
+
+        self.assertEqual(len(self.tracker), 0)
+
+    def test_older_seed_does_not_replace_updated_list(self):
+        self.tracker.record_vote("poll-1", _member(1, "Иван Петров", 100), True, 1, 5)
+
+        self.tracker.seed(POLL, GROUP, [_member(1, "Иван Петров", 100)])
+
+        self.assertEqual(
+            [member["id"] for member in self.tracker.get({**POLL, "results_version": 1}, GROUP)],
+            [2],
+        )
+
+
+class SchedulerTrackerTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        not_voted_tracker.clear()
+        self.addCleanup(not_voted_tracker.clear)
+
+    def _build_service(self):
+        service = SchedulerService.__new__(SchedulerService)
+        service.report_service = SimpleNamespace(get_cached=Mock(return_value=None))
+        service.group_member_service = AsyncMock()
+        return service
+
+    async def test_manual_reminder_list_comes_from_tracker(self):
+        service = self._build_service()
+        not_voted_tracker.seed(POLL, GROUP, [_member(1, "Иван Петров", 100)])
+
+        not_voted = await service._get_not_voted_members(POLL, GROUP)
+
+        self.assertEqual([member["id"] for member in not_voted], [1])
+        service.group_member_service.get_not_voted_members.assert_not_awaited()
+
+    async def test_reminder_run_queries_only_untracked_polls(self):
+        service = self._build_service()
+        tomorrow = date.today() + timedelta(days=1)
+        polls = [
+            {"id": "poll-1", "group_id": 1, "poll_date": tomorrow, "results_version": 0},
+            {"id": "poll-2", "group_id": 2, "poll_date": tomorrow, "results_version": 0},
+        ]
+        groups = {
+            1: {"id": 1, "is_night": False, "members_version": 5},
+            2: {"id": 2, "is_night": False, "members_version": 1},
+        }
+        not_voted_tracker.seed(polls[0], groups[1], [_member(1, "Иван Петров", 100)])
+        service.poll_service = SimpleNamespace(poll_repo=AsyncMock())
+        service.poll_service.poll_repo.get_active_polls.return_value = polls
+        service.poll_service.poll_repo.claim_reminder_dispatches.return_value = {
+            ("poll-1", 17, False),
+            ("poll-2", 17, False),
+        }
+        service.group_service = AsyncMock()
+        service.group_service.get_all_groups.return_value = list(groups.values())
+        service.group_member_service.get_not_voted_members_for_polls.return_value = {"poll-2": [{"id": 20}]}
+        service._post_reminder = AsyncMock()
+
+        await service._send_reminders(reminder_hour=17)
+
+        service.group_member_service.get_not_voted_members_for_polls.assert_awaited_once_with(["poll-2"])
+        passed = [
+            [member["id"] for member in call.args[1]]
+            for call in service._post_reminder.await_args_list
+        ]
+        self.assertEqual(passed, [[1], [20]])
+
+
+if __name__ == "__main__":
+    unittest.main()
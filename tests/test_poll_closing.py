@@ -8,6 +8,7 @@ from aiogram.methods import StopPoll
 
 from src.handlers import poll_handlers
 from src.services.scheduler_service import SchedulerService
+from src.utils.poll_kind_cache import PollKindCache
 
 
 class SchedulerClosingTests(unittest.IsolatedAsyncioTestCase):
@@ -20,6 +21,7 @@ class SchedulerClosingTests(unittest.IsolatedAsyncioTestCase):
         service._get_not_voted_members = AsyncMock(return_value=[])
         service._format_not_voted_report = Mock(return_value="not voted")
         service._save_poll_report = AsyncMock(return_value="report.txt")
+        service.report_images = None
         service._close_lock = asyncio.Lock()
         return service, repo
 
@@ -78,18 +80,26 @@ class SchedulerClosingTests(unittest.IsolatedAsyncioTestCase):
 
 
 class PollAnswerStatusTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = PollKindCache(ttl_seconds=600, max_size=100)
+        cache_patch = patch.object(poll_handlers, "poll_kind_cache", self.cache)
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+    def _answer(self, poll_id):
+        return SimpleNamespace(
+            user=SimpleNamespace(id=42, full_name="Иван", username=None),
+            poll_id=poll_id,
+            option_ids=[0],
+        )
+
     async def test_vote_for_closed_poll_is_ignored(self):
         repo = AsyncMock()
-        repo.get_by_telegram_poll_id.return_value = {
+        repo.resolve_telegram_poll.return_value = ("daily", {
             "id": "poll-1",
             "group_id": 1,
             "status": "closed",
-        }
-        answer = SimpleNamespace(
-            user=SimpleNamespace(id=42, full_name="Иван", username=None),
-            poll_id="telegram-poll-1",
-            option_ids=[0],
-        )
+        })
         group_repo = SimpleNamespace(get_by_id=AsyncMock())
 
         with (
@@ -97,40 +107,89 @@ class PollAnswerStatusTests(unittest.IsolatedAsyncioTestCase):
             patch.object(poll_handlers, "PollRepository", return_value=repo),
             patch.object(poll_handlers, "GroupRepository", return_value=group_repo),
         ):
-            await poll_handlers.handle_poll_answer(answer, AsyncMock())
+            await poll_handlers.handle_poll_answer(self._answer("telegram-poll-1"), AsyncMock())
 
         group_repo.get_by_id.assert_not_awaited()
         repo.sync_user_vote.assert_not_awaited()
+        self.assertIsNone(self.cache.get("telegram-poll-1"))
 
     async def test_vote_for_duty_poll_is_ignored_without_warning(self):
         repo = AsyncMock()
-        repo.get_by_telegram_poll_id.return_value = None
-        duty_repo = AsyncMock()
-        duty_repo.get_dispatch_by_telegram_poll_id.return_value = {
-            "id": 1,
-            "telegram_poll_id": "telegram-duty-poll",
-            "status": "active",
-        }
-        answer = SimpleNamespace(
-            user=SimpleNamespace(id=42, full_name="Иван", username=None),
-            poll_id="telegram-duty-poll",
-            option_ids=[0],
-        )
+        repo.resolve_telegram_poll.return_value = ("duty", None)
 
         with (
             patch.object(poll_handlers, "get_db_pool", new=AsyncMock(return_value=AsyncMock())),
             patch.object(poll_handlers, "PollRepository", return_value=repo),
-            patch.object(poll_handlers, "DutyPollRepository", return_value=duty_repo),
             patch.object(poll_handlers.logger, "warning") as warning,
         ):
-            await poll_handlers.handle_poll_answer(answer, AsyncMock())
+            await poll_handlers.handle_poll_answer(self._answer("telegram-duty-poll"), AsyncMock())
 
-        duty_repo.get_dispatch_by_telegram_poll_id.assert_awaited_once_with(
-            "telegram-duty-poll"
-        )
+        repo.resolve_telegram_poll.assert_awaited_once_with("telegram-duty-poll")
         warning.assert_not_called()
-        repo.is_telegram_poll_obsolete.assert_not_awaited()
+        repo.sync_user_vote.assert_not_awaited()
+
+    async def test_repeated_duty_and_obsolete_votes_skip_database(self):
+        repo = AsyncMock()
+        repo.resolve_telegram_poll.side_effect = lambda poll_id: (
+            ("duty", None) if poll_id == "telegram-duty-poll" else ("obsolete", None)
+        )
+        get_db_pool = AsyncMock(return_value=AsyncMock())
+
+        with (
+            patch.object(poll_handlers, "get_db_pool", new=get_db_pool),
+            patch.object(poll_handlers, "PollRepository", return_value=repo),
+        ):
+            for _ in range(3):
+                await poll_handlers.handle_poll_answer(self._answer("telegram-duty-poll"), AsyncMock())
+                await poll_handlers.handle_poll_answer(self._answer("telegram-old-poll"), AsyncMock())
 
+        self.assertEqual(repo.resolve_telegram_poll.await_count, 2)
+        self.assertEqual(get_db_pool.await_count, 2)
+
+    async def test_unknown_poll_is_not_cached(self):
+        repo = AsyncMock()
+        # Первый голос пришёл раньше, чем опрос записан в daily_polls
+        repo.resolve_telegram_poll.side_effect = [
+            ("unknown", None),
+            ("daily", {"id": "poll-1", "group_id": 1, "status": "closed"}),
+        ]
+        group_repo = SimpleNamespace(get_by_id=AsyncMock())
+
+        with (
+            patch.object(poll_handlers, "get_db_pool", new=AsyncMock(return_value=AsyncMock())),
+            patch.object(poll_handlers, "PollRepository", return_value=repo),
+            patch.object(poll_handlers, "GroupRepository", return_value=group_repo),
+        ):
+            await poll_handlers.handle_poll_answer(self._answer("telegram-new-poll"), AsyncMock())
+            self.assertIsNone(self.cache.get("telegram-new-poll"))
+            await poll_handlers.handle_poll_answer(self._answer("telegram-new-poll"), AsyncMock())
+
+        self.assertEqual(repo.resolve_telegram_poll.await_count, 2)
+
+
+class PollKindCacheTests(unittest.TestCase):
+    def test_only_duty_and_obsolete_polls_are_cached(self):
+        now = [0.0]
+        cache = PollKindCache(ttl_seconds=600, max_size=10, clock=lambda: now[0])
+        cache.remember("duty", "duty")
+        cache.remember("old", "obsolete")
+        cache.remember("missing", "unknown")
+        cache.remember("daily", "daily")
+
+        self.assertEqual(cache.get("duty"), "duty")
+        self.assertEqual(cache.get("old"), "obsolete")
+        self.assertIsNone(cache.get("missing"))
+        self.assertIsNone(cache.get("daily"))
+
+        now[0] = 601
+        self.assertIsNone(cache.get("duty"))
+
+    def test_size_is_bounded(self):
+        cache = PollKindCache(ttl_seconds=600, max_size=2)
+        for poll_id in ("a", "b", "c"):
+            cache.remember(poll_id, "obsolete")
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("a"))
 
 if __name__ == "__main__":
     unittest.main()
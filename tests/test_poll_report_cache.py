@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+from src.services import poll_report_service
+from src.services.group_member_service import GroupMemberService
+from src.services.poll_report_service import PollReportService
+from src.services.scheduler_service import SchedulerService
+
+GROUP = {
+    "id": 1,
+    "name": "Дневная",
+    "is_night": False,
+    "members_version": 3,
+    "settings": {"slots": [{"start": "09:00", "end": "21:00"}]},
+}
+MEMBERS = [
+    {"id": 10, "full_name": "Иван Петров", "telegram_user_id": 100},
+    {"id": 11, "full_name": "Пётр Сидоров", "telegram_user_id": 101},
+]
+
+
+def _poll(version: int, voters=None) -> dict:
+    return {
+        "id": "poll-1",
+        "poll_date": date(2026, 8, 15),
+        "results_version": version,
+        "results": {"slots": {"slot_0": voters if voters is not None else [{"user_id": 100, "name": "Ваня"}]}},
+    }
+
+
+class PollReportCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.member_service = GroupMemberService.__new__(GroupMemberService)
+        self.member_service.get_group_members = AsyncMock(return_value=MEMBERS)
+        self.service = PollReportService(self.member_service)
+
+    async def test_report_is_reused_until_results_change(self):
+        first = await self.service.get_report(_poll(1), GROUP)
+        again = await self.service.get_report(_poll(1), GROUP)
+
+        self.assertIs(first, again)
+        self.assertEqual(self.member_service.get_group_members.await_count, 1)
+        self.assertIn("Иван Петров", first.body)
+        self.assertEqual([member["id"] for member in first.not_voted], [11])
+
+        updated = await self.service.get_report(
+            _poll(2, [{"user_id": 100, "name": "Ваня"}, {"user_id": 101, "name": "Петя"}]),
+            GROUP,
+        )
+        self.assertEqual(self.member_service.get_group_members.await_count, 2)
+        self.assertIn("2 человека", updated.body)
+        self.assertEqual(updated.not_voted, [])
+
+    async def test_member_changes_invalidate_report(self):
+        await self.service.get_report(_poll(1), GROUP)
+        await self.service.get_report(_poll(1), {**GROUP, "members_version": 4})
+
+        self.assertEqual(self.member_service.get_group_members.await_count, 2)
+
+    async def test_without_versions_report_is_not_cached(self):
+        poll = _poll(1)
+        poll.pop("results_version")
+
+        await self.service.get_report(poll, GROUP)
+        await self.service.get_report(poll, GROUP)
+
+        self.assertEqual(self.member_service.get_group_members.await_count, 2)
+
+    async def test_vote_burst_triggers_single_refresh(self):
+        with patch.object(poll_report_service, "REFRESH_DELAY_SECONDS", 0.01):
+            for version in (1, 2, 3):
+                self.service.schedule_refresh(_poll(version), GROUP)
+            await asyncio.gather(*self.service._refresh_tasks)
+
+        self.assertEqual(self.member_service.get_group_members.await_count, 1)
+        self.assertIsNotNone(self.service.get_cached(_poll(3), GROUP))
+        self.assertIsNone(self.service.get_cached(_poll(2), GROUP))
+
+    async def test_closing_report_and_not_voted_share_one_build(self):
+        scheduler = SchedulerService.__new__(SchedulerService)
+        scheduler.report_service = self.service
+
+        report = await scheduler._generate_poll_report(_poll(1), GROUP)
+        not_voted = await scheduler._get_not_voted_members(_poll(1), GROUP)
+
+        self.assertIn("Результаты опроса", report)
+        self.assertIn("Иван Петров", report)
+        self.assertEqual([member["full_name"] for member in not_voted], ["Пётр Сидоров"])
+        self.assertEqual(self.member_service.get_group_members.await_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ from datetime import date
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
 
+from src.services.poll_report_service import PollReportService
 from src.services.scheduler_service import SchedulerService
 
 
@@ -11,10 +12,12 @@ class PollReportTests(unittest.IsolatedAsyncioTestCase):
         service = SchedulerService.__new__(SchedulerService)
         service.group_member_service = SimpleNamespace(
             get_member_name_maps=AsyncMock(return_value=({}, {})),
+            get_group_members=AsyncMock(return_value=[]),
             resolve_voter_display_name=Mock(
                 side_effect=lambda voter, *_: voter.get("name", "Без имени")
             ),
         )
+        service.report_service = PollReportService(service.group_member_service)
         return service
 
     async def test_day_report_does_not_show_curator(self):
@@ -0,0 +1,59 @@
+import asyncio
+import time
+import unittest
+
+from src.services.profiler_service import ProfilerBusyError, ProfilerService
+
+
+async def _busy_work(deadline: float) -> None:
+    while time.monotonic() < deadline:
+        sum(i * i for i in range(2000))
+        await asyncio.sleep(0)
+
+
+class ProfilerServiceTests(unittest.IsolatedAsyncioTestCase):
+    def test_duration_is_clamped_to_hard_limit(self):
+        service = ProfilerService(max_seconds=30)
+
+        self.assertEqual(service.clamp_duration(None), 10)
+        self.assertEqual(service.clamp_duration(0), 10)
+        self.assertEqual(service.clamp_duration(500), 30)
+        self.assertEqual(ProfilerService(max_seconds=5).clamp_duration(None), 5)
+
+    async def test_sampling_profile_sees_running_coroutine(self):
+        service = ProfilerService(max_seconds=1)
+        worker = asyncio.create_task(_busy_work(time.monotonic() + 1.5))
+
+        result = await service.capture("cpu", 1)
+        await worker
+
+        text = result.content.decode("utf-8")
+        self.assertTrue(result.filename.startswith("profile_cpu_"))
+        self.assertIn("_busy_work", text)
+
+    async def test_task_dump_lists_pending_tasks(self):
+        service = ProfilerService(max_seconds=1)
+        waiter = asyncio.create_task(asyncio.sleep(10), name="long-waiter")
+        try:
+            result = await service.capture("tasks")
+        finally:
+            waiter.cancel()
+
+        self.assertIn("long-waiter", result.content.decode("utf-8"))
+
+    async def test_rejects_parallel_capture_and_unknown_mode(self):
+        service = ProfilerService(max_seconds=1)
+        first = asyncio.create_task(service.capture("memory", 1))
+        await asyncio.sleep(0.05)
+
+        with self.assertRaises(ProfilerBusyError):
+            await service.capture("cpu", 1)
+        with self.assertRaises(ValueError):
+            await service.capture("unknown")
+
+        result = await first
+        self.assertIn("tracemalloc", result.content.decode("utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
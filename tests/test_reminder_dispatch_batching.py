@@ -0,0 +1,266 @@
+import asyncio
+import unittest
+from contextlib import asynccontextmanager
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from src.repositories.poll_repository import PollRepository
+from src.services.group_schedule_dispatcher import (
+    ACTION_CLOSE,
+    ACTION_REMIND,
+    GroupEvent,
+    GroupScheduleDispatcher,
+)
+from src.services.scheduler_service import SchedulerService
+
+
+class FakeConnection:
+    def __init__(self, rows=None, status="DELETE 0"):
+        self.rows = rows or []
+        self.status = status
+        self.calls = []
+
+    async def fetch(self, query, *args):
+        self.calls.append((query, args))
+        return self.rows
+
+    async def execute(self, query, *args):
+        self.calls.append((query, args))
+        return self.status
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+class ReminderDispatchRepositoryTests(unittest.IsolatedAsyncioTestCase):
+    async def test_claims_all_polls_with_one_insert(self):
+        conn = FakeConnection(rows=[{"poll_id": "poll-1", "reminder_hour": 17, "is_night": False}])
+        repository = PollRepository(FakePool(conn))
+
+        claimed = await repository.claim_reminder_dispatches([
+            ("poll-1", 17, False),
+            ("poll-2", 17, False),
+        ])
+
+        self.assertEqual(claimed, {("poll-1", 17, False)})
+        self.assertEqual(len(conn.calls), 1)
+        query, args = conn.calls[0]
+        self.assertIn("unnest", query)
+        self.assertIn("ON CONFLICT", query)
+        self.assertEqual(args, (["poll-1", "poll-2"], [17, 17], [False, False]))
+
+    async def test_failed_claims_are_released_with_one_delete(self):
+        conn = FakeConnection(status="DELETE 2")
+        repository = PollRepository(FakePool(conn))
+
+        released = await repository.release_reminder_dispatches([("poll-1", 17, False), ("poll-2", 17, False)])
+
+        self.assertEqual(released, 2)
+        self.assertEqual(len(conn.calls), 1)
+
+    async def test_empty_batches_do_not_touch_database(self):
+        conn = FakeConnection()
+        repository = PollRepository(FakePool(conn))
+
+        self.assertEqual(await repository.claim_reminder_dispatches([]), set())
+        self.assertEqual(await repository.release_reminder_dispatches([]), 0)
+        self.assertEqual(await repository.get_sent_reminders([]), set())
+        self.assertEqual(conn.calls, [])
+
+
+class ReminderRunTests(unittest.IsolatedAsyncioTestCase):
+    def _build_service(self, poll_count):
+        service = SchedulerService.__new__(SchedulerService)
+        tomorrow = date.today() + timedelta(days=1)
+        self.polls = [
+            {"id": f"poll-{index}", "group_id": index, "poll_date": tomorrow}
+            for index in range(poll_count)
+        ]
+        service.poll_service = SimpleNamespace(poll_repo=AsyncMock())
+        service.poll_service.poll_repo.get_active_polls.return_value = self.polls
+        service.group_service = AsyncMock()
+        service.group_service.get_all_groups.return_value = [
+            {"id": index, "name": f"ЗИЗ-{index}", "is_night": False, "telegram_chat_id": -index}
+            for index in range(poll_count)
+        ]
+        service.group_member_service = AsyncMock()
+        service.group_member_service.get_not_voted_members_for_polls.side_effect = lambda poll_ids: {
+            poll_id: [{"id": 1, "full_name": "Иван Петров"}] for poll_id in poll_ids
+        }
+        service.report_service = SimpleNamespace(get_cached=Mock(return_value=None))
+        service._post_reminder = AsyncMock()
+        service._schedule_reminder_retry = Mock()
+        return service
+
+    async def test_round_trips_do_not_grow_with_group_count(self):
+        service = self._build_service(poll_count=50)
+        repo = service.poll_service.poll_repo
+        repo.claim_reminder_dispatches.side_effect = lambda claims: set(claims[1:])
+        service._post_reminder.side_effect = [RuntimeError("flood")] + [None] * 48
+
+        await service._send_reminders(reminder_hour=17)
+
+        repo.get_active_polls.assert_awaited_once()
+        service.group_service.get_all_groups.assert_awaited_once()
+        service.group_service.get_group_by_id.assert_not_awaited()
+        repo.claim_reminder_dispatches.assert_awaited_once()
+        repo.claim_reminder_dispatch.assert_not_awaited()
+        service.group_member_service.get_not_voted_members_for_polls.assert_awaited_once()
+        self.assertEqual(service._post_reminder.await_count, 49)
+        # Первая группа уже получила напоминание, вторая упала и освобождается
+        repo.release_reminder_dispatches.assert_awaited_once_with([("poll-1", 17, False)])
+        repo.release_reminder_dispatch.assert_not_awaited()
+        service._schedule_reminder_retry.assert_called_once()
+        self.assertEqual(service._schedule_reminder_retry.call_args.kwargs["poll"], self.polls[1])
+
+    async def test_pending_check_is_one_query(self):
+        service = self._build_service(poll_count=50)
+        repo = service.poll_service.poll_repo
+        repo.has_pending_reminders.return_value = False
+        target_date = date.today() + timedelta(days=1)
+
+        pending = await service._has_pending_reminders(reminder_hour=17, is_night=False, target_date=target_date)
+
+        self.assertFalse(pending)
+        repo.has_pending_reminders.assert_awaited_once_with(
+            poll_date=target_date,
+            reminder_hour=17,
+            is_night=False,
+        )
+        repo.get_active_polls.assert_not_awaited()
+        repo.reminder_already_sent.assert_not_awaited()
+
+
+class DispatcherReminderBatchTests(unittest.IsolatedAsyncioTestCase):
+    async def test_reminders_due_in_one_tick_are_handled_in_one_call(self):
+        batches = []
+        handled = []
+        completed = []
+
+        async def on_reminders(events):
+            batches.append(sorted(event.group_id for event in events))
+
+        async def handler(event):
+            handled.append(event.group_id)
+
+        async def on_window_complete(action, is_night, schedule_date):
+            completed.append(action)
+
+        dispatcher = GroupScheduleDispatcher(
+            handler,
+            on_window_complete,
+            spread_seconds=0,
+            batch_handlers={ACTION_REMIND: on_reminders},
+        )
+        due_at = datetime.now() - timedelta(seconds=1)
+        for group_id in (1, 2, 3):
+            dispatcher._versions[group_id] = 0
+            dispatcher._push(GroupEvent(due_at, group_id, ACTION_REMIND, False, 0, reminder_hour=17))
+        dispatcher._push(GroupEvent(due_at, 1, ACTION_CLOSE, False, 0))
+
+        await dispatcher.start()
+        for _ in range(50):
+            if len(completed) == 2:
+                break
+            await asyncio.sleep(0.02)
+        await dispatcher.stop()
+
+        self.assertEqual(batches, [[1, 2, 3]])
+        self.assertEqual(handled, [1])
+        self.assertEqual(sorted(completed), [ACTION_CLOSE, ACTION_REMIND])
+
+
+class GroupReminderEventTests(unittest.IsolatedAsyncioTestCase):
+    def _build_service(self, group_count):
+        service = SchedulerService.__new__(SchedulerService)
+        service.group_dispatcher = GroupScheduleDispatcher(handler=AsyncMock(), spread_seconds=0)
+        self.groups = [
+            {
+                "id": index,
+                "name": f"ЗИЗ-{index}",
+                "is_night": False,
+                "is_active": index != 0,
+                "telegram_chat_id": -index,
+                "poll_close_time": time(19, 0),
+            }
+            for index in range(group_count)
+        ]
+        service.group_service = AsyncMock()
+        service.group_service.get_groups_by_ids.return_value = self.groups
+        service.group_service.get_all_groups.return_value = self.groups
+        repo = AsyncMock()
+        repo.claim_reminder_dispatches.side_effect = lambda claims: set(claims)
+        repo.get_sent_reminders.return_value = set()
+        service.poll_service = SimpleNamespace(poll_repo=repo)
+        service.group_member_service = AsyncMock()
+        service.group_member_service.get_not_voted_members_for_polls.side_effect = lambda poll_ids: {
+            poll_id: [{"id": 1, "full_name": "Иван Петров"}] for poll_id in poll_ids
+        }
+        service.report_service = SimpleNamespace(get_cached=Mock(return_value=None))
+        service._post_reminder = AsyncMock()
+        service._schedule_reminder_retry = Mock()
+        return service
+
+    async def test_tick_reminders_cost_fixed_number_of_queries(self):
+        service = self._build_service(group_count=30)
+        run_at = datetime(2026, 3, 2, 17, 0)
+        target_date = date(2026, 3, 3)
+        repo = service.poll_service.poll_repo
+        repo.get_active_by_group_dates.return_value = [
+            {"id": f"poll-{group['id']}", "group_id": group["id"], "poll_date": target_date}
+            for group in self.groups[1:]
+        ]
+        events = [
+            GroupEvent(run_at, group["id"], ACTION_REMIND, False, 0, reminder_hour=17)
+            for group in self.groups
+        ]
+
+        await service._handle_reminder_events(events)
+
+        service.group_service.get_groups_by_ids.assert_awaited_once()
+        service.group_service.get_group_by_id.assert_not_awaited()
+        repo.get_active_by_group_dates.assert_awaited_once()
+        # Отключённая группа не запрашивается и не получает напоминание
+        self.assertNotIn((0, target_date), repo.get_active_by_group_dates.await_args.args[0])
+        repo.claim_reminder_dispatches.assert_awaited_once()
+        repo.claim_reminder_dispatch.assert_not_awaited()
+        repo.get_by_group_and_date.assert_not_awaited()
+        self.assertEqual(service._post_reminder.await_count, 29)
+
+    async def test_single_reminder_event_uses_batch_path(self):
+        service = self._build_service(group_count=2)
+        service.poll_service.poll_repo.get_active_by_group_dates.return_value = []
+
+        await service._handle_group_event(GroupEvent(datetime(2026, 3, 2, 17, 0), 1, ACTION_REMIND, False, 0, 17))
+
+        service.poll_service.poll_repo.get_active_by_group_dates.assert_awaited_once_with([(1, date(2026, 3, 3))])
+        service.group_service.get_group_by_id.assert_not_awaited()
+
+    async def test_recovery_claims_missed_reminders_at_once(self):
+        service = self._build_service(group_count=20)
+        now = datetime.combine(date.today(), time(18, 0))
+        repo = service.poll_service.poll_repo
+        repo.get_active_polls.return_value = [
+            {"id": f"poll-{group['id']}", "group_id": group["id"], "poll_date": now.date() + timedelta(days=1)}
+            for group in self.groups
+        ]
+
+        await service._recover_missed_group_events(now)
+
+        service.group_service.get_all_groups.assert_awaited_once()
+        service.group_service.get_group_by_id.assert_not_awaited()
+        repo.claim_reminder_dispatches.assert_awaited_once()
+        repo.claim_reminder_dispatch.assert_not_awaited()
+        claims = repo.claim_reminder_dispatches.await_args.args[0]
+        self.assertEqual({poll_id for poll_id, _, _ in claims}, {f"poll-{index}" for index in range(1, 20)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import gzip
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from src.services.report_archive import ReportArchive, _clean_name
+
+
+class ReportArchiveTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base_dir = Path(self.tmp.name)
+        self.archive = ReportArchive(self.base_dir, compress_level=6)
+
+    async def asyncTearDown(self):
+        await self.archive.close()
+        self.tmp.cleanup()
+
+    async def test_append_and_get(self):
+        path = await self.archive.append("ЗИЗ-1", date(2024, 1, 15), "Отчет 15")
+        await self.archive.append("ЗИЗ-1", date(2024, 1, 16), "Отчет 16")
+
+        self.assertEqual(Path(path), self.base_dir / "ЗИЗ-1" / "2024-01.gz")
+        self.assertEqual(await self.archive.get("ЗИЗ-1", date(2024, 1, 15)), "Отчет 15")
+        self.assertEqual(await self.archive.get("ЗИЗ-1", date(2024, 1, 16)), "Отчет 16")
+        self.assertIsNone(await self.archive.get("ЗИЗ-1", date(2024, 1, 17)))
+        self.assertIsNone(await self.archive.get("ЗИЗ-2", date(2024, 1, 15)))
+
+    async def test_bundle_is_append_only_sequence_of_gzip_members(self):
+        await self.archive.append("ЗИЗ-1", date(2024, 1, 15), "первый")
+        bundle = self.base_dir / "ЗИЗ-1" / "2024-01.gz"
+        first_bytes = bundle.read_bytes()
+        await self.archive.append("ЗИЗ-1", date(2024, 1, 16), "второй")
+
+        data = bundle.read_bytes()
+        self.assertTrue(data.startswith(first_bytes))
+        self.assertEqual(gzip.decompress(data).decode("utf-8"), "первыйвторой")
+
+    async def test_resaved_report_replaces_previous_one(self):
+        await self.archive.append("ЗИЗ-1", date(2024, 1, 15), "старый")
+        await self.archive.append("ЗИЗ-1", date(2024, 1, 15), "новый")
+
+        self.assertEqual(await self.archive.get("ЗИЗ-1", date(2024, 1, 15)), "новый")
+        reopened = ReportArchive(self.base_dir)
+        try:
+            self.assertEqual(await reopened.get("ЗИЗ-1", date(2024, 1, 15)), "новый")
+        finally:
+            await reopened.close()
+
+    async def test_reader_sees_reports_written_by_another_instance(self):
+        reader = ReportArchive(self.base_dir)
+        try:
+            self.assertIsNone(await reader.get("ЗИЗ-1", date(2024, 1, 15)))
+            await self.archive.append("ЗИЗ-1", date(2024, 1, 15), "Отчет")
+            self.assertEqual(await reader.get("ЗИЗ-1", date(2024, 1, 15)), "Отчет")
+        finally:
+            await reader.close()
+
+    async def test_torn_index_line_is_skipped(self):
+        await self.archive.append("ЗИЗ-1", date(2024, 1, 15), "Отчет 15")
+        with (self.base_dir / "index.tsv").open("a", encoding="utf-8") as index_file:
+            index_file.write("ЗИЗ-1\t2024-01-")
+        await self.archive.append("ЗИЗ-1", date(2024, 1, 16), "Отчет 16")
+
+        reopened = ReportArchive(self.base_dir)
+        try:
+            self.assertEqual(
+                await reopened.list_dates("ЗИЗ-1", 2024, 1),
+                [date(2024, 1, 15), date(2024, 1, 16)],
+            )
+            self.assertEqual(await reopened.get("ЗИЗ-1", date(2024, 1, 16)), "Отчет 16")
+        finally:
+            await reopened.close()
+
+    async def test_export_month_returns_reports_in_date_order(self):
+        await self.archive.append("ЗИЗ-1", date(2024, 1, 20), "20")
+        await self.archive.append("ЗИЗ-1", date(2024, 1, 3), "03")
+        await self.archive.append("ЗИЗ-1", date(2024, 2, 1), "февраль")
+        await self.archive.append("ЗИЗ-2", date(2024, 1, 5), "другая группа")
+
+        self.assertEqual(
+            await self.archive.export_month("ЗИЗ-1", 2024, 1),
+            [(date(2024, 1, 3), "03"), (date(2024, 1, 20), "20")],
+        )
+        self.assertEqual(await self.archive.export_month("ЗИЗ-1", 2023, 12), [])
+
+    async def test_group_name_cannot_escape_archive_dir(self):
+        for name in ("..", ".", "../../etc", "..\\evil", "a\0b", "index.tsv", "  "):
+            segment = _clean_name(name)
+            self.assertEqual(len(Path(segment).parts), 1, name)
+            self.assertNotIn(segment, ("", ".", "..", "index.tsv"))
+
+        path = await self.archive.append("..", date(2024, 1, 15), "Отчет")
+        image_path = await self.archive.save_image("../x", date(2024, 1, 15), b"png")
+
+        root = self.base_dir.resolve()
+        self.assertEqual(Path(path).resolve().parent.parent, root)
+        self.assertEqual(Path(image_path).resolve().parent.parent, root)
+        self.assertEqual(await self.archive.get("..", date(2024, 1, 15)), "Отчет")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+import asyncio
+import importlib.util
+import os
+import threading
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.services.report_image_service import ReportImage, ReportImageService, render_report_image
+from src.services.scheduler_service import SchedulerService
+
+PIL_INSTALLED = importlib.util.find_spec("PIL") is not None
+
+ROWS = [
+    ("Рабочие смены", "08:00–12:00", 12),
+    ("Рабочие смены", "12:00–16:00", 0),
+    ("Дополнительно", "Выходной", 3),
+]
+
+
+@unittest.skipUnless(PIL_INSTALLED, "Pillow не установлен")
+class ReportImageRenderingTests(unittest.IsolatedAsyncioTestCase):
+    def test_render_returns_png(self):
+        data, render_ms = render_report_image("ЗИЗ-1", "Итоги опроса на 15.01.2024", ROWS)
+
+        self.assertTrue(data.startswith(b"\x89PNG\r\n\x1a\n"))
+        self.assertGreaterEqual(render_ms, 0)
+
+    async def test_warm_pool_renders_in_worker_process(self):
+        service = ReportImageService(workers=1, queue_size=2, timeout_seconds=60, font_path="")
+        await service.start()
+        try:
+            self.assertTrue(service.available)
+            image = await service.render("ЗИЗ-1", "Итоги опроса на 15.01.2024", ROWS)
+        finally:
+            await service.stop()
+
+        self.assertIsNotNone(image)
+        self.assertTrue(image.data.startswith(b"\x89PNG"))
+        self.assertEqual(service.get_stats()["rendered"], 1)
+        self.assertFalse(service.available)
+
+    async def test_crashed_worker_process_does_not_break_later_renders(self):
+        service = ReportImageService(workers=1, queue_size=2, timeout_seconds=60, font_path="")
+        await service.start()
+        try:
+            crash = asyncio.get_running_loop().run_in_executor(service._pool, os._exit, 1)
+            with self.assertRaises(BrokenProcessPool):
+                await crash
+            image = await service.render("ЗИЗ-1", "Итоги опроса на 15.01.2024", ROWS)
+        finally:
+            await service.stop()
+
+        self.assertIsNotNone(image)
+        self.assertEqual(service.restarts, 1)
+
+
+class ReportImageQueueTests(unittest.IsolatedAsyncioTestCase):
+    async def test_full_queue_skips_image(self):
+        service = ReportImageService(workers=1, queue_size=1)
+        service._pool = Mock()
+        service._pending = 1
+
+        self.assertIsNone(await service.render("ЗИЗ-1", "", ROWS))
+        self.assertEqual(service.skipped, 1)
+        service._pool.submit.assert_not_called()
+
+    async def test_timed_out_render_keeps_slot_until_worker_finishes(self):
+        release = threading.Event()
+
+        def slow_render(title, subtitle, rows):
+            release.wait(5)
+            return b"\x89PNG", 1.0
+
+        service = ReportImageService(workers=1, queue_size=1, timeout_seconds=0.05)
+        service._pool = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(service._pool.shutdown, True)
+
+        with patch("src.services.report_image_service.render_report_image", slow_render):
+            self.assertIsNone(await service.render("ЗИЗ-1", "", ROWS))
+            self.assertEqual(service.failed, 1)
+            # Процесс всё ещё рисует: следующая картинка не встаёт в очередь
+            self.assertEqual(service._pending, 1)
+            self.assertIsNone(await service.render("ЗИЗ-2", "", ROWS))
+            self.assertEqual(service.skipped, 1)
+
+            release.set()
+            for _ in range(100):
+                if service._pending == 0:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(service._pending, 0)
+
+    def _broken_pool(self):
+        future = Future()
+        future.set_exception(BrokenProcessPool("процесс отрисовки упал"))
+        return Mock(submit=Mock(return_value=future))
+
+    async def test_broken_pool_is_recreated_and_render_retried(self):
+        service = ReportImageService(workers=1, queue_size=2, timeout_seconds=5)
+        broken = self._broken_pool()
+        service._pool = broken
+        fresh = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(fresh.shutdown, True)
+
+        with patch.object(service, "_create_pool", return_value=fresh), \
+                patch("src.services.report_image_service.render_report_image", return_value=(b"\x89PNG", 1.0)):
+            image = await service.render("ЗИЗ-1", "", ROWS)
+            # Следующая отрисовка идёт уже в новом пуле
+            second = await service.render("ЗИЗ-2", "", ROWS)
+
+        self.assertEqual(image.data, b"\x89PNG")
+        self.assertIsNotNone(second)
+        self.assertIs(service._pool, fresh)
+        broken.shutdown.assert_called_once_with(False, cancel_futures=True)
+        self.assertEqual(broken.submit.call_count, 1)
+        self.assertEqual((service.rendered, service.failed, service.restarts), (2, 0, 1))
+        self.assertEqual(service._pending, 0)
+
+    async def test_pool_broken_again_falls_back_to_text_report(self):
+        service = ReportImageService(workers=1, queue_size=2, timeout_seconds=5)
+        service._pool = self._broken_pool()
+
+        with patch.object(service, "_create_pool", side_effect=lambda: self._broken_pool()):
+            self.assertIsNone(await service.render("ЗИЗ-1", "", ROWS))
+
+        self.assertEqual((service.failed, service.restarts), (1, 2))
+        self.assertIsNotNone(service._pool)
+
+    async def test_render_without_pool_returns_none(self):
+        self.assertIsNone(await ReportImageService().render("ЗИЗ-1", "", ROWS))
+
+
+class ClosingReportImageTests(unittest.IsolatedAsyncioTestCase):
+    def _build_service(self):
+        service = SchedulerService.__new__(SchedulerService)
+        service.bot = AsyncMock()
+        service.report_images = Mock(available=True)
+        service.report_images.render = AsyncMock(return_value=ReportImage(b"\x89PNG", 12.0, 15.0))
+        service.report_archive = Mock()
+        service.report_archive.save_image = AsyncMock(return_value="reports/ЗИЗ-1/2024-01-15.png")
+
+        async def call_once(call, **_):
+            return await call()
+
+        service._call_telegram_with_retry = call_once
+        return service
+
+    def _poll_and_group(self):
+        poll = {"poll_date": date(2024, 1, 15), "results": {"slots": {"slot_0": [{"user_id": 1}]}}}
+        group = {
+            "name": "ЗИЗ-1",
+            "telegram_chat_id": -100,
+            "is_night": False,
+            "settings": {"slots": [{"start": "08:00", "end": "12:00"}]},
+        }
+        return poll, group
+
+    async def test_image_is_sent_and_archived(self):
+        service = self._build_service()
+        poll, group = self._poll_and_group()
+
+        path = await service._send_report_image(poll, group)
+
+        self.assertEqual(path, "reports/ЗИЗ-1/2024-01-15.png")
+        rows = service.report_images.render.await_args.args[2]
+        self.assertEqual(rows[0], ("Рабочие смены", "08:00–12:00", 1))
+        service.bot.send_photo.assert_awaited_once()
+        service.report_archive.save_image.assert_awaited_once_with("ЗИЗ-1", date(2024, 1, 15), b"\x89PNG")
+
+    async def test_send_failure_does_not_break_closing(self):
+        service = self._build_service()
+        service.bot.send_photo.side_effect = RuntimeError("telegram down")
+        poll, group = self._poll_and_group()
+
+        self.assertIsNone(await service._send_report_image(poll, group))
+        service.report_archive.save_image.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+
+from src.services.report_renderer import (
+    TELEGRAM_MESSAGE_LIMIT,
+    layout_for_group,
+    render_results,
+    split_message,
+    summarize_results,
+)
+
+
+def _group(slots: int = 3, extra_options=("Стажировка",), is_night: bool = False) -> dict:
+    return {
+        "is_night": is_night,
+        "settings": {
+            "slots": [{"start": f"{8 + i:02d}:00", "end": f"{12 + i:02d}:00"} for i in range(slots)],
+            "extra_options": list(extra_options),
+        },
+    }
+
+
+def _voters(start: int, count: int) -> list[dict]:
+    return [{"user_id": start + index, "name": f"Курьер {start + index}"} for index in range(count)]
+
+
+class ReportLayoutTests(unittest.TestCase):
+    def test_layout_is_compiled_once_per_group_configuration(self):
+        first = layout_for_group({**_group(), "id": 1})
+        second = layout_for_group({**_group(), "id": 2})
+        changed = layout_for_group(_group(extra_options=("Стажировка", "Обучение")))
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, changed)
+
+    def test_large_day_group_report(self):
+        results = {
+            "slots": {"slot_0": _voters(0, 120), "slot_1": _voters(200, 3), "slot_2": []},
+            "day_off": _voters(400, 60),
+            "custom": {"option_0": _voters(500, 25)},
+        }
+
+        text = render_results(layout_for_group(_group()), results, lambda voter: voter["name"])
+
+        self.assertIn("✅ 08:00–12:00 — 120 человек\n", text)
+        self.assertIn("... и еще 110\n", text)
+        self.assertIn("✅ 09:00–13:00 — 3 человека\n", text)
+        self.assertIn("❌ 10:00–14:00 — нет курьеров\n", text)
+        self.assertIn("Дополнительно\n\n🏖 Выходной — 60 человек\n", text)
+        self.assertIn("📝 Стажировка — 25 человек\n", text)
+        self.assertEqual(text.count("• "), 10 + 3 + 10 + 10)
+
+    def test_night_group_hides_empty_additional_section(self):
+        results = {"night_out": _voters(0, 25), "not_going": [], "day_off": [], "custom": {}}
+
+        text = render_results(layout_for_group(_group(slots=0, is_night=True)), results, lambda voter: voter["name"])
+
+        self.assertTrue(text.startswith("Рабочие смены\n\n✅ Выхожу — 25 человек\n"))
+        self.assertIn("❌ Не выхожу — нет курьеров\n", text)
+        self.assertNotIn("Дополнительно", text)
+        self.assertNotIn("и еще", text)
+        self.assertEqual(text.count("• "), 20)
+
+    def test_summary_rows_follow_text_report(self):
+        results = {"slots": {"slot_0": _voters(0, 4)}, "day_off": [], "custom": {"option_0": _voters(10, 2)}}
+
+        rows = summarize_results(layout_for_group(_group(slots=2)), results)
+
+        self.assertEqual(rows, [
+            ("Рабочие смены", "08:00–12:00", 4),
+            ("Рабочие смены", "09:00–13:00", 0),
+            ("Дополнительно", "Стажировка", 2),
+        ])
+
+
+class SplitMessageTests(unittest.TestCase):
+    def test_short_text_is_not_split(self):
+        self.assertEqual(split_message("итоги"), ["итоги"])
+
+    def test_long_report_is_split_on_line_boundaries(self):
+        lines = [f"• <b>Курьер {index:04d}</b> (@courier_{index})\n" for index in range(400)]
+        text = "".join(lines)
+
+        chunks = split_message(text)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= TELEGRAM_MESSAGE_LIMIT for chunk in chunks))
+        self.assertEqual("".join(chunks), text)
+        self.assertTrue(all(chunk.endswith("\n") for chunk in chunks))
+
+    def test_overlong_line_is_cut(self):
+        chunks = split_message("a" * 10000, limit=4096)
+
+        self.assertEqual([len(chunk) for chunk in chunks], [4096, 4096, 1808])
+
+
+if __name__ == "__main__":
+    unittest.main()
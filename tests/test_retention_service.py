@@ -0,0 +1,116 @@
+import asyncio
+import unittest
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from src.services.retention_service import (
+    MIN_POLL_RETENTION_DAYS,
+    RetentionBusyError,
+    RetentionService,
+    format_retention_report,
+)
+
+
+def _archive_batch(polls):
+    return {
+        "daily_polls": polls,
+        "poll_options": polls * 5,
+        "user_votes": polls * 12,
+        "poll_reminder_dispatches": polls,
+        "freed_bytes": polls * 1000,
+        "archived_bytes": polls * 300,
+    }
+
+
+class RetentionServiceTests(unittest.IsolatedAsyncioTestCase):
+    def _build_service(self):
+        service = RetentionService(
+            db_pool=None,
+            poll_retention_days=180,
+            dispatch_retention_days=30,
+            batch_size=100,
+            batch_pause_seconds=0,
+        )
+        service.repository = AsyncMock()
+        service.repository.archive_closed_polls.side_effect = [
+            _archive_batch(100),
+            _archive_batch(100),
+            _archive_batch(40),
+        ]
+        service.repository.delete_expired.return_value = {"rows": 0, "freed_bytes": 0}
+        service.repository.get_table_sizes.side_effect = [
+            {"daily_polls": 5_000_000, "user_votes": 20_000_000},
+            {"daily_polls": 4_000_000, "user_votes": 18_000_000},
+        ]
+        return service
+
+    async def test_archives_in_batches_until_short_batch(self):
+        service = self._build_service()
+
+        with patch("src.services.retention_service.settings.RETENTION_VACUUM", True):
+            report = await service.run()
+
+        self.assertEqual(service.repository.archive_closed_polls.await_count, 3)
+        cutoff, limit = service.repository.archive_closed_polls.await_args.args
+        self.assertEqual(cutoff, date.today() - timedelta(days=180))
+        self.assertEqual(limit, 100)
+        self.assertEqual(report.archived_polls, 240)
+        self.assertEqual(report.deleted_rows["user_votes"], 240 * 12)
+        self.assertEqual(report.freed_bytes, 240 * 1000)
+        self.assertEqual(report.reclaimed_bytes, 3_000_000)
+
+        vacuumed = service.repository.vacuum.await_args.args[0]
+        self.assertIn("daily_polls", vacuumed)
+        self.assertIn("daily_polls_archive", vacuumed)
+        self.assertNotIn("duty_poll_dispatches", vacuumed)
+
+        text = format_retention_report(report)
+        self.assertIn("Перенесено в архив опросов: <b>240</b>", text)
+
+    async def test_expired_dispatches_use_dispatch_cutoff(self):
+        service = self._build_service()
+        service.repository.archive_closed_polls.side_effect = None
+        service.repository.archive_closed_polls.return_value = _archive_batch(0)
+        service.repository.delete_expired.side_effect = lambda table, before, limit: (
+            {"rows": 3, "freed_bytes": 90} if table == "poll_reminder_dispatches" else {"rows": 0, "freed_bytes": 0}
+        )
+
+        report = await service.run()
+
+        calls = {call.args[0]: call.args[1] for call in service.repository.delete_expired.await_args_list}
+        cutoff = date.today() - timedelta(days=30)
+        self.assertEqual(calls["poll_reminder_dispatches"], datetime.combine(cutoff, datetime.min.time()))
+        self.assertEqual(calls["duty_poll_dispatches"], cutoff)
+        self.assertEqual(report.deleted_rows, {"poll_reminder_dispatches": 3})
+        self.assertEqual(report.archived_polls, 0)
+
+    async def test_retention_days_cannot_go_below_minimum(self):
+        service = self._build_service()
+
+        report = await service.run(poll_retention_days=1)
+
+        self.assertEqual(report.poll_cutoff, date.today() - timedelta(days=MIN_POLL_RETENTION_DAYS))
+
+    async def test_concurrent_run_is_rejected(self):
+        service = self._build_service()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_batch(before, limit):
+            started.set()
+            await release.wait()
+            return _archive_batch(0)
+
+        service.repository.archive_closed_polls.side_effect = slow_batch
+        first = asyncio.create_task(service.run())
+        await started.wait()
+
+        with self.assertRaises(RetentionBusyError):
+            await service.run()
+
+        release.set()
+        await first
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+from apscheduler.events import EVENT_JOB_MISSED
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from src.services.scheduler_job_store import PostgresJobStore
+from src.services.scheduler_service import PERSISTENT_JOBSTORE, create_scheduler
+
+CALLS = []
+
+
+async def _record_call(label: str) -> None:
+    CALLS.append(label)
+
+
+class _FakeJobRepository:
+    def __init__(self):
+        self.rows = {}
+
+    async def get_all(self):
+        return sorted(
+            (
+                {"id": job_id, "next_run_time": next_run_time, "job_state": state}
+                for job_id, (next_run_time, state) in self.rows.items()
+            ),
+            key=lambda row: (row["next_run_time"] is None, row["next_run_time"] or 0),
+        )
+
+    async def upsert(self, job_id, next_run_time, job_state):
+        self.rows[job_id] = (next_run_time, job_state)
+
+    async def delete(self, job_id):
+        self.rows.pop(job_id, None)
+
+    async def delete_all(self):
+        self.rows.clear()
+
+
+class PostgresJobStoreTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        CALLS.clear()
+        self.repository = _FakeJobRepository()
+
+    async def _start(self, **scheduler_options):
+        store = PostgresJobStore(self.repository)
+        scheduler = create_scheduler(store, **scheduler_options)
+        await store.preload()
+        scheduler.start()
+        return scheduler, store
+
+    async def _stop(self, scheduler, store):
+        scheduler.shutdown(wait=False)
+        await asyncio.sleep(0)
+        await store.close()
+
+    async def _persist_job(self, trigger, next_run_time, **scheduler_options):
+        """Сохранить задачу так, как если бы бот остановился до её запуска."""
+        scheduler, store = await self._start(**scheduler_options)
+        scheduler.pause()
+        scheduler.add_job(
+            _record_call,
+            trigger,
+            id="job",
+            kwargs={"label": "run"},
+            jobstore=PERSISTENT_JOBSTORE,
+            next_run_time=next_run_time,
+        )
+        await self._stop(scheduler, store)
+
+    async def test_one_shot_job_survives_restart(self):
+        run_at = datetime.now().astimezone() + timedelta(hours=1)
+        await self._persist_job(DateTrigger(run_date=run_at), run_at)
+
+        self.assertIn("job", self.repository.rows)
+        scheduler, store = await self._start()
+        try:
+            job = scheduler.get_job("job")
+            self.assertEqual(job.kwargs, {"label": "run"})
+            self.assertEqual(job.next_run_time, run_at)
+        finally:
+            await self._stop(scheduler, store)
+        self.assertIn("job", self.repository.rows)
+
+    async def test_executed_one_shot_job_is_deleted(self):
+        scheduler, store = await self._start()
+        try:
+            scheduler.add_job(
+                _record_call,
+                DateTrigger(run_date=datetime.now().astimezone() + timedelta(milliseconds=50)),
+                id="job",
+                kwargs={"label": "soon"},
+                jobstore=PERSISTENT_JOBSTORE,
+            )
+            await store.flush()
+            self.assertIn("job", self.repository.rows)
+            await asyncio.sleep(0.3)
+            await store.flush()
+        finally:
+            await self._stop(scheduler, store)
+
+        self.assertEqual(CALLS, ["soon"])
+        self.assertEqual(self.repository.rows, {})
+
+    async def test_job_missed_beyond_grace_is_dropped(self):
+        late = datetime.now().astimezone() - timedelta(minutes=10)
+        await self._persist_job(DateTrigger(run_date=late), late, misfire_grace_seconds=60)
+
+        missed = []
+        scheduler, store = await self._start()
+        scheduler.add_listener(lambda event: missed.append(event.job_id), EVENT_JOB_MISSED)
+        try:
+            scheduler.wakeup()
+            await asyncio.sleep(0.2)
+            await store.flush()
+        finally:
+            await self._stop(scheduler, store)
+
+        self.assertEqual(CALLS, [])
+        self.assertEqual(missed, ["job"])
+        self.assertEqual(self.repository.rows, {})
+
+    async def test_job_missed_within_grace_still_runs(self):
+        late = datetime.now().astimezone() - timedelta(minutes=10)
+        await self._persist_job(DateTrigger(run_date=late), late, misfire_grace_seconds=3600)
+
+        scheduler, store = await self._start()
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            await self._stop(scheduler, store)
+
+        self.assertEqual(CALLS, ["run"])
+
+    async def test_coalesce_controls_catch_up_runs(self):
+        for coalesce, expected_runs in ((True, 1), (False, 5)):
+            with self.subTest(coalesce=coalesce):
+                CALLS.clear()
+                self.repository.rows.clear()
+                first_run = datetime.now().astimezone() - timedelta(minutes=4, seconds=30)
+                await self._persist_job(
+                    IntervalTrigger(minutes=1, start_date=first_run),
+                    first_run,
+                    misfire_grace_seconds=3600,
+                    coalesce=coalesce,
+                )
+
+                scheduler, store = await self._start()
+                try:
+                    await asyncio.sleep(0.3)
+                    await store.flush()
+                    next_run = self.repository.rows["job"][0]
+                finally:
+                    await self._stop(scheduler, store)
+
+                self.assertEqual(len(CALLS), expected_runs)
+                self.assertGreater(next_run, datetime.now().timestamp())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import unittest
+from datetime import date, time, timedelta
+from unittest.mock import AsyncMock, patch
+
+from src.services.stats_service import StatsService, format_close_times, format_votes_by_day
+
+COUNTS = {
+    "total_groups": 5,
+    "active_groups": 4,
+    "day_groups": 3,
+    "night_groups": 2,
+    "groups_with_slots": 3,
+    "active_polls": 4,
+    "active_today": 1,
+    "active_tomorrow": 3,
+    "today_polls": 5,
+    "today_closed": 4,
+    "verified_users": 120,
+    "unverified_users": 3,
+}
+
+
+class StatsServiceTests(unittest.IsolatedAsyncioTestCase):
+    def _build_service(self):
+        service = StatsService(db_pool=None, refresh_seconds=60, history_days=7)
+        today = date.today()
+        service.repository = AsyncMock()
+        service.repository.get_counts.return_value = dict(COUNTS)
+        service.repository.get_votes_by_day.return_value = [
+            {"day": today - timedelta(days=1), "votes": 80, "voters": 75},
+            {"day": today, "votes": 42, "voters": 40},
+        ]
+        service.repository.get_close_times.return_value = [
+            {"is_night": False, "poll_close_time": time(18, 0), "groups": 1},
+            {"is_night": False, "poll_close_time": time(20, 30), "groups": 2},
+            {"is_night": True, "poll_close_time": None, "groups": 1},
+        ]
+        return service
+
+    async def test_snapshot_is_built_from_aggregates(self):
+        service = self._build_service()
+
+        snapshot = await service.get_snapshot()
+
+        self.assertEqual(snapshot.active_polls, 4)
+        self.assertEqual(snapshot.today_votes, 42)
+        self.assertEqual(snapshot.as_dict()["today_votes"], 42)
+        since = service.repository.get_votes_by_day.await_args.args[0]
+        self.assertEqual(since, date.today() - timedelta(days=6))
+        self.assertTrue(format_votes_by_day(snapshot).startswith(
+            f"• {date.today().strftime('%d.%m')}: <b>42</b> (курьеров: 40)\n"
+        ))
+
+    async def test_close_times_show_group_window_instead_of_global_setting(self):
+        service = self._build_service()
+        snapshot = await service.get_snapshot()
+
+        with patch("src.services.stats_service.settings.ENABLE_PER_GROUP_SCHEDULES", True), \
+                patch("src.services.stats_service.settings.GROUP_SCHEDULE_SPREAD_MINUTES", 10), \
+                patch("src.services.stats_service.settings.POLL_CLOSING_HOUR", 21):
+            text = format_close_times(snapshot)
+
+        self.assertIn("• Закрытие: дневные 18:00–20:30 (групп: 3)\n", text)
+        # Ночная группа без poll_close_time закрывается в 17:00
+        self.assertIn("• Закрытие: ночные 17:00 (групп: 1)\n", text)
+        self.assertIn("до 10 мин", text)
+        self.assertNotIn("21:", text)
+
+        with patch("src.services.stats_service.settings.ENABLE_PER_GROUP_SCHEDULES", False), \
+                patch("src.services.stats_service.settings.POLL_CLOSING_HOUR", 21), \
+                patch("src.services.stats_service.settings.POLL_CLOSING_MINUTE", 0):
+            self.assertEqual(format_close_times(snapshot), "• Закрытие: 21:00\n")
+
+    async def test_reads_use_cached_snapshot_until_invalidated(self):
+        service = self._build_service()
+
+        first = await service.get_snapshot()
+        second = await service.get_snapshot()
+        self.assertIs(first, second)
+        self.assertEqual(service.repository.get_counts.await_count, 1)
+
+        service.invalidate()
+        third = await service.get_snapshot()
+        self.assertIsNot(third, first)
+        self.assertEqual(service.repository.get_counts.await_count, 2)
+
+    async def test_concurrent_readers_share_one_refresh(self):
+        service = self._build_service()
+
+        async def slow_counts(today):
+            await asyncio.sleep(0.01)
+            return dict(COUNTS)
+
+        service.repository.get_counts.side_effect = slow_counts
+
+        snapshots = await asyncio.gather(*(service.get_snapshot() for _ in range(10)))
+
+        self.assertEqual(service.repository.get_counts.await_count, 1)
+        self.assertTrue(all(snapshot is snapshots[0] for snapshot in snapshots))
+
+    async def test_failed_refresh_keeps_snapshot_stale(self):
+        service = self._build_service()
+        service.repository.get_counts.side_effect = RuntimeError("db down")
+
+        with self.assertRaises(RuntimeError):
+            await service.get_snapshot()
+
+        service.repository.get_counts.side_effect = None
+        service.repository.get_counts.return_value = dict(COUNTS)
+        snapshot = await service.get_snapshot()
+        self.assertEqual(snapshot.total_groups, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+Проверка функции sync_group_member (миграция 021) на настоящем PostgreSQL.
+
+Как и проверка планов запросов, тест запускается, только если задан
+QUERY_PLAN_DATABASE_URL (см. tests/test_query_plans.py). Каждый тест
+создаёт отдельную схему со всеми миграциями и вызывает
+GroupMemberRepository.sync_to_group.
+"""
+import importlib.util
+import os
+import unittest
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+DATABASE_URL = os.getenv("QUERY_PLAN_DATABASE_URL")
+BASE_DIR = Path(__file__).parent.parent
+
+SEED_SQL = """
+INSERT INTO groups (id, name, telegram_chat_id, is_night)
+VALUES (1, 'ЗИЗ-1', -1000000001, false),
+       (2, 'ЗИЗ-2', -1000000002, false),
+       (3, 'ЗИЗ-3', -1000000003, false);
+"""
+
+
+def _load_init_script():
+    spec = importlib.util.spec_from_file_location(
+        "init_runtime_database", BASE_DIR / "scripts" / "init_runtime_database.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class SingleConnectionPool:
+    """Пул из одного соединения."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+@unittest.skipUnless(DATABASE_URL, "QUERY_PLAN_DATABASE_URL не задан")
+class SyncGroupMemberTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        import asyncpg
+
+        from src.repositories.group_member_repository import GroupMemberRepository
+
+        self.schema = f"sync_member_{uuid.uuid4().hex[:8]}"
+        self.conn = await asyncpg.connect(DATABASE_URL, ssl=False)
+        await self.conn.execute(f"CREATE SCHEMA {self.schema}")
+        await self.conn.execute(f"SET search_path TO {self.schema}, public")
+
+        init_script = _load_init_script()
+        await self.conn.execute(init_script.CORE_SCHEMA_SQL)
+        await init_script._apply_migrations(self.conn)
+        await self.conn.execute(SEED_SQL)
+        self.repository = GroupMemberRepository(SingleConnectionPool(self.conn))
+
+    async def asyncTearDown(self):
+        await self.conn.execute(f"DROP SCHEMA {self.schema} CASCADE")
+        await self.conn.close()
+
+    async def _add_member(self, group_id, full_name, telegram_user_id=None, is_active=True, username=None):
+        return await self.conn.fetchval(
+            """
+            INSERT INTO group_members (group_id, full_name, telegram_user_id, username, is_active, created_at, updated_at)
+            VALUES ($1, $2, $3, $4, $5, NOW() - INTERVAL '1 day', NOW() - INTERVAL '1 day')
+            RETURNING id
+            """,
+            group_id,
+            full_name,
+            telegram_user_id,
+            username,
+            is_active,
+        )
+
+    async def _sync(self, group_id, telegram_user_id, full_name, username=None, create_if_missing=True):
+        return await self.repository.sync_to_group(
+            group_id=group_id,
+            telegram_user_id=telegram_user_id,
+            full_name=full_name,
+            username=username,
+            create_if_missing=create_if_missing,
+        )
+
+    async def _count(self):
+        return await self.conn.fetchval("SELECT COUNT(*) FROM group_members")
+
+    async def test_reactivates_card_in_same_group(self):
+        member_id = await self._add_member(3, "Иван Петров", 42, is_active=False)
+
+        member = await self._sync(3, 42, "Иван Петров", "@ivan")
+
+        self.assertEqual(member["id"], member_id)
+        self.assertEqual(member["group_id"], 3)
+        self.assertTrue(member["is_active"])
+        self.assertEqual(member["username"], "@ivan")
+        self.assertTrue(member["member_changed"])
+        self.assertFalse(member["member_created"])
+        self.assertEqual(await self._count(), 1)
+
+    async def test_moves_card_from_another_group(self):
+        member_id = await self._add_member(1, "Иван Петров", 42)
+
+        member = await self._sync(3, 42, "Иван Петров")
+
+        self.assertEqual(member["id"], member_id)
+        self.assertEqual(member["group_id"], 3)
+        self.assertTrue(member["member_changed"])
+        self.assertFalse(member["member_created"])
+        self.assertEqual(await self._count(), 1)
+
+    async def test_bound_courier_vote_does_not_write(self):
+        await self._add_member(3, "Иван Петров", 42, username="@ivan")
+
+        member = await self._sync(3, 42, "Иван Петров", "@ivan")
+
+        self.assertFalse(member["member_changed"])
+        self.assertFalse(member["member_created"])
+
+    async def test_binds_unlinked_roster_card_not_bound_namesake(self):
+        bound_id = await self._add_member(1, "Сергей Орлов", 77)
+        roster_id = await self._add_member(3, "Сергей Орлов")
+
+        member = await self._sync(3, 55, "  Сергей Орлов ")
+
+        self.assertEqual(member["id"], roster_id)
+        self.assertEqual(member["telegram_user_id"], 55)
+        self.assertTrue(member["member_changed"])
+        self.assertFalse(member["member_created"])
+        namesake = await self.conn.fetchrow("SELECT * FROM group_members WHERE id = $1", bound_id)
+        self.assertEqual((namesake["group_id"], namesake["telegram_user_id"]), (1, 77))
+        self.assertEqual(await self._count(), 2)
+
+    async def test_restores_inactive_card_with_same_name(self):
+        member_id = await self._add_member(3, "Пётр Иванов", is_active=False)
+
+        member = await self._sync(3, 60, "Пётр Иванов", "@petr")
+
+        self.assertEqual(member["id"], member_id)
+        self.assertTrue(member["is_active"])
+        self.assertEqual(member["telegram_user_id"], 60)
+        self.assertEqual(member["username"], "@petr")
+        self.assertTrue(member["member_changed"])
+        self.assertFalse(member["member_created"])
+        self.assertEqual(await self._count(), 1)
+
+    async def test_creates_new_card(self):
+        member = await self._sync(3, 61, "   ")
+
+        self.assertEqual(member["full_name"], "User_61")
+        self.assertEqual(member["telegram_user_id"], 61)
+        self.assertTrue(member["member_changed"])
+        self.assertTrue(member["member_created"])
+
+    async def test_without_create_if_missing_nothing_is_created(self):
+        await self._add_member(3, "Администратор")
+
+        member = await self._sync(3, 99, "Администратор", create_if_missing=False)
+
+        self.assertIsNone(member)
+        self.assertIsNone(await self.conn.fetchval("SELECT telegram_user_id FROM group_members"))
+        self.assertEqual(await self._count(), 1)
+
+    async def test_without_create_if_missing_known_card_is_still_moved(self):
+        member_id = await self._add_member(1, "Администратор", 99)
+
+        member = await self._sync(3, 99, "Администратор", create_if_missing=False)
+
+        self.assertEqual(member["id"], member_id)
+        self.assertEqual(member["group_id"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from src.services.metrics_service import MetricsSample, SystemMetricsService
+
+
+def _sample(timestamp: float, cpu: float, lag_ms: float = 1.0) -> MetricsSample:
+    return MetricsSample(
+        timestamp=timestamp,
+        cpu_percent=cpu,
+        system_cpu_percent=cpu,
+        rss_bytes=100 * 1024 * 1024,
+        open_fds=42,
+        loop_lag_ms=lag_ms,
+        db_pool_size=4,
+        db_pool_max_size=10,
+        db_pool_in_use=1,
+        redis_latency_ms=None,
+    )
+
+
+class SystemMetricsServiceTests(unittest.IsolatedAsyncioTestCase):
+    def test_ring_buffer_is_bounded_by_history(self):
+        service = SystemMetricsService(interval_seconds=10, history_seconds=60)
+
+        for index in range(100):
+            service._samples.append(_sample(float(index), cpu=float(index)))
+
+        self.assertEqual(len(service._samples), 7)
+        self.assertEqual(service.get_latest().cpu_percent, 99.0)
+
+    def test_trends_use_only_samples_inside_window(self):
+        service = SystemMetricsService(interval_seconds=10, history_seconds=3600)
+        now = 10_000.0
+        service._samples.extend(
+            [
+                _sample(now - 1000, cpu=90.0),
+                _sample(now - 50, cpu=10.0, lag_ms=4.0),
+                _sample(now - 20, cpu=30.0, lag_ms=2.0),
+                _sample(now, cpu=20.0, lag_ms=0.0),
+            ]
+        )
+
+        trends = service.get_trends(60, now=now)
+
+        self.assertEqual(trends["cpu_percent"], {"min": 10.0, "avg": 20.0, "max": 30.0})
+        self.assertEqual(trends["loop_lag_ms"]["max"], 4.0)
+        self.assertNotIn("redis_latency_ms", trends)
+        self.assertEqual(service.get_trends(3600, now=now)["cpu_percent"]["max"], 90.0)
+
+    async def test_collect_sample_reads_pool_and_redis_without_blocking(self):
+        pool = SimpleNamespace(
+            get_size=MagicMock(return_value=5),
+            get_idle_size=MagicMock(return_value=2),
+            get_max_size=MagicMock(return_value=10),
+        )
+        redis = SimpleNamespace(ping=AsyncMock(return_value=True))
+        service = SystemMetricsService(db_pool=pool, redis=redis, interval_seconds=10)
+
+        sample = await service.collect_sample(loop_lag_seconds=0.25)
+
+        self.assertEqual(sample.db_pool_size, 5)
+        self.assertEqual(sample.db_pool_in_use, 3)
+        self.assertEqual(sample.db_pool_max_size, 10)
+        self.assertEqual(sample.loop_lag_ms, 250.0)
+        self.assertIsNotNone(sample.redis_latency_ms)
+        self.assertGreater(sample.rss_bytes, 0)
+        redis.ping.assert_awaited_once()
+
+    async def test_redis_failure_does_not_break_sample(self):
+        redis = SimpleNamespace(ping=AsyncMock(side_effect=ConnectionError("down")))
+        service = SystemMetricsService(redis=redis, interval_seconds=10)
+
+        sample = await service.collect_sample()
+
+        self.assertIsNone(sample.redis_latency_ms)
+        self.assertIsNone(sample.db_pool_size)
+
+
+if __name__ == "__main__":
+    unittest.main()